@@ -1,11 +1,32 @@
-from fastapi import APIRouter, Path, HTTPException, Body
+import time
+from fastapi import APIRouter, Path, HTTPException, Depends, Request
+from fastapi.responses import ORJSONResponse
 from app.models.tool_models import AgentToolRequestPayload, AgentToolResponsePayload
-from app.services.agent_tool_service import AgentToolService
+from app.services.container import get_services
+from app.core.metrics import TOOL_CALL_DURATION
+from app.core.fast_json import ORJSONRoute, JSON_OBJECT_BODY, json_object_body
 from app.core.logging import get_logger
 
 logger = get_logger(__name__)
-router = APIRouter()
-agent_tool_service = AgentToolService()  # 서비스 인스턴스 생성
+router = APIRouter(route_class=ORJSONRoute)
+
+
+TOOL_CALL_HEADERS = [
+    {
+        "name": "Idempotency-Key",
+        "in": "header",
+        "required": False,
+        "schema": {"type": "string"},
+        "description": "재시도 시 중복 실행을 막기 위한 키 (없으면 페이로드의 tool_call_id 사용)",
+    },
+    {
+        "name": "X-Vox-Call-Id",
+        "in": "header",
+        "required": False,
+        "schema": {"type": "string"},
+        "description": "도구를 호출한 통화 ID (없으면 페이로드의 call_id 사용)",
+    },
+]
 
 
 # 에이전트 도구 호출을 수신하는 동적 엔드포인트
@@ -15,13 +36,14 @@ agent_tool_service = AgentToolService()  # 서비스 인스턴스 생성
     summary="에이전트 도구 호출 처리",
     response_model=AgentToolResponsePayload,
     response_description="도구 실행 결과",
+    openapi_extra={**JSON_OBJECT_BODY, "parameters": TOOL_CALL_HEADERS},
 )
 async def handle_agent_tool(
+    request: Request,
     tool_name: str = Path(..., description="호출할 도구의 이름"),
-    payload: AgentToolRequestPayload = Body(
-        ..., description="도구 호출에 필요한 파라미터 (JSON 객체)"
-    ),
-) -> AgentToolResponsePayload:
+    # 도구별 파라미터(JSON 객체)는 스키마가 없으므로 재검증 없이 orjson 파싱 결과를 그대로 사용합니다.
+    payload: AgentToolRequestPayload = Depends(json_object_body),
+) -> ORJSONResponse:
     """
     Vox.ai 에이전트로부터 특정 API 도구 호출을 수신하고 처리합니다.j
     `tool_name` 경로는 Vox.ai 대시보드에 설정된 도구 이름과 일치해야 합니다.
@@ -29,11 +51,41 @@ async def handle_agent_tool(
     """
     logger.info(f"수신된 에이전트 도구 호출: '{tool_name}', 페이로드: {payload}")
 
+    services = get_services(request)
+    agent_tool_service = services.agent_tool_service
+    call_session_index = services.call_session_index
+    # 헤더는 요청마다 파라미터 검증을 거치지 않도록 직접 읽습니다 (문서는 TOOL_CALL_HEADERS 참고).
+    idempotency_key = request.headers.get("idempotency-key")
+    call_id = request.headers.get("x-vox-call-id") or payload.get("call_id")
+    # 임의의 경로 값이 지표 라벨을 늘리지 않도록 구현되지 않은 도구는 하나로 묶습니다.
+    metric_tool_name = (
+        tool_name if agent_tool_service.is_supported_tool(tool_name) else "unknown"
+    )
+    started_at = time.time()
+    started = time.perf_counter()
+
     # 서비스에게 도구 호출 처리를 위임합니다.
     try:
-        response_data = await agent_tool_service.process_tool_call(tool_name, payload)
-        return response_data
+        response_data = await agent_tool_service.process_tool_call(
+            tool_name, payload, idempotency_key=idempotency_key, call_id=call_id
+        )
+        elapsed = time.perf_counter() - started
+        ok = response_data.get("status") != "error" and "error" not in response_data
+        TOOL_CALL_DURATION.observe(elapsed, metric_tool_name, "ok" if ok else "error")
+        if call_id:
+            # 통화 세션에 도구별 서버 측 처리 시간을 기록합니다.
+            call_session_index.record_tool_call(
+                str(call_id), tool_name, started_at, elapsed * 1000, ok=ok
+            )
+        # 응답을 직접 반환하여 response_model 재검증과 jsonable_encoder 변환을 생략합니다.
+        return ORJSONResponse(response_data)
     except Exception as e:
         logger.error(f"에이전트 도구 '{tool_name}' 처리 중 오류 발생: {e}")
+        elapsed = time.perf_counter() - started
+        TOOL_CALL_DURATION.observe(elapsed, metric_tool_name, "exception")
+        if call_id:
+            call_session_index.record_tool_call(
+                str(call_id), tool_name, started_at, elapsed * 1000, ok=False
+            )
         # 실제 프로덕션에서는 도구 실행 실패에 대한 사용자 친화적인 응답 형식을 정의해야 합니다.
         raise HTTPException(status_code=500, detail=f"도구 처리 중 오류 발생: {e}")
@@ -1,12 +1,14 @@
-from fastapi import APIRouter, HTTPException
+import time
+from fastapi import APIRouter, HTTPException, Request
 from typing import Dict, Any
 from app.models.webhook_models import CallWebhookPayload
-from app.services.call_webhook_service import CallWebhookService
+from app.services.container import get_services
 from app.core.logging import get_logger
+from app.core.tracing import current_span
+from app.core.fast_json import ORJSONRoute
 
 logger = get_logger(__name__)
-router = APIRouter()
-call_webhook_service = CallWebhookService()  # 서비스 인스턴스 생성
+router = APIRouter(route_class=ORJSONRoute)
 
 
 # 통화 데이터 웹훅 이벤트를 수신하는 엔드포인트
@@ -17,6 +19,7 @@ call_webhook_service = CallWebhookService()  # 서비스 인스턴스 생성
     response_description="이벤트 처리 결과",
 )
 async def handle_call_webhook(
+    request: Request,
     webhook_data: CallWebhookPayload,  # Pydantic 모델을 사용하여 자동 유효성 검사 및 파싱
 ) -> Dict[str, Any]:
     """
@@ -26,8 +29,17 @@ async def handle_call_webhook(
     event_type = webhook_data.event
     logger.info(f"수신된 통화 웹훅 이벤트: {event_type}")
 
+    span = current_span()
+    if span is not None:
+        # 요청 시작부터 여기까지의 시간은 본문 수신과 페이로드 파싱/검증에 해당합니다.
+        span.set_attribute("call.event", event_type)
+        span.set_attribute(
+            "request.parse_ms", round((time.time_ns() - span.start_ns) / 1e6, 3)
+        )
+
     # 서비스에게 이벤트 처리를 위임합니다.
     try:
+        call_webhook_service = get_services(request).call_webhook_service
         result = await call_webhook_service.process_webhook_event(
             event_type, webhook_data
         )
@@ -1,11 +1,12 @@
-from fastapi import APIRouter
+from typing import Dict, Any
+from fastapi import APIRouter, Request, Response
 from app.models.webhook_models import InboundWebhookPayload, InboundWebhookResponse
-from app.services.inbound_webhook_service import InboundWebhookService
+from app.services.container import get_services
 from app.core.logging import get_logger
+from app.core.fast_json import ORJSONRoute
 
 logger = get_logger(__name__)
-router = APIRouter()
-inbound_webhook_service = InboundWebhookService()  # 서비스 인스턴스 생성
+router = APIRouter(route_class=ORJSONRoute)
 
 
 # 인바운드 콜 웹훅을 수신하는 엔드포인트
@@ -17,8 +18,9 @@ inbound_webhook_service = InboundWebhookService()  # 서비스 인스턴스 생
     response_description="동적 변수 및 메타데이터",
 )
 async def handle_inbound_webhook(
+    request: Request,
     webhook_data: InboundWebhookPayload,  # Pydantic 모델을 사용하여 자동 유효성 검사 및 파싱
-) -> InboundWebhookResponse:
+) -> Response:
     """
     Vox.ai로부터 인바운드 콜 웹훅 이벤트를 수신합니다.
     이 웹훅은 통화 라우팅 또는 에이전트에게 전달할 정보를 동적으로 설정하는 데 사용됩니다.
@@ -27,5 +29,26 @@ async def handle_inbound_webhook(
     logger.info(f"수신된 인바운드 웹훅 이벤트: {webhook_data.event}")
 
     # 서비스에게 인바운드 콜 처리를 위임하고 응답을 반환합니다.
+    inbound_webhook_service = get_services(request).inbound_webhook_service
     response_data = await inbound_webhook_service.process_inbound_call(webhook_data)
-    return response_data
+    # 서비스가 이미 검증된 모델을 만들었으므로 재검증 없이 바로 직렬화합니다.
+    return Response(response_data.model_dump_json(), media_type="application/json")
+
+
+# 발신자 정보 조회 캐시의 적중/미스/병합 통계를 조회하는 엔드포인트
+@router.get(
+    "/stats/inbound",
+    summary="인바운드 발신자 조회 통계",
+    response_description="캐시 적중/미스/병합 수 및 처리 시간 예산 초과 수",
+)
+async def get_inbound_cache_stats(request: Request) -> Dict[str, Any]:
+    """
+    발신자 정보 조회 캐시의 적중(hit), stale 적중, 미스(miss),
+    동시 요청 병합(coalesced) 및 백그라운드 갱신 횟수와,
+    처리 시간 예산을 초과하여 기본값으로 응답한 횟수를 반환합니다.
+    """
+    inbound_webhook_service = get_services(request).inbound_webhook_service
+    return {
+        "caller_cache": inbound_webhook_service.caller_cache.stats(),
+        "deadline": inbound_webhook_service.deadline_stats(),
+    }
@@ -0,0 +1,14 @@
+from fastapi import APIRouter, Request
+from fastapi.responses import PlainTextResponse
+from app.services.container import get_services
+
+router = APIRouter()
+
+
+# Prometheus가 수집하는 지표 엔드포인트 (모든 워커의 값을 합산하여 반환)
+@router.get("/metrics", include_in_schema=False)
+async def get_metrics(request: Request) -> PlainTextResponse:
+    return PlainTextResponse(
+        get_services(request).metrics_exporter.render(),
+        media_type="text/plain; version=0.0.4; charset=utf-8",
+    )
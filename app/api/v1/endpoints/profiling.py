@@ -0,0 +1,92 @@
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.responses import PlainTextResponse
+from typing import Any, Dict, List
+from app.core.fast_json import ORJSONRoute
+from app.core.profiling import ADMIN_TOKEN_HEADER, Profiler, ProfilerBusyError
+
+router = APIRouter(route_class=ORJSONRoute)
+
+
+def require_admin(request: Request) -> Profiler:
+    """X-Admin-Token 헤더가 PROFILING_ADMIN_TOKEN과 일치할 때만 프로파일러를 반환합니다."""
+    profiler: Profiler = request.app.state.profiler
+    if profiler is None:
+        raise HTTPException(status_code=404, detail="Not Found")
+    if not profiler.is_authorized(request.headers.get(ADMIN_TOKEN_HEADER)):
+        raise HTTPException(status_code=403, detail="관리자 토큰이 올바르지 않습니다.")
+    return profiler
+
+
+# 이벤트 루프 스레드의 CPU 사용 위치를 표본 추출하는 엔드포인트
+@router.get("/admin/profile/cpu", include_in_schema=False)
+async def profile_cpu(
+    duration: float = Query(10.0, gt=0, description="표본 추출 시간(초)"),
+    profiler: Profiler = Depends(require_admin),
+) -> PlainTextResponse:
+    """
+    duration초 동안 이벤트 루프 스레드의 호출 스택을 표본 추출하여
+    flamegraph.pl / speedscope에 바로 넣을 수 있는 접힌 스택 텍스트로 반환합니다.
+    """
+    try:
+        sampler = await profiler.profile_cpu(duration)
+    except ProfilerBusyError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    summary = sampler.summary()
+    return PlainTextResponse(
+        sampler.collapsed(),
+        headers={
+            "X-Profile-Samples": str(summary["samples"]),
+            "X-Profile-Duration-Seconds": str(summary["duration_seconds"]),
+        },
+    )
+
+
+# 일정 시간 동안 늘어난 메모리 할당 위치를 비교하는 엔드포인트
+@router.get("/admin/profile/memory", include_in_schema=False)
+async def profile_memory(
+    duration: float = Query(10.0, gt=0, description="스냅샷 간격(초)"),
+    top: int = Query(25, ge=1, le=500, description="반환할 할당 위치 수"),
+    group_by: str = Query("lineno", pattern="^(lineno|filename|traceback)$"),
+    profiler: Profiler = Depends(require_admin),
+) -> Dict[str, Any]:
+    """
+    tracemalloc을 켜고 duration초 간격으로 두 스냅샷을 찍어, 그 사이에 할당되어
+    아직 해제되지 않은 메모리가 많은 위치(증가량 순)를 반환합니다.
+    """
+    try:
+        return await profiler.profile_memory(duration, top, group_by)
+    except ProfilerBusyError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+
+
+# 요청 단위(X-Vox-Profile 헤더) 프로파일 결과 목록을 조회하는 엔드포인트
+@router.get("/admin/profiles", include_in_schema=False)
+async def list_profiles(
+    profiler: Profiler = Depends(require_admin),
+) -> List[Dict[str, Any]]:
+    return profiler.list_results()
+
+
+# 요청 단위 프로파일 결과를 조회하는 엔드포인트
+@router.get("/admin/profiles/{profile_id}", include_in_schema=False)
+async def get_profile(
+    profile_id: str,
+    format: str = Query("json", pattern="^(json|collapsed)$"),
+    profiler: Profiler = Depends(require_admin),
+):
+    """
+    응답 헤더 X-Vox-Profile-Id로 받은 ID의 결과를 반환합니다.
+    format=collapsed이면 CPU 프로파일의 접힌 스택 텍스트만 반환합니다.
+    """
+    result = profiler.get_result(profile_id)
+    if result is None:
+        raise HTTPException(
+            status_code=404, detail=f"프로파일을 찾을 수 없습니다: {profile_id}"
+        )
+    if format == "collapsed":
+        if "cpu" not in result:
+            raise HTTPException(
+                status_code=404, detail="CPU 프로파일이 없는 결과입니다."
+            )
+        return PlainTextResponse(result["cpu"]["collapsed"])
+    return result
@@ -0,0 +1,239 @@
+from fastapi import APIRouter, HTTPException, Query, Request
+from typing import Dict, Any, Optional
+from app.services.container import get_services
+from app.core.fast_json import ORJSONRoute
+
+router = APIRouter(route_class=ORJSONRoute)
+
+
+# 통화 종료 이벤트로부터 집계된 실시간 통화 통계를 조회하는 엔드포인트
+@router.get(
+    "/stats",
+    summary="실시간 통화 통계 조회",
+    response_description="1분/1시간/24시간 롤링 윈도우 통계",
+)
+async def get_call_stats(
+    request: Request,
+    agent_id: Optional[str] = Query(None, description="특정 에이전트만 조회"),
+) -> Dict[str, Any]:
+    """
+    전체 및 에이전트별 통화 수, 통화 시간 분포(p50/p90/p99), 종료 사유,
+    사용자 감성, 사용 크레딧 합계를 1분/1시간/24시간 단위로 반환합니다.
+    """
+    return get_services(request).call_analytics.snapshot(agent_id)
+
+
+# 외부 전송 목적지별 서킷 브레이커 상태와 동시성 한도를 조회하는 엔드포인트
+@router.get(
+    "/stats/outbound",
+    summary="외부 전송 목적지 상태 조회",
+    response_description="목적지별 서킷 브레이커 및 동시성 한도",
+)
+async def get_outbound_destination_stats(request: Request) -> Dict[str, Any]:
+    """
+    Make.com, 커스텀 서버 등 외부 웹훅 목적지별 서킷 브레이커 상태,
+    현재 동시성 한도와 처리 중인 요청 수를 반환합니다.
+    """
+    return {"destinations": get_services(request).outbound_guards.stats()}
+
+
+# 통화 세션 인덱스 상태를 조회하는 엔드포인트
+@router.get(
+    "/stats/sessions",
+    summary="통화 세션 인덱스 상태 조회",
+    response_description="진행 중/종료/만료된 세션 수",
+)
+async def get_call_session_stats(request: Request) -> Dict[str, Any]:
+    """
+    call_started와 도구 호출, call_ended를 연결하는 세션 인덱스의
+    진행 중인 세션 수와 종료(completed)/만료(abandoned) 세션 수를 반환합니다.
+    """
+    return get_services(request).call_session_index.stats()
+
+
+# 대화 스크립트에서 집계한 도구별 사용 통계를 조회하는 엔드포인트
+@router.get(
+    "/stats/tools",
+    summary="도구 사용 통계 조회",
+    response_description="도구별 호출 수, 오류율, 인수 형태 빈도",
+)
+async def get_tool_usage_stats(request: Request) -> Dict[str, Any]:
+    """
+    call_ended의 transcript_with_tool_calls에서 누적한 도구별 호출 수,
+    결과의 오류 비율, 인수 형태(키와 타입 조합)별 빈도를 반환합니다.
+    """
+    return get_services(request).tool_usage_analytics.snapshot()
+
+
+# 읽기 전용 도구 응답 캐시의 도구별 적중률을 조회하는 엔드포인트
+@router.get(
+    "/stats/tool_cache",
+    summary="도구 응답 캐시 통계 조회",
+    response_description="도구별 TTL, 적중/미스 수와 적중률",
+)
+async def get_tool_cache_stats(request: Request) -> Dict[str, Any]:
+    """
+    *_schema.json에 캐시 정책이 선언된 도구별 TTL, 적중(hit)/미스(miss) 수와 적중률,
+    상태 변경 도구로 인한 무효화 횟수와 LRU 제거 횟수를 반환합니다.
+    """
+    return get_services(request).agent_tool_service.response_cache.stats()
+
+
+# 이메일 알림 발송 큐와 SMTP 연결 풀 상태를 조회하는 엔드포인트
+@router.get(
+    "/stats/email",
+    summary="이메일 발송 상태 조회",
+    response_description="발송 대기/완료/실패 수, 연결 수, 접수부터 발송까지의 지연",
+)
+async def get_email_delivery_stats(request: Request) -> Dict[str, Any]:
+    """
+    send_email_notification으로 접수된 이메일의 대기 중·발송 완료·실패·재시도 횟수와
+    열린 SMTP 연결 수, 접수부터 발송 완료까지의 지연 분포(ms)를 반환합니다.
+    """
+    return get_services(request).agent_tool_service.email_delivery.stats()
+
+
+# email_id별 발송 상태를 조회하는 엔드포인트
+@router.get(
+    "/stats/email/{email_id}",
+    summary="이메일별 발송 상태 조회",
+    response_description="queued / sending / deferred / sent / failed 상태와 시도 횟수",
+)
+async def get_email_delivery_status(request: Request, email_id: str) -> Dict[str, Any]:
+    """
+    send_email_notification 응답의 email_id로 현재 발송 상태, 시도 횟수,
+    SMTP 서버 응답 또는 마지막 오류를 반환합니다. 최근 요청만 보관합니다.
+    상태는 접수한 워커에만 있으므로 워커가 여러 개면 고정 라우팅이 필요합니다.
+    """
+    status = get_services(request).agent_tool_service.email_delivery.get_status(
+        email_id
+    )
+    if status is None:
+        raise HTTPException(
+            status_code=404, detail=f"이메일을 찾을 수 없습니다: {email_id}"
+        )
+    return status
+
+
+# 젠데스크 티켓 일괄 생성 상태를 조회하는 엔드포인트
+@router.get(
+    "/stats/tickets",
+    summary="젠데스크 티켓 생성 상태 조회",
+    response_description="대기/생성/실패 티켓 수, 일괄 요청 크기, 속도 제한 상태",
+)
+async def get_ticket_stats(request: Request) -> Dict[str, Any]:
+    """
+    티켓 도구로 접수된 티켓의 대기 중·생성·실패 수, create_many 요청 수와 요청당 티켓 수,
+    임시 ID가 실제 티켓 ID로 연결되기까지의 지연(ms), Zendesk 속도 제한 상태를 반환합니다.
+    """
+    return get_services(request).agent_tool_service.zendesk_tickets.stats()
+
+
+# 임시 티켓 ID로 실제 Zendesk 티켓 ID를 조회하는 엔드포인트
+@router.get(
+    "/stats/tickets/{provisional_id}",
+    summary="임시 티켓 ID 조회",
+    response_description="pending / submitted / created / failed 상태와 실제 티켓 ID",
+)
+async def get_ticket_status(request: Request, provisional_id: str) -> Dict[str, Any]:
+    """
+    티켓 도구가 반환한 임시 티켓 ID(ZD-P-...)의 생성 상태와,
+    생성이 끝났다면 Zendesk가 부여한 실제 티켓 ID를 반환합니다. 최근 요청만 보관합니다.
+    상태는 접수한 워커에만 있으므로 워커가 여러 개면 고정 라우팅이 필요합니다.
+    """
+    status = get_services(request).agent_tool_service.zendesk_tickets.get_status(
+        provisional_id
+    )
+    if status is None:
+        raise HTTPException(
+            status_code=404, detail=f"티켓을 찾을 수 없습니다: {provisional_id}"
+        )
+    return status
+
+
+# 우선순위 콜백 대기열 깊이와 상담원 처리 용량을 조회하는 엔드포인트
+@router.get(
+    "/stats/callbacks",
+    summary="우선순위 콜백 대기열 조회",
+    response_description="긴급도별 대기 콜백 수, 상담원 처리량, 예상/실제 대기 시간",
+)
+async def get_callback_stats(request: Request) -> Dict[str, Any]:
+    """
+    긴급도(Critical/High/Normal)별 대기 중인 콜백 수와 지금 접수하면 예상되는 대기 시간,
+    통화 중인 상담원 수와 분당 처리량, 실제 대기 시간과 예측 오차 분포(초)를 반환합니다.
+    """
+    return get_services(request).agent_tool_service.callback_scheduler.stats()
+
+
+# callback_id별 대기 순번과 연결 상태를 조회하는 엔드포인트
+@router.get(
+    "/stats/callbacks/{callback_id}",
+    summary="콜백 상태 조회",
+    response_description="pending / dispatched 상태, 현재 순번과 남은 예상 대기 시간",
+)
+async def get_callback_status(request: Request, callback_id: str) -> Dict[str, Any]:
+    """
+    schedule_priority_callback 도구가 반환한 callback_id의 상태를 반환합니다.
+    대기 중이면 앞에 남은 콜백 수와 남은 예상 대기 시간(초)을 함께 반환합니다.
+    상태는 접수한 워커에만 있으므로 워커가 여러 개면 고정 라우팅이 필요합니다.
+    """
+    status = get_services(request).agent_tool_service.callback_scheduler.get_status(
+        callback_id
+    )
+    if status is None:
+        raise HTTPException(
+            status_code=404, detail=f"콜백을 찾을 수 없습니다: {callback_id}"
+        )
+    return status
+
+
+# 서비스 지역별 기사 수와 미결 티켓 부하를 조회하는 엔드포인트
+@router.get(
+    "/stats/technicians",
+    summary="기사 배정 현황 조회",
+    response_description="지역별 기사 수, 미결 티켓 수, 최소/최대 부하",
+)
+async def get_technician_stats(request: Request) -> Dict[str, Any]:
+    """
+    create_support_ticket 도구가 배정한 티켓 수, 지역을 찾지 못해 전체 기사 중에서 배정한 수,
+    서비스 지역별 기사 수와 미결 티켓 수, 기사별 최소/최대 부하를 반환합니다.
+    """
+    return get_services(request).agent_tool_service.technician_dispatcher.stats()
+
+
+# 고객 만족도 조사 점수 집계를 조회하는 엔드포인트
+@router.get(
+    "/stats/csat",
+    summary="고객 만족도 통계 조회",
+    response_description="전체 / 시간대별 / 에이전트별 점수 건수, 평균, 분포",
+)
+async def get_csat_stats(
+    request: Request,
+    agent_id: Optional[str] = Query(None, description="특정 에이전트만 조회"),
+    hours: int = Query(
+        24, ge=1, le=168, description="시간대별 집계를 반환할 최근 시간 수"
+    ),
+) -> Dict[str, Any]:
+    """
+    save_csat_survey 도구로 저장된 점수(1-5)의 건수, 평균, 점수별 분포를
+    전체, 최근 hours시간(1시간 단위), 에이전트별로 반환합니다.
+    """
+    return get_services(request).agent_tool_service.csat_store.stats(agent_id, hours)
+
+
+# 승인 제어(동시성 한도, 에이전트별 속도 제한) 상태를 조회하는 엔드포인트
+@router.get(
+    "/stats/admission",
+    summary="승인 제어 상태 조회",
+    response_description="우선순위별 처리 중/대기 중/거절된 요청 수",
+)
+async def get_admission_stats(request: Request) -> Dict[str, Any]:
+    """
+    실시간(live: /inbound, /tools) 및 후순위(background: /call_events, /stats) 요청별
+    처리 중·대기 중인 요청 수와 승인/거절 누적 횟수, 에이전트별 속도 제한 현황을 반환합니다.
+    값은 요청을 처리한 워커 하나의 상태입니다.
+    """
+    admission = request.app.state.admission
+    if admission is None:
+        return {"enabled": False}
+    return admission.stats()
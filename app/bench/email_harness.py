@@ -0,0 +1,112 @@
+import argparse
+import asyncio
+import json
+import logging
+import time
+from typing import Any, Dict, List, Optional
+from app.bench.smtp_sink import LocalSmtpServer
+from app.core.config import Settings
+from app.core.histogram import LogLinearHistogram
+from app.services.agent_tool_service import AgentToolService
+from app.services.email_delivery import EMAIL_TEMPLATES
+
+
+async def run_benchmark(
+    notifications: int,
+    pool_size: int,
+    latency_ms: float,
+    temp_fail_ratio: float,
+    pipelining: bool,
+) -> Dict[str, Any]:
+    """
+    같은 프로세스에 로컬 SMTP 서버를 띄우고 send_email_notification 도구 호출을 연속으로 보내
+    도구 응답 지연(큐 접수까지)과 발송 완료까지의 처리량(건/분)을 측정합니다.
+    """
+    smtp = LocalSmtpServer(
+        port=0,
+        latency_ms=latency_ms,
+        temp_fail_ratio=temp_fail_ratio,
+        pipelining=pipelining,
+        max_stored=0,
+        seed=7,
+    )
+    await smtp.start()
+    settings = Settings(
+        smtp_host=smtp.host,
+        smtp_port=smtp.port,
+        smtp_pool_size=pool_size,
+        smtp_retry_backoff_seconds=0.05,
+        email_queue_size=max(notifications, 1),
+        tool_cache_enabled=False,
+    )
+    service = AgentToolService(settings)
+    delivery = service.email_delivery
+    types = list(EMAIL_TEMPLATES)
+    payloads = [
+        {
+            "type": types[i % len(types)],
+            "reservation_number": f"R{i:07d}",
+            "email_address": f"customer{i}@example.com",
+        }
+        for i in range(notifications)
+    ]
+    submit_us = LogLinearHistogram()
+
+    started = time.perf_counter()
+    for payload in payloads:
+        call_started = time.perf_counter()
+        await service.process_tool_call("send_email_notification", payload)
+        submit_us.record((time.perf_counter() - call_started) * 1e6)
+    submitted = time.perf_counter() - started
+    await delivery.aclose(drain_timeout_seconds=600.0)
+    elapsed = time.perf_counter() - started
+    await smtp.stop()
+
+    stats = delivery.stats()
+    return {
+        "notifications": notifications,
+        "pool_size": pool_size,
+        "pipelining": pipelining,
+        "submit_seconds": round(submitted, 3),
+        "elapsed_seconds": round(elapsed, 3),
+        "sent": stats["sent"],
+        "failed": stats["failed"],
+        "retries": stats["retries"],
+        "sent_per_minute": round(stats["sent"] * 60.0 / elapsed, 1),
+        "connections_opened": stats["connections_opened"],
+        "tool_call_latency_us": submit_us.summary((50, 99, 99.9)),
+        "delivery_latency_ms": stats["delivery_latency_ms"],
+        "smtp_server": smtp.stats(),
+    }
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(
+        description="로컬 SMTP 서버를 대상으로 한 이메일 알림 발송 벤치마크"
+    )
+    parser.add_argument("--notifications", type=int, default=5000)
+    parser.add_argument("--pool-size", type=int, default=4)
+    parser.add_argument(
+        "--latency-ms", type=float, default=0.0, help="DATA 응답 지연 (ms)"
+    )
+    parser.add_argument("--temp-fail-ratio", type=float, default=0.0)
+    parser.add_argument("--no-pipelining", action="store_true")
+    parser.add_argument("--log-level", default="WARNING")
+    args = parser.parse_args(argv)
+    logging.getLogger().setLevel(args.log_level)
+
+    report = asyncio.run(
+        run_benchmark(
+            args.notifications,
+            args.pool_size,
+            args.latency_ms,
+            args.temp_fail_ratio,
+            not args.no_pipelining,
+        )
+    )
+    print(json.dumps(report, ensure_ascii=False, indent=2))
+
+
+if __name__ == "__main__":
+    # 사용 예: python -m app.bench.email_harness --notifications 10000 --pool-size 8 --latency-ms 5
+    main()
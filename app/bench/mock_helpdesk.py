@@ -0,0 +1,211 @@
+import argparse
+import itertools
+import math
+import random
+import time
+from typing import Any, Dict, List, Optional
+import uvicorn
+from fastapi import FastAPI, Request
+from fastapi.responses import ORJSONResponse
+
+# Zendesk create_many가 한 번에 받는 최대 티켓 수
+MAX_TICKETS_PER_REQUEST = 100
+
+
+# create_many 일괄 생성 작업 하나 (일정 시간이 지나면 완료 상태가 됩니다)
+class _Job:
+    __slots__ = ("job_id", "created", "completes_at", "results")
+
+    def __init__(self, job_id: str, completes_at: float, results: List[Dict[str, Any]]):
+        self.job_id = job_id
+        self.created = time.monotonic()
+        self.completes_at = completes_at
+        self.results = results
+
+
+# 티켓 도구의 일괄 생성 경로를 실제 Zendesk 없이 확인하기 위한 모의 헬프데스크 상태
+# 고정 창(window_seconds) 단위로 요청 수를 세어 ratelimit-* 헤더와 429(Retry-After)를 돌려주며,
+# create_many는 job_status를 반환하고 job_delay 후에 결과(티켓 ID)를 채웁니다.
+class MockHelpdesk:
+
+    def __init__(
+        self,
+        rate_limit: int = 700,
+        window_seconds: float = 60.0,
+        job_delay_ms: float = 500.0,
+        failure_ratio: float = 0.0,
+        seed: Optional[int] = None,
+    ):
+        self.rate_limit = rate_limit
+        self.window_seconds = window_seconds
+        self.job_delay_seconds = job_delay_ms / 1000.0
+        self.failure_ratio = failure_ratio
+        self._rng = random.Random(seed)
+        self._ticket_ids = itertools.count(100001)
+        self._job_ids = itertools.count(1)
+        self.jobs: Dict[str, _Job] = {}
+        self.tickets: Dict[int, Dict[str, Any]] = {}
+        self.window_started = time.monotonic()
+        self.window_requests = 0
+        self.requests: Dict[str, int] = {}
+        self.throttled = 0
+        self.batch_sizes: List[int] = []
+
+    def admit(self) -> Optional[Dict[str, str]]:
+        """요청 한 건을 현재 창에 기록하고 속도 제한 헤더를 반환합니다. 한도를 넘으면 None입니다."""
+        now = time.monotonic()
+        if now - self.window_started >= self.window_seconds:
+            self.window_started = now
+            self.window_requests = 0
+        reset = max(1, math.ceil(self.window_started + self.window_seconds - now))
+        if self.window_requests >= self.rate_limit:
+            self.throttled += 1
+            return None
+        self.window_requests += 1
+        return {
+            "ratelimit-limit": str(self.rate_limit),
+            "ratelimit-remaining": str(self.rate_limit - self.window_requests),
+            "ratelimit-reset": str(reset),
+        }
+
+    def throttled_response(self) -> ORJSONResponse:
+        retry_after = max(
+            1,
+            math.ceil(self.window_started + self.window_seconds - time.monotonic()),
+        )
+        return ORJSONResponse(
+            {"error": "APIRateLimitExceeded"},
+            status_code=429,
+            headers={"retry-after": str(retry_after)},
+        )
+
+    def count_request(self, endpoint: str):
+        self.requests[endpoint] = self.requests.get(endpoint, 0) + 1
+
+    def create_many(self, tickets: List[Dict[str, Any]]) -> Dict[str, Any]:
+        results = []
+        for index, ticket in enumerate(tickets):
+            if self._rng.random() < self.failure_ratio:
+                results.append(
+                    {
+                        "index": index,
+                        "error": "InvalidValue",
+                        "details": "모의 헬프데스크가 거절한 티켓입니다.",
+                    }
+                )
+                continue
+            ticket_id = next(self._ticket_ids)
+            self.tickets[ticket_id] = {"id": ticket_id, "status": "new", **ticket}
+            results.append(
+                {"index": index, "id": ticket_id, "action": "create", "success": True}
+            )
+        job_id = f"job{next(self._job_ids):08d}"
+        self.jobs[job_id] = _Job(
+            job_id, time.monotonic() + self.job_delay_seconds, results
+        )
+        self.batch_sizes.append(len(tickets))
+        return self.job_status(job_id)
+
+    def job_status(self, job_id: str) -> Optional[Dict[str, Any]]:
+        job = self.jobs.get(job_id)
+        if job is None:
+            return None
+        completed = time.monotonic() >= job.completes_at
+        status = {
+            "id": job_id,
+            "url": f"/api/v2/job_statuses/{job_id}.json",
+            "status": "completed" if completed else "queued",
+            "total": len(job.results),
+            "progress": len(job.results) if completed else 0,
+        }
+        if completed:
+            status["results"] = job.results
+        return {"job_status": status}
+
+    def stats(self) -> Dict[str, Any]:
+        sizes = self.batch_sizes
+        return {
+            "requests": self.requests,
+            "throttled": self.throttled,
+            "tickets_created": len(self.tickets),
+            "jobs": len(self.jobs),
+            "mean_batch_size": round(sum(sizes) / len(sizes), 2) if sizes else None,
+            "max_batch_size": max(sizes) if sizes else None,
+        }
+
+
+def create_mock_helpdesk_app(helpdesk: MockHelpdesk) -> FastAPI:
+    app = FastAPI(title="Mock Helpdesk", docs_url=None, redoc_url=None)
+    app.state.helpdesk = helpdesk
+
+    @app.post("/api/v2/tickets/create_many.json")
+    async def create_many(request: Request):
+        helpdesk.count_request("create_many")
+        headers = helpdesk.admit()
+        if headers is None:
+            return helpdesk.throttled_response()
+        tickets = (await request.json()).get("tickets") or []
+        if not tickets or len(tickets) > MAX_TICKETS_PER_REQUEST:
+            return ORJSONResponse(
+                {
+                    "error": "InvalidValue",
+                    "description": f"tickets는 1~{MAX_TICKETS_PER_REQUEST}개여야 합니다.",
+                },
+                status_code=400,
+                headers=headers,
+            )
+        return ORJSONResponse(helpdesk.create_many(tickets), headers=headers)
+
+    @app.get("/api/v2/job_statuses/{job_id}.json")
+    async def job_status(job_id: str):
+        helpdesk.count_request("job_status")
+        headers = helpdesk.admit()
+        if headers is None:
+            return helpdesk.throttled_response()
+        status = helpdesk.job_status(job_id)
+        if status is None:
+            return ORJSONResponse(
+                {"error": "RecordNotFound"}, status_code=404, headers=headers
+            )
+        return ORJSONResponse(status, headers=headers)
+
+    @app.get("/api/v2/tickets/{ticket_id}.json")
+    async def show_ticket(ticket_id: int):
+        helpdesk.count_request("show_ticket")
+        ticket = helpdesk.tickets.get(ticket_id)
+        if ticket is None:
+            return ORJSONResponse({"error": "RecordNotFound"}, status_code=404)
+        return {"ticket": ticket}
+
+    @app.get("/_mock/stats")
+    async def stats():
+        return helpdesk.stats()
+
+    return app
+
+
+if __name__ == "__main__":
+    # 사용 예: python -m app.bench.mock_helpdesk --port 9910 --rate-limit 100 --job-delay-ms 1000
+    parser = argparse.ArgumentParser(description="모의 Zendesk 헬프데스크 서버")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=9910)
+    parser.add_argument("--rate-limit", type=int, default=700, help="창당 허용 요청 수")
+    parser.add_argument("--window-seconds", type=float, default=60.0)
+    parser.add_argument("--job-delay-ms", type=float, default=500.0)
+    parser.add_argument("--failure-ratio", type=float, default=0.0)
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args()
+    uvicorn.run(
+        create_mock_helpdesk_app(
+            MockHelpdesk(
+                args.rate_limit,
+                args.window_seconds,
+                args.job_delay_ms,
+                args.failure_ratio,
+                args.seed,
+            )
+        ),
+        host=args.host,
+        port=args.port,
+        log_level="warning",
+    )
@@ -0,0 +1,197 @@
+import argparse
+import asyncio
+import random
+import time
+from collections import deque
+from typing import Any, Deque, Dict, Optional, Tuple
+from app.core.logging import get_logger
+
+logger = get_logger(__name__)
+
+
+# send_email_notification의 SMTP 발송을 실제 메일 서버 없이 확인하기 위한 로컬 SMTP 서버
+# EHLO(PIPELINING, 8BITMIME, SIZE) / HELO / MAIL / RCPT / DATA / RSET / NOOP / QUIT만 지원하며
+# 받은 메시지는 최근 max_stored건만 보관합니다. 같은 프로세스에서 테스트용으로 띄울 수 있습니다.
+class LocalSmtpServer:
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 2525,
+        latency_ms: float = 0.0,
+        temp_fail_ratio: float = 0.0,
+        reject_ratio: float = 0.0,
+        pipelining: bool = True,
+        max_stored: int = 1000,
+        seed: Optional[int] = None,
+    ):
+        self.host = host
+        self.port = port
+        self.latency_ms = latency_ms
+        self.temp_fail_ratio = temp_fail_ratio
+        self.reject_ratio = reject_ratio
+        self.pipelining = pipelining
+        self._rng = random.Random(seed)
+        self._server: Optional[asyncio.AbstractServer] = None
+        self.messages: Deque[Tuple[str, str, bytes]] = deque(maxlen=max_stored)
+        self.reset_stats()
+
+    def reset_stats(self):
+        self.started_at = time.monotonic()
+        self.connections = 0
+        self.accepted = 0
+        self.temp_failed = 0
+        self.rejected = 0
+        self.bytes_received = 0
+        self.messages.clear()
+
+    async def start(self):
+        self._server = await asyncio.start_server(
+            self._serve_connection, self.host, self.port, backlog=1024
+        )
+        self.port = self._server.sockets[0].getsockname()[1]
+        logger.info(f"로컬 SMTP 서버 시작: {self.host}:{self.port}")
+
+    async def stop(self):
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+
+    def stats(self) -> Dict[str, Any]:
+        elapsed = max(time.monotonic() - self.started_at, 1e-9)
+        return {
+            "elapsed_seconds": round(elapsed, 3),
+            "connections": self.connections,
+            "accepted": self.accepted,
+            "temp_failed": self.temp_failed,
+            "rejected": self.rejected,
+            "bytes_received": self.bytes_received,
+            "accepted_per_minute": round(self.accepted * 60.0 / elapsed, 1),
+        }
+
+    async def _serve_connection(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ):
+        self.connections += 1
+        mail_from: Optional[str] = None
+        rcpt_to: Optional[str] = None
+        writer.write(b"220 localhost ESMTP voxai-smtp-sink\r\n")
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    return
+                command, _, argument = (
+                    line.decode("utf-8", "replace").rstrip("\r\n").partition(" ")
+                )
+                command = command.upper()
+                if command == "EHLO":
+                    extensions = ["8BITMIME", "SIZE 10485760"]
+                    if self.pipelining:
+                        extensions.insert(0, "PIPELINING")
+                    lines = ["localhost"] + extensions
+                    writer.write(
+                        "".join(
+                            f"250{'-' if i < len(lines) - 1 else ' '}{text}\r\n"
+                            for i, text in enumerate(lines)
+                        ).encode("ascii")
+                    )
+                elif command == "HELO":
+                    writer.write(b"250 localhost\r\n")
+                elif command == "MAIL":
+                    mail_from = argument.partition(":")[2].strip("<> ")
+                    rcpt_to = None
+                    writer.write(b"250 2.1.0 OK\r\n")
+                elif command == "RCPT":
+                    if mail_from is None:
+                        writer.write(b"503 5.5.1 MAIL first\r\n")
+                    else:
+                        rcpt_to = argument.partition(":")[2].strip("<> ")
+                        writer.write(b"250 2.1.5 OK\r\n")
+                elif command == "DATA":
+                    if rcpt_to is None:
+                        writer.write(b"554 5.5.1 No valid recipients\r\n")
+                        continue
+                    writer.write(b"354 End data with <CR><LF>.<CR><LF>\r\n")
+                    await writer.drain()
+                    data = await self._read_data(reader)
+                    writer.write(await self._accept(mail_from, rcpt_to, data))
+                    mail_from = rcpt_to = None
+                elif command == "RSET":
+                    mail_from = rcpt_to = None
+                    writer.write(b"250 2.0.0 OK\r\n")
+                elif command == "NOOP":
+                    writer.write(b"250 2.0.0 OK\r\n")
+                elif command == "QUIT":
+                    writer.write(b"221 2.0.0 Bye\r\n")
+                    await writer.drain()
+                    return
+                else:
+                    writer.write(b"502 5.5.2 Command not implemented\r\n")
+                await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError):
+            return
+        finally:
+            writer.close()
+
+    async def _read_data(self, reader: asyncio.StreamReader) -> bytes:
+        lines = []
+        while True:
+            line = await reader.readline()
+            if not line:
+                raise asyncio.IncompleteReadError(b"", None)
+            if line in (b".\r\n", b".\n"):
+                return b"".join(lines)
+            lines.append(line[1:] if line.startswith(b"..") else line)
+
+    async def _accept(self, mail_from: str, rcpt_to: str, data: bytes) -> bytes:
+        if self.latency_ms:
+            await asyncio.sleep(self.latency_ms / 1000.0)
+        roll = self._rng.random()
+        if roll < self.reject_ratio:
+            self.rejected += 1
+            return b"550 5.7.1 Message rejected\r\n"
+        if roll < self.reject_ratio + self.temp_fail_ratio:
+            self.temp_failed += 1
+            return b"451 4.3.0 Temporary failure, try again later\r\n"
+        self.accepted += 1
+        self.bytes_received += len(data)
+        self.messages.append((mail_from, rcpt_to, data))
+        return f"250 2.0.0 OK queued as {self.accepted:08X}\r\n".encode("ascii")
+
+
+def run_smtp_sink(server: LocalSmtpServer):
+    """SMTP 서버를 현재 프로세스에서 종료될 때까지 실행합니다."""
+
+    async def serve():
+        await server.start()
+        await asyncio.Event().wait()
+
+    try:
+        asyncio.run(serve())
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    # 사용 예: python -m app.bench.smtp_sink --port 2525 --latency-ms 20 --temp-fail-ratio 0.01
+    parser = argparse.ArgumentParser(description="로컬 SMTP 싱크 서버")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=2525)
+    parser.add_argument("--latency-ms", type=float, default=0.0)
+    parser.add_argument("--temp-fail-ratio", type=float, default=0.0)
+    parser.add_argument("--reject-ratio", type=float, default=0.0)
+    parser.add_argument("--no-pipelining", action="store_true")
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args()
+    run_smtp_sink(
+        LocalSmtpServer(
+            args.host,
+            args.port,
+            latency_ms=args.latency_ms,
+            temp_fail_ratio=args.temp_fail_ratio,
+            reject_ratio=args.reject_ratio,
+            pipelining=not args.no_pipelining,
+            seed=args.seed,
+        )
+    )
@@ -0,0 +1,124 @@
+import argparse
+import asyncio
+import json
+import logging
+import socket
+import time
+from typing import Any, Dict, List, Optional
+import uvicorn
+from app.bench.mock_helpdesk import MockHelpdesk, create_mock_helpdesk_app
+from app.core.config import Settings
+from app.core.histogram import LogLinearHistogram
+from app.services.agent_tool_service import AgentToolService
+
+
+async def run_benchmark(
+    tickets: int,
+    rate_per_second: float,
+    rate_limit: int,
+    window_seconds: float,
+    job_delay_ms: float,
+    batch_max_wait_ms: float,
+) -> Dict[str, Any]:
+    """
+    같은 프로세스에 모의 헬프데스크를 띄우고 티켓 도구 호출을 rate_per_second 속도로 보내
+    도구 응답 지연, create_many 요청 수(일괄 처리 효과), 429 횟수, 실제 티켓 ID 연결까지의 지연을 측정합니다.
+    """
+    helpdesk = MockHelpdesk(rate_limit, window_seconds, job_delay_ms, seed=7)
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+    server = uvicorn.Server(
+        uvicorn.Config(
+            create_mock_helpdesk_app(helpdesk),
+            host="127.0.0.1",
+            port=port,
+            log_level="warning",
+            lifespan="off",
+        )
+    )
+    server_task = asyncio.create_task(server.serve())
+    while not server.started:
+        await asyncio.sleep(0.01)
+
+    settings = Settings(
+        zendesk_base_url=f"http://127.0.0.1:{port}",
+        zendesk_batch_max_wait_ms=batch_max_wait_ms,
+        zendesk_job_poll_interval_seconds=max(0.05, job_delay_ms / 2000.0),
+        zendesk_queue_size=max(tickets, 1),
+        tool_cache_enabled=False,
+    )
+    service = AgentToolService(settings)
+    zendesk = service.zendesk_tickets
+    call_us = LogLinearHistogram()
+    interval = 1.0 / rate_per_second if rate_per_second > 0 else 0.0
+
+    started = time.perf_counter()
+    for i in range(tickets):
+        if interval:
+            # 지정한 속도를 유지하도록 다음 호출 시각까지 기다립니다.
+            delay = started + i * interval - time.perf_counter()
+            if delay > 0:
+                await asyncio.sleep(delay)
+        call_started = time.perf_counter()
+        await service.process_tool_call(
+            "submit_detailed_zendesk_ticket",
+            {
+                "urgency": ("Critical", "High", "Normal")[i % 3],
+                "assigned_team": "환불팀",
+            },
+        )
+        call_us.record((time.perf_counter() - call_started) * 1e6)
+    await zendesk.aclose(drain_timeout_seconds=600.0)
+    elapsed = time.perf_counter() - started
+
+    server.should_exit = True
+    await server_task
+    stats = zendesk.stats()
+    return {
+        "tickets": tickets,
+        "elapsed_seconds": round(elapsed, 3),
+        "created": stats["created"],
+        "failed": stats["failed"],
+        "create_many_requests": stats["batches"],
+        "http_requests": stats["http_requests"],
+        "batch_size": stats["batch_size"],
+        "tool_call_latency_us": call_us.summary((50, 99, 99.9)),
+        "reconcile_latency_ms": stats["reconcile_latency_ms"],
+        "rate_limit": stats["rate_limit"],
+        "helpdesk": helpdesk.stats(),
+    }
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(
+        description="모의 헬프데스크를 대상으로 한 티켓 일괄 생성 벤치마크"
+    )
+    parser.add_argument("--tickets", type=int, default=2000)
+    parser.add_argument(
+        "--rate", type=float, default=500.0, help="초당 도구 호출 수 (0은 최대 속도)"
+    )
+    parser.add_argument("--rate-limit", type=int, default=100, help="창당 허용 요청 수")
+    parser.add_argument("--window-seconds", type=float, default=10.0)
+    parser.add_argument("--job-delay-ms", type=float, default=300.0)
+    parser.add_argument("--batch-max-wait-ms", type=float, default=500.0)
+    parser.add_argument("--log-level", default="WARNING")
+    args = parser.parse_args(argv)
+    logging.getLogger().setLevel(args.log_level)
+
+    report = asyncio.run(
+        run_benchmark(
+            args.tickets,
+            args.rate,
+            args.rate_limit,
+            args.window_seconds,
+            args.job_delay_ms,
+            args.batch_max_wait_ms,
+        )
+    )
+    print(json.dumps(report, ensure_ascii=False, indent=2))
+
+
+if __name__ == "__main__":
+    # 사용 예: python -m app.bench.ticket_harness --tickets 5000 --rate 1000 --rate-limit 50
+    main()
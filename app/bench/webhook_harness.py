@@ -0,0 +1,314 @@
+import argparse
+import asyncio
+import json
+import logging
+import multiprocessing
+import socket
+import time
+import uuid
+from typing import Any, Dict, List, Optional
+import httpx
+from app.bench.webhook_sink import (
+    RESET_PATH,
+    STATS_PATH,
+    SinkBehavior,
+    add_behavior_arguments,
+    behavior_from_args,
+    run_sink,
+)
+from app.core.config import Settings
+from app.core.histogram import LogLinearHistogram
+from app.models.webhook_models import CallEndedPayload
+from app.services.call_analytics import CallAnalyticsAggregator
+from app.services.call_session_index import CallSessionIndex
+from app.services.call_webhook_service import CallWebhookService
+from app.services.outbound_guard import DestinationGuardRegistry
+from app.services.tool_usage_analytics import ToolUsageAnalytics
+
+_USER_LINES = (
+    "안녕하세요, 충전기가 작동하지 않아서 전화드렸어요.",
+    "충전기 번호는 CH-1024입니다.",
+    "네, 화면에 통신장애라고 떠 있어요.",
+    "리셋하면 바로 쓸 수 있나요?",
+)
+_AGENT_LINES = (
+    "안녕하세요, 고객님. 불편을 드려 죄송합니다. 충전기 번호를 알려주시겠어요?",
+    "확인해 보겠습니다. 잠시만 기다려 주세요.",
+    "원격으로 충전기를 리셋했습니다. 3-5분 뒤에 다시 시도해 주세요.",
+    "더 도와드릴 일이 있으실까요?",
+)
+
+
+def build_call_ended_payload(turns: int) -> Dict[str, Any]:
+    """대화 turns턴과 도구 호출이 포함된 call_ended 웹훅 페이로드를 만듭니다."""
+    now_ms = int(time.time() * 1000)
+    transcript = []
+    transcript_with_tool_calls = []
+    for i in range(turns):
+        entry = (
+            {"role": "user", "content": _USER_LINES[i % len(_USER_LINES)]}
+            if i % 2
+            else {"role": "agent", "content": _AGENT_LINES[i % len(_AGENT_LINES)]}
+        )
+        transcript.append(entry)
+        transcript_with_tool_calls.append(entry)
+        if i % 8 == 5:
+            tool_call_id = f"tc_{i}"
+            transcript_with_tool_calls.append(
+                {
+                    "role": "tool_call_invocation",
+                    "tool_call_id": tool_call_id,
+                    "name": "monitor_ev_system",
+                    "arguments": {"charger_id": "CH-1024"},
+                }
+            )
+            transcript_with_tool_calls.append(
+                {
+                    "role": "tool_call_result",
+                    "tool_call_id": tool_call_id,
+                    "content": '{"status": "success", "current_status": "통신장애"}',
+                }
+            )
+    return {
+        "event": "call_ended",
+        "call": {
+            "agent_id": str(uuid.uuid4()),
+            "call_id": str(uuid.uuid4()),
+            "call_type": "phone",
+            "call_from": "+821012345678",
+            "call_to": "+8215881234",
+            "start_timestamp": now_ms - 180_000,
+            "end_timestamp": now_ms,
+            "duration_ms": 180_000,
+            "disconnection_reason": "user_hangup",
+            "transcript": transcript,
+            "transcript_with_tool_calls": transcript_with_tool_calls,
+            "call_cost": {"total_credits_used": 12, "duration_seconds": 180},
+            "call_analysis": {
+                "summary": "충전기 원격 리셋",
+                "user_sentiment": "Neutral",
+            },
+        },
+    }
+
+
+def _free_port(host: str) -> int:
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+        sock.bind((host, 0))
+        return sock.getsockname()[1]
+
+
+async def _wait_until_listening(
+    client: httpx.AsyncClient, sink_url: str, timeout: float
+):
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            (await client.get(f"{sink_url}{STATS_PATH}")).raise_for_status()
+            return
+        except httpx.HTTPError:
+            if time.monotonic() > deadline:
+                raise
+            await asyncio.sleep(0.05)
+
+
+async def run_benchmark(
+    sink_url: str,
+    events: int,
+    concurrency: int,
+    transcript_turns: int,
+    outbound_initial_concurrency: Optional[int] = None,
+) -> Dict[str, Any]:
+    """
+    sink_url을 Make.com / 커스텀 서버 목적지로 설정한 CallWebhookService로 call_ended 이벤트를 보내고
+    처리량과 이벤트별 처리 지연(모든 핸들러의 외부 전송 완료까지)을 측정합니다.
+    두 목적지는 같은 호스트이므로 하나의 목적지 가드(동시성 한도, 서킷 브레이커)를 함께 씁니다.
+    """
+    overrides: Dict[str, Any] = {}
+    if outbound_initial_concurrency is not None:
+        overrides["outbound_initial_concurrency"] = outbound_initial_concurrency
+    # 측정 대상인 콜 웹훅 경로만 만들고, 파일을 쓰는 다른 서비스(만족도 로그 등)는 만들지 않습니다.
+    settings = Settings(
+        make_com_webhook_url=f"{sink_url}/make",
+        custom_server_webhook_url=f"{sink_url}/custom",
+        database_url=None,
+        tracing_sample_ratio=0.0,
+        tracing_file_path=None,
+        metrics_multiprocess_dir=None,
+        csat_log_path=None,
+        **overrides,
+    )
+    http_client = httpx.AsyncClient(
+        timeout=10.0,
+        limits=httpx.Limits(
+            max_connections=settings.outbound_max_concurrency,
+            max_keepalive_connections=settings.outbound_initial_concurrency,
+        ),
+    )
+    outbound_guards = DestinationGuardRegistry(settings)
+    tool_usage_analytics = ToolUsageAnalytics(
+        queue_size=settings.tool_usage_queue_size,
+        max_tools=settings.tool_usage_max_tools,
+    )
+    webhook_service = CallWebhookService(
+        settings,
+        http_client=http_client,
+        outbound_guards=outbound_guards,
+        call_analytics=CallAnalyticsAggregator(
+            max_agents=settings.analytics_max_agents
+        ),
+        call_session_index=CallSessionIndex(
+            ttl_seconds=settings.call_session_ttl_seconds,
+            max_sessions=settings.call_session_max_sessions,
+        ),
+        tool_usage_analytics=tool_usage_analytics,
+    )
+    # 측정 구간에 모델 검증 비용이 섞이지 않도록 페이로드를 미리 만듭니다.
+    payloads = [
+        CallEndedPayload.model_validate(build_call_ended_payload(transcript_turns))
+        for _ in range(events)
+    ]
+    latency_us = LogLinearHistogram(max_value=60_000_000)
+    next_index = 0
+
+    async def worker():
+        nonlocal next_index
+        while next_index < len(payloads):
+            payload = payloads[next_index]
+            next_index += 1
+            started = time.perf_counter()
+            await webhook_service.process_webhook_event("call_ended", payload)
+            latency_us.record((time.perf_counter() - started) * 1e6)
+
+    async with httpx.AsyncClient(timeout=10.0) as control:
+        await _wait_until_listening(control, sink_url, timeout=10.0)
+        await control.post(f"{sink_url}{RESET_PATH}")
+        started = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - started
+        sink_stats = (await control.get(f"{sink_url}{STATS_PATH}")).json()
+
+    outbound = outbound_guards.stats()
+    await tool_usage_analytics.aclose()
+    await http_client.aclose()
+
+    delivered = sink_stats["delivered"]
+    # 목적지 가드가 보내지 않은 전달 (브레이커 open, 대기열 초과, 대기 시간 초과)
+    guard_rejected = sum(
+        stats["breaker"]["rejected"]
+        + stats["concurrency"]["rejected"]
+        + stats["concurrency"]["timed_out"]
+        for stats in outbound.values()
+    )
+    return {
+        "events": events,
+        "concurrency": concurrency,
+        "transcript_turns": transcript_turns,
+        "elapsed_seconds": round(elapsed, 3),
+        "events_per_second": round(events / elapsed, 1),
+        "delivered": delivered,
+        "delivered_per_second": round(delivered / elapsed, 1),
+        "bytes_per_second": round(sink_stats["bytes_received"] / elapsed, 1),
+        "attempted_deliveries": 2 * events,
+        "lost_deliveries": 2 * events - delivered,
+        "guard_rejected": guard_rejected,
+        "sink": {
+            "requests": sink_stats["requests"],
+            "resets": sink_stats["resets"],
+            "by_status": sink_stats["by_status"],
+            "connections": sink_stats["connections"],
+        },
+        "event_latency_ms": {
+            key: (round(value / 1000.0, 3) if value is not None else None)
+            for key, value in latency_us.summary((50, 90, 99, 99.9)).items()
+        },
+        "outbound": outbound,
+    }
+
+
+def format_report(report: Dict[str, Any]) -> str:
+    latency = report["event_latency_ms"]
+    sink = report["sink"]
+    lost = report["lost_deliveries"]
+    return "\n".join(
+        [
+            f"이벤트 {report['events']}건 (동시 {report['concurrency']}, 대화 {report['transcript_turns']}턴) "
+            f"{report['elapsed_seconds']}초 -> {report['events_per_second']} events/s",
+            f"전달 성공 {report['delivered']}/{report['attempted_deliveries']}건 -> "
+            f"{report['delivered_per_second']} deliveries/s, "
+            f"{report['bytes_per_second'] / 1e6:.2f} MB/s",
+            (
+                f"⚠️ 유실 {lost}건 (그중 목적지 가드가 보내지 않고 버린 전달 {report['guard_rejected']}건)"
+                if lost
+                else "유실 0건"
+            ),
+            f"싱크 수신 {sink['requests']}건, 상태 코드 {sink['by_status']}, "
+            f"연결 리셋 {sink['resets']}건, 연결 {sink['connections']}개",
+            "이벤트 처리 지연(ms): "
+            + ", ".join(f"{key} {value}" for key, value in latency.items()),
+        ]
+    )
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(
+        description="로컬 싱크 서버를 대상으로 한 외부 웹훅 핸들러 벤치마크"
+    )
+    parser.add_argument("--events", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=10)
+    parser.add_argument("--transcript-turns", type=int, default=40)
+    parser.add_argument(
+        "--sink-url",
+        default=None,
+        help="이미 실행 중인 싱크 서버 주소 (없으면 별도 프로세스로 싱크 서버를 띄웁니다)",
+    )
+    parser.add_argument(
+        "--outbound-initial-concurrency",
+        type=int,
+        default=None,
+        help="목적지 가드의 초기 동시성 한도 (기본값은 설정값)",
+    )
+    parser.add_argument("--json", action="store_true", help="결과를 JSON으로 출력")
+    parser.add_argument("--log-level", default="WARNING")
+    add_behavior_arguments(parser)
+    args = parser.parse_args(argv)
+    # 이벤트마다 남는 핸들러 로그가 측정값을 왜곡하지 않도록 기본값은 WARNING입니다.
+    logging.getLogger().setLevel(args.log_level)
+
+    sink_process = None
+    sink_url = args.sink_url
+    if sink_url is None:
+        host = "127.0.0.1"
+        port = _free_port(host)
+        behavior: SinkBehavior = behavior_from_args(args)
+        # 싱크 서버가 측정 대상과 CPU를 나눠 쓰지 않도록 별도 프로세스에서 실행합니다.
+        sink_process = multiprocessing.get_context("spawn").Process(
+            target=run_sink, args=(host, port, behavior), daemon=True
+        )
+        sink_process.start()
+        sink_url = f"http://{host}:{port}"
+
+    try:
+        report = asyncio.run(
+            run_benchmark(
+                sink_url.rstrip("/"),
+                args.events,
+                args.concurrency,
+                args.transcript_turns,
+                args.outbound_initial_concurrency,
+            )
+        )
+    finally:
+        if sink_process is not None:
+            sink_process.terminate()
+            sink_process.join()
+
+    if args.json:
+        print(json.dumps(report, ensure_ascii=False, indent=2))
+    else:
+        print(format_report(report))
+
+
+if __name__ == "__main__":
+    # 사용 예: python -m app.bench.webhook_harness --events 5000 --concurrency 100 --latency-ms 20
+    main()
@@ -0,0 +1,325 @@
+import argparse
+import asyncio
+import json
+import random
+import socket
+import struct
+import time
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional, Tuple
+from app.core.logging import get_logger
+
+logger = get_logger(__name__)
+
+STATS_PATH = "/_sink/stats"
+RESET_PATH = "/_sink/reset"
+
+_REASONS = {
+    200: "OK",
+    202: "Accepted",
+    204: "No Content",
+    400: "Bad Request",
+    404: "Not Found",
+    411: "Length Required",
+    429: "Too Many Requests",
+    500: "Internal Server Error",
+    502: "Bad Gateway",
+    503: "Service Unavailable",
+    504: "Gateway Timeout",
+}
+
+
+def parse_status_weights(spec: str) -> List[Tuple[int, float]]:
+    """ "200=0.95,503=0.05" 형식의 상태 코드별 비율을 파싱합니다."""
+    weights = []
+    for item in spec.split(","):
+        if not item.strip():
+            continue
+        code, _, weight = item.partition("=")
+        weights.append((int(code), float(weight or 1.0)))
+    if not weights:
+        raise ValueError(f"상태 코드 비율이 비어 있습니다: {spec!r}")
+    return weights
+
+
+# 싱크 서버가 흉내 낼 외부 목적지의 동작
+class SinkBehavior:
+
+    def __init__(
+        self,
+        latency_ms: float = 0.0,
+        jitter_ms: float = 0.0,
+        statuses: Optional[List[Tuple[int, float]]] = None,
+        reset_ratio: float = 0.0,
+        slow_read_bytes_per_second: int = 0,
+        max_stored: int = 1000,
+        seed: Optional[int] = None,
+    ):
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.statuses = statuses or [(200, 1.0)]
+        self.reset_ratio = reset_ratio
+        self.slow_read_bytes_per_second = slow_read_bytes_per_second
+        self.max_stored = max_stored
+        self.seed = seed
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "latency_ms": self.latency_ms,
+            "jitter_ms": self.jitter_ms,
+            "statuses": self.statuses,
+            "reset_ratio": self.reset_ratio,
+            "slow_read_bytes_per_second": self.slow_read_bytes_per_second,
+            "max_stored": self.max_stored,
+            "seed": self.seed,
+        }
+
+
+# Make.com / 커스텀 서버 대신 웹훅 POST를 받아 세고 저장하는 로컬 HTTP/1.1 서버
+# 외부 의존성 없이 asyncio 스트림으로 구현하여 지연, 상태 코드, 연결 리셋, 느린 수신을 직접 제어합니다.
+# GET /_sink/stats로 수신 통계를, POST /_sink/reset으로 통계 초기화를 할 수 있습니다.
+class WebhookSink:
+
+    def __init__(
+        self, behavior: SinkBehavior, host: str = "127.0.0.1", port: int = 9900
+    ):
+        self.behavior = behavior
+        self.host = host
+        self.port = port
+        self._rng = random.Random(behavior.seed)
+        self._status_codes = [code for code, _ in behavior.statuses]
+        self._status_weights = [weight for _, weight in behavior.statuses]
+        self._server: Optional[asyncio.AbstractServer] = None
+        self.stored: Deque[Tuple[str, bytes]] = deque(maxlen=behavior.max_stored)
+        self.reset_stats()
+
+    def reset_stats(self):
+        self.started_at = time.monotonic()
+        self.connections = 0
+        self.requests = 0
+        self.bytes_received = 0
+        self.resets = 0
+        self.by_status: Dict[int, int] = {}
+        self.by_path: Dict[str, Dict[str, int]] = {}
+        self.stored.clear()
+
+    async def start(self):
+        # 느린 수신을 흉내 낼 때는 수신 버퍼를 작게 두어 TCP 흐름 제어가 송신 측에 전달되게 합니다.
+        limit = 16 * 1024 if self.behavior.slow_read_bytes_per_second else 2**16
+        self._server = await asyncio.start_server(
+            self._serve_connection, self.host, self.port, limit=limit, backlog=1024
+        )
+        self.port = self._server.sockets[0].getsockname()[1]
+        logger.info(
+            f"웹훅 싱크 서버 시작: http://{self.host}:{self.port} ({self.behavior.to_dict()})"
+        )
+
+    async def stop(self):
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+
+    def stats(self) -> Dict[str, Any]:
+        elapsed = max(time.monotonic() - self.started_at, 1e-9)
+        delivered = sum(
+            count for status, count in self.by_status.items() if 200 <= status < 300
+        )
+        return {
+            "elapsed_seconds": round(elapsed, 3),
+            "connections": self.connections,
+            "requests": self.requests,
+            "delivered": delivered,
+            "resets": self.resets,
+            "bytes_received": self.bytes_received,
+            "requests_per_second": round(self.requests / elapsed, 1),
+            "bytes_per_second": round(self.bytes_received / elapsed, 1),
+            "by_status": {str(k): v for k, v in sorted(self.by_status.items())},
+            "by_path": self.by_path,
+            "stored": len(self.stored),
+            "behavior": self.behavior.to_dict(),
+        }
+
+    async def _serve_connection(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ):
+        self.connections += 1
+        try:
+            while True:
+                try:
+                    head = await reader.readuntil(b"\r\n\r\n")
+                except (asyncio.IncompleteReadError, ConnectionError):
+                    return
+                except asyncio.LimitOverrunError:
+                    await self._respond(writer, 400, b"", keep_alive=False)
+                    return
+
+                request_line, _, header_block = head.decode("latin-1").partition("\r\n")
+                method, path = request_line.split(" ", 2)[:2]
+                headers = {}
+                for line in header_block.split("\r\n"):
+                    name, sep, value = line.partition(":")
+                    if sep:
+                        headers[name.strip().lower()] = value.strip()
+                keep_alive = headers.get("connection", "").lower() != "close"
+
+                if method == "GET" and path == STATS_PATH:
+                    body = json.dumps(self.stats()).encode("utf-8")
+                    await self._respond(writer, 200, body, keep_alive)
+                elif method == "POST" and path == RESET_PATH:
+                    self.reset_stats()
+                    await self._respond(writer, 204, b"", keep_alive)
+                elif "content-length" not in headers:
+                    # 웹훅 클라이언트(httpx)는 JSON 본문에 항상 Content-Length를 붙입니다.
+                    await self._respond(writer, 411, b"", keep_alive=False)
+                    return
+                else:
+                    if not await self._handle_webhook(
+                        reader, writer, path, int(headers["content-length"]), keep_alive
+                    ):
+                        return
+                if not keep_alive:
+                    return
+        except ConnectionError:
+            return
+        finally:
+            if not writer.transport.is_closing():
+                writer.close()
+
+    async def _handle_webhook(
+        self,
+        reader: asyncio.StreamReader,
+        writer: asyncio.StreamWriter,
+        path: str,
+        length: int,
+        keep_alive: bool,
+    ) -> bool:
+        """웹훅 요청 하나를 처리합니다. 연결을 리셋했으면 False를 반환합니다."""
+        behavior = self.behavior
+        if behavior.reset_ratio and self._rng.random() < behavior.reset_ratio:
+            # 본문을 읽지 않고 RST로 연결을 끊습니다 (SO_LINGER 0).
+            self.resets += 1
+            sock = writer.get_extra_info("socket")
+            if sock is not None:
+                sock.setsockopt(
+                    socket.SOL_SOCKET, socket.SO_LINGER, struct.pack("ii", 1, 0)
+                )
+            writer.transport.abort()
+            return False
+
+        body = await self._read_body(reader, length)
+        if behavior.latency_ms or behavior.jitter_ms:
+            delay = behavior.latency_ms + self._rng.uniform(0, behavior.jitter_ms)
+            await asyncio.sleep(delay / 1000.0)
+
+        status = (
+            self._status_codes[0]
+            if len(self._status_codes) == 1
+            else self._rng.choices(self._status_codes, self._status_weights)[0]
+        )
+        self.requests += 1
+        self.bytes_received += len(body)
+        self.by_status[status] = self.by_status.get(status, 0) + 1
+        path_stats = self.by_path.get(path)
+        if path_stats is None:
+            path_stats = self.by_path[path] = {"requests": 0, "bytes": 0}
+        path_stats["requests"] += 1
+        path_stats["bytes"] += len(body)
+        if behavior.max_stored:
+            self.stored.append((path, body))
+
+        await self._respond(writer, status, b"", keep_alive)
+        return True
+
+    async def _read_body(self, reader: asyncio.StreamReader, length: int) -> bytes:
+        bytes_per_second = self.behavior.slow_read_bytes_per_second
+        if not bytes_per_second:
+            return await reader.readexactly(length)
+        # 0.1초 분량씩 읽고 쉬어 느린 수신 측을 흉내 냅니다.
+        step = max(1, bytes_per_second // 10)
+        chunks = []
+        remaining = length
+        while remaining:
+            chunk = await reader.readexactly(min(step, remaining))
+            chunks.append(chunk)
+            remaining -= len(chunk)
+            await asyncio.sleep(len(chunk) / bytes_per_second)
+        return b"".join(chunks)
+
+    async def _respond(
+        self, writer: asyncio.StreamWriter, status: int, body: bytes, keep_alive: bool
+    ):
+        content_type = b"content-type: application/json\r\n" if body else b""
+        writer.write(
+            f"HTTP/1.1 {status} {_REASONS.get(status, 'Unknown')}\r\n".encode("latin-1")
+            + content_type
+            + f"content-length: {len(body)}\r\n".encode("latin-1")
+            + (
+                b"connection: keep-alive\r\n"
+                if keep_alive
+                else b"connection: close\r\n"
+            )
+            + b"\r\n"
+            + body
+        )
+        await writer.drain()
+
+
+def add_behavior_arguments(parser: argparse.ArgumentParser):
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="응답 지연 (ms)")
+    parser.add_argument(
+        "--jitter-ms", type=float, default=0.0, help="지연에 더할 무작위 값 상한 (ms)"
+    )
+    parser.add_argument(
+        "--status",
+        default="200=1",
+        help='상태 코드별 비율 (예: "200=0.95,503=0.05")',
+    )
+    parser.add_argument(
+        "--reset-ratio", type=float, default=0.0, help="연결을 RST로 끊는 요청 비율"
+    )
+    parser.add_argument(
+        "--slow-read-bps",
+        type=int,
+        default=0,
+        help="요청 본문을 읽는 속도 (바이트/초, 0은 제한 없음)",
+    )
+    parser.add_argument(
+        "--max-stored", type=int, default=1000, help="보관할 최근 요청 본문 수"
+    )
+    parser.add_argument("--seed", type=int, default=None)
+
+
+def behavior_from_args(args: argparse.Namespace) -> SinkBehavior:
+    return SinkBehavior(
+        latency_ms=args.latency_ms,
+        jitter_ms=args.jitter_ms,
+        statuses=parse_status_weights(args.status),
+        reset_ratio=args.reset_ratio,
+        slow_read_bytes_per_second=args.slow_read_bps,
+        max_stored=args.max_stored,
+        seed=args.seed,
+    )
+
+
+def run_sink(host: str, port: int, behavior: SinkBehavior):
+    """싱크 서버를 현재 프로세스에서 종료될 때까지 실행합니다."""
+
+    async def serve():
+        sink = WebhookSink(behavior, host, port)
+        await sink.start()
+        await asyncio.Event().wait()
+
+    try:
+        asyncio.run(serve())
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    # 사용 예: python -m app.bench.webhook_sink --port 9900 --latency-ms 50 --status "200=0.98,503=0.02"
+    parser = argparse.ArgumentParser(description="로컬 웹훅 싱크 서버")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=9900)
+    add_behavior_arguments(parser)
+    args = parser.parse_args()
+    run_sink(args.host, args.port, behavior_from_args(args))
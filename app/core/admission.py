@@ -0,0 +1,336 @@
+import asyncio
+import math
+import re
+import time
+from collections import OrderedDict, deque
+from typing import Any, Deque, Dict, Optional
+import orjson
+from app.core.config import Settings
+from app.core.metrics import ADMISSION_REJECTED
+
+PRIORITY_LIVE = "live"
+PRIORITY_BACKGROUND = "background"
+
+# 경로별 우선순위. "/"로 끝나는 항목은 접두사로, 나머지는 정확히 일치하는 경로로 비교합니다.
+# 목록에 없는 경로(/, /ready, /metrics, 문서)는 헬스 체크가 거절되지 않도록 제한하지 않습니다.
+ROUTE_PRIORITIES = (
+    ("/api/v1/inbound", PRIORITY_LIVE),
+    ("/api/v1/tools/", PRIORITY_LIVE),
+    ("/api/v1/call_events", PRIORITY_BACKGROUND),
+    ("/api/v1/stats", PRIORITY_BACKGROUND),
+    ("/api/v1/stats/", PRIORITY_BACKGROUND),
+)
+
+# 본문 전체를 파싱하지 않고 agent_id 값만 찾습니다 (call_events의 call.agent_id, 도구 파라미터 등).
+_AGENT_ID_PATTERN = re.compile(rb'"agent_id"\s*:\s*"([^"\\]{1,128})"')
+
+
+def classify_path(path: str) -> Optional[str]:
+    for pattern, priority in ROUTE_PRIORITIES:
+        if path == pattern or (pattern.endswith("/") and path.startswith(pattern)):
+            return priority
+    return None
+
+
+# 에이전트 하나의 요청 속도를 제한하는 토큰 버킷
+class TokenBucket:
+    __slots__ = ("rate", "capacity", "tokens", "updated_at")
+
+    def __init__(self, rate: float, capacity: float, now: float):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated_at = now
+
+    def take(self, now: float) -> float:
+        """토큰 하나를 꺼냅니다. 성공하면 0을, 부족하면 다음 토큰이 채워질 때까지 남은 시간(초)을 반환합니다."""
+        self.tokens = min(
+            self.capacity, self.tokens + (now - self.updated_at) * self.rate
+        )
+        self.updated_at = now
+        if self.tokens >= 1.0:
+            self.tokens -= 1.0
+            return 0.0
+        return (1.0 - self.tokens) / self.rate
+
+
+# agent_id별 토큰 버킷 모음 (오래 사용하지 않은 에이전트부터 제거)
+class AgentRateLimiter:
+
+    def __init__(self, rate_per_second: float, burst: int, max_agents: int):
+        self.rate_per_second = rate_per_second
+        self.burst = max(1, burst)
+        self.max_agents = max_agents
+        self._buckets: "OrderedDict[str, TokenBucket]" = OrderedDict()
+        self.limited = 0
+
+    def check(self, agent_id: str) -> float:
+        """요청을 허용하면 0을, 거절하면 Retry-After로 안내할 대기 시간(초)을 반환합니다."""
+        now = time.monotonic()
+        bucket = self._buckets.get(agent_id)
+        if bucket is None:
+            bucket = self._buckets[agent_id] = TokenBucket(
+                self.rate_per_second, self.burst, now
+            )
+            if len(self._buckets) > self.max_agents:
+                self._buckets.popitem(last=False)
+        else:
+            self._buckets.move_to_end(agent_id)
+        wait = bucket.take(now)
+        if wait > 0:
+            self.limited += 1
+        return wait
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "rate_per_second": self.rate_per_second,
+            "burst": self.burst,
+            "tracked_agents": len(self._buckets),
+            "limited": self.limited,
+        }
+
+
+# 우선순위별 동시 처리 한도와 대기열
+# 실시간 요청은 전체 한도를 모두 쓸 수 있고, 후순위 요청은 별도 한도 안에서만 실행되며
+# 실시간 요청이 대기 중이면 새로 시작하지 않습니다. 슬롯이 반납되면 실시간 대기열부터 깨웁니다.
+class PriorityConcurrencyLimiter:
+
+    def __init__(
+        self,
+        max_concurrency: int,
+        background_max_concurrency: int,
+        max_queue: int,
+        queue_timeouts: Dict[str, float],
+    ):
+        self.max_concurrency = max_concurrency
+        self.background_max_concurrency = min(
+            background_max_concurrency, max_concurrency
+        )
+        self.max_queue = max_queue
+        self.queue_timeouts = queue_timeouts
+        self.inflight = {PRIORITY_LIVE: 0, PRIORITY_BACKGROUND: 0}
+        self._waiters: Dict[str, Deque[asyncio.Future]] = {
+            PRIORITY_LIVE: deque(),
+            PRIORITY_BACKGROUND: deque(),
+        }
+        self.admitted = {PRIORITY_LIVE: 0, PRIORITY_BACKGROUND: 0}
+        self.queued = {PRIORITY_LIVE: 0, PRIORITY_BACKGROUND: 0}
+        self.rejected = {PRIORITY_LIVE: 0, PRIORITY_BACKGROUND: 0}
+
+    def _can_start(self, priority: str) -> bool:
+        if (
+            self.inflight[PRIORITY_LIVE] + self.inflight[PRIORITY_BACKGROUND]
+            >= self.max_concurrency
+        ):
+            return False
+        if priority == PRIORITY_BACKGROUND:
+            return (
+                self.inflight[PRIORITY_BACKGROUND] < self.background_max_concurrency
+                and not self._waiters[PRIORITY_LIVE]
+            )
+        return True
+
+    async def acquire(self, priority: str) -> Optional[str]:
+        """
+        슬롯을 얻으면 None을, 거절되면 사유("queue_full" 또는 "queue_timeout")를 반환합니다.
+        대기열이 가득 찼으면 기다리지 않고 즉시 거절합니다.
+        """
+        waiters = self._waiters[priority]
+        if not waiters and self._can_start(priority):
+            self.inflight[priority] += 1
+            self.admitted[priority] += 1
+            return None
+        if len(waiters) >= self.max_queue:
+            self.rejected[priority] += 1
+            return "queue_full"
+
+        future = asyncio.get_running_loop().create_future()
+        waiters.append(future)
+        self.queued[priority] += 1
+        try:
+            await asyncio.wait_for(future, self.queue_timeouts[priority])
+        except asyncio.TimeoutError:
+            # 시간 초과와 동시에 슬롯을 넘겨받았다면 그대로 처리합니다.
+            if future.done() and not future.cancelled():
+                return None
+            self._discard(waiters, future)
+            self.rejected[priority] += 1
+            return "queue_timeout"
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                self.release(priority)
+            else:
+                self._discard(waiters, future)
+            raise
+        return None
+
+    def _discard(self, waiters: Deque[asyncio.Future], future: asyncio.Future):
+        try:
+            waiters.remove(future)
+        except ValueError:
+            pass
+        # 후순위 요청이 실시간 대기열이 비기를 기다리고 있었을 수 있습니다.
+        self._wake()
+
+    def release(self, priority: str):
+        self.inflight[priority] -= 1
+        self._wake()
+
+    def _wake(self):
+        for priority in (PRIORITY_LIVE, PRIORITY_BACKGROUND):
+            waiters = self._waiters[priority]
+            while waiters:
+                if waiters[0].done():
+                    # 시간 초과로 취소된 대기자
+                    waiters.popleft()
+                    continue
+                if not self._can_start(priority):
+                    break
+                future = waiters.popleft()
+                self.inflight[priority] += 1
+                self.admitted[priority] += 1
+                future.set_result(None)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "max_concurrency": self.max_concurrency,
+            "background_max_concurrency": self.background_max_concurrency,
+            "priorities": {
+                priority: {
+                    "inflight": self.inflight[priority],
+                    "waiting": len(self._waiters[priority]),
+                    "admitted": self.admitted[priority],
+                    "queued": self.queued[priority],
+                    "rejected": self.rejected[priority],
+                }
+                for priority in (PRIORITY_LIVE, PRIORITY_BACKGROUND)
+            },
+        }
+
+
+# 워커 하나의 승인 제어 상태 (동시성 한도와 에이전트별 속도 제한)
+class AdmissionController:
+
+    def __init__(self, settings: Settings):
+        self.retry_after_seconds = settings.admission_retry_after_seconds
+        self.limiter = PriorityConcurrencyLimiter(
+            max_concurrency=settings.admission_max_concurrency,
+            background_max_concurrency=settings.admission_background_max_concurrency,
+            max_queue=settings.admission_max_queue,
+            queue_timeouts={
+                PRIORITY_LIVE: settings.admission_live_queue_timeout_ms / 1000.0,
+                PRIORITY_BACKGROUND: settings.admission_background_queue_timeout_ms
+                / 1000.0,
+            },
+        )
+        self.agent_limiter: Optional[AgentRateLimiter] = None
+        if settings.admission_agent_rate_per_second > 0:
+            self.agent_limiter = AgentRateLimiter(
+                settings.admission_agent_rate_per_second,
+                settings.admission_agent_burst,
+                settings.admission_max_tracked_agents,
+            )
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "enabled": True,
+            "concurrency": self.limiter.stats(),
+            "agent_rate_limit": (
+                self.agent_limiter.stats() if self.agent_limiter else None
+            ),
+        }
+
+
+async def _send_rejection(send, status_code: int, retry_after: int, detail: str):
+    body = orjson.dumps({"detail": detail})
+    await send(
+        {
+            "type": "http.response.start",
+            "status": status_code,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(body)).encode("latin-1")),
+                (b"retry-after", str(retry_after).encode("latin-1")),
+            ],
+        }
+    )
+    await send({"type": "http.response.body", "body": body})
+
+
+# 요청을 라우트 우선순위에 따라 승인하거나 즉시 거절(503/429 + Retry-After)하는 미들웨어
+# 본문을 읽기 전에 동시성 한도를 확인하므로 과부하 시 큰 웹훅 본문도 수신하지 않고 거절합니다.
+class AdmissionMiddleware:
+
+    def __init__(self, app, controller: AdmissionController):
+        self.app = app
+        self.controller = controller
+
+    async def __call__(self, scope, receive, send):
+        priority = classify_path(scope["path"]) if scope["type"] == "http" else None
+        if priority is None:
+            await self.app(scope, receive, send)
+            return
+
+        limiter = self.controller.limiter
+        reason = await limiter.acquire(priority)
+        if reason is not None:
+            ADMISSION_REJECTED.inc(priority, reason)
+            await _send_rejection(
+                send,
+                503,
+                self.controller.retry_after_seconds,
+                "서버가 혼잡하여 요청을 처리할 수 없습니다. 잠시 후 다시 시도해 주세요.",
+            )
+            return
+
+        try:
+            if self.controller.agent_limiter is not None:
+                agent_id = None
+                for key, value in scope["headers"]:
+                    if key == b"x-vox-agent-id":
+                        agent_id = value.decode("latin-1")
+                        break
+                if agent_id is None:
+                    receive, agent_id = await _read_agent_id_from_body(receive)
+                if agent_id:
+                    wait = self.controller.agent_limiter.check(agent_id)
+                    if wait > 0:
+                        ADMISSION_REJECTED.inc(priority, "agent_rate_limit")
+                        await _send_rejection(
+                            send,
+                            429,
+                            max(1, math.ceil(wait)),
+                            f"에이전트 {agent_id}의 요청 한도를 초과했습니다.",
+                        )
+                        return
+            await self.app(scope, receive, send)
+        finally:
+            limiter.release(priority)
+
+
+async def _read_agent_id_from_body(receive):
+    """
+    본문을 모두 읽어 agent_id를 찾고, 같은 본문을 다시 전달하는 receive 함수와 함께 반환합니다.
+    엔드포인트가 어차피 본문 전체를 읽으므로 추가 비용은 정규식 검색 한 번입니다.
+    """
+    chunks = []
+    while True:
+        message = await receive()
+        if message["type"] != "http.request":
+            # 클라이언트 연결이 끊긴 경우 이후 처리는 원래 receive에 맡깁니다.
+            return receive, None
+        chunks.append(message.get("body", b""))
+        if not message.get("more_body", False):
+            break
+    body = b"".join(chunks)
+    match = _AGENT_ID_PATTERN.search(body)
+    replayed = False
+
+    async def replay_receive():
+        nonlocal replayed
+        if not replayed:
+            replayed = True
+            return {"type": "http.request", "body": body, "more_body": False}
+        return await receive()
+
+    return replay_receive, match.group(1).decode("utf-8") if match else None
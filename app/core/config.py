@@ -9,6 +9,182 @@ class Settings(BaseSettings):
     custom_server_webhook_url: Optional[str] = None
     database_url: Optional[str] = None  # Example DB URL
 
+    # Deduplication of retried webhooks and tool calls
+    idempotency_ttl_seconds: float = 600.0
+    idempotency_max_entries: int = 10000
+
+    # Per-destination circuit breaker and adaptive concurrency for outbound handlers
+    breaker_failure_threshold: int = 5
+    breaker_reset_timeout_seconds: float = 30.0
+    outbound_initial_concurrency: int = 10
+    outbound_max_concurrency: int = 100
+    outbound_latency_target_ms: float = 2000.0
+    # Deliveries wait for a concurrency permit in a bounded FIFO queue instead of being dropped
+    outbound_queue_max_waiters: int = 1000
+    outbound_queue_timeout_ms: float = 5000.0
+
+    # Reservation dataset for check_flight_ticket (memory-mapped file with hash indexes);
+    # unset keeps the original mock that answers every query with the sample reservation
+    # Generate with: python -m app.services.reservation_store reservations.rsv --count 1000000
+    reservation_store_path: Optional[str] = None
+    # Reservations returned for a passenger-name lookup
+    reservation_lookup_max_results: int = 5
+
+    # SMTP delivery for send_email_notification (unset host keeps the simulated "sent" response)
+    # Each pool worker keeps one persistent connection and pipelines MAIL/RCPT/DATA when supported.
+    smtp_host: Optional[str] = None
+    smtp_port: int = 25
+    smtp_username: Optional[str] = None
+    smtp_password: Optional[str] = None
+    smtp_starttls: bool = False
+    smtp_timeout_seconds: float = 10.0
+    smtp_sender: str = "noreply@voxai-client.example.com"
+    smtp_pool_size: int = 4
+    smtp_max_messages_per_connection: int = 100
+    smtp_idle_timeout_seconds: float = 30.0
+    smtp_max_attempts: int = 3
+    smtp_retry_backoff_seconds: float = 1.0
+    # Notifications waiting for a connection beyond this are rejected (EMAIL_QUEUE_FULL)
+    email_queue_size: int = 10000
+    # Recent email_ids whose delivery status can be queried
+    email_status_max_tracked: int = 100000
+
+    # Zendesk ticket creation for the ticket tools (unset base URL keeps the simulated ticket IDs)
+    # Tickets are micro-batched into create_many requests paced by the rate-limit headers;
+    # the agent gets a provisional ID that is reconciled once the Zendesk job completes.
+    zendesk_base_url: Optional[str] = None
+    zendesk_email: Optional[str] = None
+    zendesk_api_token: Optional[str] = None
+    zendesk_batch_max_size: int = 100
+    zendesk_batch_max_wait_ms: float = 500.0
+    zendesk_queue_size: int = 10000
+    zendesk_job_poll_interval_seconds: float = 1.0
+    zendesk_max_attempts: int = 5
+    zendesk_request_timeout_seconds: float = 10.0
+    # Recent provisional ticket IDs whose Zendesk ticket ID can be queried
+    ticket_status_max_tracked: int = 100000
+
+    # Priority callback queue for schedule_priority_callback
+    # estimated_wait_time is derived from the queue position and this agent capacity model.
+    callback_agents: int = 10
+    callback_average_handle_seconds: float = 180.0
+    callback_max_pending: int = 200000
+    # Recent callback_ids whose queue position / dispatch status can be queried
+    callback_status_max_tracked: int = 200000
+
+    # Technician roster for create_support_ticket (JSON, see technicians.example.json)
+    # Without it the five built-in regional technicians are used.
+    technician_roster_path: Optional[str] = None
+    # Open tickets count toward a technician's load until close_support_ticket is called;
+    # unclosed tickets are released after this long, or oldest-first beyond the cap
+    technician_ticket_ttl_seconds: float = 604800.0
+    technician_max_open_tickets: int = 100000
+
+    # CSAT scores from save_csat_survey (append-only NDJSON log; unset keeps them in memory only)
+    # Aggregates are checkpointed every csat_checkpoint_interval records so a restart
+    # replays only the log written after the last checkpoint.
+    csat_log_path: Optional[str] = None
+    csat_checkpoint_path: Optional[str] = None  # default: <csat_log_path>.checkpoint
+    csat_checkpoint_interval: int = 10000
+    csat_hour_buckets: int = 168
+    csat_max_agents: int = 1000
+
+    # Response cache for read-only tools, declared per tool in <tool_name>_schema.json
+    # ("x-cache": {"ttl_seconds": ..., "key": [...]}, "x-invalidates": [...])
+    tool_schema_dir: str = "."
+    tool_cache_enabled: bool = True
+    tool_cache_max_entries: int = 10000
+
+    # Per-agent Make.com payload transformation rules
+    make_com_rules_path: Optional[str] = "make_com_rules.json"
+    make_com_rules_reload_interval_seconds: float = 5.0
+
+    # Streaming call analytics (rolling 1m/1h/24h windows per agent)
+    analytics_max_agents: int = 1000
+
+    # Call session index correlating call events and tool calls
+    call_session_ttl_seconds: float = 7200.0
+    call_session_max_sessions: int = 50000
+
+    # Tool-usage analytics mined from transcript_with_tool_calls
+    tool_usage_queue_size: int = 1000
+    tool_usage_max_tools: int = 200
+
+    # Caller directory for inbound calls (CSV, NDJSON or SQLite source, prebuilt mmap index)
+    caller_directory_source: Optional[str] = None
+    caller_directory_index_path: Optional[str] = None
+
+    # Inbound caller enrichment cache (coalescing, stale-while-revalidate)
+    inbound_cache_ttl_seconds: float = 300.0
+    inbound_cache_negative_ttl_seconds: float = 30.0
+    inbound_cache_stale_seconds: float = 3600.0
+    inbound_cache_max_entries: int = 100000
+    # Latency budget for /inbound; enrichment still running past it is answered with defaults
+    inbound_latency_budget_ms: float = 150.0
+
+    # DID-range routing table for inbound calls (longest-prefix match on to_number)
+    inbound_routes_path: Optional[str] = None
+    inbound_routes_reload_interval_seconds: float = 5.0
+
+    # Prometheus metrics (/metrics). With several uvicorn workers, set a shared directory
+    # where each worker writes its snapshot so that /metrics reports the sum of all workers.
+    metrics_enabled: bool = True
+    metrics_multiprocess_dir: Optional[str] = None
+    metrics_flush_interval_seconds: float = 5.0
+    event_loop_lag_interval_seconds: float = 0.5
+
+    # Tracing (spans per request, tool dispatch, handler and outbound call)
+    # Head-based sampling: 0 disables tracing, 1 records every request.
+    # Spans go to the OTLP/HTTP collector when set, otherwise to the NDJSON file.
+    tracing_sample_ratio: float = 0.0
+    tracing_service_name: str = "voxai-client-server"
+    tracing_file_path: Optional[str] = "traces.ndjson"
+    tracing_otlp_endpoint: Optional[str] = None
+    tracing_max_queue_size: int = 2048
+    tracing_max_batch_size: int = 512
+    tracing_flush_interval_seconds: float = 2.0
+
+    # Admission control and load shedding (per worker)
+    # Live-call routes (/inbound, /tools/*) may use every slot; post-call webhooks and stats
+    # are capped separately and never start while a live request is waiting.
+    admission_enabled: bool = True
+    admission_max_concurrency: int = 256
+    admission_background_max_concurrency: int = 64
+    # Requests waiting per priority beyond this are answered 503 immediately
+    admission_max_queue: int = 256
+    admission_live_queue_timeout_ms: float = 100.0
+    admission_background_queue_timeout_ms: float = 1000.0
+    admission_retry_after_seconds: int = 1
+    # Per-agent token bucket (agent_id from X-Vox-Agent-Id or the request body); 0 disables
+    admission_agent_rate_per_second: float = 100.0
+    admission_agent_burst: int = 200
+    admission_max_tracked_agents: int = 10000
+
+    # On-demand profiling under /admin (disabled unless a token is set; send it as X-Admin-Token)
+    # A single request can also be profiled with "X-Vox-Profile: cpu,memory" plus the token.
+    profiling_admin_token: Optional[str] = None
+    profiling_sample_interval_ms: float = 10.0
+    profiling_max_duration_seconds: float = 120.0
+    profiling_traceback_frames: int = 10
+    profiling_max_results: int = 50
+
+    # Production server (python -m app.serve / poetry run serve)
+    server_host: str = "0.0.0.0"
+    server_port: int = 8000
+    # Worker processes; None sizes the pool from the CPU cores available to this process
+    server_workers: Optional[int] = None
+    # Each worker binds its own SO_REUSEPORT socket so the kernel balances connections
+    server_reuse_port: bool = True
+    server_backlog: int = 2048
+    server_keepalive_timeout_seconds: int = 75
+    # Per-worker cap on concurrent connections/requests before answering 503
+    server_limit_concurrency: Optional[int] = None
+    # Time given to in-flight requests (and their webhook fan-outs) after SIGTERM
+    server_graceful_timeout_seconds: int = 30
+    server_access_log: bool = False
+    # Proxies whose X-Forwarded-For/Proto are trusted (comma-separated, "*" for any; empty disables)
+    server_forwarded_allow_ips: str = "127.0.0.1"
+
     # Configuration for Pydantic Settings (loads from .env)
     model_config = SettingsConfigDict(env_file=".env", extra="ignore")
 
@@ -0,0 +1,80 @@
+from typing import Any, Callable, Coroutine, Dict
+import orjson
+from fastapi import Request
+from fastapi.exceptions import RequestValidationError
+from fastapi.responses import Response
+from fastapi.routing import APIRoute
+
+
+# 요청 본문을 표준 json 대신 orjson으로 파싱하는 Request
+# orjson.JSONDecodeError는 json.JSONDecodeError의 하위 클래스이므로 FastAPI의 422 응답 처리가 그대로 동작합니다.
+class ORJSONRequest(Request):
+
+    async def json(self) -> Any:
+        if not hasattr(self, "_json"):
+            self._json = orjson.loads(await self.body())
+        return self._json
+
+
+# 라우터의 모든 엔드포인트가 ORJSONRequest를 사용하도록 하는 라우트 클래스
+# 사용 예: router = APIRouter(route_class=ORJSONRoute)
+class ORJSONRoute(APIRoute):
+
+    def get_route_handler(self) -> Callable[[Request], Coroutine[Any, Any, Response]]:
+        original_route_handler = super().get_route_handler()
+
+        async def orjson_route_handler(request: Request) -> Response:
+            return await original_route_handler(
+                ORJSONRequest(request.scope, request.receive)
+            )
+
+        return orjson_route_handler
+
+
+async def json_object_body(request: Request) -> Dict[str, Any]:
+    """
+    스키마가 없는 JSON 객체 본문을 orjson으로 파싱하여 그대로 반환합니다.
+    Body(...)에 Dict[str, Any]를 선언하면 수행되는 dict 재검증과 복사를 생략합니다.
+    """
+    body = await request.body()
+    try:
+        data = orjson.loads(body)
+    except orjson.JSONDecodeError as e:
+        raise RequestValidationError(
+            [
+                {
+                    "type": "json_invalid",
+                    "loc": ("body", e.pos),
+                    "msg": "JSON decode error",
+                    "input": {},
+                    "ctx": {"error": e.msg},
+                }
+            ],
+            body=e.doc,
+        )
+    if not isinstance(data, dict):
+        raise RequestValidationError(
+            [
+                {
+                    "type": "dict_type",
+                    "loc": ("body",),
+                    "msg": "Input should be a valid dictionary",
+                    "input": data,
+                }
+            ],
+            body=data,
+        )
+    return data
+
+
+# json_object_body를 사용하는 엔드포인트의 OpenAPI 요청 본문 정의 (openapi_extra용)
+JSON_OBJECT_BODY = {
+    "requestBody": {
+        "required": True,
+        "content": {
+            "application/json": {
+                "schema": {"type": "object", "additionalProperties": True}
+            }
+        },
+    }
+}
@@ -0,0 +1,82 @@
+from array import array
+from typing import Dict, Iterable, Optional
+
+
+# HDR 히스토그램 방식의 로그-선형 히스토그램
+# 2의 거듭제곱 구간마다 일정 개수의 균등 구간을 두어 값 크기와 무관하게 상대 오차를 일정하게 유지합니다.
+# 버킷 수가 고정되어 있으므로 기록 횟수와 관계없이 메모리 사용량이 일정합니다.
+class LogLinearHistogram:
+    __slots__ = ("sub_bucket_bits", "max_value", "counts", "count", "total", "max")
+
+    def __init__(self, sub_bucket_bits: int = 4, max_value: int = 1 << 24):
+        self.sub_bucket_bits = sub_bucket_bits
+        self.max_value = max_value
+        self.counts = array("I", bytes(4 * (self._index(max_value) + 1)))
+        self.count = 0
+        self.total = 0
+        self.max = 0
+
+    def _index(self, value: int) -> int:
+        bits = self.sub_bucket_bits
+        if value < (1 << bits):
+            return value
+        shift = value.bit_length() - bits
+        half = 1 << (bits - 1)
+        return (1 << bits) + (shift - 1) * half + ((value >> shift) - half)
+
+    def _upper_bound(self, index: int) -> int:
+        bits = self.sub_bucket_bits
+        if index < (1 << bits):
+            return index
+        half = 1 << (bits - 1)
+        shift = (index - (1 << bits)) // half + 1
+        sub = (index - (1 << bits)) % half + half
+        return ((sub + 1) << shift) - 1
+
+    def record(self, value: float):
+        """값 하나를 O(1)로 기록합니다. 범위를 벗어난 값은 최댓값 버킷에 기록됩니다."""
+        v = min(max(int(value), 0), self.max_value)
+        self.counts[self._index(v)] += 1
+        self.count += 1
+        self.total += v
+        if v > self.max:
+            self.max = v
+
+    def merge(self, other: "LogLinearHistogram"):
+        counts = self.counts
+        for i, c in enumerate(other.counts):
+            if c:
+                counts[i] += c
+        self.count += other.count
+        self.total += other.total
+        self.max = max(self.max, other.max)
+
+    def reset(self):
+        counts = self.counts
+        for i in range(len(counts)):
+            counts[i] = 0
+        self.count = 0
+        self.total = 0
+        self.max = 0
+
+    def percentile(self, q: float) -> Optional[int]:
+        """q(0~100) 백분위수가 속한 버킷의 상한값을 반환합니다."""
+        if not self.count:
+            return None
+        target = max(1, int(self.count * q / 100.0 + 0.5))
+        seen = 0
+        for i, c in enumerate(self.counts):
+            seen += c
+            if seen >= target:
+                return min(self._upper_bound(i), self.max)
+        return self.max
+
+    def summary(
+        self, percentiles: Iterable[float] = (50, 90, 99)
+    ) -> Dict[str, Optional[float]]:
+        result: Dict[str, Optional[float]] = {
+            f"p{q:g}": self.percentile(q) for q in percentiles
+        }
+        result["mean"] = round(self.total / self.count, 2) if self.count else None
+        result["max"] = self.max if self.count else None
+        return result
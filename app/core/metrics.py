@@ -0,0 +1,462 @@
+import asyncio
+import fcntl
+import glob
+import json
+import multiprocessing
+import os
+import tempfile
+import time
+from bisect import bisect_left
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from app.core.logging import get_logger
+
+logger = get_logger(__name__)
+
+LabelValues = Tuple[str, ...]
+
+# 지연 시간(초) 히스토그램 버킷 상한값
+LATENCY_BUCKETS: Tuple[float, ...] = (
+    0.001,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+)
+
+
+# 모든 지표는 워커 프로세스별로 이벤트 루프 스레드에서만 갱신되므로 잠금 없이 dict만 사용합니다.
+# 여러 uvicorn 워커의 값은 워커별 스냅샷 파일을 합산하여 /metrics에서 하나로 보여줍니다.
+class _Metric:
+    type_name = ""
+
+    def __init__(self, name: str, help_text: str, label_names: Iterable[str] = ()):
+        self.name = name
+        self.help_text = help_text
+        self.label_names = tuple(label_names)
+
+    def snapshot(self) -> Dict[str, Any]:
+        raise NotImplementedError
+
+
+class Counter(_Metric):
+    type_name = "counter"
+
+    def __init__(self, name: str, help_text: str, label_names: Iterable[str] = ()):
+        super().__init__(name, help_text, label_names)
+        self.values: Dict[LabelValues, float] = {}
+
+    def inc(self, *labels: str, amount: float = 1.0):
+        self.values[labels] = self.values.get(labels, 0.0) + amount
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {"values": [[list(k), v] for k, v in self.values.items()]}
+
+
+class Gauge(_Metric):
+    type_name = "gauge"
+
+    def __init__(
+        self,
+        name: str,
+        help_text: str,
+        label_names: Iterable[str] = (),
+        multiprocess_mode: str = "sum",
+    ):
+        super().__init__(name, help_text, label_names)
+        # 워커 간 합산 방식: "sum"(예: 처리 중 요청 수) 또는 "max"(예: 이벤트 루프 지연)
+        self.multiprocess_mode = multiprocess_mode
+        self.values: Dict[LabelValues, float] = {}
+
+    def set(self, value: float, *labels: str):
+        self.values[labels] = value
+
+    def inc(self, *labels: str, amount: float = 1.0):
+        self.values[labels] = self.values.get(labels, 0.0) + amount
+
+    def dec(self, *labels: str, amount: float = 1.0):
+        self.values[labels] = self.values.get(labels, 0.0) - amount
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {"values": [[list(k), v] for k, v in self.values.items()]}
+
+
+class Histogram(_Metric):
+    type_name = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        help_text: str,
+        label_names: Iterable[str] = (),
+        buckets: Tuple[float, ...] = LATENCY_BUCKETS,
+    ):
+        super().__init__(name, help_text, label_names)
+        self.buckets = buckets
+        # 라벨 조합별 [버킷별 개수..., +Inf 개수, 합계]
+        self.values: Dict[LabelValues, List[float]] = {}
+
+    def observe(self, value: float, *labels: str):
+        series = self.values.get(labels)
+        if series is None:
+            series = self.values[labels] = [0.0] * (len(self.buckets) + 2)
+        series[bisect_left(self.buckets, value)] += 1
+        series[-1] += value
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {"values": [[list(k), v] for k, v in self.values.items()]}
+
+
+class MetricsRegistry:
+
+    def __init__(self):
+        self.metrics: Dict[str, _Metric] = {}
+
+    def register(self, metric: _Metric) -> _Metric:
+        self.metrics[metric.name] = metric
+        return metric
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {name: metric.snapshot() for name, metric in self.metrics.items()}
+
+
+def _merge_snapshots(
+    registry: MetricsRegistry, snapshots: List[Dict[str, Any]]
+) -> Dict[str, Dict[LabelValues, Any]]:
+    merged: Dict[str, Dict[LabelValues, Any]] = {}
+    for name, metric in registry.metrics.items():
+        series: Dict[LabelValues, Any] = {}
+        for snapshot in snapshots:
+            for labels, value in snapshot.get(name, {}).get("values", []):
+                key = tuple(labels)
+                current = series.get(key)
+                if current is None:
+                    series[key] = list(value) if isinstance(value, list) else value
+                elif isinstance(metric, Histogram):
+                    series[key] = [a + b for a, b in zip(current, value)]
+                elif isinstance(metric, Gauge) and metric.multiprocess_mode == "max":
+                    series[key] = max(current, value)
+                else:
+                    series[key] = current + value
+        merged[name] = series
+    return merged
+
+
+def _escape_label_value(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(
+    names: Tuple[str, ...], values: Iterable[str], extra: str = ""
+) -> str:
+    pairs = [f'{n}="{_escape_label_value(str(v))}"' for n, v in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def render_prometheus_text(
+    registry: MetricsRegistry, snapshots: List[Dict[str, Any]]
+) -> str:
+    """워커별 스냅샷을 합산하여 Prometheus 텍스트 형식(0.0.4)으로 변환합니다."""
+    merged = _merge_snapshots(registry, snapshots)
+    lines: List[str] = []
+    for name, metric in registry.metrics.items():
+        lines.append(f"# HELP {name} {metric.help_text}")
+        lines.append(f"# TYPE {name} {metric.type_name}")
+        for labels, value in merged[name].items():
+            if isinstance(metric, Histogram):
+                cumulative = 0.0
+                for bound, count in zip(metric.buckets, value):
+                    cumulative += count
+                    le = _format_labels(metric.label_names, labels, f'le="{bound:g}"')
+                    lines.append(f"{name}_bucket{le} {cumulative:g}")
+                cumulative += value[len(metric.buckets)]
+                le = _format_labels(metric.label_names, labels, 'le="+Inf"')
+                lines.append(f"{name}_bucket{le} {cumulative:g}")
+                label_text = _format_labels(metric.label_names, labels)
+                lines.append(f"{name}_sum{label_text} {value[-1]:g}")
+                lines.append(f"{name}_count{label_text} {cumulative:g}")
+            else:
+                label_text = _format_labels(metric.label_names, labels)
+                lines.append(f"{name}{label_text} {value:g}")
+    return "\n".join(lines) + "\n"
+
+
+def _archive_snapshot(
+    registry: MetricsRegistry, merged: Dict[str, Dict[LabelValues, Any]]
+) -> Dict[str, Any]:
+    """합산 결과 중 누적 값(카운터, 히스토그램)만 스냅샷 형식으로 되돌립니다."""
+    return {
+        name: {"values": [[list(k), v] for k, v in merged[name].items()]}
+        for name, metric in registry.metrics.items()
+        if isinstance(metric, (Counter, Histogram))
+    }
+
+
+# 워커 프로세스별 지표를 공유 디렉터리에 주기적으로 기록하고 합산하는 관리자
+# 종료된 워커의 카운터 / 히스토그램은 보관 파일(metrics-archive.json)에 더해 두므로
+# 워커가 바뀌어도 합산 값이 줄어들지 않습니다 (게이지는 살아 있는 워커의 값만 보여줍니다).
+# multiprocess_dir가 없으면 현재 프로세스의 지표만 보여줍니다.
+class MetricsExporter:
+
+    ARCHIVE_FILE = "metrics-archive.json"
+
+    def __init__(self, registry: MetricsRegistry, multiprocess_dir: Optional[str]):
+        self.registry = registry
+        self.multiprocess_dir = multiprocess_dir
+        if multiprocess_dir:
+            os.makedirs(multiprocess_dir, exist_ok=True)
+        elif (
+            multiprocessing.parent_process() is not None
+            or int(os.environ.get("WEB_CONCURRENCY", "1") or 1) > 1
+        ):
+            logger.warning(
+                "여러 워커 중 하나로 실행 중이지만 METRICS_MULTIPROCESS_DIR가 설정되지 않아 "
+                "/metrics는 요청을 받은 워커 하나의 값만 보여줍니다."
+            )
+
+    def _path(self, pid: int) -> str:
+        return os.path.join(self.multiprocess_dir, f"metrics-{pid}.json")
+
+    @property
+    def _archive_path(self) -> str:
+        return os.path.join(self.multiprocess_dir, self.ARCHIVE_FILE)
+
+    def _read_json(self, path: str) -> Optional[Dict[str, Any]]:
+        try:
+            with open(path, encoding="utf-8") as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+
+    def _archive_worker_file(self, path: str):
+        """종료된 워커의 스냅샷을 보관 파일에 더하고 워커 파일을 지웁니다."""
+        lock_path = os.path.join(self.multiprocess_dir, "metrics-archive.lock")
+        with open(lock_path, "a") as lock:
+            # 여러 워커가 같은 파일을 동시에 보관하지 않도록 디렉터리 단위로 잠급니다.
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            try:
+                snapshot = self._read_json(path)
+            except ValueError:
+                snapshot = None
+            if snapshot is not None:
+                archive = self._read_json(self._archive_path) or {}
+                merged = _merge_snapshots(self.registry, [archive, snapshot])
+                fd, tmp_path = tempfile.mkstemp(
+                    dir=self.multiprocess_dir, prefix="metrics-archive.", suffix=".tmp"
+                )
+                with os.fdopen(fd, "w", encoding="utf-8") as f:
+                    json.dump(_archive_snapshot(self.registry, merged), f)
+                os.replace(tmp_path, self._archive_path)
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+    def flush(self):
+        """현재 워커의 스냅샷을 파일로 기록합니다 (임시 파일 작성 후 원자적 교체)."""
+        if not self.multiprocess_dir:
+            return
+        path = self._path(os.getpid())
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self.registry.snapshot(), f)
+        os.replace(tmp_path, path)
+
+    def _collect_snapshots(self) -> List[Dict[str, Any]]:
+        own_pid = os.getpid()
+        snapshots = [self.registry.snapshot()]
+        if not self.multiprocess_dir:
+            return snapshots
+        for path in glob.glob(os.path.join(self.multiprocess_dir, "metrics-*.json")):
+            try:
+                pid = int(os.path.basename(path)[len("metrics-") : -len(".json")])
+            except ValueError:
+                continue
+            if pid == own_pid:
+                continue
+            if not _pid_alive(pid):
+                # 비정상 종료한 워커의 마지막 스냅샷은 보관 파일로 옮깁니다.
+                try:
+                    self._archive_worker_file(path)
+                except (OSError, ValueError) as e:
+                    logger.warning(f"종료된 워커 지표 보관 실패: {path}: {e}")
+                continue
+            try:
+                snapshot = self._read_json(path)
+            except (OSError, ValueError):
+                continue
+            if snapshot is not None:
+                snapshots.append(snapshot)
+        try:
+            archive = self._read_json(self._archive_path)
+        except (OSError, ValueError) as e:
+            logger.warning(f"지표 보관 파일을 읽지 못했습니다: {e}")
+            archive = None
+        if archive is not None:
+            snapshots.append(archive)
+        return snapshots
+
+    def render(self) -> str:
+        return render_prometheus_text(self.registry, self._collect_snapshots())
+
+    def retire(self):
+        """워커 종료 시 최종 스냅샷을 기록하고 보관 파일에 더합니다."""
+        if not self.multiprocess_dir:
+            return
+        try:
+            self.flush()
+            self._archive_worker_file(self._path(os.getpid()))
+        except (OSError, ValueError) as e:
+            logger.warning(f"워커 지표 보관 실패: {e}")
+
+
+def _pid_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+registry = MetricsRegistry()
+
+HTTP_REQUEST_DURATION = registry.register(
+    Histogram(
+        "voxai_http_request_duration_seconds",
+        "HTTP request latency by route",
+        ("method", "route", "status"),
+    )
+)
+HTTP_REQUESTS_IN_FLIGHT = registry.register(
+    Gauge("voxai_http_requests_in_flight", "HTTP requests currently being processed")
+)
+TOOL_CALL_DURATION = registry.register(
+    Histogram(
+        "voxai_tool_call_duration_seconds",
+        "Agent tool call latency by tool",
+        ("tool_name", "outcome"),
+    )
+)
+TOOL_CACHE_REQUESTS = registry.register(
+    Counter(
+        "voxai_tool_cache_requests_total",
+        "Tool response cache lookups and invalidations",
+        ("tool_name", "result"),
+    )
+)
+HANDLER_DURATION = registry.register(
+    Histogram(
+        "voxai_call_event_handler_duration_seconds",
+        "Call webhook handler execution time",
+        ("handler", "event", "outcome"),
+    )
+)
+OUTBOUND_REQUEST_DURATION = registry.register(
+    Histogram(
+        "voxai_outbound_request_duration_seconds",
+        "Outbound HTTP request latency by destination",
+        ("destination", "outcome"),
+    )
+)
+EMAIL_DELIVERIES = registry.register(
+    Counter(
+        "voxai_email_deliveries_total",
+        "Email notification deliveries by outcome",
+        ("notification_type", "outcome"),
+    )
+)
+ZENDESK_TICKETS = registry.register(
+    Counter(
+        "voxai_zendesk_tickets_total",
+        "Zendesk tickets by lifecycle outcome",
+        ("outcome",),
+    )
+)
+CALLBACK_QUEUE_DEPTH = registry.register(
+    Gauge(
+        "voxai_callback_queue_depth",
+        "Priority callbacks waiting for an agent",
+        ("urgency",),
+    )
+)
+ADMISSION_REJECTED = registry.register(
+    Counter(
+        "voxai_admission_rejected_total",
+        "Requests shed by admission control",
+        ("priority", "reason"),
+    )
+)
+EVENT_LOOP_LAG = registry.register(
+    Gauge(
+        "voxai_event_loop_lag_seconds",
+        "Most recent event loop scheduling lag",
+        multiprocess_mode="max",
+    )
+)
+
+
+async def run_metrics_background(
+    exporter: MetricsExporter,
+    lag_interval_seconds: float,
+    flush_interval_seconds: float,
+):
+    """이벤트 루프 지연을 측정하고, 주기적으로 워커 스냅샷을 기록합니다."""
+    loop = asyncio.get_running_loop()
+    last_flush = loop.time()
+    while True:
+        expected = loop.time() + lag_interval_seconds
+        await asyncio.sleep(lag_interval_seconds)
+        now = loop.time()
+        EVENT_LOOP_LAG.set(max(0.0, now - expected))
+        if now - last_flush >= flush_interval_seconds:
+            last_flush = now
+            try:
+                exporter.flush()
+            except OSError as e:
+                logger.warning(f"지표 스냅샷 기록 실패: {e}")
+
+
+# 라우트 템플릿 단위로 요청 지연과 처리 중 요청 수를 기록하는 ASGI 미들웨어
+class MetricsMiddleware:
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status_code = 500
+
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        started = time.perf_counter()
+        HTTP_REQUESTS_IN_FLIGHT.inc()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            HTTP_REQUESTS_IN_FLIGHT.dec()
+            route = scope.get("route")
+            # 경로 변수 값이 라벨로 들어가지 않도록 라우트 템플릿을 사용합니다.
+            route_path = getattr(route, "path", None) or "unmatched"
+            HTTP_REQUEST_DURATION.observe(
+                time.perf_counter() - started,
+                scope["method"],
+                route_path,
+                str(status_code),
+            )
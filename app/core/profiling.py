@@ -0,0 +1,352 @@
+import asyncio
+import hmac
+import os
+import sys
+import threading
+import time
+import tracemalloc
+import uuid
+from collections import OrderedDict
+from datetime import datetime
+from types import CodeType, FrameType
+from typing import Any, Dict, List, Optional, Tuple
+from app.core.config import Settings
+from app.core.logging import get_logger
+
+logger = get_logger(__name__)
+
+# 요청 단위 프로파일링: X-Vox-Profile: cpu | memory | cpu,memory (X-Admin-Token 필요)
+PROFILE_HEADER = b"x-vox-profile"
+ADMIN_TOKEN_HEADER = "x-admin-token"
+# 요청 단위 프로파일 결과를 조회할 ID (/admin/profiles/{profile_id})
+PROFILE_ID_HEADER = b"x-vox-profile-id"
+
+PROFILE_KINDS = ("cpu", "memory")
+MAX_STACK_DEPTH = 128
+# 메모리 비교 결과에서 제외하는 추적 도구와 샘플러 스레드 자체의 할당
+_MEMORY_FILTERS = (
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    tracemalloc.Filter(False, __file__),
+    tracemalloc.Filter(False, threading.__file__),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+    tracemalloc.Filter(False, "<unknown>"),
+)
+
+
+class ProfilerBusyError(Exception):
+    """같은 종류의 프로파일이 이미 진행 중일 때 발생하는 예외"""
+
+
+_PATH_PREFIXES = sorted(
+    {os.getcwd() + os.sep}
+    | {p + os.sep for p in sys.path if p and os.path.isdir(p) and p != os.getcwd()},
+    key=len,
+    reverse=True,
+)
+
+
+def _frame_label(code: CodeType, cache: Dict[CodeType, str]) -> str:
+    """코드 객체를 "app/services/agent_tool_service.py:AgentToolService._dispatch_tool_call" 형식으로 바꿉니다."""
+    label = cache.get(code)
+    if label is None:
+        filename = code.co_filename
+        for prefix in _PATH_PREFIXES:
+            if filename.startswith(prefix):
+                filename = filename[len(prefix) :]
+                break
+        # 접힌 스택 형식에서 ';'와 ' '은 구분자이므로 이름에서 바꿉니다.
+        qualname = getattr(code, "co_qualname", code.co_name)
+        label = cache[code] = f"{filename}:{qualname}".replace(";", ":").replace(
+            " ", "_"
+        )
+    return label
+
+
+# 이벤트 루프 스레드의 호출 스택을 별도 스레드에서 주기적으로 표본 추출하는 프로파일러
+# 대상 스레드를 멈추거나 계측하지 않으므로 부하가 표본 간격에만 비례합니다 (10ms 간격에서 1% 미만).
+# anchor 프레임이 주어지면 그 프레임이 스택에 있는 표본만(= 특정 요청을 처리 중인 순간만) 집계합니다.
+class StackSampler:
+
+    def __init__(
+        self,
+        thread_id: int,
+        interval_seconds: float,
+        anchor: Optional[FrameType] = None,
+    ):
+        self.thread_id = thread_id
+        self.interval_seconds = interval_seconds
+        self.anchor = anchor
+        self.counts: Dict[Tuple[CodeType, ...], int] = {}
+        self.samples = 0
+        self.matched = 0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(
+            target=self._run, name="stack-sampler", daemon=True
+        )
+        self.started = 0.0
+        self.elapsed = 0.0
+
+    def start(self):
+        self.started = time.perf_counter()
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+        self.elapsed = time.perf_counter() - self.started
+
+    def _run(self):
+        while not self._stop.wait(self.interval_seconds):
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is None:
+                return
+            self.samples += 1
+            stack: List[CodeType] = []
+            anchored = self.anchor is None
+            while frame is not None and len(stack) < MAX_STACK_DEPTH:
+                stack.append(frame.f_code)
+                if frame is self.anchor:
+                    anchored = True
+                    break
+                frame = frame.f_back
+            if not anchored:
+                continue
+            self.matched += 1
+            key = tuple(reversed(stack))
+            self.counts[key] = self.counts.get(key, 0) + 1
+
+    def collapsed(self) -> str:
+        """flamegraph.pl / speedscope가 읽는 접힌 스택("a;b;c 횟수") 형식으로 반환합니다."""
+        cache: Dict[CodeType, str] = {}
+        lines = [
+            f"{';'.join(_frame_label(code, cache) for code in stack)} {count}"
+            for stack, count in sorted(
+                self.counts.items(), key=lambda item: item[1], reverse=True
+            )
+        ]
+        return "\n".join(lines) + ("\n" if lines else "")
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            "duration_seconds": round(self.elapsed, 3),
+            "interval_ms": round(self.interval_seconds * 1000, 3),
+            "samples": self.samples,
+            "matched_samples": self.matched,
+            "unique_stacks": len(self.counts),
+        }
+
+
+def diff_snapshots(
+    before: tracemalloc.Snapshot,
+    after: tracemalloc.Snapshot,
+    top: int,
+    group_by: str,
+) -> List[Dict[str, Any]]:
+    """두 tracemalloc 스냅샷을 비교해 증가량이 큰 할당 위치 top개를 반환합니다."""
+    stats = after.filter_traces(_MEMORY_FILTERS).compare_to(
+        before.filter_traces(_MEMORY_FILTERS), group_by
+    )
+    result = []
+    for stat in stats[:top]:
+        # traceback은 오래된 프레임부터 정렬되어 있으므로 마지막 프레임이 할당 위치입니다.
+        frames = stat.traceback
+        entry = {
+            "location": f"{frames[-1].filename}:{frames[-1].lineno}",
+            "size_diff_kb": round(stat.size_diff / 1024, 1),
+            "size_kb": round(stat.size / 1024, 1),
+            "count_diff": stat.count_diff,
+            "count": stat.count,
+        }
+        if group_by == "traceback":
+            entry["traceback"] = [f"{f.filename}:{f.lineno}" for f in frames]
+        result.append(entry)
+    return result
+
+
+# 관리자용 CPU / 메모리 프로파일링 상태
+# CPU와 메모리 프로파일은 종류별로 한 번에 하나만 실행하며, 요청 단위 프로파일 결과는
+# 최근 max_results개만 보관합니다.
+class Profiler:
+
+    def __init__(self, settings: Settings):
+        self.admin_token = settings.profiling_admin_token
+        self.sample_interval_seconds = settings.profiling_sample_interval_ms / 1000.0
+        self.max_duration_seconds = settings.profiling_max_duration_seconds
+        self.traceback_frames = settings.profiling_traceback_frames
+        self.max_results = settings.profiling_max_results
+        self._cpu_busy = False
+        self._memory_busy = False
+        self._results: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+
+    def is_authorized(self, token: Optional[str]) -> bool:
+        if not self.admin_token or not token:
+            return False
+        return hmac.compare_digest(token.encode(), self.admin_token.encode())
+
+    def _clamp(self, duration_seconds: float) -> float:
+        return max(0.01, min(duration_seconds, self.max_duration_seconds))
+
+    def start_cpu(self, anchor: Optional[FrameType] = None) -> StackSampler:
+        """현재(이벤트 루프) 스레드를 표본 추출하는 샘플러를 시작합니다."""
+        if self._cpu_busy:
+            raise ProfilerBusyError("CPU 프로파일이 이미 진행 중입니다.")
+        self._cpu_busy = True
+        sampler = StackSampler(
+            threading.get_ident(), self.sample_interval_seconds, anchor
+        )
+        sampler.start()
+        return sampler
+
+    def stop_cpu(self, sampler: StackSampler):
+        sampler.stop()
+        self._cpu_busy = False
+
+    async def profile_cpu(self, duration_seconds: float) -> StackSampler:
+        """duration_seconds 동안 이벤트 루프 스레드를 표본 추출합니다."""
+        sampler = self.start_cpu()
+        try:
+            await asyncio.sleep(self._clamp(duration_seconds))
+        finally:
+            self.stop_cpu(sampler)
+        return sampler
+
+    def start_memory(self) -> Tuple[tracemalloc.Snapshot, bool]:
+        """
+        tracemalloc을 켜고(이미 켜져 있으면 그대로) 기준 스냅샷을 반환합니다.
+        추적은 할당마다 비용이 들므로 프로파일이 끝나면 stop_memory()에서 다시 끕니다.
+        """
+        if self._memory_busy:
+            raise ProfilerBusyError("메모리 프로파일이 이미 진행 중입니다.")
+        self._memory_busy = True
+        started_tracing = not tracemalloc.is_tracing()
+        if started_tracing:
+            tracemalloc.start(self.traceback_frames)
+        return tracemalloc.take_snapshot(), started_tracing
+
+    def stop_memory(
+        self,
+        before: tracemalloc.Snapshot,
+        started_tracing: bool,
+        top: int = 25,
+        group_by: str = "lineno",
+    ) -> Dict[str, Any]:
+        try:
+            after = tracemalloc.take_snapshot()
+            traced_kb, peak_kb = (v / 1024 for v in tracemalloc.get_traced_memory())
+        finally:
+            if started_tracing:
+                tracemalloc.stop()
+            self._memory_busy = False
+        return {
+            "traced_kb": round(traced_kb, 1),
+            "peak_kb": round(peak_kb, 1),
+            "group_by": group_by,
+            "top": diff_snapshots(before, after, top, group_by),
+        }
+
+    async def profile_memory(
+        self, duration_seconds: float, top: int, group_by: str
+    ) -> Dict[str, Any]:
+        """duration_seconds 동안 새로 할당되어 남아 있는 메모리를 위치별로 비교합니다."""
+        before, started_tracing = self.start_memory()
+        started = time.perf_counter()
+        try:
+            await asyncio.sleep(self._clamp(duration_seconds))
+        finally:
+            result = self.stop_memory(before, started_tracing, top, group_by)
+        return {"duration_seconds": round(time.perf_counter() - started, 3), **result}
+
+    def store_result(self, profile_id: str, result: Dict[str, Any]):
+        self._results[profile_id] = result
+        while len(self._results) > self.max_results:
+            self._results.popitem(last=False)
+
+    def get_result(self, profile_id: str) -> Optional[Dict[str, Any]]:
+        return self._results.get(profile_id)
+
+    def list_results(self) -> List[Dict[str, Any]]:
+        return [
+            {k: result[k] for k in ("profile_id", "path", "started_at", "kinds")}
+            for result in reversed(self._results.values())
+        ]
+
+
+# X-Vox-Profile 헤더가 붙은 요청 하나를 프로파일링하는 미들웨어
+# CPU는 이 요청의 처리 코드가 스택에 있는 표본만 집계하고, 메모리는 요청 전후 스냅샷을 비교합니다
+# (메모리는 프로세스 전체 기준이므로 동시에 처리된 다른 요청의 할당도 포함될 수 있습니다).
+# 응답에는 X-Vox-Profile-Id 헤더만 추가되며, 결과는 /admin/profiles/{profile_id}에서 조회합니다.
+class ProfilingMiddleware:
+
+    def __init__(self, app, profiler: Profiler):
+        self.app = app
+        self.profiler = profiler
+
+    async def __call__(self, scope, receive, send):
+        kinds = _requested_kinds(scope) if scope["type"] == "http" else None
+        if not kinds:
+            await self.app(scope, receive, send)
+            return
+        headers = {k: v for k, v in scope["headers"]}
+        token = headers.get(ADMIN_TOKEN_HEADER.encode(), b"").decode("latin-1")
+        if not self.profiler.is_authorized(token):
+            logger.warning(
+                f"관리자 토큰이 없거나 올바르지 않아 프로파일 요청을 무시합니다: {scope['path']}"
+            )
+            await self.app(scope, receive, send)
+            return
+
+        profile_id = f"PROF-{datetime.now():%Y%m%d%H%M%S}-{uuid.uuid4().hex[:8]}"
+        sampler: Optional[StackSampler] = None
+        memory: Optional[Tuple[tracemalloc.Snapshot, bool]] = None
+        try:
+            if "memory" in kinds:
+                memory = self.profiler.start_memory()
+            if "cpu" in kinds:
+                # 이 코루틴의 프레임이 스택에 있으면 이 요청을 처리 중인 표본입니다.
+                sampler = self.profiler.start_cpu(anchor=sys._getframe())
+        except ProfilerBusyError as e:
+            logger.warning(f"요청 프로파일을 건너뜁니다 ({scope['path']}): {e}")
+            if memory is not None:
+                self.profiler.stop_memory(*memory)
+            await self.app(scope, receive, send)
+            return
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                message = {
+                    **message,
+                    "headers": [
+                        *message.get("headers", []),
+                        (PROFILE_ID_HEADER, profile_id.encode()),
+                    ],
+                }
+            await send(message)
+
+        started_at = datetime.now()
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            result: Dict[str, Any] = {
+                "profile_id": profile_id,
+                "path": scope["path"],
+                "started_at": started_at.strftime("%Y-%m-%d %H:%M:%S"),
+                "kinds": sorted(kinds),
+                "request_ms": round((time.perf_counter() - started) * 1000, 3),
+            }
+            if sampler is not None:
+                self.profiler.stop_cpu(sampler)
+                result["cpu"] = {**sampler.summary(), "collapsed": sampler.collapsed()}
+            if memory is not None:
+                result["memory"] = self.profiler.stop_memory(*memory)
+            self.profiler.store_result(profile_id, result)
+            logger.info(f"요청 프로파일 저장: {profile_id} ({scope['path']})")
+
+
+def _requested_kinds(scope) -> Optional[set]:
+    for name, value in scope["headers"]:
+        if name == PROFILE_HEADER:
+            requested = {v.strip() for v in value.decode("latin-1").lower().split(",")}
+            return requested & set(PROFILE_KINDS)
+    return None
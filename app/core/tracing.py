@@ -0,0 +1,348 @@
+import asyncio
+import contextlib
+import json
+import random
+import time
+from collections import deque
+from contextvars import ContextVar
+from typing import Any, Deque, Dict, Iterator, List, Optional
+import httpx
+from app.core.logging import get_logger
+
+logger = get_logger(__name__)
+
+# OTLP 상태 코드
+STATUS_UNSET = 0
+STATUS_OK = 1
+STATUS_ERROR = 2
+
+
+class Span:
+    __slots__ = (
+        "trace_id",
+        "span_id",
+        "parent_id",
+        "name",
+        "kind",
+        "start_ns",
+        "end_ns",
+        "attributes",
+        "status",
+        "status_message",
+        "sampled",
+    )
+
+    def __init__(
+        self,
+        name: str,
+        trace_id: int,
+        parent_id: Optional[int],
+        sampled: bool,
+        kind: int = 1,
+        attributes: Optional[Dict[str, Any]] = None,
+    ):
+        self.name = name
+        self.trace_id = trace_id
+        self.span_id = random.getrandbits(64) or 1
+        self.parent_id = parent_id
+        self.kind = kind
+        self.sampled = sampled
+        self.start_ns = time.time_ns()
+        self.end_ns = 0
+        self.attributes = attributes or {}
+        self.status = STATUS_UNSET
+        self.status_message = ""
+
+    def set_attribute(self, key: str, value: Any):
+        if self.sampled:
+            self.attributes[key] = value
+
+    def set_error(self, message: str):
+        self.status = STATUS_ERROR
+        self.status_message = message
+
+    def traceparent(self) -> str:
+        flags = "01" if self.sampled else "00"
+        return f"00-{self.trace_id:032x}-{self.span_id:016x}-{flags}"
+
+    def to_otlp(self) -> Dict[str, Any]:
+        span = {
+            "traceId": f"{self.trace_id:032x}",
+            "spanId": f"{self.span_id:016x}",
+            "name": self.name,
+            "kind": self.kind,
+            "startTimeUnixNano": str(self.start_ns),
+            "endTimeUnixNano": str(self.end_ns),
+            "attributes": [
+                {"key": k, "value": _otlp_value(v)} for k, v in self.attributes.items()
+            ],
+            "status": {"code": self.status, "message": self.status_message},
+        }
+        if self.parent_id:
+            span["parentSpanId"] = f"{self.parent_id:016x}"
+        return span
+
+
+def _otlp_value(value: Any) -> Dict[str, Any]:
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    return {"stringValue": str(value)}
+
+
+# OTLP span kind
+SPAN_KIND_INTERNAL = 1
+SPAN_KIND_SERVER = 2
+SPAN_KIND_CLIENT = 3
+
+_current_span: ContextVar[Optional[Span]] = ContextVar("current_span", default=None)
+
+
+def current_span() -> Optional[Span]:
+    return _current_span.get()
+
+
+def parse_traceparent(value: Optional[str]) -> Optional[Span]:
+    """W3C traceparent 헤더를 원격 부모 스팬으로 변환합니다. 형식이 잘못되면 None을 반환합니다."""
+    if not value:
+        return None
+    parts = value.strip().split("-")
+    if len(parts) < 4 or len(parts[1]) != 32 or len(parts[2]) != 16:
+        return None
+    try:
+        trace_id = int(parts[1], 16)
+        span_id = int(parts[2], 16)
+        sampled = bool(int(parts[3], 16) & 0x01)
+    except ValueError:
+        return None
+    if not trace_id or not span_id:
+        return None
+    parent = Span("remote", trace_id, None, sampled)
+    parent.span_id = span_id
+    return parent
+
+
+def trace_headers() -> Dict[str, str]:
+    """외부 요청에 붙일 traceparent 헤더를 반환합니다. 진행 중인 트레이스가 없으면 빈 dict입니다."""
+    span = _current_span.get()
+    if span is None:
+        return {}
+    return {"traceparent": span.traceparent()}
+
+
+# 완료된 스팬을 모아 주기적으로 파일(NDJSON) 또는 OTLP/HTTP 수집기로 내보내는 배치 익스포터
+# 요청 처리 경로에서는 deque에 추가만 하며, 큐가 가득 차면 스팬을 버리고 개수만 기록합니다.
+class BatchSpanExporter:
+
+    def __init__(
+        self,
+        service_name: str,
+        file_path: Optional[str],
+        otlp_endpoint: Optional[str],
+        max_queue_size: int,
+        max_batch_size: int,
+        flush_interval_seconds: float,
+    ):
+        self.service_name = service_name
+        self.file_path = file_path
+        self.otlp_endpoint = otlp_endpoint
+        self.max_queue_size = max_queue_size
+        self.max_batch_size = max_batch_size
+        self.flush_interval_seconds = flush_interval_seconds
+        self._queue: Deque[Span] = deque()
+        self.exported = 0
+        self.dropped = 0
+        self.export_errors = 0
+
+    def enqueue(self, span: Span):
+        if len(self._queue) >= self.max_queue_size:
+            self.dropped += 1
+            return
+        self._queue.append(span)
+
+    def _drain(self) -> List[Span]:
+        batch = []
+        while self._queue and len(batch) < self.max_batch_size:
+            batch.append(self._queue.popleft())
+        return batch
+
+    async def run(self):
+        """flush_interval_seconds마다 쌓인 스팬을 내보냅니다."""
+        while True:
+            await asyncio.sleep(self.flush_interval_seconds)
+            await self.flush()
+
+    async def flush(self):
+        while self._queue:
+            batch = self._drain()
+            try:
+                await self._export(batch)
+                self.exported += len(batch)
+            except Exception as e:
+                self.export_errors += 1
+                logger.warning(f"트레이스 스팬 {len(batch)}개 내보내기 실패: {e}")
+
+    async def _export(self, batch: List[Span]):
+        if self.otlp_endpoint:
+            body = {
+                "resourceSpans": [
+                    {
+                        "resource": {
+                            "attributes": [
+                                {
+                                    "key": "service.name",
+                                    "value": {"stringValue": self.service_name},
+                                }
+                            ]
+                        },
+                        "scopeSpans": [
+                            {
+                                "scope": {"name": "app.core.tracing"},
+                                "spans": [span.to_otlp() for span in batch],
+                            }
+                        ],
+                    }
+                ]
+            }
+            async with httpx.AsyncClient() as client:
+                response = await client.post(
+                    f"{self.otlp_endpoint.rstrip('/')}/v1/traces",
+                    json=body,
+                    timeout=5.0,
+                )
+                response.raise_for_status()
+        elif self.file_path:
+            lines = "".join(
+                json.dumps(span.to_otlp(), ensure_ascii=False) + "\n" for span in batch
+            )
+            await asyncio.to_thread(self._append_file, lines)
+
+    def _append_file(self, lines: str):
+        with open(self.file_path, "a", encoding="utf-8") as f:
+            f.write(lines)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "queued": len(self._queue),
+            "exported": self.exported,
+            "dropped": self.dropped,
+            "export_errors": self.export_errors,
+        }
+
+
+# 헤드 기반 샘플링 트레이서
+# 샘플링 여부는 루트 스팬(또는 수신한 traceparent)에서 한 번만 결정되며, 샘플링되지 않은
+# 트레이스의 하위 스팬은 새 객체를 만들지 않고 부모 컨텍스트만 전파하여 비용을 최소화합니다.
+class Tracer:
+
+    def __init__(self):
+        self.sample_ratio = 0.0
+        self.exporter: Optional[BatchSpanExporter] = None
+
+    def configure(self, sample_ratio: float, exporter: Optional[BatchSpanExporter]):
+        self.sample_ratio = sample_ratio
+        self.exporter = exporter
+
+    @property
+    def enabled(self) -> bool:
+        return self.sample_ratio > 0 and self.exporter is not None
+
+    @contextlib.contextmanager
+    def start_span(
+        self,
+        name: str,
+        attributes: Optional[Dict[str, Any]] = None,
+        kind: int = SPAN_KIND_INTERNAL,
+        parent: Optional[Span] = None,
+    ) -> Iterator[Optional[Span]]:
+        """
+        현재 컨텍스트의 하위 스팬을 엽니다. 블록에서 예외가 발생하면 스팬을 오류로 표시합니다.
+        트레이싱이 꺼져 있으면 None을 반환합니다.
+        """
+        if not self.enabled:
+            yield None
+            return
+
+        parent = parent or _current_span.get()
+        if parent is None:
+            span = Span(
+                name,
+                random.getrandbits(128) or 1,
+                None,
+                random.random() < self.sample_ratio,
+                kind,
+                attributes,
+            )
+        elif not parent.sampled:
+            # 샘플링되지 않은 트레이스는 기록하지 않고 부모 컨텍스트만 유지합니다.
+            token = _current_span.set(parent)
+            try:
+                yield parent
+            finally:
+                _current_span.reset(token)
+            return
+        else:
+            span = Span(name, parent.trace_id, parent.span_id, True, kind, attributes)
+
+        token = _current_span.set(span)
+        try:
+            yield span
+        except BaseException as e:
+            span.set_error(f"{type(e).__name__}: {e}")
+            raise
+        finally:
+            _current_span.reset(token)
+            if span.sampled and self.exporter is not None:
+                span.end_ns = time.time_ns()
+                self.exporter.enqueue(span)
+
+
+# 프로세스 전역 트레이서 (create_app()의 lifespan에서 configure()로 활성화)
+tracer = Tracer()
+
+
+# 요청마다 서버 스팬을 열고 수신한 traceparent를 이어받는 ASGI 미들웨어
+class TracingMiddleware:
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not tracer.enabled:
+            await self.app(scope, receive, send)
+            return
+
+        remote_parent = None
+        for key, value in scope["headers"]:
+            if key == b"traceparent":
+                remote_parent = parse_traceparent(value.decode("latin-1"))
+                break
+
+        status_code = 500
+
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        with tracer.start_span(
+            f"{scope['method']} {scope['path']}",
+            {"http.method": scope["method"], "http.target": scope["path"]},
+            kind=SPAN_KIND_SERVER,
+            parent=remote_parent,
+        ) as span:
+            try:
+                await self.app(scope, receive, send_wrapper)
+            finally:
+                if span is not None and span.sampled:
+                    route = getattr(scope.get("route"), "path", None)
+                    if route:
+                        span.name = f"{scope['method']} {route}"
+                        span.set_attribute("http.route", route)
+                    span.set_attribute("http.status_code", status_code)
+                    if status_code >= 500:
+                        span.set_error(f"HTTP {status_code}")
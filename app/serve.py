@@ -0,0 +1,268 @@
+import argparse
+import importlib.util
+import multiprocessing
+import os
+import shutil
+import signal
+import socket
+import sys
+import tempfile
+import time
+from typing import Any, Dict, List, Optional
+import uvicorn
+from app.core.config import settings
+from app.core.logging import get_logger
+from app.services.caller_directory import ensure_directory_index
+
+logger = get_logger(__name__)
+
+DEFAULT_APP = "main:create_app"
+# 비정상 종료한 워커를 다시 띄우기 전 대기 시간 (연속으로 죽을 때마다 두 배, 최대값까지)
+RESPAWN_INITIAL_DELAY_SECONDS = 0.5
+RESPAWN_MAX_DELAY_SECONDS = 60.0
+# 이 시간 이상 살아 있던 워커가 종료되면 연속 실패 횟수를 초기화합니다.
+RESPAWN_STABLE_SECONDS = 60.0
+
+
+def available_cpu_count() -> int:
+    """이 프로세스가 사용할 수 있는 CPU 코어 수 (컨테이너 CPU 제한/affinity 반영)"""
+    if hasattr(os, "sched_getaffinity"):
+        return max(1, len(os.sched_getaffinity(0)))
+    return max(1, os.cpu_count() or 1)
+
+
+def select_event_loop() -> str:
+    return "uvloop" if importlib.util.find_spec("uvloop") else "asyncio"
+
+
+def select_http_protocol() -> str:
+    return "httptools" if importlib.util.find_spec("httptools") else "h11"
+
+
+def _bind_reuse_port_socket(host: str, port: int) -> socket.socket:
+    family = socket.AF_INET6 if ":" in host else socket.AF_INET
+    sock = socket.socket(family, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT, 1)
+    sock.bind((host, port))
+    return sock
+
+
+def _run_worker(config_kwargs: Dict[str, Any], host: str, port: int):
+    """SO_REUSEPORT 소켓을 직접 열어 uvicorn 서버 하나를 실행합니다 (자식 프로세스)."""
+    sock = _bind_reuse_port_socket(host, port)
+    config = uvicorn.Config(host=host, port=port, **config_kwargs)
+    uvicorn.Server(config).run(sockets=[sock])
+
+
+# SO_REUSEPORT 방식의 워커 프로세스 관리자
+# 워커마다 같은 포트에 소켓을 따로 열어 커널이 연결을 분산하므로, 한 워커가 바빠도
+# accept가 한곳에 몰리지 않습니다. 비정상 종료한 워커는 지수 백오프로 다시 띄우고, SIGTERM을 받으면
+# 모든 워커에 전달한 뒤 진행 중인 요청이 끝날 때까지 기다립니다.
+class ReusePortSupervisor:
+
+    def __init__(
+        self,
+        config_kwargs: Dict[str, Any],
+        host: str,
+        port: int,
+        workers: int,
+        graceful_timeout_seconds: int,
+    ):
+        self.config_kwargs = config_kwargs
+        self.host = host
+        self.port = port
+        self.workers = workers
+        self.graceful_timeout_seconds = graceful_timeout_seconds
+        self._context = multiprocessing.get_context("spawn")
+        self._processes: List[multiprocessing.process.BaseProcess] = []
+        # 워커 자리별 시작 시각, 연속 실패 횟수, 다음 재시작 시각 (0이면 실행 중)
+        self._started_at: List[float] = []
+        self._failures: List[int] = []
+        self._respawn_at: List[float] = []
+        self._stopping = False
+
+    def _spawn(self) -> multiprocessing.process.BaseProcess:
+        process = self._context.Process(
+            target=_run_worker,
+            args=(self.config_kwargs, self.host, self.port),
+            name="voxai-worker",
+        )
+        process.start()
+        return process
+
+    def _handle_signal(self, signum, frame):
+        if not self._stopping:
+            logger.info(
+                f"종료 신호({signal.Signals(signum).name})를 받아 워커를 정리합니다."
+            )
+        self._stopping = True
+
+    def run(self):
+        signal.signal(signal.SIGTERM, self._handle_signal)
+        signal.signal(signal.SIGINT, self._handle_signal)
+        self._processes = [self._spawn() for _ in range(self.workers)]
+        now = time.monotonic()
+        self._started_at = [now] * self.workers
+        self._failures = [0] * self.workers
+        self._respawn_at = [0.0] * self.workers
+        logger.info(
+            f"워커 {self.workers}개를 시작했습니다 (SO_REUSEPORT, {self.host}:{self.port})"
+        )
+
+        while not self._stopping:
+            time.sleep(0.5)
+            for i, process in enumerate(self._processes):
+                if self._stopping:
+                    break
+                now = time.monotonic()
+                if self._respawn_at[i]:
+                    if now >= self._respawn_at[i]:
+                        self._respawn_at[i] = 0.0
+                        self._started_at[i] = now
+                        self._processes[i] = self._spawn()
+                    continue
+                if process.is_alive():
+                    continue
+                if now - self._started_at[i] >= RESPAWN_STABLE_SECONDS:
+                    self._failures[i] = 0
+                delay = min(
+                    RESPAWN_MAX_DELAY_SECONDS,
+                    RESPAWN_INITIAL_DELAY_SECONDS * 2 ** self._failures[i],
+                )
+                self._failures[i] += 1
+                self._respawn_at[i] = now + delay
+                logger.warning(
+                    f"워커(pid {process.pid})가 종료 코드 {process.exitcode}로 종료되어 "
+                    f"{delay:.1f}초 뒤 다시 시작합니다 (연속 {self._failures[i]}회)."
+                )
+
+        self.shutdown()
+
+    def shutdown(self):
+        for process in self._processes:
+            if process.is_alive():
+                os.kill(process.pid, signal.SIGTERM)
+        # 워커는 새 연결을 받지 않고 진행 중인 요청을 마친 뒤 lifespan 종료 단계를 실행합니다.
+        deadline = time.monotonic() + self.graceful_timeout_seconds + 5
+        for process in self._processes:
+            process.join(max(0.0, deadline - time.monotonic()))
+            if process.is_alive():
+                logger.warning(f"워커(pid {process.pid})를 강제 종료합니다.")
+                process.kill()
+                process.join()
+        logger.info("모든 워커가 종료되었습니다.")
+
+
+def build_config_kwargs(args: argparse.Namespace) -> Dict[str, Any]:
+    return {
+        "app": args.app,
+        "factory": args.app.endswith(":create_app"),
+        "loop": select_event_loop(),
+        "http": select_http_protocol(),
+        "backlog": args.backlog,
+        "timeout_keep_alive": args.keep_alive,
+        "limit_concurrency": args.limit_concurrency,
+        "timeout_graceful_shutdown": args.graceful_timeout,
+        "access_log": args.access_log,
+        # X-Forwarded-* 헤더는 지정한 프록시(기본값: 같은 호스트)에서 온 요청만 신뢰합니다.
+        # 클라이언트 주소는 승인 제어의 클라이언트별 한도에도 쓰이므로 "*"는 프록시 뒤에서만 지정하세요.
+        "proxy_headers": bool(args.forwarded_allow_ips),
+        "forwarded_allow_ips": args.forwarded_allow_ips or None,
+    }
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Vox.ai 연동 서버 실행")
+    parser.add_argument("--app", default=DEFAULT_APP, help="ASGI 앱 경로")
+    parser.add_argument("--host", default=settings.server_host)
+    parser.add_argument("--port", type=int, default=settings.server_port)
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=settings.server_workers,
+        help="워커 프로세스 수 (기본값: CPU 코어 수)",
+    )
+    parser.add_argument("--backlog", type=int, default=settings.server_backlog)
+    parser.add_argument(
+        "--keep-alive",
+        type=int,
+        default=settings.server_keepalive_timeout_seconds,
+        help="유휴 keep-alive 연결 유지 시간 (초)",
+    )
+    parser.add_argument(
+        "--limit-concurrency",
+        type=int,
+        default=settings.server_limit_concurrency,
+        help="워커당 동시 연결 한도 (초과 시 503)",
+    )
+    parser.add_argument(
+        "--graceful-timeout",
+        type=int,
+        default=settings.server_graceful_timeout_seconds,
+        help="SIGTERM 후 진행 중인 요청을 기다리는 시간 (초)",
+    )
+    parser.add_argument(
+        "--reuse-port",
+        action=argparse.BooleanOptionalAction,
+        default=settings.server_reuse_port,
+    )
+    parser.add_argument(
+        "--forwarded-allow-ips",
+        default=settings.server_forwarded_allow_ips,
+        help="X-Forwarded-For/Proto를 신뢰할 프록시 IP 목록 (쉼표 구분, 빈 값이면 사용 안 함)",
+    )
+    parser.add_argument(
+        "--access-log",
+        action=argparse.BooleanOptionalAction,
+        default=settings.server_access_log,
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None):
+    """
+    운영용 서버 진입점.
+    uvloop/httptools가 설치되어 있으면 사용하고, 워커 수는 CPU 코어 수에 맞춥니다.
+    """
+    args = parse_args(argv)
+    workers = args.workers or available_cpu_count()
+    # main.py는 패키지 밖(프로젝트 루트)에 있으므로 uvicorn CLI처럼 현재 디렉터리에서 찾습니다.
+    sys.path.insert(0, os.getcwd())
+
+    metrics_dir = None
+    if workers > 1 and not settings.metrics_multiprocess_dir:
+        # 워커들의 지표를 /metrics에서 합산할 수 있도록 공유 디렉터리를 지정합니다.
+        metrics_dir = tempfile.mkdtemp(prefix="voxai-metrics-")
+        os.environ["METRICS_MULTIPROCESS_DIR"] = metrics_dir
+
+    # 워커마다 같은 인덱스를 다시 만들지 않도록 워커를 띄우기 전에 한 번만 생성합니다.
+    ensure_directory_index(
+        settings.caller_directory_source, settings.caller_directory_index_path
+    )
+
+    config_kwargs = build_config_kwargs(args)
+    logger.info(
+        f"서버 시작: 워커 {workers}개, loop={config_kwargs['loop']}, "
+        f"http={config_kwargs['http']}, backlog={args.backlog}, "
+        f"keep-alive={args.keep_alive}s, 동시 연결 한도={args.limit_concurrency}"
+    )
+
+    try:
+        if workers > 1 and args.reuse_port and hasattr(socket, "SO_REUSEPORT"):
+            ReusePortSupervisor(
+                config_kwargs, args.host, args.port, workers, args.graceful_timeout
+            ).run()
+        else:
+            # 단일 워커이거나 SO_REUSEPORT를 쓸 수 없으면 uvicorn의 공유 소켓 방식을 사용합니다.
+            uvicorn.run(
+                host=args.host, port=args.port, workers=workers, **config_kwargs
+            )
+    finally:
+        if metrics_dir is not None:
+            # 직접 만든 임시 지표 디렉터리만 지웁니다 (설정으로 지정한 디렉터리는 유지).
+            shutil.rmtree(metrics_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
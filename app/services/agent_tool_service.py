@@ -1,29 +1,124 @@
 from datetime import datetime, timedelta
 import random
 import re
+import uuid
+from typing import Any, Dict, List, Optional
+from app.core.config import Settings
 from app.core.logging import get_logger
+from app.core.tracing import tracer
 from app.models.tool_models import AgentToolRequestPayload, AgentToolResponsePayload
+from .call_session_index import CallSessionIndex
+from .callback_scheduler import PRIORITY_LEVELS, CallbackScheduler, format_wait_time
+from .csat_store import CsatStore
+from .email_delivery import (
+    EMAIL_TEMPLATES,
+    EmailDeliveryService,
+    is_valid_email_address,
+)
+from .idempotency_store import IdempotencyStore
+from .reservation_store import SAMPLE_RESERVATION_ROWS, load_reservation_store
+from .technician_dispatch import load_technician_dispatcher
+from .tool_response_cache import ToolResponseCache, load_tool_cache_policies
+from .zendesk_client import ZendeskTicketService
 
 logger = get_logger(__name__)
 
+# create_support_ticket이 발급하는 기술지원 티켓 번호 형식 (AS-날짜-16진수 8자리)
+SUPPORT_TICKET_ID_PATTERN = re.compile(r"^AS-\d{8}-[0-9A-F]{8}$")
+
 
 # 에이전트 도구 호출을 처리하는 서비스
 class AgentToolService:
-    def __init__(self):
-        # 기사 목록 초기화
-        self.mock_technicians = [
-            {"name": "김기사", "contact": "010-1234-5678", "area": "서울/경기"},
-            {"name": "박기사", "contact": "010-2345-6789", "area": "부산/울산"},
-            {"name": "이기사", "contact": "010-3456-7890", "area": "대구/경북"},
-            {"name": "정기사", "contact": "010-4567-8901", "area": "광주/전남"},
-            {"name": "최기사", "contact": "010-5678-9012", "area": "대전/충청"},
-        ]
+    def __init__(
+        self,
+        settings: Settings,
+        call_session_index: Optional[CallSessionIndex] = None,
+    ):
+        # 서비스 지역별 기사 배정기 (명단 파일이 없으면 기본 기사 5명)
+        self.technician_dispatcher = load_technician_dispatcher(
+            settings.technician_roster_path,
+            ticket_ttl_seconds=settings.technician_ticket_ttl_seconds,
+            max_open_tickets=settings.technician_max_open_tickets,
+        )
+        # 재시도된 도구 호출(예: 티켓 생성)이 중복 실행되지 않도록 결과를 보관합니다.
+        self.dedup_store = IdempotencyStore(
+            ttl_seconds=settings.idempotency_ttl_seconds,
+            max_entries=settings.idempotency_max_entries,
+        )
+        # 항공권 예매 확인 도구가 조회하는 예약 저장소 (파일이 없으면 예시 예약)
+        self.reservation_store = load_reservation_store(settings.reservation_store_path)
+        self.reservation_lookup_max_results = settings.reservation_lookup_max_results
+        # 예약 데이터가 없으면 기존 모의 응답처럼 조건과 관계없이 예시 예약을 반환합니다.
+        self.reservation_sample_fallback = not settings.reservation_store_path
+        # 이메일 알림 발송 큐와 SMTP 연결 풀 (SMTP 서버가 없으면 발송을 시뮬레이션)
+        self.email_delivery = EmailDeliveryService(settings)
+        # 젠데스크 티켓 일괄 생성 큐 (Zendesk 주소가 없으면 티켓 ID를 시뮬레이션)
+        self.zendesk_tickets = ZendeskTicketService(settings)
+        # 우선순위 콜백 대기열과 상담원 처리 용량 모델 (예상 대기 시간 계산)
+        self.callback_scheduler = CallbackScheduler(settings)
+        # 만족도 조사 점수 로그와 에이전트별 / 시간대별 집계
+        self.csat_store = CsatStore(settings)
+        # 도구 호출이 속한 통화의 에이전트 ID를 찾는 데 사용합니다 (없으면 페이로드의 agent_id만 사용).
+        self.call_session_index = call_session_index
+        # 읽기 전용 도구의 응답 캐시 (정책은 도구별 *_schema.json의 x-cache / x-invalidates)
+        self.response_cache = ToolResponseCache(
+            (
+                load_tool_cache_policies(settings.tool_schema_dir)
+                if settings.tool_cache_enabled
+                else {}
+            ),
+            max_entries=settings.tool_cache_max_entries,
+        )
 
     async def process_tool_call(
-        self, tool_name: str, payload: AgentToolRequestPayload
+        self,
+        tool_name: str,
+        payload: AgentToolRequestPayload,
+        idempotency_key: Optional[str] = None,
+        call_id: Optional[str] = None,
     ) -> AgentToolResponsePayload:
         """
         에이전트의 특정 도구 호출을 처리하고 응답을 반환합니다.
+        idempotency_key(또는 페이로드의 tool_call_id)가 있으면 같은 키의 재시도는
+        도구를 다시 실행하지 않고 최초 실행 결과를 반환합니다.
+        call_id는 도구를 호출한 통화 ID로, 통화 정보가 필요한 도구(만족도 조사 저장)에 전달됩니다.
+        캐시 정책이 선언된 읽기 전용 도구는 같은 인수의 반복 호출에 캐시된 응답을 반환합니다.
+        """
+        key = idempotency_key or payload.get("tool_call_id")
+        with tracer.start_span("tool.dispatch", {"tool.name": tool_name}) as span:
+            cache_key, cached = self.response_cache.lookup(tool_name, payload)
+            if span is not None and cache_key is not None:
+                span.set_attribute("tool.cache_hit", cached is not None)
+            if cached is not None:
+                return cached
+
+            if not key:
+                result = await self._dispatch_tool_call(tool_name, payload, call_id)
+            else:
+                result, replayed = await self.dedup_store.run_once(
+                    (tool_name, str(key)),
+                    lambda: self._dispatch_tool_call(tool_name, payload, call_id),
+                )
+                if replayed:
+                    logger.info(
+                        f"중복 도구 호출을 감지하여 이전 결과를 반환합니다: {tool_name} (key: {key})"
+                    )
+                if span is not None:
+                    span.set_attribute("tool.replayed", replayed)
+            self.response_cache.store(tool_name, payload, cache_key, result)
+            return result
+
+    def is_supported_tool(self, tool_name: str) -> bool:
+        """tool_name에 대응하는 _handle_<tool_name> 메서드가 있는지 확인합니다."""
+        return callable(getattr(self, f"_handle_{tool_name}", None))
+
+    async def _dispatch_tool_call(
+        self,
+        tool_name: str,
+        payload: AgentToolRequestPayload,
+        call_id: Optional[str] = None,
+    ) -> AgentToolResponsePayload:
+        """
         tool_name에 따라 다른 로직을 수행합니다.
         """
         logger.info(f"에이전트 도구 호출 처리 시작: {tool_name}, 페이로드: {payload}")
@@ -35,6 +130,8 @@ class AgentToolService:
             return await self._handle_control_ev_system(payload)
         elif tool_name == "create_support_ticket":
             return await self._handle_create_support_ticket(payload)
+        elif tool_name == "close_support_ticket":
+            return await self._handle_close_support_ticket(payload)
         elif tool_name == "submit_zendesk_ticket":
             return await self._handle_submit_zendesk_ticket(payload)
         elif tool_name == "check_flight_ticket":
@@ -48,7 +145,7 @@ class AgentToolService:
         elif tool_name == "submit_detailed_zendesk_ticket":
             return await self._handle_submit_detailed_zendesk_ticket(payload)
         elif tool_name == "save_csat_survey":
-            return await self._handle_save_csat_survey(payload)
+            return await self._handle_save_csat_survey(payload, call_id)
         elif tool_name == "send_email_notification":
             return await self._handle_send_email_notification(payload)
         elif tool_name == "calculate_cancellation_fee":
@@ -66,11 +163,38 @@ class AgentToolService:
         """
         젠데스크 티켓 제출 도구 처리
         SOP의 '젠데스크_티켓_제출' 도구에 대응
+        티켓은 일괄 생성 큐에 넣고 임시 티켓 ID를 즉시 반환합니다.
         """
+        ticket = {
+            "subject": payload.get("subject") or "Vox.ai 상담 티켓",
+            "comment": {
+                "body": payload.get("description")
+                or "Vox.ai 에이전트가 통화 중 접수한 상담 티켓입니다."
+            },
+            "priority": payload.get("priority") or "normal",
+            "tags": ["voxai"],
+        }
+        if payload.get("requester_email"):
+            ticket["requester"] = {
+                "name": payload.get("requester_name") or payload["requester_email"],
+                "email": payload["requester_email"],
+            }
+        record = self.zendesk_tickets.submit(ticket)
+        if record is None:
+            return self._ticket_queue_full_response()
         return {
             "status": "success",
             "message": "젠데스크 티켓 제출 완료",
-            "ticket_id": "1234567890",
+            "ticket_id": record.provisional_id,
+            "ticket_status": record.status,
+        }
+
+    @staticmethod
+    def _ticket_queue_full_response() -> AgentToolResponsePayload:
+        return {
+            "status": "error",
+            "message": "티켓 접수 요청이 많아 지금은 접수할 수 없습니다. 잠시 후 다시 시도해 주세요.",
+            "error_code": "TICKET_QUEUE_FULL",
         }
 
     async def _handle_check_flight_ticket(
@@ -79,126 +203,47 @@ class AgentToolService:
         """
         항공권 예매 확인 도구 처리
         SOP의 '항공권_예매_확인' 도구에 대응
+        예약 번호(RSV_NO/ALPHA_PNR_NO) 또는 예약자 이름으로 예약 저장소를 조회합니다.
+        예약 데이터가 설정되지 않았으면 조건이 없거나 일치하는 예약이 없어도 예시 예약을 반환합니다.
         """
+        reservation_no = (payload.get("reservation_no") or "").strip()
+        passenger_name = (payload.get("passenger_name") or "").strip()
+
+        if not reservation_no and not passenger_name:
+            if self.reservation_sample_fallback:
+                return self._reservation_response(
+                    [dict(row) for row in SAMPLE_RESERVATION_ROWS]
+                )
+            return {
+                "status": "error",
+                "message": "예약 번호 또는 예약자 이름이 제공되지 않았습니다.",
+                "error_code": "MISSING_RESERVATION_QUERY",
+            }
+
+        logger.info(
+            f"check_flight_ticket 처리 중, reservation_no: {reservation_no}, passenger_name: {passenger_name}"
+        )
+        rows = self.reservation_store.lookup(
+            reservation_no or None,
+            passenger_name or None,
+            max_reservations=self.reservation_lookup_max_results,
+        )
+        if not rows and self.reservation_sample_fallback:
+            rows = [dict(row) for row in SAMPLE_RESERVATION_ROWS]
+        if not rows:
+            return {
+                "status": "error",
+                "message": "일치하는 예약을 찾을 수 없습니다.",
+                "error_code": "RESERVATION_NOT_FOUND",
+            }
+        return self._reservation_response(rows)
+
+    @staticmethod
+    def _reservation_response(rows: List[Dict[str, Any]]) -> AgentToolResponsePayload:
         return {
             "meta": {},
             "result": {
-                "data": [
-                    {
-                        "PNR_SEQNO": 10456789,
-                        "DI_FLAG": "I",
-                        "STOCK_AIR_CD": "KE",
-                        "STOCK_AIR_NM": "대한항공",
-                        "TRIP_TYPE_CD": "RT",
-                        "TRIP_TYPE_NM": "왕복",
-                        "RSV_INWON": 3,
-                        "RSV_NO": "KFMNPQ",
-                        "RSV_USR_NM": "김민지",
-                        "RSV_STATUS_CD": "RMTK",
-                        "RSV_STATUS_NM": "발권완료",
-                        "DEP_DTM": "20250915141000",
-                        "ARR_DTM": "20250922092000",
-                        "RSV_DTM": "20250820094523",
-                        "PAY_TL": "20250820094500",
-                        "PNR_SEAT_STATUS_CD": "RK",
-                        "PNR_SEAT_STATUS_NM": "확약",
-                        "PAY_STATUS_CD": "PAQK",
-                        "PAY_STATUS_NM": "결제완료",
-                        "ISSUE_STATUS_CD": "TKKY",
-                        "ISSUE_STATUS_NM": "발권완료",
-                        "SALE_TOT_AMT": 1280000,
-                        "SEG_RSV_YN": "Y",
-                        "CANCEL_YN": "N",
-                        "FARE_CONFM_YN": "Y",
-                        "MIJUNG_AMT_YN": "N",
-                        "PROOF_DOC_REQUIRE_YN": "N",
-                        "PROOF_DOC_CONFM_YN": "N",
-                        "ALPHA_PNR_NO": "KFMNPQ",
-                        "ITIN_NO": 1,
-                        "ITIN_BUNDLE_UNIT": "1",
-                        "FLTNO": "KE647",
-                        "FLT_AIR_CD": "KE",
-                        "FLT_AIR_NM": "대한항공",
-                        "DEP_CITY_CD": "ICN",
-                        "DEP_CITY_NM": "인천",
-                        "DEP_AIRPORT_CD": "ICN",
-                        "DEP_AIRPORT_NM": "인천국제공항",
-                        "DEP_DATE": "20250915",
-                        "DEP_TM": "1410",
-                        "ARR_CITY_CD": "BKK",
-                        "ARR_CITY_NM": "방콕",
-                        "ARR_AIRPORT_CD": "BKK",
-                        "ARR_AIRPORT_NM": "방콕 수완나품",
-                        "ARR_DATE": "20250915",
-                        "ARR_TM": "1755",
-                        "AUTO_ISSUE_YN": "N",
-                        "STOP_OVER_YN": "N",
-                        "ATC_REISSUE_FLAG": "N",
-                        "FLIGHTS_STATUS": "발권완료",
-                        "FLIGHTS_STATUS_CD": "FLTY",
-                        "CODESHARE_YN": "N",
-                        "CODESHARE_AIR_CD": "",
-                        "CODESHARE_AIR_NM": "",
-                        "CODESHARE_CD_IMG": "",
-                    },
-                    {
-                        "PNR_SEQNO": 10456789,
-                        "DI_FLAG": "I",
-                        "STOCK_AIR_CD": "KE",
-                        "STOCK_AIR_NM": "대한항공",
-                        "TRIP_TYPE_CD": "RT",
-                        "TRIP_TYPE_NM": "왕복",
-                        "RSV_INWON": 3,
-                        "RSV_NO": "KFMNPQ",
-                        "RSV_USR_NM": "박서현",
-                        "RSV_STATUS_CD": "RMTK",
-                        "RSV_STATUS_NM": "발권완료",
-                        "DEP_DTM": "20250915141000",
-                        "ARR_DTM": "20250922092000",
-                        "RSV_DTM": "20250820094523",
-                        "PAY_TL": "20250820094500",
-                        "PNR_SEAT_STATUS_CD": "RK",
-                        "PNR_SEAT_STATUS_NM": "확약",
-                        "PAY_STATUS_CD": "PAQK",
-                        "PAY_STATUS_NM": "결제완료",
-                        "ISSUE_STATUS_CD": "TKKY",
-                        "ISSUE_STATUS_NM": "발권완료",
-                        "SALE_TOT_AMT": 1280000,
-                        "SEG_RSV_YN": "Y",
-                        "CANCEL_YN": "N",
-                        "FARE_CONFM_YN": "Y",
-                        "MIJUNG_AMT_YN": "N",
-                        "PROOF_DOC_REQUIRE_YN": "N",
-                        "PROOF_DOC_CONFM_YN": "N",
-                        "ALPHA_PNR_NO": "KFMNPQ",
-                        "ITIN_NO": 2,
-                        "ITIN_BUNDLE_UNIT": "2",
-                        "FLTNO": "KE648",
-                        "FLT_AIR_CD": "KE",
-                        "FLT_AIR_NM": "대한항공",
-                        "DEP_CITY_CD": "BKK",
-                        "DEP_CITY_NM": "방콕",
-                        "DEP_AIRPORT_CD": "BKK",
-                        "DEP_AIRPORT_NM": "방콕 수완나품",
-                        "DEP_DATE": "20250922",
-                        "DEP_TM": "0920",
-                        "ARR_CITY_CD": "ICN",
-                        "ARR_CITY_NM": "인천",
-                        "ARR_AIRPORT_CD": "ICN",
-                        "ARR_AIRPORT_NM": "인천국제공항",
-                        "ARR_DATE": "20250922",
-                        "ARR_TM": "1630",
-                        "AUTO_ISSUE_YN": "N",
-                        "STOP_OVER_YN": "N",
-                        "ATC_REISSUE_FLAG": "N",
-                        "FLIGHTS_STATUS": "발권완료",
-                        "FLIGHTS_STATUS_CD": "FLTY",
-                        "CODESHARE_YN": "N",
-                        "CODESHARE_AIR_CD": "",
-                        "CODESHARE_AIR_NM": "",
-                        "CODESHARE_CD_IMG": "",
-                    },
-                ],
+                "data": rows,
                 "status": 200,
                 "message": "SUCCESS",
                 "code": "success",
@@ -340,13 +385,20 @@ class AgentToolService:
 
         logger.info(f"create_support_ticket 처리 중, charger_id: {charger_id}")
 
-        # 티켓 ID 생성 (날짜 + 랜덤 번호)
-        ticket_id = (
-            f"AS-{datetime.now().strftime('%Y%m%d')}-{random.randint(1000, 9999)}"
-        )
+        # 티켓 ID 생성 (날짜 + 무작위 16진수, 초당 수백 건이 접수되어도 겹치지 않도록)
+        ticket_id = f"AS-{datetime.now():%Y%m%d}-{uuid.uuid4().hex[:8].upper()}"
 
-        # 기사 배정 (지역별 랜덤)
-        assigned_technician = random.choice(self.mock_technicians)
+        # 충전기 번호(또는 위치)로 정한 서비스 지역에서 미결 티켓이 가장 적은 기사를 배정합니다.
+        assignment = self.technician_dispatcher.assign(
+            ticket_id, charger_id, payload.get("location")
+        )
+        if assignment is None:
+            return {
+                "status": "error",
+                "message": "배정 가능한 기사가 없습니다.",
+                "error_code": "NO_TECHNICIAN_AVAILABLE",
+            }
+        service_area, assigned_technician = assignment
 
         visit_days = 3
         # 영업일 기준으로 계산 (주말 제외)
@@ -358,15 +410,72 @@ class AgentToolService:
             "charger_id": charger_id,
             "issue_description": issue_description,
             "estimated_visit_date": visit_date.strftime("%Y-%m-%d"),
-            "message": f"기술지원 티켓 {ticket_id}가 생성되었습니다. 담당 기사가 연락드릴 예정입니다.",
+            "service_area": service_area,
+            "assigned_technician": assigned_technician.to_dict(),
+            "message": (
+                f"기술지원 티켓 {ticket_id}가 생성되었습니다. "
+                f"담당 기사({assigned_technician.name}, {assigned_technician.contact})가 연락드릴 예정입니다."
+            ),
             "created_at": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
         }
 
         logger.info(
-            f"create_support_ticket 처리 완료: {ticket_id}, 담당자: {assigned_technician['name']}"
+            f"create_support_ticket 처리 완료: {ticket_id}, 지역: {service_area}, "
+            f"담당자: {assigned_technician.name}"
         )
         return response_data
 
+    async def _handle_close_support_ticket(
+        self, payload: AgentToolRequestPayload
+    ) -> AgentToolResponsePayload:
+        """
+        기술지원 티켓 종결 도구 처리
+        담당 기사의 미결 티켓 수를 줄여 다음 배정에 반영합니다.
+        이 워커에 미결 기록이 없는 정상 형식의 티켓 번호는 부하 변경 없이 성공으로 응답합니다 (중복 종결 허용).
+        """
+        ticket_id = payload.get("ticket_id", "").strip()
+
+        if not ticket_id:
+            return {
+                "status": "error",
+                "message": "티켓 번호가 제공되지 않았습니다.",
+                "error_code": "MISSING_TICKET_ID",
+            }
+
+        technician = self.technician_dispatcher.release(ticket_id)
+        if technician is None and SUPPORT_TICKET_ID_PATTERN.match(ticket_id):
+            # 이미 종결됐거나, 만료됐거나, 다른 워커가 배정한 티켓입니다.
+            # 기사 부하는 워커별로 관리하므로 부하 변경 없이 종결된 것으로 응답합니다.
+            logger.info(
+                f"close_support_ticket: 이 워커에 미결 기록이 없는 티켓 {ticket_id}"
+            )
+            return {
+                "status": "success",
+                "ticket_id": ticket_id,
+                "ticket_status": "closed",
+                "assigned_technician": None,
+                "message": f"기술지원 티켓 {ticket_id}가 종결되었습니다.",
+                "closed_at": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+            }
+        if technician is None:
+            return {
+                "status": "error",
+                "message": f"미결 상태의 기술지원 티켓 {ticket_id}를 찾을 수 없습니다.",
+                "error_code": "TICKET_NOT_FOUND",
+            }
+
+        logger.info(
+            f"close_support_ticket 처리 완료: {ticket_id}, 담당자: {technician.name}"
+        )
+        return {
+            "status": "success",
+            "ticket_id": ticket_id,
+            "ticket_status": "closed",
+            "assigned_technician": technician.to_dict(),
+            "message": f"기술지원 티켓 {ticket_id}가 종결되었습니다.",
+            "closed_at": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+        }
+
     def _calculate_business_date(
         self, start_date: datetime, business_days: int
     ) -> datetime:
@@ -469,29 +578,31 @@ class AgentToolService:
         inquiry_summary = payload.get("inquiry_summary", "")
         urgency = payload.get("urgency", "Normal")
 
-        # 콜백 ID 생성
-        callback_id = (
-            f"CB-{datetime.now().strftime('%Y%m%d%H%M%S')}-{random.randint(1000, 9999)}"
-        )
+        # 콜백 ID 생성 (대기열에 같은 초의 요청이 많아도 겹치지 않도록 무작위 16진수 사용)
+        callback_id = f"CB-{datetime.now():%Y%m%d%H%M%S}-{uuid.uuid4().hex[:8].upper()}"
 
-        # 우선순위별 예상 대기시간
-        if urgency == "Critical":
-            estimated_wait_time = "5분 이내"
-            priority_level = 1
-        elif urgency == "High":
-            estimated_wait_time = "15분 이내"
-            priority_level = 2
-        else:
-            estimated_wait_time = "30분 이내"
-            priority_level = 3
+        # 대기열의 현재 순번과 상담원 처리 용량으로 예상 대기시간을 계산합니다.
+        priority_level = PRIORITY_LEVELS.get(urgency, PRIORITY_LEVELS["Normal"])
+        record = self.callback_scheduler.submit(
+            callback_id, priority_level, inquiry_summary
+        )
+        if record is None:
+            return {
+                "status": "error",
+                "message": "콜백 요청이 많아 지금은 접수할 수 없습니다. 잠시 후 다시 시도해 주세요.",
+                "error_code": "CALLBACK_QUEUE_FULL",
+            }
+        estimated_wait_time = format_wait_time(record.estimated_wait_seconds)
 
         return {
             "status": "success",
             "callback_id": callback_id,
             "priority_level": priority_level,
             "estimated_wait_time": estimated_wait_time,
+            "estimated_wait_seconds": round(record.estimated_wait_seconds, 1),
+            "queue_position": self.callback_scheduler.queue_position(record),
             "message": f"최우선 콜백이 접수되었습니다. {estimated_wait_time} 연락드릴 예정입니다.",
-            "scheduled_at": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+            "scheduled_at": record.scheduled_at.strftime("%Y-%m-%d %H:%M:%S"),
             "inquiry_summary": inquiry_summary,
         }
 
@@ -505,21 +616,37 @@ class AgentToolService:
         urgency = payload.get("urgency", "Normal")
         assigned_team = payload.get("assigned_team", "일반상담팀")
 
-        # 티켓 ID 생성
-        ticket_id = (
-            f"ZD-{datetime.now().strftime('%Y%m%d')}-{random.randint(10000, 99999)}"
-        )
-
         # 우선순위별 SLA 시간
         sla_hours = {"Critical": 2, "High": 8, "Normal": 24}
+        zendesk_priority = {"Critical": "urgent", "High": "high", "Normal": "normal"}
 
         expected_resolution = datetime.now() + timedelta(
             hours=sla_hours.get(urgency, 24)
         )
 
+        # 티켓은 일괄 생성 큐에 넣고 임시 티켓 ID를 반환합니다 (실제 ID는 생성 후 연결).
+        record = self.zendesk_tickets.submit(
+            {
+                "subject": f"[{urgency}] {assigned_team} 상담 티켓",
+                "comment": {
+                    "body": (
+                        f"담당팀: {assigned_team}\n"
+                        f"긴급도: {urgency} (SLA {sla_hours.get(urgency, 24)}시간)\n"
+                        f"{payload.get('description') or ''}"
+                    ).rstrip()
+                },
+                "priority": zendesk_priority.get(urgency, "normal"),
+                "tags": ["voxai", f"urgency_{urgency.lower()}"],
+            }
+        )
+        if record is None:
+            return self._ticket_queue_full_response()
+        ticket_id = record.provisional_id
+
         return {
             "status": "success",
             "ticket_id": ticket_id,
+            "ticket_status": record.status,
             "urgency": urgency,
             "assigned_team": assigned_team,
             "sla_hours": sla_hours.get(urgency, 24),
@@ -529,11 +656,12 @@ class AgentToolService:
         }
 
     async def _handle_save_csat_survey(
-        self, payload: AgentToolRequestPayload
+        self, payload: AgentToolRequestPayload, call_id: Optional[str] = None
     ) -> AgentToolResponsePayload:
         """
         고객 만족도 조사 결과 저장 도구
         SOP Phase 5.2.e에 대응
+        점수는 통화 ID, 에이전트 ID와 함께 만족도 조사 로그에 추가됩니다.
         """
         score = payload.get("score", "")
 
@@ -568,13 +696,26 @@ class AgentToolService:
             5: "매우 만족",
         }
 
+        # 에이전트 ID는 페이로드에 없으면 call_started로 기록된 통화 세션에서 찾습니다.
+        call_id = call_id or payload.get("call_id")
+        agent_id = payload.get("agent_id")
+        if not agent_id and call_id and self.call_session_index is not None:
+            agent_id = self.call_session_index.agent_id_for(str(call_id))
+        record = self.csat_store.save(
+            score_int,
+            call_id=str(call_id) if call_id else None,
+            agent_id=str(agent_id) if agent_id else None,
+        )
+
         return {
             "status": "success",
             "score": score_int,
             "satisfaction_level": satisfaction_levels[score_int],
             "message": "고객 만족도 조사 결과가 저장되었습니다.",
-            "saved_at": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-            "feedback_id": f"CSAT-{datetime.now().strftime('%Y%m%d%H%M%S')}-{random.randint(1000, 9999)}",
+            "saved_at": datetime.fromtimestamp(record.timestamp).strftime(
+                "%Y-%m-%d %H:%M:%S"
+            ),
+            "feedback_id": record.feedback_id,
         }
 
     async def _handle_send_email_notification(
@@ -604,61 +745,56 @@ class AgentToolService:
                 "error_code": "MISSING_RESERVATION_NUMBER",
             }
 
+        if not is_valid_email_address(email_address):
+            return {
+                "status": "error",
+                "message": f"올바르지 않은 이메일 주소: {email_address}",
+                "error_code": "INVALID_EMAIL_ADDRESS",
+            }
+
         logger.info(
             f"send_email_notification 처리 중, type: {notification_type}, reservation: {reservation_number}, email: {email_address}"
         )
 
         # 지원되는 알림 타입별 처리
-        supported_types = {
-            "e-ticket": {
-                "subject": "전자항공권 재발송",
-                "description": "이티켓 정보가 재발송되었습니다.",
-                "content": "요청하신 전자항공권을 다시 발송해 드렸습니다.",
-            },
-            "extra-service": {
-                "subject": "부가서비스 재발송",
-                "description": "부가서비스 정보가 재발송되었습니다.",
-                "content": "요청하신 부가서비스를 다시 발송해 드렸습니다.",
-            },
-            "reservation": {
-                "subject": "예약 정보 재발송",
-                "description": "예약 정보가 재발송되었습니다.",
-                "content": "요청하신 예약 정보를 다시 발송해 드렸습니다.",
-            },
-            "boarding-pass": {
-                "subject": "탑승권 재발송",
-                "description": "탑승권 정보가 재발송되었습니다.",
-                "content": "요청하신 탑승권을 다시 발송해 드렸습니다.",
-            },
-        }
-
-        if notification_type not in supported_types:
+        if notification_type not in EMAIL_TEMPLATES:
             return {
                 "status": "error",
                 "message": f"지원되지 않는 알림 타입: {notification_type}",
-                "supported_types": list(supported_types.keys()),
+                "supported_types": list(EMAIL_TEMPLATES.keys()),
                 "error_code": "UNSUPPORTED_TYPE",
             }
 
-        type_info = supported_types[notification_type]
+        type_info = EMAIL_TEMPLATES[notification_type]
 
-        # 이메일 발송 시뮬레이션 (실제로는 외부 이메일 서비스 API 호출)
-        email_id = f"EMAIL-{datetime.now().strftime('%Y%m%d%H%M%S')}-{random.randint(1000, 9999)}"
+        # 발송 큐에 넣는 즉시 응답합니다 (실제 발송 결과는 email_id로 조회).
+        record = self.email_delivery.submit(
+            notification_type, reservation_number, email_address
+        )
+        if record is None:
+            return {
+                "status": "error",
+                "message": "이메일 발송 요청이 많아 지금은 접수할 수 없습니다. 잠시 후 다시 시도해 주세요.",
+                "error_code": "EMAIL_QUEUE_FULL",
+            }
 
         response_data = {
             "status": "success",
-            "email_id": email_id,
+            "email_id": record.email_id,
             "type": notification_type,
             "reservation_number": reservation_number,
             "recipient_email": email_address,
             "subject": type_info["subject"],
             "message": f"{type_info['content']} 스팸함도 확인해 주세요.",
-            "sent_at": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-            "delivery_status": "sent",
+            "queued_at": record.queued_at.strftime("%Y-%m-%d %H:%M:%S"),
+            "sent_at": (
+                record.sent_at.strftime("%Y-%m-%d %H:%M:%S") if record.sent_at else None
+            ),
+            "delivery_status": record.status,
         }
 
         logger.info(
-            f"send_email_notification 처리 완료: {email_id}, type: {notification_type}"
+            f"send_email_notification 처리 완료: {record.email_id}, type: {notification_type}, status: {record.status}"
         )
         return response_data
 
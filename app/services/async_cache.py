@@ -0,0 +1,134 @@
+import asyncio
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Hashable, Set
+from app.core.logging import get_logger
+
+logger = get_logger(__name__)
+
+Loader = Callable[[], Awaitable[Any]]
+
+
+class _CacheEntry:
+    __slots__ = ("value", "fresh_until", "stale_until")
+
+    def __init__(self, value: Any, fresh_until: float, stale_until: float):
+        self.value = value
+        self.fresh_until = fresh_until
+        self.stale_until = stale_until
+
+
+# 느린 백엔드(DB, CRM API 등) 앞에 두는 비동기 캐시
+# - 동시에 발생한 같은 키의 미스는 하나의 조회로 합칩니다 (request coalescing).
+# - 만료된 항목은 stale 구간 동안 그대로 반환하면서 백그라운드에서 갱신합니다 (stale-while-revalidate).
+# - 조회 결과가 None이면 짧은 TTL로 캐시합니다 (negative caching).
+class CoalescingCache:
+
+    def __init__(
+        self,
+        ttl_seconds: float,
+        negative_ttl_seconds: float,
+        stale_seconds: float,
+        max_entries: int,
+    ):
+        self.ttl_seconds = ttl_seconds
+        self.negative_ttl_seconds = negative_ttl_seconds
+        self.stale_seconds = stale_seconds
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Hashable, _CacheEntry]" = OrderedDict()
+        self._inflight: Dict[Hashable, asyncio.Future] = {}
+        self._refresh_tasks: Set[asyncio.Task] = set()
+        self.hits = 0
+        self.stale_hits = 0
+        self.negative_hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.refreshes = 0
+        self.load_errors = 0
+
+    async def get(self, key: Hashable, loader: Loader) -> Any:
+        """
+        캐시된 값을 반환하고, 없으면 loader로 조회합니다.
+        같은 키에 대해 이미 진행 중인 조회가 있으면 그 결과를 함께 기다립니다.
+        """
+        now = time.monotonic()
+        entry = self._entries.get(key)
+        if entry is not None:
+            if now < entry.fresh_until:
+                self._entries.move_to_end(key)
+                if entry.value is None:
+                    self.negative_hits += 1
+                else:
+                    self.hits += 1
+                return entry.value
+            if now < entry.stale_until:
+                self._entries.move_to_end(key)
+                self.stale_hits += 1
+                self._refresh_in_background(key, loader)
+                return entry.value
+
+        inflight = self._inflight.get(key)
+        if inflight is not None:
+            self.coalesced += 1
+            return await asyncio.shield(inflight)
+
+        self.misses += 1
+        return await self._load(key, loader)
+
+    def put(self, key: Hashable, value: Any):
+        now = time.monotonic()
+        ttl = self.ttl_seconds if value is not None else self.negative_ttl_seconds
+        self._entries[key] = _CacheEntry(
+            value, now + ttl, now + ttl + self.stale_seconds
+        )
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    async def _load(self, key: Hashable, loader: Loader) -> Any:
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            value = await loader()
+        except BaseException as e:
+            self.load_errors += 1
+            if isinstance(e, asyncio.CancelledError):
+                future.cancel()
+            else:
+                future.set_exception(e)
+                future.exception()
+            raise
+        finally:
+            self._inflight.pop(key, None)
+
+        self.put(key, value)
+        future.set_result(value)
+        return value
+
+    def _refresh_in_background(self, key: Hashable, loader: Loader):
+        if key in self._inflight:
+            return
+        self.refreshes += 1
+        task = asyncio.get_running_loop().create_task(self._refresh(key, loader))
+        # 태스크가 가비지 컬렉션되지 않도록 완료될 때까지 참조를 유지합니다.
+        self._refresh_tasks.add(task)
+        task.add_done_callback(self._refresh_tasks.discard)
+
+    async def _refresh(self, key: Hashable, loader: Loader):
+        try:
+            await self._load(key, loader)
+        except Exception as e:
+            logger.warning(f"캐시 백그라운드 갱신 실패 (기존 값 유지): {key} - {e}")
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "stale_hits": self.stale_hits,
+            "negative_hits": self.negative_hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+            "background_refreshes": self.refreshes,
+            "load_errors": self.load_errors,
+            "inflight": len(self._inflight),
+        }
@@ -0,0 +1,167 @@
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+from app.core.histogram import LogLinearHistogram
+from app.core.logging import get_logger
+from app.models.webhook_models import CallEndedPayload
+
+logger = get_logger(__name__)
+
+# (이름, 전체 구간(초), 슬롯 수)
+WINDOWS: Tuple[Tuple[str, int, int], ...] = (
+    ("1m", 60, 6),
+    ("1h", 3600, 12),
+    ("24h", 86400, 24),
+)
+# 종료 사유/감성 라벨 종류가 늘어나도 메모리가 일정하도록 라벨 수를 제한합니다.
+MAX_LABELS = 32
+OTHER_LABEL = "other"
+
+
+def _count_label(counter: Dict[str, int], label: Optional[str]):
+    label = label or "unknown"
+    if label not in counter and len(counter) >= MAX_LABELS:
+        label = OTHER_LABEL
+    counter[label] = counter.get(label, 0) + 1
+
+
+class _Slot:
+    __slots__ = ("epoch", "count", "credits", "durations", "reasons", "sentiments")
+
+    def __init__(self):
+        self.epoch = -1
+        self.count = 0
+        self.credits = 0
+        self.durations: Optional[LogLinearHistogram] = None
+        self.reasons: Dict[str, int] = {}
+        self.sentiments: Dict[str, int] = {}
+
+    def reset(self, epoch: int):
+        self.epoch = epoch
+        self.count = 0
+        self.credits = 0
+        if self.durations is not None:
+            self.durations.reset()
+        self.reasons.clear()
+        self.sentiments.clear()
+
+
+# 일정 개수의 슬롯을 순환하며 사용하는 롤링 윈도우
+# 기록은 현재 슬롯 하나만 갱신하므로 O(1)이며, 조회 시 유효한 슬롯을 합산합니다.
+class RollingWindow:
+
+    def __init__(self, span_seconds: int, slot_count: int):
+        self.slot_seconds = span_seconds / slot_count
+        self.slots: List[_Slot] = [_Slot() for _ in range(slot_count)]
+
+    def record(
+        self,
+        now: float,
+        duration_ms: Optional[int],
+        reason: Optional[str],
+        sentiment: Optional[str],
+        credits: Optional[int],
+    ):
+        epoch = int(now // self.slot_seconds)
+        slot = self.slots[epoch % len(self.slots)]
+        if slot.epoch != epoch:
+            slot.reset(epoch)
+
+        slot.count += 1
+        slot.credits += credits or 0
+        if duration_ms is not None:
+            if slot.durations is None:
+                slot.durations = LogLinearHistogram()
+            slot.durations.record(duration_ms)
+        _count_label(slot.reasons, reason)
+        _count_label(slot.sentiments, sentiment)
+
+    def snapshot(self, now: float) -> Dict[str, Any]:
+        current = int(now // self.slot_seconds)
+        oldest = current - len(self.slots) + 1
+        durations = LogLinearHistogram()
+        reasons: Dict[str, int] = {}
+        sentiments: Dict[str, int] = {}
+        count = 0
+        credits = 0
+        for slot in self.slots:
+            if not (oldest <= slot.epoch <= current):
+                continue
+            count += slot.count
+            credits += slot.credits
+            if slot.durations is not None:
+                durations.merge(slot.durations)
+            for label, c in slot.reasons.items():
+                reasons[label] = reasons.get(label, 0) + c
+            for label, c in slot.sentiments.items():
+                sentiments[label] = sentiments.get(label, 0) + c
+
+        return {
+            "calls": count,
+            "total_credits_used": credits,
+            "duration_ms": durations.summary(),
+            "disconnection_reasons": reasons,
+            "user_sentiments": sentiments,
+        }
+
+
+class _AgentWindows:
+    __slots__ = ("windows",)
+
+    def __init__(self):
+        self.windows = {
+            name: RollingWindow(span, slots) for name, span, slots in WINDOWS
+        }
+
+    def record(self, now: float, *values):
+        for window in self.windows.values():
+            window.record(now, *values)
+
+    def snapshot(self, now: float) -> Dict[str, Any]:
+        return {name: w.snapshot(now) for name, w in self.windows.items()}
+
+
+# call_ended 이벤트로부터 에이전트별 통화 통계를 실시간으로 집계하는 서비스
+# 추적하는 에이전트 수를 제한하여(LRU) 통화량과 무관하게 메모리 사용량이 일정합니다.
+class CallAnalyticsAggregator:
+
+    def __init__(self, max_agents: int):
+        self.max_agents = max_agents
+        self._overall = _AgentWindows()
+        self._agents: "OrderedDict[str, _AgentWindows]" = OrderedDict()
+
+    def record_call_ended(self, payload: CallEndedPayload, now: Optional[float] = None):
+        """call_ended 페이로드 하나를 모든 윈도우에 O(1)로 반영합니다."""
+        now = time.time() if now is None else now
+        call = payload.call
+
+        duration_ms = call.duration_ms
+        if duration_ms is None and call.call_cost and call.call_cost.duration_seconds:
+            duration_ms = call.call_cost.duration_seconds * 1000
+        credits = call.call_cost.total_credits_used if call.call_cost else None
+        sentiment = call.call_analysis.user_sentiment if call.call_analysis else None
+        values = (duration_ms, call.disconnection_reason, sentiment, credits)
+
+        self._overall.record(now, *values)
+
+        agent_id = str(call.agent_id) if call.agent_id else "unknown"
+        agent = self._agents.get(agent_id)
+        if agent is None:
+            agent = self._agents[agent_id] = _AgentWindows()
+            if len(self._agents) > self.max_agents:
+                evicted, _ = self._agents.popitem(last=False)
+                logger.info(
+                    f"통계 대상 에이전트 수 초과로 {evicted} 통계를 제거합니다."
+                )
+        else:
+            self._agents.move_to_end(agent_id)
+        agent.record(now, *values)
+
+    def snapshot(self, agent_id: Optional[str] = None) -> Dict[str, Any]:
+        now = time.time()
+        if agent_id is not None:
+            agent = self._agents.get(agent_id)
+            agents = {agent_id: agent.snapshot(now)} if agent else {}
+        else:
+            agents = {aid: a.snapshot(now) for aid, a in self._agents.items()}
+        return {"overall": self._overall.snapshot(now), "agents": agents}
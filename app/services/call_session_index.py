@@ -0,0 +1,181 @@
+import json
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional
+from app.core.logging import get_logger
+
+logger = get_logger(__name__)
+
+# 한 통화에서 기록하는 도구 호출 수의 상한 (비정상적으로 긴 통화가 메모리를 점유하지 않도록)
+MAX_TOOL_CALLS_PER_SESSION = 256
+
+SessionSink = Callable[[Dict[str, Any]], None]
+
+
+class ToolInvocation:
+    __slots__ = ("tool_name", "started_at", "latency_ms", "ok")
+
+    def __init__(self, tool_name: str, started_at: float, latency_ms: float, ok: bool):
+        self.tool_name = tool_name
+        self.started_at = started_at
+        self.latency_ms = latency_ms
+        self.ok = ok
+
+
+class CallSession:
+    __slots__ = (
+        "call_id",
+        "agent_id",
+        "started_at",
+        "ended_at",
+        "last_seen",
+        "tool_calls",
+        "dropped_tool_calls",
+    )
+
+    def __init__(self, call_id: str, now: float):
+        self.call_id = call_id
+        self.agent_id: Optional[str] = None
+        self.started_at: Optional[float] = None
+        self.ended_at: Optional[float] = None
+        self.last_seen = now
+        self.tool_calls: List[ToolInvocation] = []
+        self.dropped_tool_calls = 0
+
+    def to_record(self, status: str) -> Dict[str, Any]:
+        """세션을 하나의 통합 레코드(dict)로 변환합니다. 시각은 epoch 초 단위입니다."""
+        tool_latency_ms = sum(t.latency_ms for t in self.tool_calls)
+        slowest = max(self.tool_calls, key=lambda t: t.latency_ms, default=None)
+        duration_ms = None
+        if self.started_at is not None and self.ended_at is not None:
+            duration_ms = round((self.ended_at - self.started_at) * 1000)
+        return {
+            "call_id": self.call_id,
+            "agent_id": self.agent_id,
+            "status": status,
+            "started_at": self.started_at,
+            "ended_at": self.ended_at,
+            "duration_ms": duration_ms,
+            "tool_call_count": len(self.tool_calls) + self.dropped_tool_calls,
+            "tool_latency_ms": round(tool_latency_ms, 2),
+            "slowest_tool": slowest.tool_name if slowest else None,
+            "tool_calls": [
+                {
+                    "tool_name": t.tool_name,
+                    "offset_ms": (
+                        round((t.started_at - self.started_at) * 1000)
+                        if self.started_at is not None
+                        else None
+                    ),
+                    "latency_ms": round(t.latency_ms, 2),
+                    "ok": t.ok,
+                }
+                for t in self.tool_calls
+            ],
+        }
+
+
+def _log_session_record(record: Dict[str, Any]):
+    logger.info(f"통화 세션 기록: {json.dumps(record, ensure_ascii=False)}")
+
+
+# call_id를 기준으로 call_started, 도구 호출, call_ended를 연결하는 세션 인덱스
+# 종료되지 않은 세션은 TTL/LRU로 제거되며, 종료되거나 제거된 세션은 통합 레코드로 내보냅니다.
+class CallSessionIndex:
+
+    def __init__(self, ttl_seconds: float, max_sessions: int):
+        self.ttl_seconds = ttl_seconds
+        self.max_sessions = max_sessions
+        # 마지막 활동 순서로 정렬되어 가장 오래된 세션이 앞에 위치합니다.
+        self._sessions: "OrderedDict[str, CallSession]" = OrderedDict()
+        self.sinks: List[SessionSink] = [_log_session_record]
+        self.completed = 0
+        self.abandoned = 0
+
+    def _touch(self, call_id: str, now: float) -> CallSession:
+        self._evict(now)
+        session = self._sessions.get(call_id)
+        if session is None:
+            session = self._sessions[call_id] = CallSession(call_id, now)
+            if len(self._sessions) > self.max_sessions:
+                _, oldest = self._sessions.popitem(last=False)
+                self._emit(oldest, "abandoned")
+        else:
+            self._sessions.move_to_end(call_id)
+        session.last_seen = now
+        return session
+
+    def record_call_started(
+        self,
+        call_id: str,
+        agent_id: Optional[str] = None,
+        started_at: Optional[float] = None,
+    ):
+        now = time.time()
+        session = self._touch(call_id, now)
+        session.agent_id = agent_id or session.agent_id
+        session.started_at = started_at if started_at is not None else now
+
+    def agent_id_for(self, call_id: str) -> Optional[str]:
+        """진행 중인 통화의 에이전트 ID를 반환합니다 (세션을 갱신하지 않습니다)."""
+        session = self._sessions.get(call_id)
+        return session.agent_id if session is not None else None
+
+    def record_tool_call(
+        self,
+        call_id: str,
+        tool_name: str,
+        started_at: float,
+        latency_ms: float,
+        ok: bool,
+    ):
+        session = self._touch(call_id, time.time())
+        if len(session.tool_calls) >= MAX_TOOL_CALLS_PER_SESSION:
+            session.dropped_tool_calls += 1
+            return
+        session.tool_calls.append(ToolInvocation(tool_name, started_at, latency_ms, ok))
+
+    def record_call_ended(
+        self,
+        call_id: str,
+        agent_id: Optional[str] = None,
+        started_at: Optional[float] = None,
+        ended_at: Optional[float] = None,
+    ):
+        """통화 종료 시 세션을 인덱스에서 제거하고 통합 레코드로 내보냅니다."""
+        now = time.time()
+        session = self._touch(call_id, now)
+        del self._sessions[call_id]
+        session.agent_id = agent_id or session.agent_id
+        if session.started_at is None:
+            session.started_at = started_at
+        session.ended_at = ended_at if ended_at is not None else now
+        self._emit(session, "completed")
+
+    def _evict(self, now: float):
+        sessions = self._sessions
+        while sessions:
+            oldest = next(iter(sessions.values()))
+            if now - oldest.last_seen < self.ttl_seconds:
+                break
+            sessions.popitem(last=False)
+            self._emit(oldest, "abandoned")
+
+    def _emit(self, session: CallSession, status: str):
+        if status == "completed":
+            self.completed += 1
+        else:
+            self.abandoned += 1
+        record = session.to_record(status)
+        for sink in self.sinks:
+            try:
+                sink(record)
+            except Exception as e:
+                logger.error(f"통화 세션 레코드 전달 중 오류 발생: {e}")
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "active_sessions": len(self._sessions),
+            "completed": self.completed,
+            "abandoned": self.abandoned,
+        }
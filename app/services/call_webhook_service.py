@@ -1,9 +1,22 @@
+import time
 from typing import List, Union, Literal
 from app.models.webhook_models import CallStartedPayload, CallEndedPayload
+import httpx
+from app.core.config import Settings
 from app.core.logging import get_logger
+from app.core.metrics import HANDLER_DURATION
+from app.core.tracing import tracer
+from .idempotency_store import IdempotencyStore
+from .call_analytics import CallAnalyticsAggregator
+from .call_session_index import CallSessionIndex
+from .tool_usage_analytics import ToolUsageAnalytics
+from .outbound_guard import DestinationGuardRegistry
 from .handlers.make_com_handler import MakeComHandler
 from .handlers.database_handler import DatabaseHandler
 from .handlers.custom_url_handler import CustomUrlHandler
+from .handlers.analytics_handler import AnalyticsHandler
+from .handlers.call_session_handler import CallSessionHandler
+from .handlers.tool_usage_handler import ToolUsageHandler
 from .handlers.base_handler import BaseCallEventHandler
 
 logger = get_logger(__name__)
@@ -12,14 +25,32 @@ logger = get_logger(__name__)
 # 콜 데이터 웹훅 이벤트를 받아 여러 핸들러에게 전달하는 서비스
 class CallWebhookService:
 
-    def __init__(self):
+    def __init__(
+        self,
+        settings: Settings,
+        http_client: httpx.AsyncClient,
+        outbound_guards: DestinationGuardRegistry,
+        call_analytics: CallAnalyticsAggregator,
+        call_session_index: CallSessionIndex,
+        tool_usage_analytics: ToolUsageAnalytics,
+    ):
         """핸들러 인스턴스를 초기화하고 등록합니다."""
         # 여기에 필요한 다른 핸들러들을 추가하세요.
         self.handlers: List[BaseCallEventHandler] = [
-            MakeComHandler(),
-            DatabaseHandler(),  # 예시: DB 저장 핸들러
-            CustomUrlHandler(),  # 예시: 커스텀 서버 전송 핸들러
+            AnalyticsHandler(call_analytics),  # 실시간 통화 통계 집계
+            CallSessionHandler(call_session_index),  # 통화별 도구 호출 지연 추적
+            ToolUsageHandler(tool_usage_analytics),  # 대화 스크립트 기반 도구 사용 통계
+            MakeComHandler(settings, http_client, outbound_guards),
+            DatabaseHandler(settings),  # 예시: DB 저장 핸들러
+            CustomUrlHandler(
+                settings, http_client, outbound_guards
+            ),  # 예시: 커스텀 서버 전송 핸들러
         ]
+        # 재시도된 웹훅이 핸들러를 다시 실행하지 않도록 (call_id, event) 단위로 중복을 제거합니다.
+        self.dedup_store = IdempotencyStore(
+            ttl_seconds=settings.idempotency_ttl_seconds,
+            max_entries=settings.idempotency_max_entries,
+        )
         logger.info(
             f"{len(self.handlers)}개의 핸들러로 CallWebhookService를 초기화했습니다."
         )
@@ -31,22 +62,54 @@ class CallWebhookService:
     ):
         """
         받은 웹훅 이벤트를 등록된 모든 핸들러에게 전달합니다.
-        각 핸들러는 순차적으로 실행됩니다.
+        같은 (call_id, event)의 재전송은 핸들러를 다시 실행하지 않고 최초 결과를 반환합니다.
+        """
+        key = (str(payload.call.call_id), event_type)
+        result, replayed = await self.dedup_store.run_once(
+            key, lambda: self._dispatch_to_handlers(event_type, payload)
+        )
+        if replayed:
+            logger.info(
+                f"중복 웹훅 이벤트를 감지하여 이전 결과를 반환합니다: {event_type} (call_id: {key[0]})"
+            )
+        return result
+
+    async def _dispatch_to_handlers(
+        self,
+        event_type: Literal["call_started", "call_ended"],
+        payload: Union[CallStartedPayload, CallEndedPayload],
+    ):
+        """
+        등록된 모든 핸들러를 순차적으로 실행합니다.
         """
         logger.info(f"통화 웹훅 이벤트 처리 시작: {event_type}")
 
         # 순차 실행 (디버깅 및 로깅에 더 용이할 수 있음)
         for handler in self.handlers:
-            try:
-                handler_name = handler.__class__.__name__
-                logger.info(f"핸들러 실행: {handler_name} (이벤트: {event_type})")
-                await handler.handle(event_type, payload)
-                logger.info(f"핸들러 {handler_name} 실행 완료 (이벤트: {event_type})")
-            except Exception as e:
-                # 특정 핸들러 실패가 전체 요청을 중단시키지 않도록 예외 처리
-                logger.error(
-                    f"핸들러 {handler_name} 실행 중 오류 발생 (이벤트: {event_type}): {e}"
-                )
+            handler_name = handler.__class__.__name__
+            started = time.perf_counter()
+            with tracer.start_span(
+                f"handler {handler_name}",
+                {"handler.name": handler_name, "call.event": event_type},
+            ) as span:
+                try:
+                    logger.info(f"핸들러 실행: {handler_name} (이벤트: {event_type})")
+                    await handler.handle(event_type, payload)
+                    logger.info(
+                        f"핸들러 {handler_name} 실행 완료 (이벤트: {event_type})"
+                    )
+                    outcome = "success"
+                except Exception as e:
+                    # 특정 핸들러 실패가 전체 요청을 중단시키지 않도록 예외 처리
+                    logger.error(
+                        f"핸들러 {handler_name} 실행 중 오류 발생 (이벤트: {event_type}): {e}"
+                    )
+                    outcome = "failure"
+                    if span is not None:
+                        span.set_error(f"{type(e).__name__}: {e}")
+            HANDLER_DURATION.observe(
+                time.perf_counter() - started, handler_name, event_type, outcome
+            )
 
         logger.info(f"통화 웹훅 이벤트 처리 완료: {event_type}")
 
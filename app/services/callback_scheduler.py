@@ -0,0 +1,293 @@
+import asyncio
+import contextlib
+import heapq
+import math
+import time
+from collections import OrderedDict
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+from app.core.config import Settings
+from app.core.histogram import LogLinearHistogram
+from app.core.logging import get_logger
+from app.core.metrics import CALLBACK_QUEUE_DEPTH
+
+logger = get_logger(__name__)
+
+# 긴급도별 우선순위 (숫자가 작을수록 먼저 연결)
+PRIORITY_LEVELS = {"Critical": 1, "High": 2, "Normal": 3}
+PRIORITY_NAMES = {level: name for name, level in PRIORITY_LEVELS.items()}
+
+STATUS_PENDING = "pending"
+STATUS_DISPATCHED = "dispatched"
+
+
+def format_wait_time(seconds: float) -> str:
+    """예상 대기 시간(초)을 "15분 이내", "2시간 10분 이내" 형식으로 바꿉니다."""
+    minutes = max(1, math.ceil(seconds / 60))
+    if minutes < 60:
+        return f"{minutes}분 이내"
+    hours, minutes = divmod(minutes, 60)
+    return f"{hours}시간 이내" if minutes == 0 else f"{hours}시간 {minutes}분 이내"
+
+
+# 콜백 요청 한 건의 대기 / 연결 상태
+class CallbackRecord:
+    __slots__ = (
+        "callback_id",
+        "priority_level",
+        "inquiry_summary",
+        "level_seq",
+        "status",
+        "scheduled_at",
+        "enqueued_monotonic",
+        "estimated_wait_seconds",
+        "dispatched_at",
+        "agent",
+    )
+
+    def __init__(
+        self,
+        callback_id: str,
+        priority_level: int,
+        inquiry_summary: str,
+        level_seq: int,
+        estimated_wait_seconds: float,
+    ):
+        self.callback_id = callback_id
+        self.priority_level = priority_level
+        self.inquiry_summary = inquiry_summary
+        self.level_seq = level_seq
+        self.status = STATUS_PENDING
+        self.scheduled_at = datetime.now()
+        self.enqueued_monotonic = time.monotonic()
+        self.estimated_wait_seconds = estimated_wait_seconds
+        self.dispatched_at: Optional[datetime] = None
+        self.agent: Optional[int] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "callback_id": self.callback_id,
+            "priority_level": self.priority_level,
+            "callback_status": self.status,
+            "scheduled_at": self.scheduled_at.strftime("%Y-%m-%d %H:%M:%S"),
+            "estimated_wait_seconds": round(self.estimated_wait_seconds, 1),
+            "dispatched_at": (
+                self.dispatched_at.strftime("%Y-%m-%d %H:%M:%S")
+                if self.dispatched_at
+                else None
+            ),
+            "agent": self.agent,
+            "inquiry_summary": self.inquiry_summary,
+        }
+
+
+# schedule_priority_callback 도구의 콜백 대기열과 상담원 처리 용량 모델
+# 대기 콜백은 (우선순위, 접수 순서) 최소 힙에, 상담원은 다음 통화가 끝나는 시각의 최소 힙에 두어
+# 접수와 연결이 모두 O(log n)입니다. 디스패처는 가장 먼저 비는 상담원의 시각까지 잠들었다가
+# 그 시점의 최우선 콜백을 연결하고, 상담원은 평균 처리 시간 동안 통화 중으로 기록됩니다.
+class CallbackScheduler:
+
+    def __init__(self, settings: Settings):
+        self.agents = max(1, settings.callback_agents)
+        self.average_handle_seconds = settings.callback_average_handle_seconds
+        self.max_pending = settings.callback_max_pending
+        self.max_tracked = settings.callback_status_max_tracked
+        self._pending: List[Tuple[int, int, CallbackRecord]] = []
+        # (통화가 끝나는 monotonic 시각, 상담원 번호) — 처음에는 모두 대기 중입니다.
+        self._agent_free_at: List[Tuple[float, int]] = [
+            (0.0, agent) for agent in range(self.agents)
+        ]
+        self._seq = 0
+        # 우선순위별 누적 접수 / 연결 수 (같은 우선순위 안에서는 접수 순으로 연결되므로
+        # 두 값의 차이로 대기 순번을 O(1)에 계산합니다)
+        self._level_enqueued = {level: 0 for level in PRIORITY_NAMES}
+        self._level_dispatched = {level: 0 for level in PRIORITY_NAMES}
+        self._wakeup: Optional[asyncio.Event] = None
+        self._dispatcher: Optional[asyncio.Task] = None
+        # 최근 콜백 요청의 상태 (가장 오래된 기록부터 제거)
+        self._records: "OrderedDict[str, CallbackRecord]" = OrderedDict()
+        self._wait_seconds = LogLinearHistogram(max_value=7 * 24 * 3600)
+        self._estimate_error_seconds = LogLinearHistogram(max_value=7 * 24 * 3600)
+        self.counts = {"queued": 0, "dispatched": 0, "dropped": 0}
+
+    @property
+    def throughput_per_second(self) -> float:
+        return self.agents / self.average_handle_seconds
+
+    def submit(
+        self, callback_id: str, priority_level: int, inquiry_summary: str
+    ) -> Optional[CallbackRecord]:
+        """
+        콜백을 대기열에 넣고 예상 대기 시간이 계산된 기록을 반환합니다.
+        대기 중인 콜백이 max_pending개를 넘으면 None을 반환합니다.
+        """
+        if len(self._pending) >= self.max_pending:
+            self.counts["dropped"] += 1
+            logger.warning(
+                f"콜백 대기열이 가득 차 {callback_id}를 접수하지 못했습니다."
+            )
+            return None
+
+        level_seq = self._level_enqueued[priority_level]
+        position = self._ahead_of_level(priority_level) + self._pending_in_level(
+            priority_level
+        )
+        record = CallbackRecord(
+            callback_id,
+            priority_level,
+            inquiry_summary,
+            level_seq,
+            self.estimate_wait_seconds(position),
+        )
+        self._level_enqueued[priority_level] += 1
+        self._seq += 1
+        heapq.heappush(self._pending, (priority_level, self._seq, record))
+        self.counts["queued"] += 1
+        CALLBACK_QUEUE_DEPTH.inc(PRIORITY_NAMES[priority_level])
+        self._track(record)
+
+        if self._wakeup is None:
+            self._wakeup = asyncio.Event()
+        if self._dispatcher is None or self._dispatcher.done():
+            self._dispatcher = asyncio.get_running_loop().create_task(
+                self._run_dispatcher()
+            )
+        self._wakeup.set()
+        return record
+
+    def _pending_in_level(self, priority_level: int) -> int:
+        return (
+            self._level_enqueued[priority_level]
+            - self._level_dispatched[priority_level]
+        )
+
+    def _ahead_of_level(self, priority_level: int) -> int:
+        """priority_level보다 우선순위가 높은 대기 콜백 수"""
+        return sum(
+            self._pending_in_level(level)
+            for level in PRIORITY_NAMES
+            if level < priority_level
+        )
+
+    def queue_position(self, record: CallbackRecord) -> int:
+        """record보다 먼저 연결될 대기 콜백 수 (0이면 다음 차례)"""
+        level = record.priority_level
+        return self._ahead_of_level(level) + (
+            record.level_seq - self._level_dispatched[level]
+        )
+
+    def estimate_wait_seconds(self, position: int) -> float:
+        """
+        앞에 position건이 기다리고 있을 때의 예상 대기 시간(초)입니다.
+        상담원이 비는 시각을 정렬하면 i번째 콜백은 (i mod 상담원 수)번째로 비는 상담원이
+        (i // 상담원 수)번의 통화를 더 마친 뒤 연결되므로, 대기열 길이와 무관하게 계산됩니다.
+        """
+        now = time.monotonic()
+        free_in = sorted(max(0.0, free_at - now) for free_at, _ in self._agent_free_at)
+        rounds, index = divmod(position, self.agents)
+        return free_in[index] + rounds * self.average_handle_seconds
+
+    def _track(self, record: CallbackRecord):
+        self._records[record.callback_id] = record
+        while len(self._records) > self.max_tracked:
+            self._records.popitem(last=False)
+
+    def get_status(self, callback_id: str) -> Optional[Dict[str, Any]]:
+        """
+        콜백 상태를 반환합니다. 대기 중이면 현재 순번과 남은 예상 대기 시간을 함께 반환합니다.
+        이 워커가 접수한 콜백만 조회할 수 있습니다 (다른 워커의 ID는 None).
+        """
+        record = self._records.get(callback_id)
+        if record is None:
+            return None
+        status = record.to_dict()
+        if record.status == STATUS_PENDING:
+            position = self.queue_position(record)
+            status["queue_position"] = position
+            status["remaining_wait_seconds"] = round(
+                self.estimate_wait_seconds(position), 1
+            )
+        return status
+
+    async def _run_dispatcher(self):
+        while True:
+            if not self._pending:
+                self._wakeup.clear()
+                await self._wakeup.wait()
+                continue
+            # 새 콜백이 들어와도 다음 상담원이 비는 시각은 바뀌지 않으므로 그때까지 잠듭니다.
+            free_at, agent = self._agent_free_at[0]
+            delay = free_at - time.monotonic()
+            if delay > 0:
+                await asyncio.sleep(delay)
+                continue
+            self._dispatch(free_at, agent)
+
+    def _dispatch(self, free_at: float, agent: int):
+        _, _, record = heapq.heappop(self._pending)
+        now = time.monotonic()
+        # 다음 종료 시각은 타이머가 깨어난 시각이 아니라 모델상 통화 시작 시각에서 이어 계산해
+        # 잠들기 지연이 누적되어 예상 대기 시간과 어긋나지 않게 합니다.
+        started = max(free_at, record.enqueued_monotonic)
+        heapq.heapreplace(
+            self._agent_free_at, (started + self.average_handle_seconds, agent)
+        )
+        level = record.priority_level
+        self._level_dispatched[level] += 1
+        record.status = STATUS_DISPATCHED
+        record.dispatched_at = datetime.now()
+        record.agent = agent
+        waited = now - record.enqueued_monotonic
+        self._wait_seconds.record(waited)
+        self._estimate_error_seconds.record(abs(waited - record.estimated_wait_seconds))
+        self.counts["dispatched"] += 1
+        CALLBACK_QUEUE_DEPTH.dec(PRIORITY_NAMES[level])
+        logger.debug(
+            f"콜백 연결: {record.callback_id} (우선순위 {level}, 상담원 {agent}, "
+            f"대기 {waited:.1f}초)"
+        )
+
+    async def aclose(self):
+        """디스패처를 멈춥니다. 대기 중인 콜백은 워커와 함께 사라집니다."""
+        if self._dispatcher is not None:
+            self._dispatcher.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._dispatcher
+            self._dispatcher = None
+        if self._pending:
+            logger.warning(
+                f"연결되지 않은 콜백 {len(self._pending)}건을 남기고 종료합니다."
+            )
+
+    def stats(self) -> Dict[str, Any]:
+        now = time.monotonic()
+        next_free = self._agent_free_at[0][0] - now
+        return {
+            "agents": self.agents,
+            "busy_agents": sum(
+                1 for free_at, _ in self._agent_free_at if free_at > now
+            ),
+            "average_handle_seconds": self.average_handle_seconds,
+            "throughput_per_minute": round(self.throughput_per_second * 60, 2),
+            "pending": len(self._pending),
+            "pending_by_urgency": {
+                name: self._pending_in_level(level)
+                for level, name in PRIORITY_NAMES.items()
+            },
+            "next_dispatch_in_seconds": (
+                round(max(0.0, next_free), 1) if self._pending else None
+            ),
+            "estimated_wait_seconds": {
+                name: round(
+                    self.estimate_wait_seconds(
+                        self._ahead_of_level(level) + self._pending_in_level(level)
+                    ),
+                    1,
+                )
+                for level, name in PRIORITY_NAMES.items()
+            },
+            "tracked": len(self._records),
+            **self.counts,
+            "wait_seconds": self._wait_seconds.summary(),
+            "estimate_error_seconds": self._estimate_error_seconds.summary(),
+        }
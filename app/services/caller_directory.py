@@ -0,0 +1,305 @@
+import argparse
+import contextlib
+import csv
+import json
+import mmap
+import os
+import re
+import sqlite3
+import struct
+import tempfile
+from array import array
+from bisect import bisect_left
+from typing import Any, Dict, Iterator, Optional, Tuple
+from app.core.logging import get_logger
+
+logger = get_logger(__name__)
+
+# (dynamic_variables, metadata)
+CallerRecord = Tuple[Dict[str, Any], Dict[str, Any]]
+
+# 인덱스 파일 형식 (배열은 플랫폼 기본 바이트 순서)
+#   헤더: magic(8) + 레코드 수(8)
+#   번호: int64 x N (오름차순 정렬된 E.164 번호)
+#   오프셋: uint64 x (N + 1) (페이로드 영역 내 각 레코드의 시작 위치)
+#   페이로드: 레코드별 JSON {"dynamic_variables": ..., "metadata": ...}
+INDEX_MAGIC = b"VOXDIR01"
+HEADER = struct.Struct("<8sQ")
+
+DEFAULT_COUNTRY_CODE = "82"
+_NON_DIGITS = re.compile(r"\D")
+
+# 디렉터리가 설정되지 않았을 때 사용하는 예시 고객 데이터
+SAMPLE_CALLERS: Dict[str, CallerRecord] = {
+    "821012345678": (
+        {"user_name": "김철수", "product_name": "아이폰 16 프로"},
+        {"user_id": "user_kim_chul_su_123"},
+    ),
+    "821087654321": (
+        {"user_name": "손예진", "last_order_date": "2024-07-01"},
+        {"user_id": "user_son_ye_jin_456"},
+    ),
+}
+
+
+def normalize_phone_digits(
+    raw: Optional[str], country_code: str = DEFAULT_COUNTRY_CODE
+) -> Optional[str]:
+    """
+    전화번호(또는 번호 대역 접두사)를 국가 코드를 포함한 숫자 문자열로 정규화합니다.
+    예: "+82 10-1234", "+82 010-1234", "010-1234", "8210-1234" -> "82101234"
+    """
+    if not raw:
+        return None
+    # 이미 숫자만으로 된 번호(Vox.ai 기본 형식)는 문자열 정리를 생략합니다.
+    digits = raw if raw.isdigit() else _NON_DIGITS.sub("", raw)
+    if not digits:
+        return None
+    if raw.lstrip().startswith("+") or digits.startswith("00"):
+        if not raw.lstrip().startswith("+"):
+            digits = digits[2:]
+        # 국가 코드 뒤에 국내 식별 번호 0을 함께 적은 경우(+82 010-...)는 0을 제거합니다.
+        if digits.startswith(country_code + "0"):
+            digits = country_code + digits[len(country_code) + 1 :]
+    elif digits.startswith("0"):
+        # 국내 번호 형식(010-...)은 기본 국가 코드를 붙입니다.
+        digits = country_code + digits[1:]
+    return digits
+
+
+def normalize_phone_number(
+    raw: Optional[str], country_code: str = DEFAULT_COUNTRY_CODE
+) -> Optional[int]:
+    """
+    전화번호를 E.164 숫자(국가 코드 포함, '+' 제외) 정수로 정규화합니다.
+    예: "+82 10-1234-5678", "010-1234-5678", "821012345678" -> 821012345678
+    """
+    digits = normalize_phone_digits(raw, country_code)
+    if digits is None or not 8 <= len(digits) <= 15:
+        return None
+    return int(digits)
+
+
+def _parse_json_field(value: Any) -> Dict[str, Any]:
+    if not value:
+        return {}
+    if isinstance(value, dict):
+        return value
+    return json.loads(value)
+
+
+def iter_source_records(path: str) -> Iterator[Tuple[str, CallerRecord]]:
+    """
+    CSV, NDJSON, SQLite 형식의 고객 디렉터리에서 (전화번호, 레코드)를 순서대로 읽습니다.
+    - CSV: phone_number 열 + dynamic_variables/metadata JSON 열 (그 밖의 열은 동적 변수로 사용)
+    - NDJSON: 줄마다 {"phone_number", "dynamic_variables", "metadata"}
+    - SQLite: callers 테이블의 phone_number, dynamic_variables, metadata(JSON 문자열) 열
+    """
+    ext = os.path.splitext(path)[1].lower()
+    if ext == ".csv":
+        with open(path, newline="", encoding="utf-8") as f:
+            for row in csv.DictReader(f):
+                number = row.pop("phone_number", None)
+                dynamic_variables = _parse_json_field(
+                    row.pop("dynamic_variables", None)
+                )
+                metadata = _parse_json_field(row.pop("metadata", None))
+                dynamic_variables.update({k: v for k, v in row.items() if v})
+                yield number, (dynamic_variables, metadata)
+    elif ext in (".ndjson", ".jsonl"):
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                item = json.loads(line)
+                yield item.get("phone_number"), (
+                    item.get("dynamic_variables") or {},
+                    item.get("metadata") or {},
+                )
+    elif ext in (".db", ".sqlite", ".sqlite3"):
+        conn = sqlite3.connect(f"file:{path}?mode=ro", uri=True)
+        try:
+            rows = conn.execute(
+                "SELECT phone_number, dynamic_variables, metadata FROM callers"
+            )
+            for number, dynamic_variables, metadata in rows:
+                yield number, (
+                    _parse_json_field(dynamic_variables),
+                    _parse_json_field(metadata),
+                )
+        finally:
+            conn.close()
+    else:
+        raise ValueError(f"지원되지 않는 고객 디렉터리 형식입니다: {path}")
+
+
+def build_directory_index(source_path: str, index_path: str) -> int:
+    """
+    고객 디렉터리 원본을 읽어 정렬된 번호 배열과 페이로드로 이루어진 인덱스 파일을 만듭니다.
+    같은 번호가 여러 번 나오면 마지막 레코드를 사용합니다. 생성된 레코드 수를 반환합니다.
+    레코드는 읽는 대로 임시 파일에 직렬화하고, 메모리에는 번호와 위치 배열만 둡니다.
+    """
+    directory = os.path.dirname(os.path.abspath(index_path))
+    numbers = array("q")
+    starts = array("Q")
+    skipped = 0
+    # 여러 프로세스가 동시에 생성해도 서로의 파일을 덮어쓰지 않도록 고유한 임시 파일을 씁니다.
+    fd, tmp_path = tempfile.mkstemp(
+        dir=directory, prefix=f"{os.path.basename(index_path)}.", suffix=".tmp"
+    )
+    try:
+        with tempfile.TemporaryFile(dir=directory) as scratch, os.fdopen(fd, "wb") as f:
+            position = 0
+            for raw_number, (dynamic_variables, metadata) in iter_source_records(
+                source_path
+            ):
+                number = normalize_phone_number(raw_number)
+                if number is None:
+                    skipped += 1
+                    continue
+                blob = json.dumps(
+                    {"dynamic_variables": dynamic_variables, "metadata": metadata},
+                    ensure_ascii=False,
+                    separators=(",", ":"),
+                ).encode("utf-8")
+                scratch.write(blob)
+                numbers.append(number)
+                starts.append(position)
+                position += len(blob)
+            starts.append(position)
+            scratch.flush()
+
+            # 번호순으로 정렬하되 같은 번호는 원본 순서를 유지해 마지막 레코드만 남깁니다.
+            order = sorted(range(len(numbers)), key=numbers.__getitem__)
+            unique = array(
+                "Q",
+                (
+                    j
+                    for k, j in enumerate(order)
+                    if k + 1 == len(order) or numbers[order[k + 1]] != numbers[j]
+                ),
+            )
+            del order
+
+            f.write(HEADER.pack(INDEX_MAGIC, len(unique)))
+            f.write(array("q", (numbers[j] for j in unique)).tobytes())
+            offsets = array("Q", [0])
+            for j in unique:
+                offsets.append(offsets[-1] + starts[j + 1] - starts[j])
+            f.write(offsets.tobytes())
+            if position:
+                with mmap.mmap(
+                    scratch.fileno(), 0, access=mmap.ACCESS_READ
+                ) as payloads:
+                    for j in unique:
+                        f.write(payloads[starts[j] : starts[j + 1]])
+        # mkstemp는 소유자 전용(0600) 권한으로 만들므로 일반 파일 권한으로 맞춥니다.
+        os.chmod(tmp_path, 0o644)
+        # 완성된 파일만 보이도록 원자적으로 교체합니다.
+        os.replace(tmp_path, index_path)
+    except BaseException:
+        with contextlib.suppress(OSError):
+            os.unlink(tmp_path)
+        raise
+
+    logger.info(
+        f"고객 디렉터리 인덱스를 생성했습니다: {index_path} (레코드 {len(unique)}개, 제외 {skipped}개)"
+    )
+    return len(unique)
+
+
+def ensure_directory_index(
+    source_path: Optional[str], index_path: Optional[str]
+) -> Optional[str]:
+    """
+    인덱스 파일 경로를 반환합니다. 인덱스가 없거나 원본보다 오래된 경우에만 다시 생성합니다.
+    여러 워커를 띄우는 serve는 워커를 시작하기 전에 이 함수를 한 번 호출합니다.
+    """
+    if not source_path and not index_path:
+        return None
+    index_path = index_path or f"{source_path}.idx"
+    if source_path and (
+        not os.path.exists(index_path)
+        or os.path.getmtime(index_path) < os.path.getmtime(source_path)
+    ):
+        build_directory_index(source_path, index_path)
+    return index_path
+
+
+# 예시 데이터 등 소량의 고객 정보를 위한 메모리 디렉터리
+class InMemoryCallerDirectory:
+
+    def __init__(self, records: Dict[str, CallerRecord]):
+        self._records = {
+            normalize_phone_number(number): record for number, record in records.items()
+        }
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+    def lookup(self, raw_number: Optional[str]) -> Optional[CallerRecord]:
+        record = self._records.get(normalize_phone_number(raw_number))
+        if record is None:
+            return None
+        dynamic_variables, metadata = record
+        return dict(dynamic_variables), dict(metadata)
+
+
+# 미리 생성된 인덱스 파일을 메모리 매핑하여 조회하는 고객 디렉터리
+# 시작 시 원본을 다시 파싱하지 않으며, 조회는 정렬된 번호 배열에 대한 이진 탐색입니다.
+class MappedCallerDirectory:
+
+    def __init__(self, index_path: str):
+        self.index_path = index_path
+        self._file = open(index_path, "rb")
+        self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, count = HEADER.unpack_from(self._mmap, 0)
+        if magic != INDEX_MAGIC:
+            raise ValueError(f"고객 디렉터리 인덱스 파일이 아닙니다: {index_path}")
+
+        view = memoryview(self._mmap)
+        numbers_start = HEADER.size
+        offsets_start = numbers_start + 8 * count
+        self._payload_start = offsets_start + 8 * (count + 1)
+        self._numbers = view[numbers_start:offsets_start].cast("q")
+        self._offsets = view[offsets_start : self._payload_start].cast("Q")
+        self._count = count
+
+    def __len__(self) -> int:
+        return self._count
+
+    def lookup(self, raw_number: Optional[str]) -> Optional[CallerRecord]:
+        number = normalize_phone_number(raw_number)
+        if number is None:
+            return None
+        i = bisect_left(self._numbers, number)
+        if i == self._count or self._numbers[i] != number:
+            return None
+        start = self._payload_start + self._offsets[i]
+        end = self._payload_start + self._offsets[i + 1]
+        item = json.loads(self._mmap[start:end])
+        return item["dynamic_variables"], item["metadata"]
+
+
+def load_caller_directory(source_path: Optional[str], index_path: Optional[str]):
+    """
+    설정에 맞는 고객 디렉터리를 반환합니다.
+    인덱스 파일이 없거나 원본보다 오래된 경우에만 원본으로부터 인덱스를 다시 생성합니다
+    (serve로 실행하면 워커 시작 전에 이미 생성되어 있습니다).
+    """
+    index_path = ensure_directory_index(source_path, index_path)
+    if index_path is None:
+        return InMemoryCallerDirectory(SAMPLE_CALLERS)
+
+    directory = MappedCallerDirectory(index_path)
+    logger.info(f"고객 디렉터리를 로드했습니다: {index_path} ({len(directory)}명)")
+    return directory
+
+
+if __name__ == "__main__":
+    # 사용 예: python -m app.services.caller_directory customers.csv customers.idx
+    parser = argparse.ArgumentParser(description="고객 디렉터리 인덱스 생성")
+    parser.add_argument("source", help="CSV, NDJSON 또는 SQLite 원본 파일")
+    parser.add_argument("index", help="생성할 인덱스 파일 경로")
+    args = parser.parse_args()
+    build_directory_index(args.source, args.index)
@@ -0,0 +1,110 @@
+import httpx
+from fastapi import Request
+from app.core.config import Settings
+from app.core.logging import get_logger
+from app.core.metrics import MetricsExporter, registry
+from app.core.tracing import BatchSpanExporter
+from .agent_tool_service import AgentToolService
+from .call_analytics import CallAnalyticsAggregator
+from .call_session_index import CallSessionIndex
+from .call_webhook_service import CallWebhookService
+from .inbound_webhook_service import InboundWebhookService
+from .outbound_guard import DestinationGuardRegistry
+from .tool_usage_analytics import ToolUsageAnalytics
+
+logger = get_logger(__name__)
+
+# 워밍업 시 조회하는 번호와 예약 번호 (결과와 무관하게 정규화, 인덱스, 라우팅 경로를 한 번씩 거치게 합니다)
+WARMUP_PHONE_NUMBER = "+821000000000"
+WARMUP_RESERVATION_NO = "KFMNPQ"
+
+
+# 워커 프로세스마다 한 번 생성되는 서비스와 공유 리소스 묶음
+# create_app()의 lifespan에서 만들어 app.state.services에 보관하며, 엔드포인트는 get_services()로 접근합니다.
+class ServiceContainer:
+
+    def __init__(self, settings: Settings):
+        self.settings = settings
+        # 외부 웹훅 전송에 재사용하는 커넥션 풀 (요청마다 클라이언트를 만들지 않습니다)
+        self.http_client = httpx.AsyncClient(
+            timeout=10.0,
+            limits=httpx.Limits(
+                max_connections=settings.outbound_max_concurrency,
+                max_keepalive_connections=settings.outbound_initial_concurrency,
+            ),
+        )
+        self.outbound_guards = DestinationGuardRegistry(settings)
+        self.call_analytics = CallAnalyticsAggregator(
+            max_agents=settings.analytics_max_agents
+        )
+        self.call_session_index = CallSessionIndex(
+            ttl_seconds=settings.call_session_ttl_seconds,
+            max_sessions=settings.call_session_max_sessions,
+        )
+        self.tool_usage_analytics = ToolUsageAnalytics(
+            queue_size=settings.tool_usage_queue_size,
+            max_tools=settings.tool_usage_max_tools,
+        )
+        self.agent_tool_service = AgentToolService(
+            settings, call_session_index=self.call_session_index
+        )
+        self.call_webhook_service = CallWebhookService(
+            settings,
+            http_client=self.http_client,
+            outbound_guards=self.outbound_guards,
+            call_analytics=self.call_analytics,
+            call_session_index=self.call_session_index,
+            tool_usage_analytics=self.tool_usage_analytics,
+        )
+        self.inbound_webhook_service = InboundWebhookService(settings)
+        self.metrics_exporter = MetricsExporter(
+            registry, settings.metrics_multiprocess_dir
+        )
+        self.span_exporter = BatchSpanExporter(
+            service_name=settings.tracing_service_name,
+            file_path=settings.tracing_file_path,
+            otlp_endpoint=settings.tracing_otlp_endpoint,
+            max_queue_size=settings.tracing_max_queue_size,
+            max_batch_size=settings.tracing_max_batch_size,
+            flush_interval_seconds=settings.tracing_flush_interval_seconds,
+        )
+
+    async def warmup(self):
+        """
+        첫 요청이 초기화 비용을 떠안지 않도록 조회 경로를 미리 한 번 실행합니다.
+        (mmap 인덱스 페이지 적재, 라우팅 파일 확인, 정규식 및 조회 코드 경로 준비)
+        """
+        inbound = self.inbound_webhook_service
+        inbound.caller_directory.lookup(WARMUP_PHONE_NUMBER)
+        inbound.router.resolve(WARMUP_PHONE_NUMBER)
+        reservations = self.agent_tool_service.reservation_store
+        reservations.lookup(WARMUP_RESERVATION_NO)
+        logger.info(
+            f"워커 워밍업 완료: 고객 디렉터리 {len(inbound.caller_directory)}명, "
+            f"예약 {len(reservations)}건, "
+            f"콜 웹훅 핸들러 {len(self.call_webhook_service.handlers)}개"
+        )
+
+    async def aclose(self):
+        """
+        워커 종료 시 백그라운드 작업과 커넥션 풀을 정리합니다.
+        한 단계가 실패해도 나머지 단계는 계속 진행합니다.
+        """
+        steps = (
+            ("tool_usage_analytics", self.tool_usage_analytics.aclose),
+            ("email_delivery", self.agent_tool_service.email_delivery.aclose),
+            ("zendesk_tickets", self.agent_tool_service.zendesk_tickets.aclose),
+            ("callback_scheduler", self.agent_tool_service.callback_scheduler.aclose),
+            ("csat_store", self.agent_tool_service.csat_store.aclose),
+            ("http_client", self.http_client.aclose),
+        )
+        for name, close in steps:
+            try:
+                await close()
+            except Exception as e:
+                logger.error(f"{name} 종료 중 오류가 발생했습니다: {e}")
+
+
+def get_services(request: Request) -> ServiceContainer:
+    """요청이 속한 앱의 서비스 묶음을 반환합니다."""
+    return request.app.state.services
@@ -0,0 +1,354 @@
+import asyncio
+import os
+import tempfile
+import time
+import uuid
+from collections import OrderedDict
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+import orjson
+from app.core.config import Settings
+from app.core.logging import get_logger
+
+logger = get_logger(__name__)
+
+CHECKPOINT_VERSION = 1
+# 재생 시 한 번에 읽는 로그 크기
+READ_CHUNK_BYTES = 1 << 20
+UNKNOWN_AGENT = "unknown"
+
+
+# 점수 1~5의 건수 분포 (건수, 합계, 평균은 분포에서 바로 계산됩니다)
+class CsatAggregate:
+    __slots__ = ("distribution",)
+
+    def __init__(self, distribution: Optional[List[int]] = None):
+        self.distribution = distribution or [0, 0, 0, 0, 0]
+
+    def add(self, score: int):
+        self.distribution[score - 1] += 1
+
+    @property
+    def count(self) -> int:
+        return sum(self.distribution)
+
+    def to_dict(self) -> Dict[str, Any]:
+        count = self.count
+        total = sum(score * n for score, n in enumerate(self.distribution, start=1))
+        return {
+            "count": count,
+            "mean": round(total / count, 3) if count else None,
+            "distribution": {
+                str(score): n for score, n in enumerate(self.distribution, start=1)
+            },
+        }
+
+
+# 만족도 조사 점수 한 건
+class CsatRecord:
+    __slots__ = ("feedback_id", "score", "call_id", "agent_id", "timestamp")
+
+    def __init__(
+        self,
+        feedback_id: str,
+        score: int,
+        call_id: Optional[str],
+        agent_id: Optional[str],
+        timestamp: float,
+    ):
+        self.feedback_id = feedback_id
+        self.score = score
+        self.call_id = call_id
+        self.agent_id = agent_id
+        self.timestamp = timestamp
+
+    def to_log_line(self) -> bytes:
+        return (
+            orjson.dumps(
+                {
+                    "feedback_id": self.feedback_id,
+                    "ts": self.timestamp,
+                    "score": self.score,
+                    "call_id": self.call_id,
+                    "agent_id": self.agent_id,
+                }
+            )
+            + b"\n"
+        )
+
+
+# save_csat_survey 도구의 점수를 추가 전용 로그(NDJSON)에 기록하고
+# 전체 / 에이전트별 / 시간대별 점수 분포를 메모리에서 O(1)로 갱신하는 저장소
+# 집계는 항상 로그에서 유도되므로(자신이 쓴 줄도 로그를 다시 읽어 반영) 같은 로그를 쓰는
+# 여러 워커가 같은 값을 보게 되며, 일정 건수마다 집계와 로그 위치를 체크포인트로 저장해
+# 재시작 시에는 체크포인트 이후의 로그만 다시 읽습니다.
+# 점수 한 줄 쓰기(O_APPEND write)와 뒤따르는 로그 읽기는 이벤트 루프에서 동기적으로 수행되는
+# 작은 시스템 호출이며, 체크포인트 파일 쓰기만 기본 스레드 풀로 넘깁니다.
+class CsatStore:
+
+    def __init__(self, settings: Settings):
+        self.log_path = settings.csat_log_path
+        self.checkpoint_path = settings.csat_checkpoint_path or (
+            f"{self.log_path}.checkpoint" if self.log_path else None
+        )
+        self.checkpoint_interval = settings.csat_checkpoint_interval
+        self.hour_buckets = settings.csat_hour_buckets
+        self.max_agents = settings.csat_max_agents
+        self._overall = CsatAggregate()
+        self._agents: "OrderedDict[str, CsatAggregate]" = OrderedDict()
+        # 시작 시각(epoch hour) -> 분포, 최근 hour_buckets 시간만 보관합니다.
+        self._hours: Dict[int, CsatAggregate] = {}
+        self._latest_hour = 0
+        self._offset = 0
+        self._since_checkpoint = 0
+        self.replayed_on_start = 0
+        self.restored_from_checkpoint = False
+        self.malformed_lines = 0
+        self._write_fd: Optional[int] = None
+        self._read_fd: Optional[int] = None
+        self._checkpoint_write: Optional[asyncio.Future] = None
+        if self.log_path:
+            self._open_log()
+
+    def _open_log(self):
+        started = time.perf_counter()
+        self._write_fd = os.open(
+            self.log_path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644
+        )
+        self._read_fd = os.open(self.log_path, os.O_RDONLY)
+        self.restored_from_checkpoint = self._load_checkpoint()
+        self.replayed_on_start = self._catch_up()
+        logger.info(
+            f"만족도 조사 로그 로드: {self.log_path} "
+            f"(체크포인트 {'사용' if self.restored_from_checkpoint else '없음'}, "
+            f"재생 {self.replayed_on_start}건, "
+            f"{(time.perf_counter() - started) * 1000:.1f}ms)"
+        )
+
+    def save(
+        self, score: int, call_id: Optional[str] = None, agent_id: Optional[str] = None
+    ) -> CsatRecord:
+        """
+        점수 한 건을 로그에 추가하고 집계에 반영한 뒤 기록을 반환합니다.
+        로그 쓰기와 읽기는 호출한 스레드(이벤트 루프)에서 바로 수행됩니다.
+        """
+        now = time.time()
+        record = CsatRecord(
+            f"CSAT-{datetime.fromtimestamp(now):%Y%m%d%H%M%S}-{uuid.uuid4().hex[:8].upper()}",
+            score,
+            call_id,
+            agent_id,
+            now,
+        )
+        if self._write_fd is None:
+            self._apply(record.score, record.agent_id, record.timestamp)
+            return record
+        # O_APPEND로 한 줄을 한 번의 write로 쓰므로 여러 워커가 같은 로그에 써도 줄이 섞이지 않습니다.
+        os.write(self._write_fd, record.to_log_line())
+        self._catch_up()
+        return record
+
+    def _catch_up(self) -> int:
+        """마지막으로 읽은 위치 이후의 로그 줄을 집계에 반영하고 반영한 줄 수를 반환합니다."""
+        applied = 0
+        while True:
+            chunk = os.pread(self._read_fd, READ_CHUNK_BYTES, self._offset)
+            if not chunk:
+                break
+            end = chunk.rfind(b"\n")
+            if end < 0:
+                # 다른 워커가 아직 쓰고 있는 줄 (또는 줄바꿈 없는 마지막 줄)
+                if len(chunk) < READ_CHUNK_BYTES:
+                    break
+                raise ValueError(f"{self.log_path}: 줄 길이가 너무 깁니다.")
+            for line in chunk[:end].split(b"\n"):
+                applied += self._apply_line(line)
+            self._offset += end + 1
+        if applied:
+            self._since_checkpoint += applied
+            if self._since_checkpoint >= self.checkpoint_interval:
+                self._schedule_checkpoint()
+        return applied
+
+    def _apply_line(self, line: bytes) -> int:
+        try:
+            entry = orjson.loads(line)
+            score = int(entry["score"])
+            if not 1 <= score <= 5:
+                raise ValueError(score)
+            self._apply(score, entry.get("agent_id"), float(entry["ts"]))
+        except (orjson.JSONDecodeError, KeyError, TypeError, ValueError):
+            self.malformed_lines += 1
+            return 0
+        return 1
+
+    def _apply(self, score: int, agent_id: Optional[str], timestamp: float):
+        self._overall.add(score)
+
+        agent_id = str(agent_id) if agent_id else UNKNOWN_AGENT
+        agent = self._agents.get(agent_id)
+        if agent is None:
+            agent = self._agents[agent_id] = CsatAggregate()
+            if len(self._agents) > self.max_agents:
+                self._agents.popitem(last=False)
+        else:
+            self._agents.move_to_end(agent_id)
+        agent.add(score)
+
+        hour = int(timestamp // 3600)
+        bucket = self._hours.get(hour)
+        if bucket is None:
+            if hour <= self._latest_hour - self.hour_buckets:
+                return
+            bucket = self._hours[hour] = CsatAggregate()
+            if hour > self._latest_hour:
+                # 새 시간대가 시작될 때만 보관 기간이 지난 시간대를 정리합니다 (시간당 한 번).
+                self._latest_hour = hour
+                for old in [h for h in self._hours if h <= hour - self.hour_buckets]:
+                    del self._hours[old]
+        bucket.add(score)
+
+    def _load_checkpoint(self) -> bool:
+        if not self.checkpoint_path or not os.path.exists(self.checkpoint_path):
+            return False
+        try:
+            with open(self.checkpoint_path, "rb") as f:
+                checkpoint = orjson.loads(f.read())
+            if checkpoint.get("version") != CHECKPOINT_VERSION:
+                raise ValueError("지원하지 않는 체크포인트 버전")
+            offset = int(checkpoint["offset"])
+            # 로그가 잘리거나 교체되었다면 체크포인트 위치가 줄 경계가 아니게 됩니다.
+            if offset > os.fstat(self._read_fd).st_size or (
+                offset > 0 and os.pread(self._read_fd, 1, offset - 1) != b"\n"
+            ):
+                raise ValueError("로그와 체크포인트 위치가 맞지 않습니다")
+            overall = CsatAggregate(list(checkpoint["overall"]))
+            agents = OrderedDict(
+                (agent_id, CsatAggregate(list(distribution)))
+                for agent_id, distribution in checkpoint["agents"]
+            )
+            hours = {
+                int(hour): CsatAggregate(list(distribution))
+                for hour, distribution in checkpoint["hours"]
+            }
+            latest_hour = int(checkpoint["latest_hour"])
+        except (OSError, orjson.JSONDecodeError, KeyError, TypeError, ValueError) as e:
+            logger.warning(
+                f"만족도 조사 체크포인트를 사용하지 않고 로그 전체를 다시 읽습니다: {e}"
+            )
+            return False
+        self._overall = overall
+        self._agents = agents
+        self._hours = hours
+        self._latest_hour = latest_hour
+        self._offset = offset
+        return True
+
+    def _checkpoint_bytes(self) -> bytes:
+        return orjson.dumps(
+            {
+                "version": CHECKPOINT_VERSION,
+                "offset": self._offset,
+                "overall": self._overall.distribution,
+                # 에이전트는 LRU 순서를 유지하도록 목록으로 저장합니다.
+                "agents": [[a, agg.distribution] for a, agg in self._agents.items()],
+                "hours": [[h, agg.distribution] for h, agg in self._hours.items()],
+                "latest_hour": self._latest_hour,
+            }
+        )
+
+    def _write_checkpoint_file(self, data: bytes):
+        fd, tmp_path = tempfile.mkstemp(
+            dir=os.path.dirname(os.path.abspath(self.checkpoint_path)),
+            prefix=f"{os.path.basename(self.checkpoint_path)}.",
+            suffix=".tmp",
+        )
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp_path, self.checkpoint_path)
+        except OSError as e:
+            logger.error(f"만족도 조사 체크포인트 저장 실패: {e}")
+            try:
+                os.unlink(tmp_path)
+            except OSError:
+                pass
+
+    def _schedule_checkpoint(self):
+        """집계를 직렬화한 뒤 파일 쓰기는 스레드 풀에서 수행합니다 (이벤트 루프 밖이면 바로 씁니다)."""
+        if self._checkpoint_write is not None and not self._checkpoint_write.done():
+            # 이전 체크포인트를 쓰는 중이면 다음 반영 때 다시 시도합니다.
+            return
+        if not self.checkpoint_path:
+            self._since_checkpoint = 0
+            return
+        data = self._checkpoint_bytes()
+        self._since_checkpoint = 0
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            self._write_checkpoint_file(data)
+            return
+        self._checkpoint_write = loop.run_in_executor(
+            None, self._write_checkpoint_file, data
+        )
+
+    def write_checkpoint(self):
+        """현재 집계와 로그 위치를 체크포인트 파일에 원자적으로 저장합니다 (호출한 스레드에서 씁니다)."""
+        self._since_checkpoint = 0
+        if self.checkpoint_path:
+            self._write_checkpoint_file(self._checkpoint_bytes())
+
+    async def aclose(self):
+        """진행 중인 체크포인트 쓰기를 기다린 뒤 마지막 체크포인트를 남기고 로그 파일을 닫습니다."""
+        if self._checkpoint_write is not None:
+            await self._checkpoint_write
+            self._checkpoint_write = None
+        self.close()
+
+    def close(self):
+        """체크포인트를 남기고 로그 파일을 닫습니다."""
+        if self._write_fd is None:
+            return
+        self._catch_up()
+        self.write_checkpoint()
+        os.close(self._write_fd)
+        os.close(self._read_fd)
+        self._write_fd = self._read_fd = None
+
+    def stats(self, agent_id: Optional[str] = None, hours: int = 24) -> Dict[str, Any]:
+        if self._read_fd is not None:
+            # 다른 워커가 로그에 추가한 점수까지 반영합니다.
+            self._catch_up()
+        if agent_id is not None:
+            agent = self._agents.get(agent_id)
+            agents = {agent_id: agent.to_dict()} if agent else {}
+        else:
+            agents = {a: agg.to_dict() for a, agg in self._agents.items()}
+        current_hour = int(time.time() // 3600)
+        hourly = {}
+        recent = CsatAggregate()
+        for hour in range(
+            current_hour - min(hours, self.hour_buckets) + 1, current_hour + 1
+        ):
+            bucket = self._hours.get(hour)
+            if bucket is None:
+                continue
+            hourly[datetime.fromtimestamp(hour * 3600).strftime("%Y-%m-%d %H:00")] = (
+                bucket.to_dict()
+            )
+            for i, n in enumerate(bucket.distribution):
+                recent.distribution[i] += n
+        return {
+            "overall": self._overall.to_dict(),
+            f"last_{hours}h": recent.to_dict(),
+            "hourly": hourly,
+            "agents": agents,
+            "log": {
+                "path": self.log_path,
+                "bytes": self._offset,
+                "restored_from_checkpoint": self.restored_from_checkpoint,
+                "replayed_on_start": self.replayed_on_start,
+                "malformed_lines": self.malformed_lines,
+            },
+        }
@@ -0,0 +1,451 @@
+import asyncio
+import base64
+import contextlib
+import re
+import time
+import uuid
+from collections import OrderedDict
+from datetime import datetime
+from email.header import Header
+from email.utils import formatdate
+from string import Formatter
+from typing import Any, Dict, List, Optional, Tuple
+from app.core.config import Settings
+from app.core.histogram import LogLinearHistogram
+from app.core.logging import get_logger
+from app.core.metrics import EMAIL_DELIVERIES
+from .smtp_client import SmtpConnection, SmtpError, SmtpReplyError
+
+logger = get_logger(__name__)
+
+# 알림 타입별 제목과 안내 문구 (도구 응답과 이메일 본문에 함께 사용)
+EMAIL_TEMPLATES: Dict[str, Dict[str, str]] = {
+    "e-ticket": {
+        "subject": "전자항공권 재발송",
+        "description": "이티켓 정보가 재발송되었습니다.",
+        "content": "요청하신 전자항공권을 다시 발송해 드렸습니다.",
+    },
+    "extra-service": {
+        "subject": "부가서비스 재발송",
+        "description": "부가서비스 정보가 재발송되었습니다.",
+        "content": "요청하신 부가서비스를 다시 발송해 드렸습니다.",
+    },
+    "reservation": {
+        "subject": "예약 정보 재발송",
+        "description": "예약 정보가 재발송되었습니다.",
+        "content": "요청하신 예약 정보를 다시 발송해 드렸습니다.",
+    },
+    "boarding-pass": {
+        "subject": "탑승권 재발송",
+        "description": "탑승권 정보가 재발송되었습니다.",
+        "content": "요청하신 탑승권을 다시 발송해 드렸습니다.",
+    },
+}
+
+# 모든 알림 타입이 공유하는 본문 형식
+# {content}, {description}은 컴파일 시점에, {reservation_number}는 발송 시점에 채워집니다.
+EMAIL_BODY_LAYOUT = (
+    "안녕하세요, 고객님.\n"
+    "\n"
+    "{content}\n"
+    "{description}\n"
+    "\n"
+    "예약 번호: {reservation_number}\n"
+    "\n"
+    "메일이 보이지 않으면 스팸함도 확인해 주세요.\n"
+    "본 메일은 발신 전용입니다.\n"
+)
+
+# 헤더 주입을 막기 위해 ASCII 주소만 허용합니다 (SMTPUTF8 미사용).
+_EMAIL_ADDRESS = re.compile(
+    r"[A-Za-z0-9.!#$%&'*+/=?^_`{|}~-]+@[A-Za-z0-9-]+(\.[A-Za-z0-9-]+)+"
+)
+
+STATUS_QUEUED = "queued"
+STATUS_SENDING = "sending"
+STATUS_DEFERRED = "deferred"
+STATUS_SENT = "sent"
+STATUS_FAILED = "failed"
+
+
+def is_valid_email_address(address: str) -> bool:
+    return len(address) <= 254 and _EMAIL_ADDRESS.fullmatch(address) is not None
+
+
+# 알림 타입별로 한 번만 준비해 두는 이메일 템플릿
+# 제목 인코딩(RFC 2047)과 고정 MIME 헤더, 고정 문구는 미리 만들어 두고
+# 발송 시에는 예약 번호 등 메시지별 값만 이어 붙입니다.
+class CompiledEmailTemplate:
+
+    def __init__(self, notification_type: str, info: Dict[str, str], layout: str):
+        self.notification_type = notification_type
+        self.subject = info["subject"]
+        self._headers = (
+            f"Subject: {Header(self.subject, 'utf-8').encode()}\r\n"
+            "MIME-Version: 1.0\r\n"
+            "Content-Type: text/plain; charset=utf-8\r\n"
+            "Content-Transfer-Encoding: base64\r\n"
+            "\r\n"
+        ).encode("ascii")
+        # 본문을 (고정 문구, 메시지별 필드명) 조각으로 나누고 타입별 고정 필드는 미리 채웁니다.
+        self._parts: List[Tuple[str, Optional[str]]] = []
+        literal = ""
+        for text, field, _, _ in Formatter().parse(layout):
+            literal += text
+            if field is None:
+                continue
+            if field in info:
+                literal += info[field]
+            else:
+                self._parts.append((literal, field))
+                literal = ""
+        self._parts.append((literal, None))
+        self.fields = tuple(field for _, field in self._parts if field is not None)
+
+    def render_body(self, values: Dict[str, str]) -> str:
+        return "".join(
+            literal + (values[field] if field is not None else "")
+            for literal, field in self._parts
+        )
+
+    def render(self, envelope_headers: bytes, values: Dict[str, str]) -> bytes:
+        """메시지별 헤더(From/To/Date/Message-ID)와 값으로 전송할 메시지 바이트를 만듭니다."""
+        body = base64.encodebytes(self.render_body(values).encode("utf-8"))
+        # base64 줄은 '.'으로 시작하지 않으므로 DATA 전송 시 dot-stuffing이 필요 없습니다.
+        return envelope_headers + self._headers + body.replace(b"\n", b"\r\n")
+
+
+def compile_email_templates(
+    layout: str = EMAIL_BODY_LAYOUT,
+) -> Dict[str, CompiledEmailTemplate]:
+    return {
+        notification_type: CompiledEmailTemplate(notification_type, info, layout)
+        for notification_type, info in EMAIL_TEMPLATES.items()
+    }
+
+
+# 이메일 한 건의 발송 상태
+class EmailDeliveryRecord:
+    __slots__ = (
+        "email_id",
+        "notification_type",
+        "reservation_number",
+        "recipient",
+        "status",
+        "attempts",
+        "queued_at",
+        "sent_at",
+        "smtp_reply",
+        "last_error",
+        "enqueued_monotonic",
+    )
+
+    def __init__(
+        self,
+        email_id: str,
+        notification_type: str,
+        reservation_number: str,
+        recipient: str,
+    ):
+        self.email_id = email_id
+        self.notification_type = notification_type
+        self.reservation_number = reservation_number
+        self.recipient = recipient
+        self.status = STATUS_QUEUED
+        self.attempts = 0
+        self.queued_at = datetime.now()
+        self.sent_at: Optional[datetime] = None
+        self.smtp_reply: Optional[str] = None
+        self.last_error: Optional[str] = None
+        self.enqueued_monotonic = time.monotonic()
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "email_id": self.email_id,
+            "type": self.notification_type,
+            "reservation_number": self.reservation_number,
+            "recipient_email": self.recipient,
+            "delivery_status": self.status,
+            "attempts": self.attempts,
+            "queued_at": self.queued_at.strftime("%Y-%m-%d %H:%M:%S"),
+            "sent_at": (
+                self.sent_at.strftime("%Y-%m-%d %H:%M:%S") if self.sent_at else None
+            ),
+            "smtp_reply": self.smtp_reply,
+            "last_error": self.last_error,
+        }
+
+
+# send_email_notification 도구의 이메일을 발송하는 서비스
+# 도구 호출은 큐에 넣는 즉시 응답하고, 워커마다 하나씩 유지하는 SMTP 연결로 백그라운드에서 발송합니다.
+# SMTP 서버가 설정되지 않으면 실제 발송 없이 즉시 발송 완료(sent)로 기록합니다.
+class EmailDeliveryService:
+
+    def __init__(self, settings: Settings):
+        self.enabled = bool(settings.smtp_host)
+        self.host = settings.smtp_host
+        self.port = settings.smtp_port
+        self.sender = settings.smtp_sender
+        self.pool_size = settings.smtp_pool_size
+        self.max_messages_per_connection = settings.smtp_max_messages_per_connection
+        self.idle_timeout_seconds = settings.smtp_idle_timeout_seconds
+        self.max_attempts = settings.smtp_max_attempts
+        self.retry_backoff_seconds = settings.smtp_retry_backoff_seconds
+        self.queue_size = settings.email_queue_size
+        self.max_tracked = settings.email_status_max_tracked
+        self._connection_options = {
+            "timeout_seconds": settings.smtp_timeout_seconds,
+            "local_hostname": self.sender.rpartition("@")[2] or "localhost",
+            "username": settings.smtp_username,
+            "password": settings.smtp_password,
+            "starttls": settings.smtp_starttls,
+        }
+        self._from_header = f"From: <{self.sender}>\r\n".encode("ascii")
+        self._message_id_domain = self.sender.rpartition("@")[2] or "localhost"
+        self.templates = compile_email_templates()
+        self._queue: Optional[asyncio.Queue] = None
+        self._workers: List[asyncio.Task] = []
+        # 최근 발송 요청의 상태 (가장 오래된 기록부터 제거)
+        self._records: "OrderedDict[str, EmailDeliveryRecord]" = OrderedDict()
+        # 재시도 대기 중인 메일 (email_id -> (재투입 타이머, 기록))
+        self._deferred: Dict[str, Tuple[asyncio.TimerHandle, EmailDeliveryRecord]] = {}
+        self._closing = False
+        self._delivery_ms = LogLinearHistogram(max_value=3_600_000)
+        self.open_connections = 0
+        self.connections_opened = 0
+        self.counts = {
+            "queued": 0,
+            "sent": 0,
+            "failed": 0,
+            "dropped": 0,
+            "retries": 0,
+        }
+
+    def submit(
+        self, notification_type: str, reservation_number: str, recipient: str
+    ) -> Optional[EmailDeliveryRecord]:
+        """
+        발송할 이메일을 큐에 넣고 상태 기록을 반환합니다. 큐가 가득 차면 None을 반환합니다.
+        notification_type은 EMAIL_TEMPLATES에 있는 타입이어야 합니다.
+        """
+        email_id = f"EMAIL-{datetime.now():%Y%m%d%H%M%S}-{uuid.uuid4().hex[:8].upper()}"
+        record = EmailDeliveryRecord(
+            email_id, notification_type, reservation_number, recipient
+        )
+        if not self.enabled:
+            record.status = STATUS_SENT
+            record.sent_at = record.queued_at
+            self._track(record)
+            return record
+
+        if self._queue is None:
+            self._queue = asyncio.Queue(maxsize=self.queue_size)
+        self._workers = [task for task in self._workers if not task.done()]
+        if len(self._workers) < self.pool_size:
+            loop = asyncio.get_running_loop()
+            self._workers.extend(
+                loop.create_task(self._run_worker())
+                for _ in range(self.pool_size - len(self._workers))
+            )
+        try:
+            self._queue.put_nowait(record)
+        except asyncio.QueueFull:
+            self.counts["dropped"] += 1
+            EMAIL_DELIVERIES.inc(notification_type, "dropped")
+            logger.warning(
+                f"이메일 발송 큐가 가득 차 {email_id}를 접수하지 못했습니다."
+            )
+            return None
+        self.counts["queued"] += 1
+        self._track(record)
+        return record
+
+    def _track(self, record: EmailDeliveryRecord):
+        self._records[record.email_id] = record
+        while len(self._records) > self.max_tracked:
+            self._records.popitem(last=False)
+
+    def get_status(self, email_id: str) -> Optional[Dict[str, Any]]:
+        """이 워커가 접수한 요청의 상태만 조회할 수 있습니다 (다른 워커의 ID는 None)."""
+        record = self._records.get(email_id)
+        return record.to_dict() if record is not None else None
+
+    def _render(self, record: EmailDeliveryRecord) -> bytes:
+        envelope_headers = self._from_header + (
+            f"To: <{record.recipient}>\r\n"
+            f"Date: {formatdate(localtime=True)}\r\n"
+            f"Message-ID: <{record.email_id}@{self._message_id_domain}>\r\n"
+        ).encode("ascii")
+        return self.templates[record.notification_type].render(
+            envelope_headers, {"reservation_number": record.reservation_number}
+        )
+
+    async def _run_worker(self):
+        connection: Optional[SmtpConnection] = None
+        sent_on_connection = 0
+        try:
+            while True:
+                if connection is None:
+                    record = await self._queue.get()
+                else:
+                    # 한동안 보낼 메일이 없으면 서버가 끊기 전에 먼저 연결을 닫습니다.
+                    try:
+                        record = await asyncio.wait_for(
+                            self._queue.get(), self.idle_timeout_seconds
+                        )
+                    except asyncio.TimeoutError:
+                        await self._close_connection(connection)
+                        connection = None
+                        continue
+                try:
+                    connection, sent_on_connection = await self._deliver(
+                        record, connection, sent_on_connection
+                    )
+                except Exception as e:
+                    logger.error(
+                        f"이메일 발송 중 예상치 못한 오류: {record.email_id}: {e}"
+                    )
+                    self._finish(record, STATUS_FAILED, error=str(e))
+                finally:
+                    self._queue.task_done()
+        finally:
+            if connection is not None:
+                await self._close_connection(connection)
+
+    async def _deliver(
+        self,
+        record: EmailDeliveryRecord,
+        connection: Optional[SmtpConnection],
+        sent_on_connection: int,
+    ) -> Tuple[Optional[SmtpConnection], int]:
+        """
+        메일 한 건을 한 번 발송 시도하고 (다음 메일에 쓸 연결, 그 연결로 보낸 메일 수)를 반환합니다.
+        연결 오류와 4xx 응답은 재시도를 예약하고, 5xx 응답은 즉시 실패로 기록합니다.
+        """
+        record.attempts += 1
+        record.status = STATUS_SENDING
+        try:
+            if connection is None:
+                connection = SmtpConnection(
+                    self.host, self.port, **self._connection_options
+                )
+                self.open_connections += 1
+                self.connections_opened += 1
+                sent_on_connection = 0
+                await connection.connect()
+            reply = await connection.send(
+                self.sender, record.recipient, self._render(record)
+            )
+        except SmtpReplyError as e:
+            record.last_error = str(e)
+            if e.permanent:
+                self._finish(record, STATUS_FAILED, error=str(e))
+                return connection, sent_on_connection
+        except (SmtpError, OSError, asyncio.TimeoutError) as e:
+            record.last_error = str(e)
+            if connection is not None:
+                await self._close_connection(connection)
+                connection = None
+        else:
+            sent_on_connection += 1
+            self._finish(record, STATUS_SENT, reply=reply)
+            if sent_on_connection >= self.max_messages_per_connection:
+                await self._close_connection(connection)
+                connection = None
+            return connection, sent_on_connection
+
+        if record.attempts < self.max_attempts and not self._closing:
+            self._defer(record)
+        else:
+            self._finish(record, STATUS_FAILED, error=record.last_error)
+        return connection, sent_on_connection
+
+    def _defer(self, record: EmailDeliveryRecord):
+        """
+        재시도할 메일을 대기 시간 뒤에 다시 큐에 넣도록 예약합니다.
+        대기하는 동안 워커는 다른 메일을 계속 발송합니다.
+        """
+        record.status = STATUS_DEFERRED
+        self.counts["retries"] += 1
+        EMAIL_DELIVERIES.inc(record.notification_type, "retried")
+        logger.warning(
+            f"이메일 발송 재시도 예정 ({record.attempts}/{self.max_attempts}): "
+            f"{record.email_id}: {record.last_error}"
+        )
+        loop = asyncio.get_running_loop()
+        handle = loop.call_later(
+            self.retry_backoff_seconds * record.attempts, self._requeue, record
+        )
+        self._deferred[record.email_id] = (handle, record)
+
+    def _requeue(self, record: EmailDeliveryRecord):
+        self._deferred.pop(record.email_id, None)
+        try:
+            self._queue.put_nowait(record)
+        except asyncio.QueueFull:
+            self._finish(
+                record,
+                STATUS_FAILED,
+                error=f"재시도 시점에 발송 큐가 가득 찼습니다: {record.last_error}",
+            )
+
+    def _finish(
+        self,
+        record: EmailDeliveryRecord,
+        status: str,
+        reply: Optional[str] = None,
+        error: Optional[str] = None,
+    ):
+        record.status = status
+        if status == STATUS_SENT:
+            record.sent_at = datetime.now()
+            record.smtp_reply = reply
+            self._delivery_ms.record(
+                (time.monotonic() - record.enqueued_monotonic) * 1000.0
+            )
+        else:
+            record.last_error = error
+            logger.error(f"이메일 발송 실패: {record.email_id}: {error}")
+        self.counts[status] += 1
+        EMAIL_DELIVERIES.inc(record.notification_type, status)
+
+    async def _close_connection(self, connection: SmtpConnection):
+        self.open_connections -= 1
+        await connection.close()
+
+    async def aclose(self, drain_timeout_seconds: float = 5.0):
+        """
+        큐에 남은 메일을 drain_timeout_seconds 동안 발송한 뒤 워커와 SMTP 연결을 정리합니다.
+        재시도 대기 중인 메일은 대기 시간을 건너뛰고 마지막으로 한 번 더 발송합니다.
+        """
+        self._closing = True
+        for handle, record in list(self._deferred.values()):
+            handle.cancel()
+            self._requeue(record)
+        if self._queue is not None and self._workers:
+            try:
+                await asyncio.wait_for(self._queue.join(), drain_timeout_seconds)
+            except asyncio.TimeoutError:
+                logger.warning(
+                    f"이메일 발송 큐에 남은 {self._queue.qsize()}건을 보내지 못하고 종료합니다."
+                )
+        for task in self._workers:
+            task.cancel()
+        for task in self._workers:
+            with contextlib.suppress(asyncio.CancelledError):
+                await task
+        self._workers = []
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "enabled": self.enabled,
+            "smtp_server": f"{self.host}:{self.port}" if self.enabled else None,
+            "pool_size": self.pool_size,
+            "open_connections": self.open_connections,
+            "connections_opened": self.connections_opened,
+            "pending": self._queue.qsize() if self._queue else 0,
+            "deferred": len(self._deferred),
+            "tracked": len(self._records),
+            **self.counts,
+            "delivery_latency_ms": self._delivery_ms.summary(),
+        }
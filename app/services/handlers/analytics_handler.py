@@ -0,0 +1,27 @@
+from typing import Union, Literal
+from app.models.webhook_models import CallStartedPayload, CallEndedPayload
+from app.core.logging import get_logger
+from app.services.call_analytics import CallAnalyticsAggregator
+from .base_handler import BaseCallEventHandler
+
+logger = get_logger(__name__)
+
+
+# 통화 종료 이벤트를 실시간 통계 집계기에 반영하는 핸들러
+class AnalyticsHandler(BaseCallEventHandler):
+
+    def __init__(self, aggregator: CallAnalyticsAggregator):
+        self.aggregator = aggregator
+
+    async def handle(
+        self,
+        event_type: Literal["call_started", "call_ended"],
+        payload: Union[CallStartedPayload, CallEndedPayload],
+    ):
+        """
+        call_ended 이벤트의 통화 시간, 종료 사유, 감성, 크레딧을 집계합니다.
+        외부 I/O가 없으므로 다른 핸들러보다 먼저 실행해도 지연이 거의 없습니다.
+        """
+        if event_type != "call_ended" or not isinstance(payload, CallEndedPayload):
+            return
+        self.aggregator.record_call_ended(payload)
@@ -0,0 +1,43 @@
+from typing import Union, Literal
+from app.models.webhook_models import CallStartedPayload, CallEndedPayload
+from app.core.logging import get_logger
+from app.services.call_session_index import CallSessionIndex
+from .base_handler import BaseCallEventHandler
+
+logger = get_logger(__name__)
+
+
+def _ms_to_seconds(timestamp_ms):
+    return timestamp_ms / 1000.0 if timestamp_ms is not None else None
+
+
+# 통화 시작/종료 이벤트를 통화 세션 인덱스에 기록하는 핸들러
+class CallSessionHandler(BaseCallEventHandler):
+
+    def __init__(self, index: CallSessionIndex):
+        self.index = index
+
+    async def handle(
+        self,
+        event_type: Literal["call_started", "call_ended"],
+        payload: Union[CallStartedPayload, CallEndedPayload],
+    ):
+        """
+        call_started는 세션을 열고, call_ended는 세션을 닫아 도구 호출 내역과 함께
+        하나의 통합 레코드로 내보냅니다.
+        """
+        call = payload.call
+        call_id = str(call.call_id)
+        agent_id = str(call.agent_id) if call.agent_id else None
+
+        if event_type == "call_started":
+            self.index.record_call_started(
+                call_id, agent_id, _ms_to_seconds(call.start_timestamp)
+            )
+        elif event_type == "call_ended" and isinstance(payload, CallEndedPayload):
+            self.index.record_call_ended(
+                call_id,
+                agent_id,
+                started_at=_ms_to_seconds(call.start_timestamp),
+                ended_at=_ms_to_seconds(call.end_timestamp),
+            )
@@ -1,8 +1,13 @@
 from typing import Union, Literal
 import httpx
 from app.models.webhook_models import CallStartedPayload, CallEndedPayload
-from app.core.config import settings
+from app.core.config import Settings
 from app.core.logging import get_logger
+from app.core.tracing import trace_headers
+from app.services.outbound_guard import (
+    DestinationGuardRegistry,
+    DestinationUnavailableError,
+)
 from .base_handler import BaseCallEventHandler
 
 logger = get_logger(__name__)
@@ -11,6 +16,16 @@ logger = get_logger(__name__)
 # 커스텀 서버 URL로 데이터를 전송하는 핸들러
 class CustomUrlHandler(BaseCallEventHandler):
 
+    def __init__(
+        self,
+        settings: Settings,
+        http_client: httpx.AsyncClient,
+        outbound_guards: DestinationGuardRegistry,
+    ):
+        self.settings = settings
+        self.http_client = http_client
+        self.outbound_guards = outbound_guards
+
     async def handle(
         self,
         event_type: Literal["call_started", "call_ended"],
@@ -20,17 +35,22 @@ class CustomUrlHandler(BaseCallEventHandler):
         콜 데이터 웹훅 페이로드를 사용자가 지정한 커스텀 서버 URL로 전송합니다.
         설정된 CUSTOM_SERVER_WEBHOOK_URL이 없으면 아무것도 하지 않습니다.
         """
-        webhook_url = settings.custom_server_webhook_url
+        webhook_url = self.settings.custom_server_webhook_url
         if not webhook_url:
             logger.warning("커스텀 서버 웹훅 URL이 설정되지 않아 스킵합니다.")
             return
 
         logger.info(f"{event_type} 이벤트를 커스텀 서버 웹훅으로 전송합니다...")
 
+        guard = self.outbound_guards.get(httpx.URL(webhook_url).host)
+
         try:
-            async with httpx.AsyncClient() as client:
-                response = await client.post(
-                    webhook_url, json=payload.model_dump(mode="json"), timeout=10.0
+            async with guard.guard():
+                response = await self.http_client.post(
+                    webhook_url,
+                    json=payload.model_dump(mode="json"),
+                    headers=trace_headers(),
+                    timeout=10.0,
                 )
                 response.raise_for_status()
 
@@ -38,6 +58,8 @@ class CustomUrlHandler(BaseCallEventHandler):
                 f"{event_type} 이벤트를 커스텀 서버로 성공적으로 전송했습니다. 상태: {response.status_code}"
             )
 
+        except DestinationUnavailableError as e:
+            logger.warning(f"커스텀 서버로 {event_type} 전송을 건너뜁니다: {e}")
         except httpx.HTTPStatusError as e:
             logger.error(
                 f"커스텀 서버로 {event_type} 전송 중 HTTP 오류 발생: {e.response.status_code} - {e.response.text}"
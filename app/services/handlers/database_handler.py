@@ -1,6 +1,6 @@
 from typing import Union, Literal
 from app.models.webhook_models import CallStartedPayload, CallEndedPayload
-from app.core.config import settings
+from app.core.config import Settings
 from app.core.logging import get_logger
 from .base_handler import BaseCallEventHandler
 
@@ -10,6 +10,9 @@ logger = get_logger(__name__)
 # 데이터베이스에 통화 데이터를 저장하는 핸들러
 class DatabaseHandler(BaseCallEventHandler):
 
+    def __init__(self, settings: Settings):
+        self.settings = settings
+
     async def handle(
         self,
         event_type: Literal["call_started", "call_ended"],
@@ -19,7 +22,7 @@ class DatabaseHandler(BaseCallEventHandler):
         콜 데이터 웹훅 페이로드를 데이터베이스에 저장합니다.
         이 함수는 스켈레톤 구현이며, 실제 데이터베이스 로직으로 확장해야 합니다.
         """
-        if not settings.database_url:
+        if not self.settings.database_url:
             logger.warning("데이터베이스 URL이 설정되지 않아 DB 저장을 스킵합니다.")
             return
 
@@ -1,10 +1,15 @@
 from typing import Union, Literal
-from datetime import datetime, timezone
 import httpx
 from app.models.webhook_models import CallStartedPayload, CallEndedPayload
-from app.core.config import settings
+from app.core.config import Settings
 from app.core.logging import get_logger
+from app.core.tracing import trace_headers
+from app.services.outbound_guard import (
+    DestinationGuardRegistry,
+    DestinationUnavailableError,
+)
 from .base_handler import BaseCallEventHandler
+from .make_com_rules import MakeComRuleTable
 
 logger = get_logger(__name__)
 
@@ -12,6 +17,20 @@ logger = get_logger(__name__)
 # Make.com 웹훅으로 데이터를 전송하는 핸들러
 class MakeComHandler(BaseCallEventHandler):
 
+    def __init__(
+        self,
+        settings: Settings,
+        http_client: httpx.AsyncClient,
+        outbound_guards: DestinationGuardRegistry,
+    ):
+        self.settings = settings
+        self.http_client = http_client
+        self.outbound_guards = outbound_guards
+        self.rule_table = MakeComRuleTable(
+            rules_path=settings.make_com_rules_path,
+            reload_interval_seconds=settings.make_com_rules_reload_interval_seconds,
+        )
+
     async def handle(
         self,
         event_type: Literal["call_started", "call_ended"],
@@ -21,79 +40,34 @@ class MakeComHandler(BaseCallEventHandler):
         콜 데이터 웹훅 페이로드를 Make.com 웹훅 URL로 전송합니다.
         설정된 MAKE_COM_WEBHOOK_URL이 없으면 아무것도 하지 않습니다.
         """
-        webhook_url = settings.make_com_webhook_url
+        webhook_url = self.settings.make_com_webhook_url
         if not webhook_url:
             logger.warning("Make.com 웹훅 URL이 설정되지 않아 스킵합니다.")
             return
 
-        # --- Make.com 전용 페이로드 생성 로직 (시작) ---
-        # 기존 payload 데이터를 사용해서 Make.com에 최적화된 새로운 payload를 생성합니다.
-        # 이 로직을 주석 처리하거나 필요에 맞게 수정하여 사용하세요.
-
-        # 기본 Make.com 페이로드 구조
-        send_payload = {
-            "event_type": event_type,
-            "timestamp": datetime.now(timezone.utc).isoformat(),
-        }
-
-        if event_type == "call_started" and isinstance(payload, CallStartedPayload):
-            # send_payload.update(
-            #     {
-            #         "call_id": str(payload.call.call_id),
-            #         "agent_id": (
-            #             str(payload.call.agent_id) if payload.call.agent_id else None
-            #         ),
-            #         "call_from": payload.call.call_from,
-            #         "call_to": payload.call.call_to,
-            #         "dynamic_variables": payload.call.dynamic_variables,
-            #     }
-            # )
+        # --- Make.com 전용 페이로드 생성 로직 ---
+        # agent_id별 변환 규칙(make_com_rules.json)에 따라 Make.com에 최적화된 payload를 생성합니다.
+        # 새 고객사의 페이로드 구조는 코드 수정 없이 규칙 파일에 추가하면 됩니다.
+        self.rule_table.reload_if_changed()
+        agent_id = payload.call.agent_id
+        project = self.rule_table.lookup(
+            str(agent_id) if agent_id else None, event_type
+        )
+        if project is None:
             return
-
-        elif event_type == "call_ended" and isinstance(payload, CallEndedPayload):
-            agent_id = payload.call.agent_id
-
-            # 기본 call_ended 페이로드
-            send_payload.update(
-                {
-                    "call_id": str(payload.call.call_id),
-                    "agent_id": str(agent_id) if agent_id else None,
-                    "disconnection_reason": payload.call.disconnection_reason,
-                    "duration_ms": payload.call.duration_ms,
-                    "call_from": payload.call.call_from,
-                    "call_to": payload.call.call_to,
-                }
-            )
-
-            # 특정 agent_id에 대한 커스텀 페이로드 구조
-            if agent_id and str(agent_id) == "e15cf4cb-08ca-4832-b528-9a2cd45decb6":
-                logger.info(
-                    f"Creating custom Make.com payload for agent_id: {agent_id}"
-                )
-
-                # 완전히 새로운 Make.com 전용 페이로드 구조
-                send_payload = {
-                    "event_type": "custom_call_ended",
-                    "call_id": str(payload.call.call_id),
-                    "disconnection_reason": payload.call.disconnection_reason,
-                    "customer_name": (
-                        payload.call.dynamic_variables.get("customer_name")
-                        if payload.call.dynamic_variables
-                        else None
-                    ),
-                    "processed_at": datetime.now(timezone.utc).isoformat(),
-                    "agent_id": str(agent_id),
-                }
-        # --- Make.com 전용 페이로드 생성 로직 (끝) ---
+        send_payload = project(event_type, payload.call)
 
         logger.info(f"{event_type} 이벤트를 Make.com 웹훅으로 전송합니다...")
 
+        guard = self.outbound_guards.get(httpx.URL(webhook_url).host)
+
         try:
             # Pydantic 모델을 dict로 변환하여 전송
-            async with httpx.AsyncClient() as client:
-                response = await client.post(
+            async with guard.guard():
+                response = await self.http_client.post(
                     webhook_url,
                     json=send_payload,
+                    headers=trace_headers(),
                     timeout=10.0,  # 타임아웃 설정 (초)
                 )
                 response.raise_for_status()  # 4xx/5xx 상태 코드에 대해 예외 발생
@@ -102,6 +76,8 @@ class MakeComHandler(BaseCallEventHandler):
                 f"{event_type} 이벤트를 Make.com으로 성공적으로 전송했습니다. 상태: {response.status_code}"
             )
 
+        except DestinationUnavailableError as e:
+            logger.warning(f"Make.com으로 {event_type} 전송을 건너뜁니다: {e}")
         except httpx.HTTPStatusError as e:
             logger.error(
                 f"Make.com으로 {event_type} 전송 중 HTTP 오류 발생: {e.response.status_code} - {e.response.text}"
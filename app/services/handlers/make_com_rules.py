@@ -0,0 +1,227 @@
+import json
+import os
+import time
+import uuid
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, Optional, Tuple, Type, get_args
+from pydantic import BaseModel
+from app.core.logging import get_logger
+from app.models.webhook_models import CallEndedDetails, CallStartedDetails
+
+logger = get_logger(__name__)
+
+# (event_type, call, now_iso) -> 출력 필드 값
+FieldGetter = Callable[[str, Any, str], Any]
+# (event_type, call) -> Make.com 전송 페이로드
+Projection = Callable[[str, Any], Dict[str, Any]]
+
+# 규칙 파일이 없을 때 사용하는 기본 규칙 (기존 MakeComHandler의 기본 동작과 동일)
+# 이벤트에 대한 규칙이 null이면 해당 이벤트는 Make.com으로 전송하지 않습니다.
+DEFAULT_RULES: Dict[str, Any] = {
+    "default": {
+        "call_started": None,
+        "call_ended": {
+            "event_type": "$event",
+            "timestamp": "$now",
+            "call_id": "call.call_id",
+            "agent_id": "call.agent_id",
+            "disconnection_reason": "call.disconnection_reason",
+            "duration_ms": "call.duration_ms",
+            "call_from": "call.call_from",
+            "call_to": "call.call_to",
+        },
+    },
+    "agents": {},
+}
+
+
+# 이벤트별 통화 정보 모델 ("call.<필드>" 경로 검증에 사용, 그 밖의 이벤트는 통화 종료 모델 기준)
+CALL_MODELS: Dict[str, Type[BaseModel]] = {
+    "call_started": CallStartedDetails,
+    "call_ended": CallEndedDetails,
+}
+
+
+def _to_json_value(value: Any) -> Any:
+    if isinstance(value, uuid.UUID):
+        return str(value)
+    if isinstance(value, BaseModel):
+        return value.model_dump(mode="json")
+    if isinstance(value, list):
+        return [_to_json_value(item) for item in value]
+    return value
+
+
+def _nested_model(annotation: Any) -> Optional[Type[BaseModel]]:
+    """필드 타입(Optional 포함)이 pydantic 모델이면 그 모델을 반환합니다."""
+    if isinstance(annotation, type) and issubclass(annotation, BaseModel):
+        return annotation
+    for arg in get_args(annotation):
+        model = _nested_model(arg)
+        if model is not None:
+            return model
+    return None
+
+
+def _validate_call_path(path: Tuple[str, ...], model: Type[BaseModel]):
+    """ "call." 뒤의 점 경로가 통화 정보 모델에 실제로 있는 필드인지 확인합니다."""
+    current: Optional[Type[BaseModel]] = model
+    for depth, key in enumerate(path):
+        if current is None:
+            raise ValueError(
+                f"'{'.'.join(path[:depth])}'는 하위 필드가 없는 값입니다: call.{'.'.join(path)}"
+            )
+        field = current.model_fields.get(key)
+        if field is None:
+            raise ValueError(
+                f"{current.__name__}에 '{key}' 필드가 없습니다: call.{'.'.join(path)}"
+            )
+        current = _nested_model(field.annotation)
+
+
+def _compile_field(spec: Any, call_model: Type[BaseModel]) -> FieldGetter:
+    """
+    출력 필드 하나의 소스 정의를 값 추출 함수로 변환합니다.
+    - "$event" / "$now": 이벤트 유형 / 처리 시각(UTC ISO 8601)
+    - "call.<필드>[.<하위 필드>...]": 통화 정보 필드 (컴파일 시 모델에 있는 필드인지 확인)
+    - "dynamic_variables.<키>" / "metadata.<키>": 동적 변수 / 메타데이터 값
+    - {"const": 값}: 고정 값
+    """
+    if isinstance(spec, dict) and set(spec) == {"const"}:
+        constant = spec["const"]
+        return lambda event_type, call, now: constant
+    if spec == "$event":
+        return lambda event_type, call, now: event_type
+    if spec == "$now":
+        return lambda event_type, call, now: now
+    if isinstance(spec, str) and "." in spec:
+        source, key = spec.split(".", 1)
+        if source == "call":
+            path = tuple(key.split("."))
+            _validate_call_path(path, call_model)
+
+            def get_call_value(event_type, call, now):
+                value = call
+                for attr in path:
+                    value = getattr(value, attr, None)
+                    if value is None:
+                        return None
+                return _to_json_value(value)
+
+            return get_call_value
+        if source in ("dynamic_variables", "metadata"):
+
+            def get_mapping_value(event_type, call, now):
+                mapping = getattr(call, source)
+                return mapping.get(key) if mapping else None
+
+            return get_mapping_value
+    raise ValueError(f"지원되지 않는 필드 정의입니다: {spec!r}")
+
+
+def compile_rule(
+    fields: Optional[Dict[str, Any]], event_type: str = "call_ended"
+) -> Optional[Projection]:
+    """필드 매핑 규칙을 한 번 컴파일하여 페이로드 생성 함수를 반환합니다."""
+    if fields is None:
+        return None
+    if not isinstance(fields, dict):
+        raise ValueError(f"{event_type} 규칙은 객체 또는 null이어야 합니다: {fields!r}")
+    call_model = CALL_MODELS.get(event_type, CallEndedDetails)
+    getters: Tuple[Tuple[str, FieldGetter], ...] = tuple(
+        (name, _compile_field(spec, call_model)) for name, spec in fields.items()
+    )
+
+    def project(event_type: str, call: Any) -> Dict[str, Any]:
+        now = datetime.now(timezone.utc).isoformat()
+        return {name: getter(event_type, call, now) for name, getter in getters}
+
+    return project
+
+
+# agent_id별 Make.com 페이로드 변환 규칙 테이블
+# 규칙은 시작 시 한 번 컴파일되며, 파일이 변경되면 재시작 없이 다시 로드됩니다.
+class MakeComRuleTable:
+
+    def __init__(self, rules_path: Optional[str], reload_interval_seconds: float):
+        self.rules_path = rules_path
+        self.reload_interval_seconds = reload_interval_seconds
+        self._loaded_mtime: Optional[float] = None
+        self._last_checked = 0.0
+        self._default: Dict[str, Optional[Projection]] = {}
+        self._agents: Dict[str, Dict[str, Optional[Projection]]] = {}
+        self.reload()
+
+    def reload(self):
+        """
+        규칙 파일을 읽어 컴파일한 뒤 테이블을 통째로 교체합니다.
+        파일이 잘못된 경우 기존 테이블을 그대로 유지합니다.
+        """
+        rules = DEFAULT_RULES
+        mtime = None
+        if self.rules_path and os.path.exists(self.rules_path):
+            try:
+                mtime = os.path.getmtime(self.rules_path)
+                with open(self.rules_path, encoding="utf-8") as f:
+                    rules = json.load(f)
+            except (OSError, ValueError) as e:
+                logger.error(f"Make.com 규칙 파일을 읽지 못했습니다: {e}")
+                return
+
+        try:
+            if not isinstance(rules, dict):
+                raise ValueError("규칙 파일은 객체여야 합니다.")
+            file_default = rules.get("default", {})
+            file_agents = rules.get("agents", {})
+            if not isinstance(file_default, dict) or not isinstance(file_agents, dict):
+                raise ValueError("default와 agents는 객체여야 합니다.")
+            for agent_id, agent_rules in file_agents.items():
+                if not isinstance(agent_rules, dict):
+                    raise ValueError(f"에이전트 {agent_id}의 규칙은 객체여야 합니다.")
+            default_rules = {**DEFAULT_RULES["default"], **file_default}
+            default = {
+                event: compile_rule(fields, event)
+                for event, fields in default_rules.items()
+            }
+            agents = {
+                agent_id: {
+                    event: compile_rule(fields, event)
+                    for event, fields in agent_rules.items()
+                }
+                for agent_id, agent_rules in file_agents.items()
+            }
+        except (ValueError, AttributeError, TypeError) as e:
+            logger.error(f"Make.com 규칙 컴파일 실패, 기존 규칙을 유지합니다: {e}")
+            return
+
+        # 단일 참조 교체로 처리 중인 요청에 영향을 주지 않습니다.
+        self._default, self._agents = default, agents
+        self._loaded_mtime = mtime
+        logger.info(
+            f"Make.com 변환 규칙을 로드했습니다: 에이전트별 규칙 {len(agents)}개"
+        )
+
+    def reload_if_changed(self):
+        """reload_interval_seconds마다 규칙 파일의 수정 시각을 확인합니다."""
+        now = time.monotonic()
+        if now - self._last_checked < self.reload_interval_seconds:
+            return
+        self._last_checked = now
+        if not self.rules_path:
+            return
+        try:
+            mtime = os.path.getmtime(self.rules_path)
+        except OSError:
+            mtime = None
+        if mtime != self._loaded_mtime:
+            self.reload()
+
+    def lookup(self, agent_id: Optional[str], event_type: str) -> Optional[Projection]:
+        """
+        agent_id와 이벤트 유형에 맞는 페이로드 생성 함수를 반환합니다.
+        에이전트별 규칙이 없으면 기본 규칙을 사용하고, None이면 전송하지 않습니다.
+        """
+        agent_rules = self._agents.get(agent_id) if agent_id else None
+        if agent_rules is not None and event_type in agent_rules:
+            return agent_rules[event_type]
+        return self._default.get(event_type)
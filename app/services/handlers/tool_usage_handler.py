@@ -0,0 +1,28 @@
+from typing import Union, Literal
+from app.models.webhook_models import CallStartedPayload, CallEndedPayload
+from app.core.logging import get_logger
+from app.services.tool_usage_analytics import ToolUsageAnalytics
+from .base_handler import BaseCallEventHandler
+
+logger = get_logger(__name__)
+
+
+# 통화 종료 시 도구 호출이 포함된 대화 스크립트를 도구 사용 통계로 넘기는 핸들러
+class ToolUsageHandler(BaseCallEventHandler):
+
+    def __init__(self, analytics: ToolUsageAnalytics):
+        self.analytics = analytics
+
+    async def handle(
+        self,
+        event_type: Literal["call_started", "call_ended"],
+        payload: Union[CallStartedPayload, CallEndedPayload],
+    ):
+        """
+        transcript_with_tool_calls를 백그라운드 처리 큐에 넣기만 하고 바로 반환합니다.
+        """
+        if event_type != "call_ended" or not isinstance(payload, CallEndedPayload):
+            return
+        entries = payload.call.transcript_with_tool_calls
+        if entries:
+            self.analytics.submit(entries)
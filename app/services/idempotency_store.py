@@ -0,0 +1,99 @@
+import asyncio
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Hashable, Tuple
+from app.core.logging import get_logger
+
+logger = get_logger(__name__)
+
+
+class _Entry:
+    __slots__ = ("future", "expires_at")
+
+    def __init__(self, future: asyncio.Future, expires_at: float):
+        self.future = future
+        self.expires_at = expires_at
+
+
+# Vox.ai 재시도로 인한 중복 실행을 막는 TTL 기반 중복 제거 저장소
+# 같은 키로 들어온 요청은 최초 실행 결과를 그대로 재사용합니다.
+class IdempotencyStore:
+
+    def __init__(self, ttl_seconds: float, max_entries: int):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        # TTL이 모두 같으므로 삽입 순서가 곧 만료 순서입니다.
+        self._entries: "OrderedDict[Hashable, _Entry]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.inflight_waits = 0
+
+    async def run_once(
+        self, key: Hashable, func: Callable[[], Awaitable[Any]]
+    ) -> Tuple[Any, bool]:
+        """
+        키에 대해 func를 한 번만 실행하고 (결과, 재사용 여부)를 반환합니다.
+        실행 중인 중복 요청은 최초 실행이 끝날 때까지 기다렸다가 같은 결과를 받습니다.
+        실행이 실패하면 키를 제거하여 다음 재시도가 다시 실행되도록 합니다.
+        """
+        while True:
+            self._evict(time.monotonic())
+            entry = self._entries.get(key)
+            if entry is None:
+                break
+
+            if entry.future.done():
+                self.hits += 1
+            else:
+                self.inflight_waits += 1
+            try:
+                return await asyncio.shield(entry.future), True
+            except asyncio.CancelledError:
+                # 최초 실행이 취소된 경우에만 다시 시도하고, 자신이 취소된 경우는 전파합니다.
+                if not entry.future.cancelled():
+                    raise
+                logger.info(f"최초 실행이 취소되어 다시 실행합니다: {key}")
+
+        future = asyncio.get_running_loop().create_future()
+        entry = _Entry(future, time.monotonic() + self.ttl_seconds)
+        self._entries[key] = entry
+        self.misses += 1
+
+        try:
+            result = await func()
+        except asyncio.CancelledError:
+            self._forget(key, entry)
+            future.cancel()
+            raise
+        except Exception as e:
+            self._forget(key, entry)
+            future.set_exception(e)
+            # 대기자가 없는 경우에도 "exception was never retrieved" 경고가 나지 않도록 합니다.
+            future.exception()
+            raise
+
+        future.set_result(result)
+        return result, False
+
+    def _forget(self, key: Hashable, entry: _Entry):
+        if self._entries.get(key) is entry:
+            del self._entries[key]
+
+    def _evict(self, now: float):
+        entries = self._entries
+        while entries:
+            oldest = next(iter(entries.values()))
+            if oldest.expires_at > now:
+                break
+            entries.popitem(last=False)
+        # 크기 제한 초과 시 가장 오래된 항목부터 제거합니다.
+        while len(entries) > self.max_entries:
+            entries.popitem(last=False)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "inflight_waits": self.inflight_waits,
+        }
@@ -0,0 +1,159 @@
+import json
+import os
+import time
+from typing import Any, Dict, List, Optional
+from app.core.logging import get_logger
+from .caller_directory import normalize_phone_digits
+
+logger = get_logger(__name__)
+
+
+class InboundRoute:
+    __slots__ = ("prefix", "agent_id", "locale", "dynamic_variables", "metadata")
+
+    def __init__(
+        self,
+        prefix: str,
+        agent_id: Optional[str] = None,
+        locale: Optional[str] = None,
+        dynamic_variables: Optional[Dict[str, Any]] = None,
+        metadata: Optional[Dict[str, Any]] = None,
+    ):
+        self.prefix = prefix
+        self.agent_id = agent_id
+        self.locale = locale
+        self.dynamic_variables = dynamic_variables or {}
+        self.metadata = metadata or {}
+
+
+class _TrieNode:
+    __slots__ = ("children", "route")
+
+    def __init__(self):
+        self.children: Dict[str, "_TrieNode"] = {}
+        self.route: Optional[InboundRoute] = None
+
+
+# 수신 번호(DID) 대역을 숫자 단위로 저장하는 트라이
+# 조회는 번호 길이에 비례하며(O(번호 길이)), 가장 긴 접두사가 일치하는 경로를 반환합니다.
+class RoutingTrie:
+
+    def __init__(self, routes: List[InboundRoute], default: Optional[InboundRoute]):
+        self.root = _TrieNode()
+        self.root.route = default
+        self.size = 0
+        for route in routes:
+            node = self.root
+            for digit in route.prefix:
+                child = node.children.get(digit)
+                if child is None:
+                    child = node.children[digit] = _TrieNode()
+                node = child
+            if node.route is not None and node is not self.root:
+                logger.warning(f"중복된 수신 번호 대역을 덮어씁니다: {route.prefix}")
+            node.route = route
+            self.size += 1
+
+    def match(self, digits: Optional[str]) -> Optional[InboundRoute]:
+        node = self.root
+        best = node.route
+        if digits:
+            for digit in digits:
+                node = node.children.get(digit)
+                if node is None:
+                    break
+                if node.route is not None:
+                    best = node.route
+        return best
+
+
+def _parse_route(item: Dict[str, Any], prefix: str) -> InboundRoute:
+    for key in ("dynamic_variables", "metadata"):
+        if item.get(key) is not None and not isinstance(item[key], dict):
+            raise ValueError(f"{key}는 객체여야 합니다: {item}")
+    return InboundRoute(
+        prefix=prefix,
+        agent_id=item.get("agent_id"),
+        locale=item.get("locale"),
+        dynamic_variables=item.get("dynamic_variables"),
+        metadata=item.get("metadata"),
+    )
+
+
+def compile_routing_table(table: Dict[str, Any]) -> RoutingTrie:
+    """
+    라우팅 테이블(dict)을 트라이로 컴파일합니다.
+    {"default": {...}, "routes": [{"prefix": "8215881234", "agent_id": ..., "locale": ...,
+    "dynamic_variables": {...}, "metadata": {...}}, ...]}
+    """
+    if not isinstance(table, dict):
+        raise ValueError("라우팅 테이블은 객체여야 합니다.")
+    items = table.get("routes", [])
+    if not isinstance(items, list):
+        raise ValueError("routes는 목록이어야 합니다.")
+    routes = []
+    for item in items:
+        if not isinstance(item, dict):
+            raise ValueError(f"라우트는 객체여야 합니다: {item}")
+        prefix = normalize_phone_digits(str(item.get("prefix", "")))
+        if not prefix:
+            raise ValueError(f"수신 번호 대역(prefix)이 올바르지 않습니다: {item}")
+        routes.append(_parse_route(item, prefix))
+    default = table.get("default")
+    if default is not None and not isinstance(default, dict):
+        raise ValueError("default는 객체여야 합니다.")
+    return RoutingTrie(routes, _parse_route(default, "") if default else None)
+
+
+# to_number 기준으로 에이전트, 로캘, 기본 동적 변수를 결정하는 라우터
+# 라우팅 파일이 바뀌면 새 트라이를 만든 뒤 참조만 교체하므로 처리 중인 요청을 막지 않습니다.
+class InboundRouter:
+
+    def __init__(self, routes_path: Optional[str], reload_interval_seconds: float):
+        self.routes_path = routes_path
+        self.reload_interval_seconds = reload_interval_seconds
+        self._trie = RoutingTrie([], None)
+        self._loaded_mtime: Optional[float] = None
+        self._last_checked = 0.0
+        self.reload()
+
+    def reload(self):
+        """라우팅 파일을 읽어 트라이로 컴파일한 뒤 교체합니다. 실패하면 기존 트라이를 유지합니다."""
+        if not self.routes_path or not os.path.exists(self.routes_path):
+            return
+        try:
+            mtime = os.path.getmtime(self.routes_path)
+            with open(self.routes_path, encoding="utf-8") as f:
+                trie = compile_routing_table(json.load(f))
+        except (OSError, ValueError, AttributeError, TypeError) as e:
+            logger.error(
+                f"인바운드 라우팅 테이블 로드 실패, 기존 테이블을 유지합니다: {e}"
+            )
+            return
+
+        self._trie = trie
+        self._loaded_mtime = mtime
+        logger.info(f"인바운드 라우팅 테이블을 로드했습니다: 번호 대역 {trie.size}개")
+
+    def reload_if_changed(self):
+        """reload_interval_seconds마다 라우팅 파일의 수정 시각을 확인합니다."""
+        now = time.monotonic()
+        if now - self._last_checked < self.reload_interval_seconds:
+            return
+        self._last_checked = now
+        if not self.routes_path:
+            return
+        try:
+            mtime = os.path.getmtime(self.routes_path)
+        except OSError:
+            return
+        if mtime != self._loaded_mtime:
+            self.reload()
+
+    def swap(self, table: Dict[str, Any]):
+        """파일 대신 dict로 전달된 라우팅 테이블을 즉시 적용합니다."""
+        self._trie = compile_routing_table(table)
+
+    def resolve(self, to_number: Optional[str]) -> Optional[InboundRoute]:
+        self.reload_if_changed()
+        return self._trie.match(normalize_phone_digits(to_number))
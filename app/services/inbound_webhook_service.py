@@ -1,10 +1,19 @@
-from typing import Dict, Any
+import asyncio
+from typing import Dict, Any, Optional, Set
+from app.core.config import Settings
 from app.core.logging import get_logger
 from app.models.webhook_models import (
     InboundWebhookPayload,
     InboundWebhookResponse,
     InboundCallDetailsResponse,
 )
+from .async_cache import CoalescingCache
+from .inbound_routing import InboundRouter
+from .caller_directory import (
+    CallerRecord,
+    load_caller_directory,
+    normalize_phone_number,
+)
 
 logger = get_logger(__name__)
 
@@ -12,14 +21,42 @@ logger = get_logger(__name__)
 # 인바운드 콜 웹훅을 처리하는 서비스
 class InboundWebhookService:
 
+    def __init__(self, settings: Settings):
+        # 발신 번호로 고객 정보를 조회하는 디렉터리 (미설정 시 예시 데이터 사용)
+        self.caller_directory = load_caller_directory(
+            settings.caller_directory_source, settings.caller_directory_index_path
+        )
+        # 수신 번호(DID) 대역별 에이전트, 로캘, 기본 동적 변수
+        self.router = InboundRouter(
+            routes_path=settings.inbound_routes_path,
+            reload_interval_seconds=settings.inbound_routes_reload_interval_seconds,
+        )
+        # 재다이얼, IVR 반복 등으로 같은 번호가 몰려도 백엔드 조회는 한 번만 수행합니다.
+        self.caller_cache = CoalescingCache(
+            ttl_seconds=settings.inbound_cache_ttl_seconds,
+            negative_ttl_seconds=settings.inbound_cache_negative_ttl_seconds,
+            stale_seconds=settings.inbound_cache_stale_seconds,
+            max_entries=settings.inbound_cache_max_entries,
+        )
+        # 통화 연결을 지연시키지 않도록 요청별 처리 시간 예산을 둡니다.
+        self.latency_budget_seconds = settings.inbound_latency_budget_ms / 1000.0
+        self._late_lookups: Set[asyncio.Task] = set()
+        self.requests = 0
+        self.budget_overruns = 0
+        self.lookup_failures = 0
+
     async def process_inbound_call(
         self, payload: InboundWebhookPayload
     ) -> InboundWebhookResponse:
         """
         인바운드 콜 웹훅 요청을 처리하고 동적 변수 및 메타데이터를 반환합니다.
-        발신 번호 등을 기반으로 사용자 정보를 조회하는 로직을 여기에 추가합니다.
+        발신자 정보 조회는 처리 시간 예산 안에서만 기다리며, 예산을 넘기면
+        그때까지 준비된 동적 변수와 기본 이름으로 즉시 응답합니다.
         """
         logger.info(f"인바운드 콜 웹훅 처리 시작, 페이로드: {payload}")
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.latency_budget_seconds
+        self.requests += 1
 
         from_number = payload.call_inbound.from_number
         to_number = payload.call_inbound.to_number
@@ -27,19 +64,31 @@ class InboundWebhookService:
         dynamic_variables: Dict[str, Any] = {}
         metadata: Dict[str, Any] = {}
 
-        # --- 예시 로직: 발신 번호에 따라 동적 변수 설정 ---
-        if from_number == "821012345678":
-            dynamic_variables["user_name"] = "김철수"
-            dynamic_variables["product_name"] = "아이폰 16 프로"
-            metadata["user_id"] = "user_kim_chul_su_123"
-            logger.info(f"{from_number}로부터 김철수님을 식별했습니다.")
-        elif from_number == "821087654321":
-            dynamic_variables["user_name"] = "손예진"
-            dynamic_variables["last_order_date"] = "2024-07-01"
-            metadata["user_id"] = "user_son_ye_jin_456"
-            logger.info(f"{from_number}로부터 손예진님을 식별했습니다.")
+        # --- 수신 번호 대역(최장 접두사 일치)의 기본값 적용 ---
+        # 발신자별 정보가 이후에 덮어쓰며, 처리 시간 예산을 넘기더라도 이 값은 응답에 포함됩니다.
+        route = self.router.resolve(to_number)
+        if route is not None:
+            dynamic_variables.update(route.dynamic_variables)
+            metadata.update(route.metadata)
+            if route.prefix:
+                metadata["route_prefix"] = route.prefix
+            if route.agent_id:
+                metadata["agent_id"] = route.agent_id
+            if route.locale:
+                metadata["locale"] = route.locale
+                dynamic_variables.setdefault("locale", route.locale)
+
+        # --- 발신 번호로 고객 디렉터리를 조회하여 동적 변수 설정 ---
+        caller = await self._lookup_caller_before(from_number, deadline)
+        if caller is not None:
+            caller_variables, caller_metadata = caller
+            dynamic_variables.update(caller_variables)
+            metadata.update(caller_metadata)
+            logger.info(
+                f"{from_number}로부터 {dynamic_variables.get('user_name')}님을 식별했습니다."
+            )
         else:
-            dynamic_variables["user_name"] = "고객님"  # 기본 이름
+            dynamic_variables.setdefault("user_name", "고객님")  # 기본 이름
             logger.info(f"알 수 없는 발신 번호: {from_number}. 기본 이름을 사용합니다.")
             # 알 수 없는 번호 처리 로직 (예: 신규 고객 처리)
 
@@ -51,3 +100,70 @@ class InboundWebhookService:
 
         logger.info(f"인바운드 콜 처리 완료, 반환 데이터: {response_data}")
         return InboundWebhookResponse(call_inbound=response_data)
+
+    async def _lookup_caller_before(
+        self, from_number: Optional[str], deadline: float
+    ) -> Optional[CallerRecord]:
+        """
+        deadline(이벤트 루프 시각)까지만 고객 정보 조회를 기다립니다.
+        시간 내에 끝나지 않으면 None을 반환하고, 조회는 백그라운드에서 계속되어
+        완료되면 캐시를 채웁니다. 조회가 실패해도 None을 반환해 기본값으로 응답합니다.
+        """
+        task = asyncio.ensure_future(self._lookup_caller(from_number))
+        if not task.done():
+            timeout = max(0.0, deadline - asyncio.get_running_loop().time())
+            await asyncio.wait({task}, timeout=timeout)
+
+        if task.done():
+            if task.cancelled():
+                self.lookup_failures += 1
+                logger.error(
+                    f"발신자 정보 조회가 취소되어 기본값으로 응답합니다: {from_number}"
+                )
+                return None
+            try:
+                return task.result()
+            except Exception as e:
+                self.lookup_failures += 1
+                logger.error(
+                    f"발신자 정보 조회 실패로 기본값으로 응답합니다: {from_number}: {e}"
+                )
+                return None
+
+        self.budget_overruns += 1
+        logger.warning(
+            f"발신자 정보 조회가 처리 시간 예산({self.latency_budget_seconds * 1000:.0f}ms)을 초과하여 기본값으로 응답합니다: {from_number}"
+        )
+        self._late_lookups.add(task)
+        task.add_done_callback(self._finish_late_lookup)
+        return None
+
+    def _finish_late_lookup(self, task: asyncio.Task):
+        self._late_lookups.discard(task)
+        if not task.cancelled() and task.exception() is not None:
+            logger.error(f"지연된 발신자 정보 조회 실패: {task.exception()}")
+
+    def deadline_stats(self) -> Dict[str, Any]:
+        return {
+            "latency_budget_ms": self.latency_budget_seconds * 1000,
+            "requests": self.requests,
+            "budget_overruns": self.budget_overruns,
+            "lookup_failures": self.lookup_failures,
+            "late_lookups_inflight": len(self._late_lookups),
+        }
+
+    async def _lookup_caller(
+        self, from_number: Optional[str]
+    ) -> Optional[CallerRecord]:
+        """정규화된 발신 번호를 키로 캐시를 거쳐 고객 정보를 조회합니다."""
+        key = normalize_phone_number(from_number)
+        if key is None:
+            return None
+        return await self.caller_cache.get(key, lambda: self._fetch_caller(from_number))
+
+    async def _fetch_caller(self, from_number: Optional[str]) -> Optional[CallerRecord]:
+        """
+        고객 정보 원본 조회입니다.
+        DB나 CRM API 등 느린 소스를 사용하려면 이 메서드를 교체하세요.
+        """
+        return self.caller_directory.lookup(from_number)
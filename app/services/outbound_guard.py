@@ -0,0 +1,300 @@
+import asyncio
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Deque, Dict
+import httpx
+from app.core.config import Settings
+from app.core.logging import get_logger
+from app.core.metrics import OUTBOUND_REQUEST_DURATION
+from app.core.tracing import SPAN_KIND_CLIENT, tracer
+
+logger = get_logger(__name__)
+
+
+class DestinationUnavailableError(Exception):
+    """외부 목적지로의 전송을 시도하지 않고 즉시 거절할 때 발생하는 예외"""
+
+
+class CircuitOpenError(DestinationUnavailableError):
+    pass
+
+
+class ConcurrencyLimitExceededError(DestinationUnavailableError):
+    pass
+
+
+# 연속 실패가 누적되면 요청을 즉시 거절하는 서킷 브레이커
+# closed -> (연속 실패) -> open -> (대기 시간 경과) -> half_open -> (프로브 성공) -> closed
+class CircuitBreaker:
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(
+        self,
+        failure_threshold: int,
+        reset_timeout_seconds: float,
+        half_open_max_calls: int = 1,
+    ):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout_seconds = reset_timeout_seconds
+        self.half_open_max_calls = half_open_max_calls
+        self.state = self.CLOSED
+        self.consecutive_failures = 0
+        self.opened_at = 0.0
+        self.half_open_inflight = 0
+        self.rejected = 0
+        # open 상태로 바뀔 때마다 증가합니다. 요청 결과는 허용된 시점의 세대와 같을 때만 반영합니다.
+        self.generation = 0
+
+    def fail_fast(self) -> bool:
+        """open 상태이고 대기 시간이 지나지 않았으면 True (상태는 바꾸지 않습니다)"""
+        if (
+            self.state == self.OPEN
+            and time.monotonic() - self.opened_at < self.reset_timeout_seconds
+        ):
+            self.rejected += 1
+            return True
+        return False
+
+    def allow(self) -> bool:
+        """요청을 보내도 되는지 판단합니다. open 상태에서는 대기 시간이 지나야 프로브를 허용합니다."""
+        if self.state == self.OPEN:
+            if time.monotonic() - self.opened_at < self.reset_timeout_seconds:
+                self.rejected += 1
+                return False
+            self.state = self.HALF_OPEN
+            self.half_open_inflight = 0
+            logger.info(
+                "서킷 브레이커가 half_open 상태로 전환되어 프로브 요청을 허용합니다."
+            )
+
+        if self.state == self.HALF_OPEN:
+            if self.half_open_inflight >= self.half_open_max_calls:
+                self.rejected += 1
+                return False
+            self.half_open_inflight += 1
+        return True
+
+    def record_success(self, generation: int):
+        if generation != self.generation:
+            # 브레이커가 열리기 전에 허용된 요청의 늦은 성공으로 open 상태가 닫히지 않게 합니다.
+            return
+        if self.state == self.HALF_OPEN:
+            logger.info(
+                "프로브 요청이 성공하여 서킷 브레이커를 closed 상태로 전환합니다."
+            )
+        self.state = self.CLOSED
+        self.consecutive_failures = 0
+        self.half_open_inflight = 0
+
+    def record_failure(self, generation: int):
+        if generation != self.generation:
+            return
+        self.consecutive_failures += 1
+        if (
+            self.state == self.HALF_OPEN
+            or self.consecutive_failures >= self.failure_threshold
+        ):
+            if self.state != self.OPEN:
+                logger.warning(
+                    f"연속 {self.consecutive_failures}회 실패로 서킷 브레이커를 open 상태로 전환합니다."
+                )
+            self.state = self.OPEN
+            self.opened_at = time.monotonic()
+            self.half_open_inflight = 0
+            self.generation += 1
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "state": self.state,
+            "consecutive_failures": self.consecutive_failures,
+            "rejected": self.rejected,
+        }
+
+
+# AIMD(가산 증가 / 승산 감소) 방식의 적응형 동시성 제한기
+# 지연이 목표치 이하인 성공은 한도를 천천히 늘리고, 실패나 지연 초과는 한도를 절반으로 줄입니다.
+# 한도가 찬 동안의 요청은 최대 max_waiters개까지 도착 순서대로 대기열에서 권한을 기다립니다.
+class AdaptiveConcurrencyLimiter:
+
+    def __init__(
+        self,
+        initial_limit: int,
+        min_limit: int,
+        max_limit: int,
+        latency_target_seconds: float,
+        backoff_ratio: float = 0.5,
+        max_waiters: int = 1000,
+    ):
+        self.limit = float(initial_limit)
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.latency_target_seconds = latency_target_seconds
+        self.backoff_ratio = backoff_ratio
+        self.max_waiters = max_waiters
+        self.inflight = 0
+        # 시간 초과로 취소된 대기자는 권한을 넘길 때 건너뛰므로 실제 대기 수는 waiting으로 셉니다.
+        self._waiters: Deque[asyncio.Future] = deque()
+        self.waiting = 0
+        self.queued = 0
+        self.timed_out = 0
+        self.rejected = 0
+
+    async def acquire(self, timeout_seconds: float) -> bool:
+        """
+        권한을 얻으면 True를 반환합니다. 한도가 차 있으면 timeout_seconds 동안 대기하며,
+        대기열이 가득 찼거나 시간 안에 권한을 얻지 못하면 False를 반환합니다.
+        """
+        if self.waiting == 0 and self.inflight < int(self.limit):
+            self.inflight += 1
+            return True
+        if self.waiting >= self.max_waiters:
+            self.rejected += 1
+            return False
+
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        self.waiting += 1
+        self.queued += 1
+        try:
+            await asyncio.wait_for(waiter, timeout_seconds)
+            return True
+        except asyncio.TimeoutError:
+            if waiter.done() and not waiter.cancelled():
+                # 시간 초과와 동시에 권한을 받은 경우
+                return True
+            self.timed_out += 1
+            return False
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled():
+                self.release_unused()
+            raise
+        finally:
+            self.waiting -= 1
+
+    def release(self, latency_seconds: float, success: bool):
+        if success and latency_seconds <= self.latency_target_seconds:
+            # 한도 하나가 모두 채워질 때마다 1씩 증가하는 효과
+            self.limit = min(self.max_limit, self.limit + 1.0 / self.limit)
+        else:
+            self.limit = max(self.min_limit, self.limit * self.backoff_ratio)
+        self.release_unused()
+
+    def release_unused(self):
+        """요청을 보내지 않은 권한을 돌려줍니다 (한도는 조정하지 않습니다)."""
+        self.inflight -= 1
+        self._wake_waiters()
+
+    def _wake_waiters(self):
+        while self._waiters and self.inflight < int(self.limit):
+            waiter = self._waiters.popleft()
+            if waiter.done():
+                continue
+            self.inflight += 1
+            waiter.set_result(None)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "limit": int(self.limit),
+            "inflight": self.inflight,
+            "waiting": self.waiting,
+            "queued": self.queued,
+            "timed_out": self.timed_out,
+            "rejected": self.rejected,
+        }
+
+
+# 목적지별 서킷 브레이커와 동시성 제한기를 묶은 보호 장치
+class DestinationGuard:
+
+    def __init__(self, name: str, settings: Settings):
+        self.name = name
+        self.breaker = CircuitBreaker(
+            failure_threshold=settings.breaker_failure_threshold,
+            reset_timeout_seconds=settings.breaker_reset_timeout_seconds,
+        )
+        self.limiter = AdaptiveConcurrencyLimiter(
+            initial_limit=settings.outbound_initial_concurrency,
+            min_limit=1,
+            max_limit=settings.outbound_max_concurrency,
+            latency_target_seconds=settings.outbound_latency_target_ms / 1000.0,
+            max_waiters=settings.outbound_queue_max_waiters,
+        )
+        self.queue_timeout_seconds = settings.outbound_queue_timeout_ms / 1000.0
+        self.successes = 0
+        self.failures = 0
+
+    @asynccontextmanager
+    async def guard(self) -> AsyncIterator[None]:
+        """
+        블록 안의 외부 요청 결과를 서킷 브레이커와 동시성 제한기에 반영합니다.
+        동시성 한도가 차 있으면 대기열에서 권한을 기다리고, 서킷 브레이커가 open 상태이거나
+        대기열이 가득 찼거나 대기 시간이 초과되면 요청을 보내지 않고 예외를 발생시킵니다.
+        """
+        if self.breaker.fail_fast():
+            raise CircuitOpenError(f"{self.name} 서킷 브레이커가 열려 있습니다.")
+        if not await self.limiter.acquire(self.queue_timeout_seconds):
+            raise ConcurrencyLimitExceededError(
+                f"{self.name} 동시 요청 한도({int(self.limiter.limit)}) 대기 실패 "
+                f"(대기 {self.limiter.waiting}건)"
+            )
+        # 대기하는 동안 브레이커가 열렸을 수 있으므로 권한을 얻은 뒤 다시 확인합니다.
+        if not self.breaker.allow():
+            self.limiter.release_unused()
+            raise CircuitOpenError(f"{self.name} 서킷 브레이커가 열려 있습니다.")
+        generation = self.breaker.generation
+
+        started = time.monotonic()
+        success = False
+        # 블록 안에서 trace_headers()를 호출하면 이 스팬이 외부 요청의 부모 스팬이 됩니다.
+        with tracer.start_span(
+            f"outbound {self.name}", {"peer.service": self.name}, kind=SPAN_KIND_CLIENT
+        ):
+            try:
+                yield
+                success = True
+            except httpx.HTTPStatusError as e:
+                # 요청 자체가 잘못된 4xx는 목적지 장애로 보지 않습니다.
+                status = e.response.status_code
+                success = status < 500 and status != 429
+                raise
+            finally:
+                elapsed = time.monotonic() - started
+                self.limiter.release(elapsed, success)
+                OUTBOUND_REQUEST_DURATION.observe(
+                    elapsed, self.name, "success" if success else "failure"
+                )
+                if success:
+                    self.successes += 1
+                    self.breaker.record_success(generation)
+                else:
+                    self.failures += 1
+                    self.breaker.record_failure(generation)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "breaker": self.breaker.stats(),
+            "concurrency": self.limiter.stats(),
+            "successes": self.successes,
+            "failures": self.failures,
+        }
+
+
+# 목적지 이름(호스트)별로 하나의 DestinationGuard를 보관하는 레지스트리
+class DestinationGuardRegistry:
+
+    def __init__(self, settings: Settings):
+        self.settings = settings
+        self._guards: Dict[str, DestinationGuard] = {}
+
+    def get(self, name: str) -> DestinationGuard:
+        """목적지 이름별로 하나의 DestinationGuard를 반환합니다."""
+        guard = self._guards.get(name)
+        if guard is None:
+            guard = self._guards[name] = DestinationGuard(name, self.settings)
+        return guard
+
+    def stats(self) -> Dict[str, Any]:
+        return {name: guard.stats() for name, guard in self._guards.items()}
@@ -0,0 +1,755 @@
+import argparse
+import hashlib
+import mmap
+import os
+import random
+import struct
+import tempfile
+from array import array
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional, Tuple
+from app.core.logging import get_logger
+
+logger = get_logger(__name__)
+
+ReservationRow = Dict[str, Any]
+
+# 예약 파일 형식 (리틀 엔디언, 각 영역은 8바이트 경계에서 시작)
+#   헤더: magic(8) + 예약 수, 구간 수, PNR 슬롯 수, 이름 슬롯 수, 고유 이름 수(uint32) + 영역 시작 위치(uint64 x 10)
+#   예약: RESERVATION 고정 길이 레코드 x 예약 수
+#   구간: SEGMENT 고정 길이 레코드 x 구간 수 (예약별로 연속 저장)
+#   PNR 해시 인덱스: 해시(uint64) 배열 + 값(uint32, 예약 번호 + 1, 0은 빈 슬롯) 배열 (RSV_NO, ALPHA_PNR_NO 모두 등록)
+#   이름 해시 인덱스: 해시(uint64) 배열 + 값(uint32, 이름 번호 + 1) 배열
+#   이름 목록: 오프셋(uint32 x (고유 이름 수 + 1)) + UTF-8 문자열 영역
+#   이름별 예약 목록: 시작 위치(uint32 x (고유 이름 수 + 1)) + 예약 번호(uint32 x 예약 수)
+INDEX_MAGIC = b"VOXRSV01"
+SECTIONS = (
+    "reservations",
+    "segments",
+    "pnr_hashes",
+    "pnr_values",
+    "name_hashes",
+    "name_values",
+    "name_offsets",
+    "name_blob",
+    "postings_start",
+    "postings",
+)
+HEADER = struct.Struct("<8s5I" + "Q" * len(SECTIONS))
+# rsv_no, alpha_pnr_no, pnr_seqno, name_id, 예약 시각, 판매 금액, 첫 구간 번호,
+# 판매 항공사, 여정 유형, 인원, 상태, 구간 수, 국내/국제
+RESERVATION = struct.Struct("<6s6sIIIII6B")
+# 출발 시각, 도착 시각, 편명 숫자, 운항 항공사, 출발 공항, 도착 공항, 공동 운항사(0은 없음, 그 외 항공사 번호 + 1)
+SEGMENT = struct.Struct("<IIH4B")
+
+# 시각은 1970-01-01 기준 초 단위의 현지 시각(KST)으로 저장합니다.
+_EPOCH = datetime(1970, 1, 1)
+
+AIRLINES = (
+    ("KE", "대한항공"),
+    ("OZ", "아시아나항공"),
+    ("7C", "제주항공"),
+    ("LJ", "진에어"),
+    ("TW", "티웨이항공"),
+)
+# (공항 코드, 도시명, 공항명, 국내선 여부, 인천/김포 출발 기준 비행 시간(분), 1인 기준 왕복 운임)
+AIRPORTS = (
+    ("ICN", "인천", "인천국제공항", False, 0, 0),
+    ("GMP", "서울", "김포국제공항", True, 0, 0),
+    ("CJU", "제주", "제주국제공항", True, 65, 180000),
+    ("PUS", "부산", "김해국제공항", True, 55, 160000),
+    ("BKK", "방콕", "방콕 수완나품", False, 345, 420000),
+    ("NRT", "도쿄", "나리타국제공항", False, 140, 350000),
+    ("KIX", "오사카", "간사이국제공항", False, 110, 320000),
+    ("HKG", "홍콩", "홍콩국제공항", False, 225, 380000),
+    ("SIN", "싱가포르", "창이국제공항", False, 385, 650000),
+    ("DAD", "다낭", "다낭국제공항", False, 275, 400000),
+    ("TPE", "타이베이", "타오위안국제공항", False, 150, 330000),
+    ("LAX", "로스앤젤레스", "로스앤젤레스국제공항", False, 660, 1600000),
+)
+_INTERNATIONAL = [i for i, a in enumerate(AIRPORTS) if not a[3] and a[4]]
+_DOMESTIC = [i for i, a in enumerate(AIRPORTS) if a[3] and a[4]]
+_ICN = 0
+_GMP = 1
+
+TRIP_TYPES = (("OW", "편도"), ("RT", "왕복"))
+RESERVATION_STATUSES = (
+    {
+        "RSV_STATUS_CD": "RMTK",
+        "RSV_STATUS_NM": "발권완료",
+        "PNR_SEAT_STATUS_CD": "RK",
+        "PNR_SEAT_STATUS_NM": "확약",
+        "PAY_STATUS_CD": "PAQK",
+        "PAY_STATUS_NM": "결제완료",
+        "ISSUE_STATUS_CD": "TKKY",
+        "ISSUE_STATUS_NM": "발권완료",
+        "CANCEL_YN": "N",
+        "FLIGHTS_STATUS": "발권완료",
+        "FLIGHTS_STATUS_CD": "FLTY",
+    },
+    {
+        "RSV_STATUS_CD": "RMRQ",
+        "RSV_STATUS_NM": "예약완료",
+        "PNR_SEAT_STATUS_CD": "HK",
+        "PNR_SEAT_STATUS_NM": "확약",
+        "PAY_STATUS_CD": "PANN",
+        "PAY_STATUS_NM": "미결제",
+        "ISSUE_STATUS_CD": "TKNN",
+        "ISSUE_STATUS_NM": "미발권",
+        "CANCEL_YN": "N",
+        "FLIGHTS_STATUS": "예약완료",
+        "FLIGHTS_STATUS_CD": "FLRQ",
+    },
+    {
+        "RSV_STATUS_CD": "RMCX",
+        "RSV_STATUS_NM": "예약취소",
+        "PNR_SEAT_STATUS_CD": "XX",
+        "PNR_SEAT_STATUS_NM": "취소",
+        "PAY_STATUS_CD": "PARF",
+        "PAY_STATUS_NM": "환불완료",
+        "ISSUE_STATUS_CD": "TKCX",
+        "ISSUE_STATUS_NM": "발권취소",
+        "CANCEL_YN": "Y",
+        "FLIGHTS_STATUS": "취소",
+        "FLIGHTS_STATUS_CD": "FLCX",
+    },
+)
+_STATUS_WEIGHTS = (70, 20, 10)
+
+_SURNAMES = "김이박최정강조윤장임한오서신권황안송류홍"
+_GIVEN_SYLLABLES = "민서지현수예준도하윤우진영은성주연아채유시원건태"
+_PNR_ALPHABET = "ABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789"
+_PNR_SPACE = len(_PNR_ALPHABET) ** 6
+# _PNR_SPACE(2^12 * 3^12)와 서로소인 수를 곱해 일련번호를 겹치지 않는 6자리 코드로 바꿉니다.
+_PNR_MULTIPLIER = 1_000_003
+
+# 예약 파일이 설정되지 않았을 때 사용하는 예시 예약
+SAMPLE_RESERVATION_ROWS: List[ReservationRow] = [
+    {
+        "PNR_SEQNO": 10456789,
+        "DI_FLAG": "I",
+        "STOCK_AIR_CD": "KE",
+        "STOCK_AIR_NM": "대한항공",
+        "TRIP_TYPE_CD": "RT",
+        "TRIP_TYPE_NM": "왕복",
+        "RSV_INWON": 3,
+        "RSV_NO": "KFMNPQ",
+        "RSV_USR_NM": "김민지",
+        "RSV_STATUS_CD": "RMTK",
+        "RSV_STATUS_NM": "발권완료",
+        "DEP_DTM": "20250915141000",
+        "ARR_DTM": "20250922092000",
+        "RSV_DTM": "20250820094523",
+        "PAY_TL": "20250820094500",
+        "PNR_SEAT_STATUS_CD": "RK",
+        "PNR_SEAT_STATUS_NM": "확약",
+        "PAY_STATUS_CD": "PAQK",
+        "PAY_STATUS_NM": "결제완료",
+        "ISSUE_STATUS_CD": "TKKY",
+        "ISSUE_STATUS_NM": "발권완료",
+        "SALE_TOT_AMT": 1280000,
+        "SEG_RSV_YN": "Y",
+        "CANCEL_YN": "N",
+        "FARE_CONFM_YN": "Y",
+        "MIJUNG_AMT_YN": "N",
+        "PROOF_DOC_REQUIRE_YN": "N",
+        "PROOF_DOC_CONFM_YN": "N",
+        "ALPHA_PNR_NO": "KFMNPQ",
+        "ITIN_NO": 1,
+        "ITIN_BUNDLE_UNIT": "1",
+        "FLTNO": "KE647",
+        "FLT_AIR_CD": "KE",
+        "FLT_AIR_NM": "대한항공",
+        "DEP_CITY_CD": "ICN",
+        "DEP_CITY_NM": "인천",
+        "DEP_AIRPORT_CD": "ICN",
+        "DEP_AIRPORT_NM": "인천국제공항",
+        "DEP_DATE": "20250915",
+        "DEP_TM": "1410",
+        "ARR_CITY_CD": "BKK",
+        "ARR_CITY_NM": "방콕",
+        "ARR_AIRPORT_CD": "BKK",
+        "ARR_AIRPORT_NM": "방콕 수완나품",
+        "ARR_DATE": "20250915",
+        "ARR_TM": "1755",
+        "AUTO_ISSUE_YN": "N",
+        "STOP_OVER_YN": "N",
+        "ATC_REISSUE_FLAG": "N",
+        "FLIGHTS_STATUS": "발권완료",
+        "FLIGHTS_STATUS_CD": "FLTY",
+        "CODESHARE_YN": "N",
+        "CODESHARE_AIR_CD": "",
+        "CODESHARE_AIR_NM": "",
+        "CODESHARE_CD_IMG": "",
+    },
+    {
+        "PNR_SEQNO": 10456789,
+        "DI_FLAG": "I",
+        "STOCK_AIR_CD": "KE",
+        "STOCK_AIR_NM": "대한항공",
+        "TRIP_TYPE_CD": "RT",
+        "TRIP_TYPE_NM": "왕복",
+        "RSV_INWON": 3,
+        "RSV_NO": "KFMNPQ",
+        "RSV_USR_NM": "박서현",
+        "RSV_STATUS_CD": "RMTK",
+        "RSV_STATUS_NM": "발권완료",
+        "DEP_DTM": "20250915141000",
+        "ARR_DTM": "20250922092000",
+        "RSV_DTM": "20250820094523",
+        "PAY_TL": "20250820094500",
+        "PNR_SEAT_STATUS_CD": "RK",
+        "PNR_SEAT_STATUS_NM": "확약",
+        "PAY_STATUS_CD": "PAQK",
+        "PAY_STATUS_NM": "결제완료",
+        "ISSUE_STATUS_CD": "TKKY",
+        "ISSUE_STATUS_NM": "발권완료",
+        "SALE_TOT_AMT": 1280000,
+        "SEG_RSV_YN": "Y",
+        "CANCEL_YN": "N",
+        "FARE_CONFM_YN": "Y",
+        "MIJUNG_AMT_YN": "N",
+        "PROOF_DOC_REQUIRE_YN": "N",
+        "PROOF_DOC_CONFM_YN": "N",
+        "ALPHA_PNR_NO": "KFMNPQ",
+        "ITIN_NO": 2,
+        "ITIN_BUNDLE_UNIT": "2",
+        "FLTNO": "KE648",
+        "FLT_AIR_CD": "KE",
+        "FLT_AIR_NM": "대한항공",
+        "DEP_CITY_CD": "BKK",
+        "DEP_CITY_NM": "방콕",
+        "DEP_AIRPORT_CD": "BKK",
+        "DEP_AIRPORT_NM": "방콕 수완나품",
+        "DEP_DATE": "20250922",
+        "DEP_TM": "0920",
+        "ARR_CITY_CD": "ICN",
+        "ARR_CITY_NM": "인천",
+        "ARR_AIRPORT_CD": "ICN",
+        "ARR_AIRPORT_NM": "인천국제공항",
+        "ARR_DATE": "20250922",
+        "ARR_TM": "1630",
+        "AUTO_ISSUE_YN": "N",
+        "STOP_OVER_YN": "N",
+        "ATC_REISSUE_FLAG": "N",
+        "FLIGHTS_STATUS": "발권완료",
+        "FLIGHTS_STATUS_CD": "FLTY",
+        "CODESHARE_YN": "N",
+        "CODESHARE_AIR_CD": "",
+        "CODESHARE_AIR_NM": "",
+        "CODESHARE_CD_IMG": "",
+    },
+]
+
+
+def normalize_pnr(raw: Optional[str]) -> Optional[str]:
+    if not raw:
+        return None
+    code = raw.strip().upper()
+    return code if len(code) == 6 and code.isalnum() else None
+
+
+def normalize_name(raw: Optional[str]) -> Optional[str]:
+    if not raw:
+        return None
+    return "".join(raw.split()) or None
+
+
+def _stable_hash(value: str) -> int:
+    # 내장 hash()는 프로세스마다 달라지므로 파일에 저장하는 인덱스에는 쓸 수 없습니다.
+    return int.from_bytes(
+        hashlib.blake2b(value.encode("utf-8"), digest_size=8).digest(), "little"
+    )
+
+
+def _table_size(keys: int) -> int:
+    """부하율이 0.7을 넘지 않는 2의 거듭제곱 슬롯 수"""
+    size = 8
+    while size * 0.7 < keys:
+        size *= 2
+    return size
+
+
+def _insert(hashes: array, values: array, key_hash: int, value: int):
+    mask = len(values) - 1
+    slot = key_hash & mask
+    while values[slot]:
+        slot = (slot + 1) & mask
+    hashes[slot] = key_hash
+    values[slot] = value
+
+
+def _pnr_code(serial: int, offset: int) -> str:
+    n = (serial * _PNR_MULTIPLIER + offset) % _PNR_SPACE
+    chars = []
+    for _ in range(6):
+        n, r = divmod(n, len(_PNR_ALPHABET))
+        chars.append(_PNR_ALPHABET[r])
+    return "".join(chars)
+
+
+def _format_dtm(seconds: int) -> str:
+    return (_EPOCH + timedelta(seconds=seconds)).strftime("%Y%m%d%H%M%S")
+
+
+def _to_seconds(value: datetime) -> int:
+    return int((value - _EPOCH).total_seconds())
+
+
+def _pad(f) -> int:
+    position = f.tell()
+    if position % 8:
+        f.write(bytes(8 - position % 8))
+        position = f.tell()
+    return position
+
+
+def generate_reservation_file(path: str, count: int, seed: int = 0) -> int:
+    """
+    합성 예약 데이터 파일을 생성합니다 (예약마다 PNR 두 개, 예약자 이름, 편도 1구간 또는 왕복 2구간).
+    같은 seed로 생성하면 같은 데이터가 만들어집니다. 생성된 구간 수를 반환합니다.
+    """
+    rng = random.Random(seed)
+    pnr_offset = rng.randrange(_PNR_SPACE)
+    start_date = datetime(2025, 1, 1)
+
+    name_ids: Dict[str, int] = {}
+    names: List[str] = []
+    reservation_names = array("I")
+    pnr_slots = _table_size(2 * count)
+    pnr_hashes = array("Q", bytes(8 * pnr_slots))
+    pnr_values = array("I", bytes(4 * pnr_slots))
+    segment_count = 0
+
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "wb") as f, tempfile.TemporaryFile() as segments:
+        f.write(bytes(HEADER.size))
+        offsets = {"reservations": _pad(f)}
+        for i in range(count):
+            name = (
+                rng.choice(_SURNAMES)
+                + rng.choice(_GIVEN_SYLLABLES)
+                + rng.choice(_GIVEN_SYLLABLES)
+            )
+            name_id = name_ids.get(name)
+            if name_id is None:
+                name_id = name_ids[name] = len(names)
+                names.append(name)
+            reservation_names.append(name_id)
+
+            rsv_no = _pnr_code(2 * i, pnr_offset)
+            alpha_pnr_no = _pnr_code(2 * i + 1, pnr_offset)
+            _insert(pnr_hashes, pnr_values, _stable_hash(rsv_no), i + 1)
+            _insert(pnr_hashes, pnr_values, _stable_hash(alpha_pnr_no), i + 1)
+
+            domestic = rng.random() < 0.3
+            if domestic:
+                origin, destination = _GMP, rng.choice(_DOMESTIC)
+            else:
+                origin, destination = _ICN, rng.choice(_INTERNATIONAL)
+            duration = AIRPORTS[destination][4]
+            round_trip = rng.random() < 0.7
+            airline = rng.randrange(len(AIRLINES))
+            inwon = rng.choice((1, 1, 1, 2, 2, 3, 4))
+
+            departure = start_date + timedelta(
+                days=rng.randrange(365),
+                hours=rng.randrange(6, 22),
+                minutes=5 * rng.randrange(12),
+            )
+            legs = [(origin, destination, departure)]
+            if round_trip:
+                legs.append(
+                    (
+                        destination,
+                        origin,
+                        departure
+                        + timedelta(
+                            days=rng.randrange(2, 15), hours=rng.randrange(-4, 5)
+                        ),
+                    )
+                )
+            for dep_airport, arr_airport, dep_at in legs:
+                codeshare = 0
+                if rng.random() < 0.1:
+                    codeshare = (airline + rng.randrange(1, len(AIRLINES))) % len(
+                        AIRLINES
+                    ) + 1
+                segments.write(
+                    SEGMENT.pack(
+                        _to_seconds(dep_at),
+                        _to_seconds(dep_at + timedelta(minutes=duration)),
+                        rng.randrange(100, 1000),
+                        airline,
+                        dep_airport,
+                        arr_airport,
+                        codeshare,
+                    )
+                )
+
+            fare = AIRPORTS[destination][5] * (1.0 if round_trip else 0.6)
+            sale_amount = int(fare * inwon * rng.uniform(0.8, 1.3)) // 1000 * 1000
+            reserved_at = departure - timedelta(
+                days=rng.randrange(1, 90), seconds=rng.randrange(86400)
+            )
+            f.write(
+                RESERVATION.pack(
+                    rsv_no.encode("ascii"),
+                    alpha_pnr_no.encode("ascii"),
+                    10_000_000 + i,
+                    name_id,
+                    _to_seconds(reserved_at),
+                    sale_amount,
+                    segment_count,
+                    airline,
+                    1 if round_trip else 0,
+                    inwon,
+                    rng.choices(range(len(RESERVATION_STATUSES)), _STATUS_WEIGHTS)[0],
+                    len(legs),
+                    0 if domestic else 1,
+                )
+            )
+            segment_count += len(legs)
+
+        offsets["segments"] = _pad(f)
+        segments.seek(0)
+        while True:
+            chunk = segments.read(1 << 20)
+            if not chunk:
+                break
+            f.write(chunk)
+
+        offsets["pnr_hashes"] = _pad(f)
+        f.write(pnr_hashes.tobytes())
+        offsets["pnr_values"] = _pad(f)
+        f.write(pnr_values.tobytes())
+        del pnr_hashes, pnr_values
+
+        name_slots = _table_size(len(names))
+        name_hashes = array("Q", bytes(8 * name_slots))
+        name_values = array("I", bytes(4 * name_slots))
+        name_offsets = array("I", [0])
+        blob = bytearray()
+        for name_id, name in enumerate(names):
+            _insert(name_hashes, name_values, _stable_hash(name), name_id + 1)
+            blob += name.encode("utf-8")
+            name_offsets.append(len(blob))
+        offsets["name_hashes"] = _pad(f)
+        f.write(name_hashes.tobytes())
+        offsets["name_values"] = _pad(f)
+        f.write(name_values.tobytes())
+        offsets["name_offsets"] = _pad(f)
+        f.write(name_offsets.tobytes())
+        offsets["name_blob"] = _pad(f)
+        f.write(blob)
+
+        # 이름 번호별 예약 목록 (계수 정렬)
+        postings_start = array("I", bytes(4 * (len(names) + 1)))
+        for name_id in reservation_names:
+            postings_start[name_id + 1] += 1
+        for k in range(len(names)):
+            postings_start[k + 1] += postings_start[k]
+        postings = array("I", bytes(4 * count))
+        cursor = array("I", postings_start)
+        for i, name_id in enumerate(reservation_names):
+            postings[cursor[name_id]] = i
+            cursor[name_id] += 1
+        offsets["postings_start"] = _pad(f)
+        f.write(postings_start.tobytes())
+        offsets["postings"] = _pad(f)
+        f.write(postings.tobytes())
+
+        f.seek(0)
+        f.write(
+            HEADER.pack(
+                INDEX_MAGIC,
+                count,
+                segment_count,
+                pnr_slots,
+                name_slots,
+                len(names),
+                *(offsets[section] for section in SECTIONS),
+            )
+        )
+    # 완성된 파일만 보이도록 원자적으로 교체합니다.
+    os.replace(tmp_path, path)
+
+    logger.info(
+        f"예약 데이터 파일을 생성했습니다: {path} (예약 {count}건, 구간 {segment_count}개, 예약자 이름 {len(names)}개)"
+    )
+    return segment_count
+
+
+# 예시 예약 등 소량의 예약 정보를 위한 메모리 저장소
+class InMemoryReservationStore:
+
+    def __init__(self, rows: List[ReservationRow]):
+        self._count = len({row["RSV_NO"] for row in rows})
+        self._by_pnr: Dict[str, List[ReservationRow]] = {}
+        self._pnrs_by_name: Dict[str, List[str]] = {}
+        for row in rows:
+            self._by_pnr.setdefault(row["RSV_NO"], []).append(row)
+            if row["ALPHA_PNR_NO"] != row["RSV_NO"]:
+                self._by_pnr.setdefault(row["ALPHA_PNR_NO"], []).append(row)
+            pnrs = self._pnrs_by_name.setdefault(row["RSV_USR_NM"], [])
+            if row["RSV_NO"] not in pnrs:
+                pnrs.append(row["RSV_NO"])
+
+    def __len__(self) -> int:
+        return self._count
+
+    def lookup(
+        self,
+        reservation_no: Optional[str] = None,
+        passenger_name: Optional[str] = None,
+        max_reservations: int = 5,
+    ) -> List[ReservationRow]:
+        pnr = normalize_pnr(reservation_no)
+        name = normalize_name(passenger_name)
+        if pnr:
+            rows = self._by_pnr.get(pnr, [])
+            if name and all(row["RSV_USR_NM"] != name for row in rows):
+                return []
+            return [dict(row) for row in rows]
+        if name:
+            pnrs = self._pnrs_by_name.get(name, [])[:max_reservations]
+            return [dict(row) for pnr in pnrs for row in self._by_pnr[pnr]]
+        return []
+
+
+# 생성된 예약 파일을 메모리 매핑하여 조회하는 저장소
+# 시작 시 파일을 읽어 들이지 않으며, 조회는 해시 인덱스 탐색 후 일치한 예약의 구간만 응답 형식으로 변환합니다.
+class MappedReservationStore:
+
+    def __init__(self, path: str):
+        self.path = path
+        self._file = open(path, "rb")
+        self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        header = HEADER.unpack_from(self._mmap, 0)
+        if header[0] != INDEX_MAGIC:
+            raise ValueError(f"예약 데이터 파일이 아닙니다: {path}")
+        (
+            self._count,
+            self._segment_count,
+            pnr_slots,
+            name_slots,
+            name_count,
+        ) = header[1:6]
+        offsets = dict(zip(SECTIONS, header[6:]))
+
+        view = memoryview(self._mmap)
+        self._reservations_start = offsets["reservations"]
+        self._segments_start = offsets["segments"]
+        self._pnr_hashes = view[
+            offsets["pnr_hashes"] : offsets["pnr_hashes"] + 8 * pnr_slots
+        ].cast("Q")
+        self._pnr_values = view[
+            offsets["pnr_values"] : offsets["pnr_values"] + 4 * pnr_slots
+        ].cast("I")
+        self._name_hashes = view[
+            offsets["name_hashes"] : offsets["name_hashes"] + 8 * name_slots
+        ].cast("Q")
+        self._name_values = view[
+            offsets["name_values"] : offsets["name_values"] + 4 * name_slots
+        ].cast("I")
+        self._name_offsets = view[
+            offsets["name_offsets"] : offsets["name_offsets"] + 4 * (name_count + 1)
+        ].cast("I")
+        self._name_blob_start = offsets["name_blob"]
+        self._postings_start = view[
+            offsets["postings_start"] : offsets["postings_start"] + 4 * (name_count + 1)
+        ].cast("I")
+        self._postings = view[
+            offsets["postings"] : offsets["postings"] + 4 * self._count
+        ].cast("I")
+
+    def __len__(self) -> int:
+        return self._count
+
+    def _reservation(self, index: int) -> Tuple:
+        return RESERVATION.unpack_from(
+            self._mmap, self._reservations_start + RESERVATION.size * index
+        )
+
+    def _name(self, name_id: int) -> str:
+        start = self._name_blob_start + self._name_offsets[name_id]
+        end = self._name_blob_start + self._name_offsets[name_id + 1]
+        return self._mmap[start:end].decode("utf-8")
+
+    def _find_pnr(self, pnr: str) -> Optional[int]:
+        key_hash = _stable_hash(pnr)
+        encoded = pnr.encode("ascii")
+        mask = len(self._pnr_values) - 1
+        slot = key_hash & mask
+        while True:
+            value = self._pnr_values[slot]
+            if not value:
+                return None
+            if self._pnr_hashes[slot] == key_hash:
+                record = self._reservation(value - 1)
+                # 해시 충돌에 대비해 실제 코드를 비교합니다.
+                if encoded in (record[0], record[1]):
+                    return value - 1
+            slot = (slot + 1) & mask
+
+    def _find_name(self, name: str) -> Optional[int]:
+        key_hash = _stable_hash(name)
+        mask = len(self._name_values) - 1
+        slot = key_hash & mask
+        while True:
+            value = self._name_values[slot]
+            if not value:
+                return None
+            if self._name_hashes[slot] == key_hash and self._name(value - 1) == name:
+                return value - 1
+            slot = (slot + 1) & mask
+
+    def lookup(
+        self,
+        reservation_no: Optional[str] = None,
+        passenger_name: Optional[str] = None,
+        max_reservations: int = 5,
+    ) -> List[ReservationRow]:
+        """
+        예약 번호(RSV_NO 또는 ALPHA_PNR_NO)나 예약자 이름으로 예약을 찾아 구간별 행을 반환합니다.
+        둘 다 주어지면 예약 번호로 찾은 예약의 예약자 이름이 일치해야 합니다.
+        """
+        pnr = normalize_pnr(reservation_no)
+        name = normalize_name(passenger_name)
+        if pnr:
+            index = self._find_pnr(pnr)
+            if index is None:
+                return []
+            record = self._reservation(index)
+            if name and self._name(record[3]) != name:
+                return []
+            return self._rows(record)
+        if name:
+            name_id = self._find_name(name)
+            if name_id is None:
+                return []
+            start = self._postings_start[name_id]
+            end = min(self._postings_start[name_id + 1], start + max_reservations)
+            rows = []
+            for position in range(start, end):
+                rows.extend(self._rows(self._reservation(self._postings[position])))
+            return rows
+        return []
+
+    def _rows(self, record: Tuple) -> List[ReservationRow]:
+        (
+            rsv_no,
+            alpha_pnr_no,
+            pnr_seqno,
+            name_id,
+            reserved_at,
+            sale_amount,
+            first_segment,
+            airline,
+            trip_type,
+            inwon,
+            status,
+            segment_count,
+            international,
+        ) = record
+        segments = [
+            SEGMENT.unpack_from(
+                self._mmap,
+                self._segments_start + SEGMENT.size * (first_segment + k),
+            )
+            for k in range(segment_count)
+        ]
+        status_fields = RESERVATION_STATUSES[status]
+        rsv_no = rsv_no.decode("ascii")
+        reservation = {
+            "PNR_SEQNO": pnr_seqno,
+            "DI_FLAG": "I" if international else "D",
+            "STOCK_AIR_CD": AIRLINES[airline][0],
+            "STOCK_AIR_NM": AIRLINES[airline][1],
+            "TRIP_TYPE_CD": TRIP_TYPES[trip_type][0],
+            "TRIP_TYPE_NM": TRIP_TYPES[trip_type][1],
+            "RSV_INWON": inwon,
+            "RSV_NO": rsv_no,
+            "RSV_USR_NM": self._name(name_id),
+            "RSV_STATUS_CD": status_fields["RSV_STATUS_CD"],
+            "RSV_STATUS_NM": status_fields["RSV_STATUS_NM"],
+            "DEP_DTM": _format_dtm(segments[0][0]),
+            "ARR_DTM": _format_dtm(segments[-1][0]),
+            "RSV_DTM": _format_dtm(reserved_at),
+            "PAY_TL": _format_dtm(reserved_at - reserved_at % 60),
+            "PNR_SEAT_STATUS_CD": status_fields["PNR_SEAT_STATUS_CD"],
+            "PNR_SEAT_STATUS_NM": status_fields["PNR_SEAT_STATUS_NM"],
+            "PAY_STATUS_CD": status_fields["PAY_STATUS_CD"],
+            "PAY_STATUS_NM": status_fields["PAY_STATUS_NM"],
+            "ISSUE_STATUS_CD": status_fields["ISSUE_STATUS_CD"],
+            "ISSUE_STATUS_NM": status_fields["ISSUE_STATUS_NM"],
+            "SALE_TOT_AMT": sale_amount,
+            "SEG_RSV_YN": "Y",
+            "CANCEL_YN": status_fields["CANCEL_YN"],
+            "FARE_CONFM_YN": "Y",
+            "MIJUNG_AMT_YN": "N",
+            "PROOF_DOC_REQUIRE_YN": "N",
+            "PROOF_DOC_CONFM_YN": "N",
+            "ALPHA_PNR_NO": alpha_pnr_no.decode("ascii"),
+        }
+
+        rows = []
+        for itin_no, segment in enumerate(segments, start=1):
+            dep_at, arr_at, flight_no, operating, dep, arr, codeshare = segment
+            dep_dtm = _format_dtm(dep_at)
+            arr_dtm = _format_dtm(arr_at)
+            dep_airport = AIRPORTS[dep]
+            arr_airport = AIRPORTS[arr]
+            codeshare_airline = AIRLINES[codeshare - 1] if codeshare else ("", "")
+            row = dict(reservation)
+            row.update(
+                {
+                    "ITIN_NO": itin_no,
+                    "ITIN_BUNDLE_UNIT": str(itin_no),
+                    "FLTNO": f"{AIRLINES[operating][0]}{flight_no}",
+                    "FLT_AIR_CD": AIRLINES[operating][0],
+                    "FLT_AIR_NM": AIRLINES[operating][1],
+                    "DEP_CITY_CD": dep_airport[0],
+                    "DEP_CITY_NM": dep_airport[1],
+                    "DEP_AIRPORT_CD": dep_airport[0],
+                    "DEP_AIRPORT_NM": dep_airport[2],
+                    "DEP_DATE": dep_dtm[:8],
+                    "DEP_TM": dep_dtm[8:12],
+                    "ARR_CITY_CD": arr_airport[0],
+                    "ARR_CITY_NM": arr_airport[1],
+                    "ARR_AIRPORT_CD": arr_airport[0],
+                    "ARR_AIRPORT_NM": arr_airport[2],
+                    "ARR_DATE": arr_dtm[:8],
+                    "ARR_TM": arr_dtm[8:12],
+                    "AUTO_ISSUE_YN": "N",
+                    "STOP_OVER_YN": "N",
+                    "ATC_REISSUE_FLAG": "N",
+                    "FLIGHTS_STATUS": status_fields["FLIGHTS_STATUS"],
+                    "FLIGHTS_STATUS_CD": status_fields["FLIGHTS_STATUS_CD"],
+                    "CODESHARE_YN": "Y" if codeshare else "N",
+                    "CODESHARE_AIR_CD": codeshare_airline[0],
+                    "CODESHARE_AIR_NM": codeshare_airline[1],
+                    "CODESHARE_CD_IMG": "",
+                }
+            )
+            rows.append(row)
+        return rows
+
+
+def load_reservation_store(path: Optional[str]):
+    """설정에 맞는 예약 저장소를 반환합니다. 파일이 없으면 예시 예약만 조회됩니다."""
+    if not path:
+        return InMemoryReservationStore(SAMPLE_RESERVATION_ROWS)
+    store = MappedReservationStore(path)
+    logger.info(f"예약 데이터를 로드했습니다: {path} ({len(store)}건)")
+    return store
+
+
+if __name__ == "__main__":
+    # 사용 예: python -m app.services.reservation_store reservations.rsv --count 1000000
+    parser = argparse.ArgumentParser(description="합성 예약 데이터 파일 생성")
+    parser.add_argument("path", help="생성할 예약 데이터 파일 경로")
+    parser.add_argument("--count", type=int, default=1_000_000, help="예약 수")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    generate_reservation_file(args.path, args.count, args.seed)
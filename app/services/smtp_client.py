@@ -0,0 +1,191 @@
+import asyncio
+import base64
+import ssl
+from typing import Dict, List, Optional, Tuple
+from app.core.logging import get_logger
+
+logger = get_logger(__name__)
+
+
+class SmtpError(Exception):
+    """SMTP 서버와의 통신에 실패했을 때 발생하는 예외 (연결은 다시 맺어야 합니다)"""
+
+
+class SmtpReplyError(SmtpError):
+    """서버가 명령을 거절했을 때 발생하는 예외 (RSET 후 같은 연결을 계속 사용할 수 있습니다)"""
+
+    def __init__(self, command: str, code: int, message: str):
+        super().__init__(f"{command} 거절됨: {code} {message}")
+        self.command = command
+        self.code = code
+        self.message = message
+
+    @property
+    def permanent(self) -> bool:
+        # 5xx는 재시도해도 같은 결과이고, 4xx는 일시적인 오류입니다.
+        return self.code >= 500
+
+
+def _dot_stuff(data: bytes) -> bytes:
+    """DATA 본문의 '.'으로 시작하는 줄 앞에 '.'을 하나 더 붙이고 CRLF로 끝나게 합니다."""
+    if data.startswith(b"."):
+        data = b"." + data
+    if b"\n." in data:
+        data = data.replace(b"\n.", b"\n..")
+    if not data.endswith(b"\r\n"):
+        data += b"\r\n"
+    return data
+
+
+# asyncio 스트림 위에서 동작하는 SMTP 클라이언트 연결 하나
+# 한 번 맺은 연결로 여러 메시지를 보내며, 서버가 PIPELINING을 지원하면
+# MAIL FROM / RCPT TO / DATA를 한 번에 보내 메시지당 왕복을 한 번으로 줄입니다.
+class SmtpConnection:
+
+    def __init__(
+        self,
+        host: str,
+        port: int,
+        timeout_seconds: float = 10.0,
+        local_hostname: str = "localhost",
+        username: Optional[str] = None,
+        password: Optional[str] = None,
+        starttls: bool = False,
+    ):
+        self.host = host
+        self.port = port
+        self.timeout_seconds = timeout_seconds
+        self.local_hostname = local_hostname
+        self.username = username
+        self.password = password
+        self.starttls = starttls
+        self.extensions: Dict[str, str] = {}
+        self._reader: Optional[asyncio.StreamReader] = None
+        self._writer: Optional[asyncio.StreamWriter] = None
+
+    @property
+    def pipelining(self) -> bool:
+        return "PIPELINING" in self.extensions
+
+    async def connect(self):
+        self._reader, self._writer = await asyncio.wait_for(
+            asyncio.open_connection(self.host, self.port), self.timeout_seconds
+        )
+        await self._expect("CONNECT", 220)
+        await self._ehlo()
+        if self.starttls:
+            if "STARTTLS" not in self.extensions:
+                raise SmtpError(
+                    f"{self.host}:{self.port}가 STARTTLS를 지원하지 않습니다."
+                )
+            self._writer.write(b"STARTTLS\r\n")
+            await self._expect("STARTTLS", 220)
+            await self._writer.start_tls(
+                ssl.create_default_context(), server_hostname=self.host
+            )
+            await self._ehlo()
+        if self.username:
+            token = base64.b64encode(
+                f"\0{self.username}\0{self.password or ''}".encode("utf-8")
+            ).decode("ascii")
+            self._writer.write(f"AUTH PLAIN {token}\r\n".encode("ascii"))
+            await self._expect("AUTH", 235)
+
+    async def _ehlo(self):
+        self._writer.write(f"EHLO {self.local_hostname}\r\n".encode("ascii"))
+        code, lines = await self._read_reply()
+        if code != 250:
+            raise SmtpReplyError("EHLO", code, " ".join(lines))
+        self.extensions = {}
+        # 첫 줄은 서버 인사말이고, 이후 줄이 지원 확장 목록입니다.
+        for line in lines[1:]:
+            keyword, _, params = line.partition(" ")
+            self.extensions[keyword.upper()] = params
+
+    async def send(self, mail_from: str, rcpt_to: str, data: bytes) -> str:
+        """
+        메시지 하나를 보내고 DATA 종료에 대한 서버 응답(큐 ID 등)을 반환합니다.
+        서버가 거절하면 RSET으로 트랜잭션을 정리한 뒤 SmtpReplyError를 발생시킵니다.
+        """
+        commands: List[Tuple[str, bytes, int]] = [
+            ("MAIL", f"MAIL FROM:<{mail_from}>\r\n".encode("ascii"), 250),
+            ("RCPT", f"RCPT TO:<{rcpt_to}>\r\n".encode("ascii"), 250),
+            ("DATA", b"DATA\r\n", 354),
+        ]
+        try:
+            if self.pipelining:
+                self._writer.write(b"".join(command for _, command, _ in commands))
+                # 파이프라이닝에서는 앞 명령이 실패해도 뒤 명령의 응답까지 모두 읽어야 합니다.
+                failure: Optional[SmtpReplyError] = None
+                data_accepted = False
+                for name, _, expected in commands:
+                    code, lines = await self._read_reply()
+                    if code != expected and failure is None:
+                        failure = SmtpReplyError(name, code, " ".join(lines))
+                    data_accepted = name == "DATA" and code == 354
+                if failure is not None:
+                    if data_accepted:
+                        # MAIL/RCPT가 실패했는데 DATA가 수락된 경우 빈 본문으로 데이터 단계를 끝냅니다.
+                        self._writer.write(b".\r\n")
+                        await self._read_reply()
+                    raise failure
+            else:
+                for name, command, expected in commands:
+                    self._writer.write(command)
+                    await self._expect(name, expected)
+
+            self._writer.write(_dot_stuff(data) + b".\r\n")
+            code, lines = await self._read_reply()
+            if code != 250:
+                raise SmtpReplyError("DATA", code, " ".join(lines))
+            return " ".join(lines)
+        except SmtpReplyError:
+            await self.reset()
+            raise
+
+    async def reset(self):
+        self._writer.write(b"RSET\r\n")
+        await self._expect("RSET", 250)
+
+    async def close(self):
+        """QUIT을 보내고 연결을 닫습니다. 이미 끊긴 연결이어도 예외를 발생시키지 않습니다."""
+        writer = self._writer
+        if writer is None:
+            return
+        self._writer = None
+        try:
+            if not writer.is_closing():
+                writer.write(b"QUIT\r\n")
+                await asyncio.wait_for(self._read_reply(), 1.0)
+        except (SmtpError, OSError, asyncio.TimeoutError):
+            pass
+        finally:
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except OSError:
+                pass
+
+    async def _expect(self, command: str, expected: int):
+        code, lines = await self._read_reply()
+        if code != expected:
+            raise SmtpReplyError(command, code, " ".join(lines))
+
+    async def _read_reply(self) -> Tuple[int, List[str]]:
+        """여러 줄 응답("250-..." ... "250 ...")을 모두 읽어 (코드, 줄 목록)을 반환합니다."""
+        lines: List[str] = []
+        while True:
+            try:
+                raw = await asyncio.wait_for(
+                    self._reader.readline(), self.timeout_seconds
+                )
+            except asyncio.TimeoutError:
+                raise SmtpError(f"{self.host}:{self.port} 응답 시간 초과")
+            if not raw:
+                raise SmtpError(f"{self.host}:{self.port} 연결이 끊어졌습니다.")
+            line = raw.decode("utf-8", "replace").rstrip("\r\n")
+            if len(line) < 3 or not line[:3].isdigit():
+                raise SmtpError(f"잘못된 SMTP 응답: {line!r}")
+            lines.append(line[4:])
+            if line[3:4] != "-":
+                return int(line[:3]), lines
@@ -0,0 +1,288 @@
+import heapq
+import json
+import os
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+from app.core.logging import get_logger
+
+logger = get_logger(__name__)
+
+# 기사 명단 파일이 없을 때 사용하는 서비스 지역
+# charger_prefixes: 충전기 번호 앞자리(영문 지역 코드), keywords: 위치 문자열에서 찾는 지명
+DEFAULT_SERVICE_AREAS: Dict[str, Dict[str, List[str]]] = {
+    "서울/경기": {
+        "charger_prefixes": ["SEL", "GGI", "ICN"],
+        "keywords": ["서울", "경기", "인천"],
+    },
+    "부산/울산": {
+        "charger_prefixes": ["BSN", "USN", "GNM"],
+        "keywords": ["부산", "울산", "경남"],
+    },
+    "대구/경북": {
+        "charger_prefixes": ["DGU", "GBK"],
+        "keywords": ["대구", "경북"],
+    },
+    "광주/전남": {
+        "charger_prefixes": ["GWJ", "JNM"],
+        "keywords": ["광주", "전남"],
+    },
+    "대전/충청": {
+        "charger_prefixes": ["DJN", "CCN", "CCB", "SJG"],
+        "keywords": ["대전", "충청", "충남", "충북", "세종"],
+    },
+}
+
+DEFAULT_TECHNICIANS: List[Dict[str, Any]] = [
+    {"name": "김기사", "contact": "010-1234-5678", "areas": ["서울/경기"]},
+    {"name": "박기사", "contact": "010-2345-6789", "areas": ["부산/울산"]},
+    {"name": "이기사", "contact": "010-3456-7890", "areas": ["대구/경북"]},
+    {"name": "정기사", "contact": "010-4567-8901", "areas": ["광주/전남"]},
+    {"name": "최기사", "contact": "010-5678-9012", "areas": ["대전/충청"]},
+]
+
+# 충전기 번호와 위치로 지역을 찾지 못했을 때의 지역 이름 (전체 기사 중에서 배정)
+UNRESOLVED_AREA = "미확인"
+
+
+class Technician:
+    __slots__ = ("index", "name", "contact", "areas", "open_tickets", "version")
+
+    def __init__(self, index: int, name: str, contact: str, areas: List[str]):
+        self.index = index
+        self.name = name
+        self.contact = contact
+        self.areas = areas
+        self.open_tickets = 0
+        # 힙 항목 중 이 값과 같은 순번을 가진 항목만 유효합니다.
+        self.version = index
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "name": self.name,
+            "contact": self.contact,
+            "area": ", ".join(self.areas),
+            "open_tickets": self.open_tickets,
+        }
+
+
+# 지역 하나의 기사들을 (미결 티켓 수, 부하가 바뀐 순번) 최소 힙으로 관리합니다.
+# 기사는 여러 지역 힙에 들어갈 수 있으므로 부하가 바뀌면 새 항목을 넣고,
+# 순번이 기사의 현재 version과 다른 항목은 꺼낼 때 버립니다 (지연 삭제).
+class _AreaHeap:
+    __slots__ = ("entries", "members")
+
+    def __init__(self):
+        self.entries: List[Tuple[int, int, int]] = []
+        self.members = 0
+
+
+# create_support_ticket 도구의 기사 배정기
+# 충전기 번호 접두사(없으면 위치 문자열)로 서비스 지역을 정하고, 그 지역의 최소 힙에서
+# 미결 티켓이 가장 적은 기사를 O(log n)에 배정합니다. 부하가 같으면 가장 오래전에 배정된 기사가 먼저입니다.
+# 티켓은 close_support_ticket 도구로 종결되며, 종결되지 않은 티켓도 ticket_ttl_seconds가 지나거나
+# 미결 티켓이 max_open_tickets개를 넘으면 오래된 것부터 자동 종결되어 부하와 메모리가 계속 늘지 않습니다.
+class TechnicianDispatcher:
+
+    def __init__(
+        self,
+        areas: Dict[str, Dict[str, List[str]]],
+        technicians: List[Dict[str, Any]],
+        ticket_ttl_seconds: float = 7 * 24 * 3600,
+        max_open_tickets: int = 100000,
+    ):
+        self._prefixes: Dict[str, str] = {}
+        self._keywords: List[Tuple[str, str]] = []
+        for area, rules in areas.items():
+            for prefix in rules.get("charger_prefixes", []):
+                self._prefixes[prefix.upper()] = area
+            for keyword in rules.get("keywords", []):
+                self._keywords.append((keyword, area))
+        self._prefix_lengths = sorted({len(p) for p in self._prefixes}, reverse=True)
+        self.areas = list(areas)
+
+        self.technicians: List[Technician] = []
+        self._heaps: Dict[str, _AreaHeap] = {area: _AreaHeap() for area in areas}
+        # 지역을 알 수 없는 티켓은 전체 기사 중에서 배정합니다.
+        self._heaps[UNRESOLVED_AREA] = _AreaHeap()
+        for item in technicians:
+            item_areas = [str(a) for a in item.get("areas") or [item.get("area")] if a]
+            unknown = [a for a in item_areas if a not in areas]
+            if not item.get("name") or not item_areas or unknown:
+                raise ValueError(f"기사 정보가 올바르지 않습니다: {item}")
+            technician = Technician(
+                len(self.technicians),
+                str(item["name"]),
+                str(item.get("contact", "")),
+                item_areas,
+            )
+            self.technicians.append(technician)
+            for area in item_areas + [UNRESOLVED_AREA]:
+                heap = self._heaps[area]
+                heap.entries.append((0, technician.index, technician.index))
+                heap.members += 1
+        self._seq = len(self.technicians)
+        self.ticket_ttl_seconds = ticket_ttl_seconds
+        self.max_open_tickets = max_open_tickets
+        # 배정된 티켓 ID -> (기사 번호, 배정 monotonic 시각), 배정 순서대로 보관합니다.
+        self._open: "OrderedDict[str, Tuple[int, float]]" = OrderedDict()
+        self.counts = {
+            "assigned": 0,
+            "released": 0,
+            "expired": 0,
+            "unresolved_area": 0,
+        }
+
+    def resolve_area(
+        self, charger_id: Optional[str], location: Optional[str] = None
+    ) -> Optional[str]:
+        """충전기 번호의 가장 긴 접두사, 없으면 위치 문자열의 지명으로 서비스 지역을 찾습니다."""
+        if charger_id:
+            code = charger_id.strip().upper()
+            for length in self._prefix_lengths:
+                area = self._prefixes.get(code[:length])
+                if area is not None:
+                    return area
+        if location:
+            for keyword, area in self._keywords:
+                if keyword in location:
+                    return area
+        return None
+
+    def assign(
+        self,
+        ticket_id: str,
+        charger_id: Optional[str],
+        location: Optional[str] = None,
+    ) -> Optional[Tuple[str, Technician]]:
+        """
+        티켓에 기사를 배정하고 (서비스 지역, 기사)를 반환합니다.
+        지역을 알 수 없으면 전체 기사 중 부하가 가장 적은 기사를, 배정할 기사가 없으면 None을 반환합니다.
+        """
+        now = time.monotonic()
+        self._expire(now, incoming=1)
+        area = self.resolve_area(charger_id, location)
+        if area is None:
+            self.counts["unresolved_area"] += 1
+        heap = self._heaps[area if area is not None else UNRESOLVED_AREA]
+        technician = self._pop_least_loaded(heap)
+        if technician is None:
+            return None
+        self._set_load(technician, technician.open_tickets + 1)
+        self._open[ticket_id] = (technician.index, now)
+        self.counts["assigned"] += 1
+        return (area or UNRESOLVED_AREA), technician
+
+    def release(self, ticket_id: str) -> Optional[Technician]:
+        """티켓이 종결되면 담당 기사의 미결 티켓 수를 하나 줄이고 그 기사를 반환합니다."""
+        entry = self._open.pop(ticket_id, None)
+        if entry is None:
+            return None
+        technician = self.technicians[entry[0]]
+        self._set_load(technician, technician.open_tickets - 1)
+        self.counts["released"] += 1
+        return technician
+
+    def _expire(self, now: float, incoming: int = 0):
+        """
+        보관 기간이 지났거나 한도를 넘은 미결 티켓을 배정 순서대로 종결 처리합니다.
+        incoming은 곧 추가될 티켓 수로, 추가 후에도 한도를 넘지 않도록 자리를 비워 둡니다.
+        """
+        deadline = now - self.ticket_ttl_seconds
+        while self._open:
+            ticket_id, (index, assigned_at) = next(iter(self._open.items()))
+            if (
+                assigned_at > deadline
+                and len(self._open) + incoming <= self.max_open_tickets
+            ):
+                break
+            del self._open[ticket_id]
+            technician = self.technicians[index]
+            self._set_load(technician, technician.open_tickets - 1)
+            self.counts["expired"] += 1
+
+    def _pop_least_loaded(self, heap: _AreaHeap) -> Optional[Technician]:
+        entries = heap.entries
+        while entries:
+            _, version, index = heapq.heappop(entries)
+            technician = self.technicians[index]
+            if version == technician.version:
+                return technician
+        return None
+
+    def _set_load(self, technician: Technician, load: int):
+        technician.open_tickets = load
+        self._seq += 1
+        technician.version = self._seq
+        entry = (load, self._seq, technician.index)
+        for area in technician.areas + [UNRESOLVED_AREA]:
+            heap = self._heaps[area]
+            heapq.heappush(heap.entries, entry)
+            # 지연 삭제로 쌓인 항목이 기사 수의 몇 배가 되면 유효한 항목만 남겨 다시 만듭니다.
+            if len(heap.entries) > 4 * heap.members + 64:
+                heap.entries = [
+                    e for e in heap.entries if e[1] == self.technicians[e[2]].version
+                ]
+                heapq.heapify(heap.entries)
+
+    def stats(self) -> Dict[str, Any]:
+        self._expire(time.monotonic())
+        areas: Dict[str, Dict[str, Any]] = {
+            area: {
+                "technicians": 0,
+                "open_tickets": 0,
+                "min_load": None,
+                "max_load": None,
+            }
+            for area in self.areas
+        }
+        for technician in self.technicians:
+            load = technician.open_tickets
+            for area in technician.areas:
+                summary = areas[area]
+                summary["technicians"] += 1
+                summary["open_tickets"] += load
+                if summary["min_load"] is None or load < summary["min_load"]:
+                    summary["min_load"] = load
+                if summary["max_load"] is None or load > summary["max_load"]:
+                    summary["max_load"] = load
+        return {
+            "technicians": len(self.technicians),
+            "open_tickets": len(self._open),
+            **self.counts,
+            "areas": areas,
+        }
+
+
+def load_technician_dispatcher(
+    roster_path: Optional[str],
+    ticket_ttl_seconds: float = 7 * 24 * 3600,
+    max_open_tickets: int = 100000,
+) -> TechnicianDispatcher:
+    """
+    기사 명단 파일(JSON)로 배정기를 만듭니다. 파일이 없거나 올바르지 않으면 기본 명단을 사용합니다.
+    {"areas": {"서울/경기": {"charger_prefixes": ["SEL"], "keywords": ["서울"]}, ...},
+     "technicians": [{"name": "김기사", "contact": "010-...", "areas": ["서울/경기"]}, ...]}
+    """
+    if roster_path and os.path.exists(roster_path):
+        try:
+            with open(roster_path, encoding="utf-8") as f:
+                roster = json.load(f)
+            dispatcher = TechnicianDispatcher(
+                roster.get("areas") or DEFAULT_SERVICE_AREAS,
+                roster.get("technicians") or [],
+                ticket_ttl_seconds,
+                max_open_tickets,
+            )
+            logger.info(
+                f"기사 명단을 로드했습니다: {roster_path} "
+                f"(기사 {len(dispatcher.technicians)}명, 지역 {len(dispatcher.areas)}개)"
+            )
+            return dispatcher
+        except (OSError, ValueError, AttributeError, TypeError) as e:
+            logger.error(f"기사 명단 로드 실패, 기본 명단을 사용합니다: {e}")
+    elif roster_path:
+        logger.warning(f"기사 명단 파일이 없어 기본 명단을 사용합니다: {roster_path}")
+    return TechnicianDispatcher(
+        DEFAULT_SERVICE_AREAS, DEFAULT_TECHNICIANS, ticket_ttl_seconds, max_open_tickets
+    )
@@ -0,0 +1,208 @@
+import glob
+import hashlib
+import json
+import os
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, List, Optional, Tuple
+import orjson
+from app.core.logging import get_logger
+from app.core.metrics import TOOL_CACHE_REQUESTS
+
+logger = get_logger(__name__)
+
+SCHEMA_SUFFIX = "_schema.json"
+
+# 키 필드를 선언하지 않은 도구에서 캐시 키에 넣지 않는 호출별 식별자
+VOLATILE_FIELDS = frozenset({"tool_call_id", "call_id", "agent_id"})
+
+
+# *_schema.json의 "x-cache" / "x-invalidates" 확장 필드로 선언한 도구별 캐시 정책
+# 예) "x-cache": {"ttl_seconds": 15, "key": ["charger_id"]}
+#     "x-invalidates": ["monitor_ev_system"]
+class ToolCachePolicy:
+    __slots__ = ("tool_name", "ttl_seconds", "key_fields", "invalidates")
+
+    def __init__(
+        self,
+        tool_name: str,
+        ttl_seconds: Optional[float],
+        key_fields: Optional[List[str]],
+        invalidates: List[str],
+    ):
+        self.tool_name = tool_name
+        self.ttl_seconds = ttl_seconds
+        self.key_fields = key_fields
+        self.invalidates = invalidates
+
+    @property
+    def cacheable(self) -> bool:
+        return bool(self.ttl_seconds and self.ttl_seconds > 0)
+
+
+def load_tool_cache_policies(schema_dir: str) -> Dict[str, ToolCachePolicy]:
+    """
+    schema_dir의 <tool_name>_schema.json 파일에서 캐시 정책을 읽습니다.
+    확장 필드가 없는 도구는 캐시하지 않으며, 읽을 수 없는 파일은 경고 후 건너뜁니다.
+    """
+    policies: Dict[str, ToolCachePolicy] = {}
+    for path in sorted(glob.glob(os.path.join(schema_dir, f"*{SCHEMA_SUFFIX}"))):
+        tool_name = os.path.basename(path)[: -len(SCHEMA_SUFFIX)]
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                schema = json.load(f)
+        except (OSError, ValueError) as e:
+            logger.warning(f"도구 스키마를 읽을 수 없어 건너뜁니다: {path} - {e}")
+            continue
+
+        cache = schema.get("x-cache") or {}
+        invalidates = schema.get("x-invalidates") or []
+        if not cache and not invalidates:
+            continue
+        key_fields = cache.get("key")
+        policies[tool_name] = ToolCachePolicy(
+            tool_name,
+            ttl_seconds=cache.get("ttl_seconds"),
+            key_fields=list(key_fields) if key_fields is not None else None,
+            invalidates=list(invalidates),
+        )
+    return policies
+
+
+class _CachedResponse:
+    __slots__ = ("tool_name", "response", "expires_at")
+
+    def __init__(self, tool_name: str, response: Dict[str, Any], expires_at: float):
+        self.tool_name = tool_name
+        self.response = response
+        self.expires_at = expires_at
+
+
+# 읽기 전용 도구의 응답 캐시 (도구 이름 + 정규화한 인수 해시 키, 도구별 TTL, 크기 제한 LRU)
+# 상태를 바꾸는 도구가 실행되면 x-invalidates에 선언한 도구의 같은 키 항목을 지웁니다.
+class ToolResponseCache:
+
+    def __init__(self, policies: Dict[str, ToolCachePolicy], max_entries: int):
+        self.policies = policies
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Hashable, _CachedResponse]" = OrderedDict()
+        self.hits: Dict[str, int] = {}
+        self.misses: Dict[str, int] = {}
+        self.invalidations = 0
+        self.evictions = 0
+
+    def _key(
+        self, policy: ToolCachePolicy, payload: Dict[str, Any]
+    ) -> Optional[Tuple[str, bytes]]:
+        if policy.key_fields is None:
+            args = {k: v for k, v in payload.items() if k not in VOLATILE_FIELDS}
+        else:
+            args = {field: payload.get(field) for field in policy.key_fields}
+        # 핸들러가 앞뒤 공백을 무시하므로 키에서도 무시합니다.
+        args = {k: v.strip() if isinstance(v, str) else v for k, v in args.items()}
+        try:
+            canonical = orjson.dumps(
+                args, option=orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS
+            )
+        except TypeError:
+            return None
+        return policy.tool_name, hashlib.blake2b(canonical, digest_size=16).digest()
+
+    def lookup(
+        self, tool_name: str, payload: Dict[str, Any]
+    ) -> Tuple[Optional[Hashable], Optional[Dict[str, Any]]]:
+        """
+        캐시 키와 캐시된 응답을 반환합니다.
+        캐시 대상이 아닌 도구는 (None, None), 미스이거나 만료된 경우 (키, None)을 반환합니다.
+        """
+        policy = self.policies.get(tool_name)
+        if policy is None or not policy.cacheable:
+            return None, None
+        key = self._key(policy, payload)
+        if key is None:
+            return None, None
+
+        entry = self._entries.get(key)
+        if entry is not None:
+            if time.monotonic() < entry.expires_at:
+                self._entries.move_to_end(key)
+                self.hits[tool_name] = self.hits.get(tool_name, 0) + 1
+                TOOL_CACHE_REQUESTS.inc(tool_name, "hit")
+                return key, entry.response
+            del self._entries[key]
+        self.misses[tool_name] = self.misses.get(tool_name, 0) + 1
+        TOOL_CACHE_REQUESTS.inc(tool_name, "miss")
+        return key, None
+
+    def store(
+        self,
+        tool_name: str,
+        payload: Dict[str, Any],
+        key: Optional[Hashable],
+        response: Dict[str, Any],
+    ):
+        """
+        도구 실행 결과를 반영합니다. 오류 응답은 캐시하지 않으며,
+        상태를 바꾸는 도구라면 영향을 받는 도구의 캐시 항목을 무효화합니다.
+        """
+        policy = self.policies.get(tool_name)
+        if policy is None:
+            return
+        for target in policy.invalidates:
+            self.invalidate(target, payload)
+
+        if key is None or response.get("status") == "error" or "error" in response:
+            return
+        self._entries[key] = _CachedResponse(
+            tool_name, response, time.monotonic() + policy.ttl_seconds
+        )
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def invalidate(self, tool_name: str, payload: Dict[str, Any]) -> int:
+        """
+        payload의 인수로 만든 tool_name의 캐시 항목을 지웁니다.
+        대상 도구의 키 필드가 payload에 없으면 그 도구의 항목을 모두 지웁니다.
+        """
+        policy = self.policies.get(tool_name)
+        if policy is None or not policy.cacheable:
+            return 0
+
+        if policy.key_fields is not None and all(
+            field in payload for field in policy.key_fields
+        ):
+            key = self._key(policy, payload)
+            removed = 1 if self._entries.pop(key, None) is not None else 0
+        else:
+            keys = [k for k, e in self._entries.items() if e.tool_name == tool_name]
+            for k in keys:
+                del self._entries[k]
+            removed = len(keys)
+
+        if removed:
+            self.invalidations += removed
+            TOOL_CACHE_REQUESTS.inc(tool_name, "invalidated", amount=removed)
+        return removed
+
+    def stats(self) -> Dict[str, Any]:
+        tools = {}
+        for tool_name, policy in self.policies.items():
+            if not policy.cacheable:
+                continue
+            hits = self.hits.get(tool_name, 0)
+            misses = self.misses.get(tool_name, 0)
+            tools[tool_name] = {
+                "ttl_seconds": policy.ttl_seconds,
+                "hits": hits,
+                "misses": misses,
+                "hit_rate": round(hits / (hits + misses), 4) if hits + misses else None,
+            }
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "invalidations": self.invalidations,
+            "evictions": self.evictions,
+            "tools": tools,
+        }
@@ -0,0 +1,190 @@
+import asyncio
+import contextlib
+import json
+from typing import Any, Dict, List, Optional, Sequence
+from app.core.logging import get_logger
+
+logger = get_logger(__name__)
+
+# 도구별로 추적하는 인수 형태의 종류 수 상한 (초과분은 "other"로 집계)
+MAX_ARG_SHAPES_PER_TOOL = 64
+OTHER_LABEL = "other"
+
+
+class ToolUsageCounters:
+    __slots__ = ("invocations", "results", "errors", "unmatched_results", "arg_shapes")
+
+    def __init__(self):
+        self.invocations = 0
+        self.results = 0
+        self.errors = 0
+        self.unmatched_results = 0
+        self.arg_shapes: Dict[str, int] = {}
+
+    def merge(self, other: "ToolUsageCounters"):
+        self.invocations += other.invocations
+        self.results += other.results
+        self.errors += other.errors
+        self.unmatched_results += other.unmatched_results
+        for shape, count in other.arg_shapes.items():
+            if (
+                shape not in self.arg_shapes
+                and len(self.arg_shapes) >= MAX_ARG_SHAPES_PER_TOOL
+            ):
+                shape = OTHER_LABEL
+            self.arg_shapes[shape] = self.arg_shapes.get(shape, 0) + count
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "invocations": self.invocations,
+            "results": self.results,
+            "errors": self.errors,
+            "error_rate": (
+                round(self.errors / self.results, 4) if self.results else None
+            ),
+            "unmatched_results": self.unmatched_results,
+            "arg_shapes": dict(
+                sorted(self.arg_shapes.items(), key=lambda item: -item[1])
+            ),
+        }
+
+
+def _argument_shape(arguments: Optional[Dict[str, Any]]) -> str:
+    """인수 값은 제외하고 키와 값 타입만으로 인수 형태를 표현합니다."""
+    if not arguments:
+        return "{}"
+    return ",".join(
+        f"{key}:{type(value).__name__}" for key, value in sorted(arguments.items())
+    )
+
+
+def _is_error_result(content: Optional[str]) -> bool:
+    """도구 결과(JSON 문자열)의 status가 error이거나 error 키가 있으면 오류로 판단합니다."""
+    if not content:
+        return False
+    try:
+        result = json.loads(content)
+    except ValueError:
+        return False
+    return isinstance(result, dict) and (
+        result.get("status") == "error" or "error" in result
+    )
+
+
+def extract_tool_usage(entries: Sequence[Any]) -> Dict[str, ToolUsageCounters]:
+    """
+    transcript_with_tool_calls 항목을 한 번만 순회하며 도구별 사용 통계를 계산합니다.
+    tool_call_invocation과 tool_call_result는 tool_call_id로 짝지어집니다.
+    """
+    delta: Dict[str, ToolUsageCounters] = {}
+    pending: Dict[str, str] = {}
+
+    for entry in entries:
+        role = entry.role
+        if role == "tool_call_invocation":
+            name = getattr(entry, "name", None) or "unknown"
+            counters = delta.get(name)
+            if counters is None:
+                counters = delta[name] = ToolUsageCounters()
+            counters.invocations += 1
+            shape = _argument_shape(getattr(entry, "arguments", None))
+            counters.arg_shapes[shape] = counters.arg_shapes.get(shape, 0) + 1
+            tool_call_id = getattr(entry, "tool_call_id", None)
+            if tool_call_id is not None:
+                pending[tool_call_id] = name
+        elif role == "tool_call_result":
+            name = pending.pop(getattr(entry, "tool_call_id", None), None)
+            unmatched = name is None
+            if unmatched:
+                name = getattr(entry, "name", None) or "unknown"
+            counters = delta.get(name)
+            if counters is None:
+                counters = delta[name] = ToolUsageCounters()
+            counters.results += 1
+            counters.unmatched_results += unmatched
+            if _is_error_result(getattr(entry, "content", None)):
+                counters.errors += 1
+
+    return delta
+
+
+# call_ended 대화 스크립트에서 도구 사용 통계를 누적하는 서비스
+# 웹훅 경로를 막지 않도록 큐에 넣기만 하고, 집계는 백그라운드 워커가 통화 단위로 수행합니다.
+# 항목은 이미 검증된 모델이고 집계는 GIL을 잡는 순수 파이썬 연산이라 스레드로 넘기지 않으며,
+# 대신 통화 하나를 처리할 때마다 이벤트 루프에 양보합니다.
+class ToolUsageAnalytics:
+
+    def __init__(self, queue_size: int, max_tools: int):
+        self.queue_size = queue_size
+        self.max_tools = max_tools
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker: Optional[asyncio.Task] = None
+        self._tools: Dict[str, ToolUsageCounters] = {}
+        self.processed_calls = 0
+        self.dropped_calls = 0
+
+    def submit(self, entries: List[Any]) -> bool:
+        """대화 스크립트를 처리 큐에 넣습니다. 큐가 가득 차면 버리고 False를 반환합니다."""
+        if self._queue is None:
+            self._queue = asyncio.Queue(maxsize=self.queue_size)
+        if self._worker is None or self._worker.done():
+            self._worker = asyncio.get_running_loop().create_task(self._run())
+        try:
+            self._queue.put_nowait(entries)
+            return True
+        except asyncio.QueueFull:
+            self.dropped_calls += 1
+            logger.warning("도구 사용 통계 큐가 가득 차 대화 스크립트를 건너뜁니다.")
+            return False
+
+    async def _run(self):
+        while True:
+            entries = await self._queue.get()
+            try:
+                self._merge(extract_tool_usage(entries))
+                self.processed_calls += 1
+            except Exception as e:
+                logger.error(f"도구 사용 통계 처리 중 오류 발생: {e}")
+            finally:
+                self._queue.task_done()
+            # 큐에 항목이 쌓여 있으면 get()이 양보하지 않으므로 직접 양보합니다.
+            await asyncio.sleep(0)
+
+    def _merge(self, delta: Dict[str, ToolUsageCounters]):
+        for name, counters in delta.items():
+            current = self._tools.get(name)
+            if current is None:
+                if len(self._tools) >= self.max_tools:
+                    name = OTHER_LABEL
+                    current = self._tools.setdefault(name, ToolUsageCounters())
+                else:
+                    current = self._tools[name] = ToolUsageCounters()
+            current.merge(counters)
+
+    async def aclose(self, drain_timeout_seconds: float = 5.0):
+        """큐에 남은 대화 스크립트를 drain_timeout_seconds 동안 처리한 뒤 백그라운드 워커를 종료합니다."""
+        if self._queue is not None and self._worker is not None:
+            try:
+                await asyncio.wait_for(self._queue.join(), drain_timeout_seconds)
+            except asyncio.TimeoutError:
+                logger.warning(
+                    f"도구 사용 통계 큐에 남은 {self._queue.qsize()}건을 처리하지 못하고 종료합니다."
+                )
+        if self._worker is not None:
+            self._worker.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._worker
+            self._worker = None
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "processed_calls": self.processed_calls,
+            "dropped_calls": self.dropped_calls,
+            "pending_calls": self._queue.qsize() if self._queue else 0,
+            "tools": {
+                name: counters.to_dict()
+                for name, counters in sorted(
+                    self._tools.items(), key=lambda item: -item[1].invocations
+                )
+            },
+        }
@@ -0,0 +1,446 @@
+import asyncio
+import contextlib
+import random
+import time
+import uuid
+from collections import OrderedDict
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Set
+import httpx
+from app.core.config import Settings
+from app.core.histogram import LogLinearHistogram
+from app.core.logging import get_logger
+from app.core.metrics import ZENDESK_TICKETS
+from app.core.tracing import SPAN_KIND_CLIENT, trace_headers, tracer
+
+logger = get_logger(__name__)
+
+CREATE_MANY_PATH = "/api/v2/tickets/create_many.json"
+JOB_STATUS_PATH = "/api/v2/job_statuses/{job_id}.json"
+# Zendesk create_many가 한 번에 받는 최대 티켓 수
+CREATE_MANY_LIMIT = 100
+
+STATUS_PENDING = "pending"
+STATUS_SUBMITTED = "submitted"
+STATUS_CREATED = "created"
+STATUS_FAILED = "failed"
+
+_JOB_FINISHED = ("completed", "failed", "killed")
+
+# 요청이 서버에 전달되기 전에 실패한 것이 확실한 오류 (재전송해도 티켓이 중복되지 않습니다)
+_NOT_SENT_ERRORS = (httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout)
+
+
+def _header_float(headers: httpx.Headers, *names: str) -> Optional[float]:
+    for name in names:
+        value = headers.get(name)
+        if value is None:
+            continue
+        try:
+            return float(value)
+        except ValueError:
+            continue
+    return None
+
+
+# 응답의 속도 제한 헤더로 다음 요청 시각을 조절하는 페이서
+# 남은 호출 수(ratelimit-remaining)를 재설정까지 남은 시간(ratelimit-reset)에 고르게 나누어 보내고,
+# 429 응답을 받으면 Retry-After가 지날 때까지 요청을 보내지 않습니다.
+class RateLimitPacer:
+
+    def __init__(self, min_interval_seconds: float = 0.0):
+        self.min_interval_seconds = min_interval_seconds
+        self.next_allowed = 0.0
+        self.remaining: Optional[float] = None
+        self.limit: Optional[float] = None
+        self.throttled = 0
+        self.total_wait_seconds = 0.0
+
+    async def wait(self):
+        delay = self.next_allowed - time.monotonic()
+        if delay > 0:
+            self.total_wait_seconds += delay
+            await asyncio.sleep(delay)
+
+    def update(self, response: httpx.Response):
+        now = time.monotonic()
+        headers = response.headers
+        if response.status_code == 429:
+            self.throttled += 1
+            retry_after = _header_float(headers, "retry-after")
+            self.next_allowed = now + (retry_after if retry_after is not None else 60.0)
+            return
+
+        self.limit = _header_float(headers, "ratelimit-limit", "x-rate-limit")
+        self.remaining = _header_float(
+            headers, "ratelimit-remaining", "x-rate-limit-remaining"
+        )
+        interval = self.min_interval_seconds
+        if self.remaining is not None:
+            # Zendesk 한도는 분 단위이므로 재설정 시각이 없으면 60초 창으로 봅니다.
+            window = _header_float(headers, "ratelimit-reset") or 60.0
+            interval = max(interval, window / max(self.remaining, 1.0))
+        self.next_allowed = max(self.next_allowed, now + interval)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "limit": self.limit,
+            "remaining": self.remaining,
+            "throttled": self.throttled,
+            "total_wait_seconds": round(self.total_wait_seconds, 3),
+        }
+
+
+# 티켓 한 건의 생성 상태 (에이전트에게 준 임시 ID와 Zendesk가 부여한 실제 ID를 연결)
+class ZendeskTicketRecord:
+    __slots__ = (
+        "provisional_id",
+        "ticket",
+        "status",
+        "ticket_id",
+        "job_id",
+        "error",
+        "created_at",
+        "resolved_at",
+        "enqueued_monotonic",
+    )
+
+    def __init__(self, provisional_id: str, ticket: Dict[str, Any]):
+        self.provisional_id = provisional_id
+        self.ticket = ticket
+        self.status = STATUS_PENDING
+        self.ticket_id: Optional[str] = None
+        self.job_id: Optional[str] = None
+        self.error: Optional[str] = None
+        self.created_at = datetime.now()
+        self.resolved_at: Optional[datetime] = None
+        self.enqueued_monotonic = time.monotonic()
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "provisional_id": self.provisional_id,
+            "ticket_status": self.status,
+            "ticket_id": self.ticket_id,
+            "job_id": self.job_id,
+            "error": self.error,
+            "created_at": self.created_at.strftime("%Y-%m-%d %H:%M:%S"),
+            "resolved_at": (
+                self.resolved_at.strftime("%Y-%m-%d %H:%M:%S")
+                if self.resolved_at
+                else None
+            ),
+        }
+
+
+# 티켓 도구의 Zendesk 티켓 생성을 묶어서 처리하는 서비스
+# 도구 호출에는 임시 ID를 즉시 돌려주고, 백그라운드 워커가 모인 티켓을 create_many 한 번으로 보낸 뒤
+# 비동기 작업(job_status)이 끝나면 임시 ID를 실제 티켓 ID로 연결합니다.
+# Zendesk 주소가 설정되지 않으면 실제 요청 없이 즉시 생성 완료로 기록합니다.
+class ZendeskTicketService:
+
+    def __init__(self, settings: Settings):
+        self.enabled = bool(settings.zendesk_base_url)
+        self.base_url = (settings.zendesk_base_url or "").rstrip("/")
+        self.auth = (
+            (f"{settings.zendesk_email}/token", settings.zendesk_api_token or "")
+            if settings.zendesk_email
+            else None
+        )
+        self.batch_max_size = min(settings.zendesk_batch_max_size, CREATE_MANY_LIMIT)
+        self.batch_max_wait_seconds = settings.zendesk_batch_max_wait_ms / 1000.0
+        self.queue_size = settings.zendesk_queue_size
+        self.job_poll_interval_seconds = settings.zendesk_job_poll_interval_seconds
+        self.max_attempts = settings.zendesk_max_attempts
+        self.request_timeout_seconds = settings.zendesk_request_timeout_seconds
+        self.max_tracked = settings.ticket_status_max_tracked
+        self.pacer = RateLimitPacer()
+        self._client: Optional[httpx.AsyncClient] = None
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker: Optional[asyncio.Task] = None
+        self._poll_tasks: Set[asyncio.Task] = set()
+        self._records: "OrderedDict[str, ZendeskTicketRecord]" = OrderedDict()
+        self._reconcile_ms = LogLinearHistogram(max_value=3_600_000)
+        self.batch_sizes = LogLinearHistogram(max_value=CREATE_MANY_LIMIT)
+        self.http_requests = 0
+        self.counts = {
+            "queued": 0,
+            "created": 0,
+            "failed": 0,
+            "dropped": 0,
+            "batches": 0,
+            "retries": 0,
+        }
+
+    def submit(self, ticket: Dict[str, Any]) -> Optional[ZendeskTicketRecord]:
+        """
+        티켓을 생성 큐에 넣고 임시 ID가 담긴 기록을 반환합니다. 큐가 가득 차면 None을 반환합니다.
+        임시 ID는 티켓의 external_id로도 전달되어 Zendesk에서 검색할 수 있습니다.
+        """
+        today = datetime.now().strftime("%Y%m%d")
+        if not self.enabled:
+            ticket_id = f"ZD-{today}-{random.randint(10000, 99999)}"
+            record = ZendeskTicketRecord(ticket_id, ticket)
+            record.status = STATUS_CREATED
+            record.ticket_id = ticket_id
+            record.resolved_at = record.created_at
+            self._track(record)
+            return record
+
+        provisional_id = f"ZD-P-{today}-{uuid.uuid4().hex[:8].upper()}"
+        record = ZendeskTicketRecord(
+            provisional_id, {**ticket, "external_id": provisional_id}
+        )
+        if self._queue is None:
+            self._queue = asyncio.Queue(maxsize=self.queue_size)
+        if self._worker is None or self._worker.done():
+            self._worker = asyncio.get_running_loop().create_task(self._run())
+        try:
+            self._queue.put_nowait(record)
+        except asyncio.QueueFull:
+            self.counts["dropped"] += 1
+            ZENDESK_TICKETS.inc("dropped")
+            logger.warning(
+                f"티켓 생성 큐가 가득 차 {provisional_id}를 접수하지 못했습니다."
+            )
+            return None
+        self.counts["queued"] += 1
+        ZENDESK_TICKETS.inc("queued")
+        self._track(record)
+        return record
+
+    def _track(self, record: ZendeskTicketRecord):
+        self._records[record.provisional_id] = record
+        while len(self._records) > self.max_tracked:
+            self._records.popitem(last=False)
+
+    def get_status(self, provisional_id: str) -> Optional[Dict[str, Any]]:
+        """이 워커가 접수한 요청의 상태만 조회할 수 있습니다 (다른 워커의 ID는 None)."""
+        record = self._records.get(provisional_id)
+        return record.to_dict() if record is not None else None
+
+    def _get_client(self) -> httpx.AsyncClient:
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                base_url=self.base_url,
+                auth=self.auth,
+                timeout=self.request_timeout_seconds,
+            )
+        return self._client
+
+    async def _run(self):
+        while True:
+            batch = await self._next_batch()
+            try:
+                await self._submit_batch(batch)
+            except Exception as e:
+                logger.error(f"티켓 일괄 생성 중 예상치 못한 오류: {e}")
+                self._fail(batch, str(e))
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+
+    async def _next_batch(self) -> List[ZendeskTicketRecord]:
+        """첫 티켓이 들어온 뒤 batch_max_wait 동안 또는 batch_max_size개가 될 때까지 모읍니다."""
+        batch = [await self._queue.get()]
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.batch_max_wait_seconds
+        while len(batch) < self.batch_max_size:
+            timeout = deadline - loop.time()
+            if timeout <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+            except asyncio.TimeoutError:
+                break
+        return batch
+
+    def _top_up(self, batch: List[ZendeskTicketRecord]):
+        # 속도 제한으로 기다리는 동안 쌓인 티켓을 같은 요청에 싣습니다.
+        while len(batch) < self.batch_max_size:
+            try:
+                batch.append(self._queue.get_nowait())
+            except asyncio.QueueEmpty:
+                return
+
+    async def _request(
+        self, method: str, url: str, json: Optional[Dict[str, Any]] = None
+    ) -> httpx.Response:
+        """페이서 순서를 지켜 요청을 보내고 응답 헤더로 다음 요청 간격을 갱신합니다."""
+        await self.pacer.wait()
+        self.http_requests += 1
+        with tracer.start_span(
+            f"zendesk {method} {url}",
+            {"peer.service": "zendesk"},
+            kind=SPAN_KIND_CLIENT,
+        ):
+            response = await self._get_client().request(
+                method, url, json=json, headers=trace_headers()
+            )
+        self.pacer.update(response)
+        return response
+
+    async def _submit_batch(self, batch: List[ZendeskTicketRecord]):
+        attempt = 0
+        while True:
+            if self.pacer.next_allowed > time.monotonic():
+                await self.pacer.wait()
+                self._top_up(batch)
+            try:
+                response = await self._request(
+                    "POST",
+                    CREATE_MANY_PATH,
+                    {"tickets": [record.ticket for record in batch]},
+                )
+            except _NOT_SENT_ERRORS as e:
+                error = f"{type(e).__name__}: {e}"
+            except httpx.HTTPError as e:
+                # 읽기/쓰기 타임아웃 등은 서버가 이미 작업을 접수했을 수 있어 재전송하면 티켓이 중복될 수 있습니다.
+                # create_many는 비동기 작업이라 external_id로 바로 조회해도 생성 여부를 확정할 수 없으므로 실패로 기록합니다.
+                self._fail(
+                    batch,
+                    f"{type(e).__name__}: {e} (전송 여부 불명확, external_id로 생성 여부 확인 필요)",
+                )
+                return
+            else:
+                if response.status_code == 429:
+                    # 한도 초과는 재시도 횟수에 넣지 않고 Retry-After 이후 다시 보냅니다.
+                    logger.warning(
+                        f"Zendesk 속도 제한(429), {response.headers.get('retry-after')}초 후 {len(batch)}건 재전송"
+                    )
+                    continue
+                if response.status_code < 300:
+                    self.counts["batches"] += 1
+                    self.batch_sizes.record(len(batch))
+                    job = response.json().get("job_status") or {}
+                    for record in batch:
+                        record.status = STATUS_SUBMITTED
+                        record.job_id = job.get("id")
+                    task = asyncio.get_running_loop().create_task(
+                        self._reconcile(batch, job)
+                    )
+                    self._poll_tasks.add(task)
+                    task.add_done_callback(self._poll_tasks.discard)
+                    return
+                error = f"HTTP {response.status_code}: {response.text[:200]}"
+                if response.status_code < 500:
+                    # 요청 자체가 잘못된 경우(401, 422 등)는 재시도해도 같은 결과입니다.
+                    self._fail(batch, error)
+                    return
+
+            attempt += 1
+            if attempt >= self.max_attempts:
+                self._fail(batch, error)
+                return
+            self.counts["retries"] += 1
+            logger.warning(
+                f"티켓 일괄 생성 재시도 예정 ({attempt}/{self.max_attempts}): {error}"
+            )
+            await asyncio.sleep(min(30.0, 0.5 * 2**attempt))
+
+    async def _reconcile(self, batch: List[ZendeskTicketRecord], job: Dict[str, Any]):
+        """create_many 작업이 끝날 때까지 job_status를 조회하고 결과를 임시 ID에 연결합니다."""
+        job_id = job.get("id")
+        if not job_id:
+            self._fail(batch, "응답에 job_status.id가 없습니다.")
+            return
+        failures = 0
+        while job.get("status") not in _JOB_FINISHED:
+            await asyncio.sleep(self.job_poll_interval_seconds)
+            try:
+                response = await self._request(
+                    "GET", JOB_STATUS_PATH.format(job_id=job_id)
+                )
+                if response.status_code == 429:
+                    continue
+                response.raise_for_status()
+                job = response.json().get("job_status") or {}
+                failures = 0
+            except httpx.HTTPError as e:
+                failures += 1
+                if failures >= self.max_attempts:
+                    self._fail(batch, f"작업 상태 조회 실패: {e}")
+                    return
+
+        results = job.get("results") or []
+        # 결과의 index는 요청한 티켓 배열에서의 위치입니다 (없으면 결과 순서를 따릅니다).
+        by_index = {
+            result.get("index", position): result
+            for position, result in enumerate(results)
+        }
+        for position, record in enumerate(batch):
+            result = by_index.get(position)
+            if result and result.get("id") is not None and not result.get("error"):
+                self._finish(record, STATUS_CREATED, ticket_id=str(result["id"]))
+            else:
+                error = (
+                    (result or {}).get("details")
+                    or (result or {}).get("error")
+                    or f"작업 {job_id}이 {job.get('status')} 상태로 종료되었습니다."
+                )
+                self._finish(record, STATUS_FAILED, error=str(error))
+
+    def _fail(self, batch: List[ZendeskTicketRecord], error: str):
+        logger.error(f"티켓 {len(batch)}건 생성 실패: {error}")
+        for record in batch:
+            self._finish(record, STATUS_FAILED, error=error)
+
+    def _finish(
+        self,
+        record: ZendeskTicketRecord,
+        status: str,
+        ticket_id: Optional[str] = None,
+        error: Optional[str] = None,
+    ):
+        record.status = status
+        record.ticket_id = ticket_id
+        record.error = error
+        record.resolved_at = datetime.now()
+        if status == STATUS_CREATED:
+            self._reconcile_ms.record(
+                (time.monotonic() - record.enqueued_monotonic) * 1000.0
+            )
+        self.counts[status] += 1
+        ZENDESK_TICKETS.inc(status)
+
+    async def aclose(self, drain_timeout_seconds: float = 10.0):
+        """남은 티켓을 drain_timeout_seconds 동안 보내고 결과를 기다린 뒤 워커와 커넥션을 정리합니다."""
+        deadline = time.monotonic() + drain_timeout_seconds
+        if self._queue is not None and self._worker is not None:
+            try:
+                await asyncio.wait_for(self._queue.join(), drain_timeout_seconds)
+            except asyncio.TimeoutError:
+                logger.warning(
+                    f"티켓 생성 큐에 남은 {self._queue.qsize()}건을 보내지 못하고 종료합니다."
+                )
+        if self._poll_tasks:
+            await asyncio.wait(
+                set(self._poll_tasks), timeout=max(0.0, deadline - time.monotonic())
+            )
+        tasks = list(self._poll_tasks)
+        if self._worker is not None:
+            tasks.append(self._worker)
+        for task in tasks:
+            task.cancel()
+        for task in tasks:
+            with contextlib.suppress(asyncio.CancelledError):
+                await task
+        self._worker = None
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    def stats(self) -> Dict[str, Any]:
+        counts = self.counts
+        return {
+            "enabled": self.enabled,
+            "base_url": self.base_url or None,
+            # 접수되었지만 아직 실제 티켓 ID가 확정되지 않은 티켓 수
+            "pending": counts["queued"] - counts["created"] - counts["failed"],
+            "queue_depth": self._queue.qsize() if self._queue else 0,
+            "tracked": len(self._records),
+            **self.counts,
+            "http_requests": self.http_requests,
+            "batch_size": self.batch_sizes.summary(),
+            "reconcile_latency_ms": self._reconcile_ms.summary(),
+            "rate_limit": self.pacer.stats(),
+        }
@@ -1,33 +1,136 @@
-from fastapi import FastAPI
+import asyncio
+import contextlib
+from contextlib import asynccontextmanager
+from typing import Optional
+from fastapi import FastAPI, Request
+from fastapi.responses import ORJSONResponse
+from app.core.config import Settings, settings
 from app.core.logging import get_logger
-from app.api.v1.endpoints import call_webhooks, agent_tools, inbound_webhook
+from app.core.admission import AdmissionController, AdmissionMiddleware
+from app.core.metrics import MetricsMiddleware, run_metrics_background
+from app.core.profiling import Profiler, ProfilingMiddleware
+from app.core.tracing import TracingMiddleware, tracer
+from app.services.container import ServiceContainer
+from app.api.v1.endpoints import (
+    call_webhooks,
+    agent_tools,
+    inbound_webhook,
+    stats,
+    metrics,
+    profiling,
+)
 
 # 로거 초기화
 logger = get_logger(__name__)
 
-# FastAPI 애플리케이션 생성
-app = FastAPI(
-    title="Vox.ai Integration Client Server",
-    description="Vox.ai 웹훅 및 API 도구 연동을 위한 고객사 서버",
-    version="1.0.0",
-    docs_url="/docs",
-    redoc_url="/redoc",
-)
 
-# 라우터 포함
-app.include_router(call_webhooks.router, prefix="/api/v1", tags=["Call Webhooks"])
-app.include_router(agent_tools.router, prefix="/api/v1", tags=["Agent Tools"])
-app.include_router(inbound_webhook.router, prefix="/api/v1", tags=["Inbound Webhook"])
+def create_app(app_settings: Optional[Settings] = None) -> FastAPI:
+    """
+    FastAPI 애플리케이션을 생성합니다.
+    서비스, 커넥션 풀, 고객 디렉터리 등 무거운 리소스는 import 시점이 아니라
+    워커마다 lifespan 시작 단계에서 한 번 만들어지며, 워밍업이 끝나야 /ready가 200을 반환합니다.
+    """
+    app_settings = app_settings or settings
+
+    @asynccontextmanager
+    async def lifespan(app: FastAPI):
+        services = ServiceContainer(app_settings)
+        app.state.services = services
+
+        background_tasks = []
+        if app_settings.metrics_enabled:
+            background_tasks.append(
+                asyncio.create_task(
+                    run_metrics_background(
+                        services.metrics_exporter,
+                        app_settings.event_loop_lag_interval_seconds,
+                        app_settings.metrics_flush_interval_seconds,
+                    )
+                )
+            )
+        if app_settings.tracing_sample_ratio > 0:
+            tracer.configure(app_settings.tracing_sample_ratio, services.span_exporter)
+            background_tasks.append(asyncio.create_task(services.span_exporter.run()))
+
+        await services.warmup()
+        app.state.ready = True
+        logger.info("워커가 요청을 받을 준비를 마쳤습니다.")
+        yield
+
+        # 종료가 시작되면 로드 밸런서가 새 요청을 보내지 않도록 준비 상태를 먼저 해제합니다.
+        app.state.ready = False
+        for task in background_tasks:
+            task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await task
+        if tracer.exporter is services.span_exporter:
+            tracer.configure(0.0, None)
+            # 종료 전에 남은 스팬을 모두 내보냅니다.
+            await services.span_exporter.flush()
+        services.metrics_exporter.retire()
+        await services.aclose()
+
+    # FastAPI 애플리케이션 생성
+    app = FastAPI(
+        title="Vox.ai Integration Client Server",
+        description="Vox.ai 웹훅 및 API 도구 연동을 위한 고객사 서버",
+        version="1.0.0",
+        docs_url="/docs",
+        redoc_url="/redoc",
+        lifespan=lifespan,
+        # 응답은 orjson으로 직렬화합니다 (한국어는 이스케이프 없이 UTF-8로 전송).
+        default_response_class=ORJSONResponse,
+    )
+    app.state.settings = app_settings
+    app.state.ready = False
+
+    # 나중에 추가한 미들웨어가 바깥쪽에서 실행되므로 요청 스팬이 지표 측정 구간을 포함하고,
+    # 승인 제어에서 거절된 요청(503/429)도 지표와 트레이스에 기록됩니다.
+    # 요청 단위 프로파일은 가장 안쪽에서 실행되어 엔드포인트 처리 구간만 측정합니다.
+    app.state.profiler = None
+    if app_settings.profiling_admin_token:
+        app.state.profiler = Profiler(app_settings)
+        app.add_middleware(ProfilingMiddleware, profiler=app.state.profiler)
+        app.include_router(profiling.router, tags=["Admin"])
+    app.state.admission = None
+    if app_settings.admission_enabled:
+        app.state.admission = AdmissionController(app_settings)
+        app.add_middleware(AdmissionMiddleware, controller=app.state.admission)
+    if app_settings.metrics_enabled:
+        app.add_middleware(MetricsMiddleware)
+        app.include_router(metrics.router, tags=["Metrics"])
+    if app_settings.tracing_sample_ratio > 0:
+        app.add_middleware(TracingMiddleware)
+
+    # 라우터 포함
+    app.include_router(call_webhooks.router, prefix="/api/v1", tags=["Call Webhooks"])
+    app.include_router(agent_tools.router, prefix="/api/v1", tags=["Agent Tools"])
+    app.include_router(
+        inbound_webhook.router, prefix="/api/v1", tags=["Inbound Webhook"]
+    )
+    app.include_router(stats.router, prefix="/api/v1", tags=["Stats"])
+
+    @app.get("/", include_in_schema=False)
+    async def root():
+        """기본 경로 (헬스 체크용)"""
+        return {"message": "Vox.ai Integration Skeleton Server is running."}
+
+    @app.get("/ready", include_in_schema=False)
+    async def ready(request: Request):
+        """준비 상태 확인 (워밍업 완료 전이나 종료 중에는 503)"""
+        if not request.app.state.ready:
+            return ORJSONResponse({"status": "starting"}, status_code=503)
+        return {"status": "ready"}
+
+    return app
 
 
-@app.get("/", include_in_schema=False)
-async def root():
-    """기본 경로 (헬스 체크용)"""
-    return {"message": "Vox.ai Integration Skeleton Server is running."}
+app = create_app()
 
 
 # 서버 실행 방법 안내 (주석)
 # 터미널에서 아래 명령어를 실행하세요:
 # poetry run uvicorn main:app --reload --host 0.0.0.0 --port 8000
+# (또는 설정별 앱을 만들려면: poetry run uvicorn --factory main:create_app)
 #
 # .env 파일을 생성하여 환경 변수를 설정해야 합니다. (.env.example 참고)
@@ -0,0 +1,134 @@
+import asyncio
+from app.core.admission import (
+    PRIORITY_BACKGROUND,
+    PRIORITY_LIVE,
+    PriorityConcurrencyLimiter,
+    classify_path,
+)
+
+
+def _limiter(**kwargs) -> PriorityConcurrencyLimiter:
+    options = {
+        "max_concurrency": 2,
+        "background_max_concurrency": 1,
+        "max_queue": 10,
+        "queue_timeouts": {PRIORITY_LIVE: 1.0, PRIORITY_BACKGROUND: 1.0},
+    }
+    options.update(kwargs)
+    return PriorityConcurrencyLimiter(**options)
+
+
+def test_classify_path():
+    assert classify_path("/api/v1/inbound") == PRIORITY_LIVE
+    assert classify_path("/api/v1/tools/check_flight_ticket") == PRIORITY_LIVE
+    assert classify_path("/api/v1/call_events") == PRIORITY_BACKGROUND
+    assert classify_path("/api/v1/stats/admission") == PRIORITY_BACKGROUND
+    assert classify_path("/ready") is None
+
+
+def test_background_is_limited_to_its_own_share():
+    async def scenario():
+        limiter = _limiter()
+        assert await limiter.acquire(PRIORITY_BACKGROUND) is None
+        waiter = asyncio.create_task(limiter.acquire(PRIORITY_BACKGROUND))
+        await asyncio.sleep(0)
+        # 후순위 한도가 차도 실시간 요청은 남은 전체 한도로 바로 시작합니다.
+        assert await limiter.acquire(PRIORITY_LIVE) is None
+        assert limiter.stats()["priorities"][PRIORITY_BACKGROUND]["waiting"] == 1
+
+        limiter.release(PRIORITY_BACKGROUND)
+        assert await waiter is None
+        return limiter
+
+    limiter = asyncio.run(scenario())
+    assert limiter.inflight == {PRIORITY_LIVE: 1, PRIORITY_BACKGROUND: 1}
+    assert limiter.queued[PRIORITY_BACKGROUND] == 1
+
+
+def test_released_slot_goes_to_live_waiter_first():
+    async def scenario():
+        limiter = _limiter(background_max_concurrency=2)
+        assert await limiter.acquire(PRIORITY_LIVE) is None
+        assert await limiter.acquire(PRIORITY_LIVE) is None
+        order = []
+
+        async def wait(priority):
+            assert await limiter.acquire(priority) is None
+            order.append(priority)
+
+        background = asyncio.create_task(wait(PRIORITY_BACKGROUND))
+        await asyncio.sleep(0)
+        live = asyncio.create_task(wait(PRIORITY_LIVE))
+        await asyncio.sleep(0)
+
+        # 먼저 기다린 후순위 요청보다 실시간 요청이 슬롯을 먼저 받습니다.
+        limiter.release(PRIORITY_LIVE)
+        await live
+        assert order == [PRIORITY_LIVE]
+        assert not background.done()
+        limiter.release(PRIORITY_LIVE)
+        await asyncio.gather(background, live)
+        return order
+
+    assert asyncio.run(scenario()) == [PRIORITY_LIVE, PRIORITY_BACKGROUND]
+
+
+def test_background_does_not_start_while_live_is_waiting():
+    async def scenario():
+        limiter = _limiter(max_concurrency=1)
+        assert await limiter.acquire(PRIORITY_LIVE) is None
+        live = asyncio.create_task(limiter.acquire(PRIORITY_LIVE))
+        await asyncio.sleep(0)
+        background = asyncio.create_task(limiter.acquire(PRIORITY_BACKGROUND))
+        await asyncio.sleep(0)
+
+        limiter.release(PRIORITY_LIVE)
+        assert await live is None
+        assert not background.done()
+        limiter.release(PRIORITY_LIVE)
+        assert await background is None
+
+    asyncio.run(scenario())
+
+
+def test_queue_full_and_queue_timeout_are_rejected():
+    async def scenario():
+        limiter = _limiter(
+            max_concurrency=1,
+            max_queue=1,
+            queue_timeouts={PRIORITY_LIVE: 0.01, PRIORITY_BACKGROUND: 0.01},
+        )
+        assert await limiter.acquire(PRIORITY_LIVE) is None
+        waiter = asyncio.create_task(limiter.acquire(PRIORITY_LIVE))
+        await asyncio.sleep(0)
+        assert await limiter.acquire(PRIORITY_LIVE) == "queue_full"
+        assert await waiter == "queue_timeout"
+
+        # 시간 초과된 대기자는 대기열에서 빠지고 반납된 슬롯을 받지 않습니다.
+        limiter.release(PRIORITY_LIVE)
+        return limiter
+
+    limiter = asyncio.run(scenario())
+    assert limiter.rejected[PRIORITY_LIVE] == 2
+    assert limiter.inflight[PRIORITY_LIVE] == 0
+    assert limiter.stats()["priorities"][PRIORITY_LIVE]["waiting"] == 0
+
+
+def test_timed_out_live_waiter_unblocks_background():
+    async def scenario():
+        limiter = _limiter(
+            max_concurrency=2,
+            queue_timeouts={PRIORITY_LIVE: 0.01, PRIORITY_BACKGROUND: 1.0},
+        )
+        assert await limiter.acquire(PRIORITY_LIVE) is None
+        assert await limiter.acquire(PRIORITY_LIVE) is None
+        live = asyncio.create_task(limiter.acquire(PRIORITY_LIVE))
+        await asyncio.sleep(0)
+        background = asyncio.create_task(limiter.acquire(PRIORITY_BACKGROUND))
+        await asyncio.sleep(0)
+
+        assert await live == "queue_timeout"
+        limiter.release(PRIORITY_LIVE)
+        assert await background is None
+
+    asyncio.run(scenario())
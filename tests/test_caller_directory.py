@@ -0,0 +1,99 @@
+import json
+import os
+import pytest
+from app.services.caller_directory import (
+    MappedCallerDirectory,
+    build_directory_index,
+    ensure_directory_index,
+    normalize_phone_digits,
+    normalize_phone_number,
+)
+
+
+@pytest.mark.parametrize(
+    "raw",
+    [
+        "+82 10-1234-5678",
+        "+82 010-1234-5678",
+        "0082 10-1234-5678",
+        "0082-010-1234-5678",
+        "010-1234-5678",
+        "821012345678",
+    ],
+)
+def test_normalize_korean_mobile_formats(raw):
+    assert normalize_phone_number(raw) == 821012345678
+
+
+def test_normalize_keeps_foreign_numbers():
+    assert normalize_phone_digits("+1 415 555 0100") == "14155550100"
+    assert normalize_phone_number("+82 0") is None
+    assert normalize_phone_number(None) is None
+
+
+def _write_source(path, records):
+    with open(path, "w", encoding="utf-8") as f:
+        for number, dynamic_variables, metadata in records:
+            item = {
+                "phone_number": number,
+                "dynamic_variables": dynamic_variables,
+                "metadata": metadata,
+            }
+            f.write(json.dumps(item, ensure_ascii=False) + "\n")
+
+
+def test_index_round_trip(tmp_path):
+    source = tmp_path / "callers.ndjson"
+    index = tmp_path / "callers.idx"
+    _write_source(
+        source,
+        [
+            ("010-2222-3333", {"user_name": "이영희"}, {"user_id": "u2"}),
+            ("+82 10-1111-2222", {"user_name": "김철수"}, {"user_id": "u1"}),
+            ("not a number", {"user_name": "무시"}, {}),
+            # 같은 번호가 다시 나오면 마지막 레코드를 사용합니다.
+            ("+82 010-2222-3333", {"user_name": "이영희2"}, {"user_id": "u3"}),
+        ],
+    )
+
+    assert build_directory_index(str(source), str(index)) == 2
+    directory = MappedCallerDirectory(str(index))
+    assert len(directory) == 2
+    assert directory.lookup("010-1111-2222") == (
+        {"user_name": "김철수"},
+        {"user_id": "u1"},
+    )
+    assert directory.lookup("821022223333") == (
+        {"user_name": "이영희2"},
+        {"user_id": "u3"},
+    )
+    assert directory.lookup("010-9999-9999") is None
+    assert directory.lookup(None) is None
+
+
+def test_empty_source_builds_empty_index(tmp_path):
+    source = tmp_path / "callers.ndjson"
+    index = tmp_path / "callers.idx"
+    source.write_text("", encoding="utf-8")
+
+    assert build_directory_index(str(source), str(index)) == 0
+    directory = MappedCallerDirectory(str(index))
+    assert len(directory) == 0
+    assert directory.lookup("010-1111-2222") is None
+
+
+def test_ensure_rebuilds_only_stale_index(tmp_path):
+    source = tmp_path / "callers.ndjson"
+    _write_source(source, [("010-1111-2222", {"user_name": "김철수"}, {})])
+
+    index = ensure_directory_index(str(source), None)
+    assert index == f"{source}.idx"
+    built_at = os.path.getmtime(index)
+    assert ensure_directory_index(str(source), None) == index
+    assert os.path.getmtime(index) == built_at
+
+    _write_source(source, [("010-3333-4444", {"user_name": "박민수"}, {})])
+    os.utime(source, (built_at + 10, built_at + 10))
+    ensure_directory_index(str(source), None)
+    assert MappedCallerDirectory(index).lookup("010-3333-4444") is not None
+    assert not [name for name in os.listdir(tmp_path) if name.endswith(".tmp")]
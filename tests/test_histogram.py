@@ -0,0 +1,75 @@
+import pytest
+from app.core.histogram import LogLinearHistogram
+
+
+@pytest.mark.parametrize("bits", [2, 4, 7])
+def test_bucket_bounds_contain_value(bits):
+    histogram = LogLinearHistogram(sub_bucket_bits=bits, max_value=1 << 20)
+    half = 1 << (bits - 1)
+    for value in list(range(5000)) + [(1 << 20) - 1, 1 << 20]:
+        index = histogram._index(value)
+        upper = histogram._upper_bound(index)
+        lower = histogram._upper_bound(index - 1) + 1 if index else 0
+        assert lower <= value <= upper
+        # 버킷 폭은 값의 1/half 이내입니다 (작은 값은 정확히 기록됩니다).
+        assert upper - lower <= max(0, value // half)
+
+
+def test_bucket_index_is_monotonic():
+    histogram = LogLinearHistogram(max_value=100_000)
+    indexes = [histogram._index(value) for value in range(100_000)]
+    assert indexes == sorted(indexes)
+    assert indexes[-1] < len(histogram.counts)
+
+
+def test_percentiles_of_small_values_are_exact():
+    histogram = LogLinearHistogram()
+    for value in range(1, 11):
+        histogram.record(value)
+    assert histogram.percentile(50) == 5
+    assert histogram.percentile(90) == 9
+    assert histogram.percentile(100) == 10
+    assert histogram.summary() == {
+        "p50": 5,
+        "p90": 9,
+        "p99": 10,
+        "mean": 5.5,
+        "max": 10,
+    }
+
+
+def test_percentile_is_capped_by_recorded_max():
+    histogram = LogLinearHistogram()
+    histogram.record(1000)
+    upper = histogram._upper_bound(histogram._index(1000))
+    assert upper > 1000
+    assert histogram.percentile(99) == 1000
+
+
+def test_out_of_range_values_are_clamped():
+    histogram = LogLinearHistogram(max_value=1000)
+    histogram.record(-5)
+    histogram.record(10**9)
+    assert histogram.count == 2
+    assert histogram.max == 1000
+    assert histogram.percentile(0) == 0
+    assert histogram.percentile(100) == 1000
+
+
+def test_merge_and_reset():
+    first = LogLinearHistogram()
+    second = LogLinearHistogram()
+    for value in (1, 2, 3):
+        first.record(value)
+    for value in (100, 200):
+        second.record(value)
+
+    first.merge(second)
+    assert first.count == 5
+    assert first.total == 306
+    assert first.max == 200
+
+    first.reset()
+    assert first.count == 0
+    assert first.percentile(50) is None
+    assert first.summary()["mean"] is None
@@ -0,0 +1,162 @@
+import asyncio
+import pytest
+from app.services import outbound_guard
+from app.services.outbound_guard import AdaptiveConcurrencyLimiter, CircuitBreaker
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    # 서킷 브레이커의 대기 시간을 실제로 기다리지 않도록 monotonic 시계를 고정합니다.
+    now = [1000.0]
+    monkeypatch.setattr(outbound_guard.time, "monotonic", lambda: now[0])
+    return now
+
+
+def test_breaker_opens_after_consecutive_failures(clock):
+    breaker = CircuitBreaker(failure_threshold=3, reset_timeout_seconds=10)
+    for _ in range(2):
+        assert breaker.allow()
+        breaker.record_failure(breaker.generation)
+    assert breaker.state == CircuitBreaker.CLOSED
+
+    breaker.record_failure(breaker.generation)
+    assert breaker.state == CircuitBreaker.OPEN
+    assert breaker.fail_fast()
+    assert not breaker.allow()
+    assert breaker.rejected == 2
+
+
+def test_breaker_success_resets_failure_count(clock):
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout_seconds=10)
+    breaker.record_failure(breaker.generation)
+    breaker.record_success(breaker.generation)
+    breaker.record_failure(breaker.generation)
+    assert breaker.state == CircuitBreaker.CLOSED
+
+
+def test_breaker_half_open_probe_closes_on_success(clock):
+    breaker = CircuitBreaker(
+        failure_threshold=1, reset_timeout_seconds=10, half_open_max_calls=1
+    )
+    breaker.record_failure(breaker.generation)
+    clock[0] += 10
+    assert not breaker.fail_fast()
+
+    assert breaker.allow()
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    # 프로브는 half_open_max_calls개까지만 허용합니다.
+    assert not breaker.allow()
+
+    breaker.record_success(breaker.generation)
+    assert breaker.state == CircuitBreaker.CLOSED
+    assert breaker.allow()
+
+
+def test_breaker_half_open_probe_failure_reopens(clock):
+    breaker = CircuitBreaker(failure_threshold=5, reset_timeout_seconds=10)
+    for _ in range(5):
+        breaker.record_failure(breaker.generation)
+    clock[0] += 10
+    assert breaker.allow()
+
+    breaker.record_failure(breaker.generation)
+    assert breaker.state == CircuitBreaker.OPEN
+    assert breaker.fail_fast()
+
+
+def test_breaker_ignores_results_from_previous_generation(clock):
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout_seconds=10)
+    generation = breaker.generation
+    assert breaker.allow()
+    breaker.record_failure(breaker.generation)
+    assert breaker.state == CircuitBreaker.OPEN
+
+    # 브레이커가 열리기 전에 허용된 요청의 늦은 결과는 상태를 바꾸지 않습니다.
+    breaker.record_success(generation)
+    assert breaker.state == CircuitBreaker.OPEN
+    breaker.record_failure(generation)
+    assert breaker.consecutive_failures == 1
+
+
+def _limiter(**kwargs) -> AdaptiveConcurrencyLimiter:
+    options = {
+        "initial_limit": 1,
+        "min_limit": 1,
+        "max_limit": 10,
+        "latency_target_seconds": 1.0,
+    }
+    options.update(kwargs)
+    return AdaptiveConcurrencyLimiter(**options)
+
+
+def test_limiter_wakes_waiters_in_arrival_order():
+    async def scenario():
+        limiter = _limiter()
+        assert await limiter.acquire(1.0)
+        order = []
+
+        async def wait(name):
+            assert await limiter.acquire(1.0)
+            order.append(name)
+
+        tasks = [asyncio.create_task(wait(name)) for name in "abc"]
+        await asyncio.sleep(0)
+        assert limiter.waiting == 3
+
+        for _ in range(3):
+            limiter.release_unused()
+            await asyncio.sleep(0)
+        await asyncio.gather(*tasks)
+        return limiter, order
+
+    limiter, order = asyncio.run(scenario())
+    assert order == ["a", "b", "c"]
+    assert limiter.inflight == 1
+    assert limiter.queued == 3
+    assert limiter.waiting == 0
+
+
+def test_limiter_timed_out_waiter_is_skipped():
+    async def scenario():
+        limiter = _limiter()
+        assert await limiter.acquire(1.0)
+        assert not await limiter.acquire(0.01)
+
+        waiter = asyncio.create_task(limiter.acquire(1.0))
+        await asyncio.sleep(0)
+        limiter.release_unused()
+        return limiter, await waiter
+
+    limiter, acquired = asyncio.run(scenario())
+    # 시간 초과된 대기자를 건너뛰고 다음 대기자에게 권한을 넘깁니다.
+    assert acquired
+    assert limiter.timed_out == 1
+    assert limiter.inflight == 1
+    assert limiter.waiting == 0
+
+
+def test_limiter_rejects_when_waiter_queue_is_full():
+    async def scenario():
+        limiter = _limiter(max_waiters=1)
+        assert await limiter.acquire(1.0)
+        waiter = asyncio.create_task(limiter.acquire(1.0))
+        await asyncio.sleep(0)
+        rejected = not await limiter.acquire(1.0)
+        limiter.release_unused()
+        await waiter
+        return limiter, rejected
+
+    limiter, rejected = asyncio.run(scenario())
+    assert rejected
+    assert limiter.rejected == 1
+
+
+def test_limiter_aimd_adjusts_limit():
+    limiter = _limiter(initial_limit=4)
+    limiter.inflight = 1
+    limiter.release(latency_seconds=0.1, success=True)
+    assert limiter.limit == pytest.approx(4.25)
+
+    limiter.inflight = 1
+    limiter.release(latency_seconds=5.0, success=True)
+    assert limiter.limit == pytest.approx(2.125)
@@ -0,0 +1,61 @@
+import pytest
+from app.services.reservation_store import (
+    SAMPLE_RESERVATION_ROWS,
+    InMemoryReservationStore,
+    MappedReservationStore,
+    generate_reservation_file,
+    load_reservation_store,
+)
+
+
+@pytest.fixture(scope="module")
+def store(tmp_path_factory):
+    path = tmp_path_factory.mktemp("reservations") / "reservations.rsv"
+    generate_reservation_file(str(path), 200, seed=7)
+    return MappedReservationStore(str(path))
+
+
+def test_generated_file_is_deterministic(tmp_path):
+    first = tmp_path / "first.rsv"
+    second = tmp_path / "second.rsv"
+    assert generate_reservation_file(str(first), 50, seed=3) == (
+        generate_reservation_file(str(second), 50, seed=3)
+    )
+    assert first.read_bytes() == second.read_bytes()
+
+
+def test_every_reservation_round_trips(store):
+    assert len(store) == 200
+    for index in range(len(store)):
+        record = store._reservation(index)
+        rsv_no = record[0].decode("ascii")
+        alpha_pnr_no = record[1].decode("ascii")
+        name = store._name(record[3])
+
+        rows = store.lookup(reservation_no=rsv_no)
+        assert rows
+        assert {row["RSV_NO"] for row in rows} == {rsv_no}
+        assert {row["ALPHA_PNR_NO"] for row in rows} == {alpha_pnr_no}
+        assert {row["RSV_USR_NM"] for row in rows} == {name}
+        assert store.lookup(reservation_no=alpha_pnr_no.lower()) == rows
+        assert store.lookup(reservation_no=rsv_no, passenger_name=name) == rows
+        assert rsv_no in {
+            row["RSV_NO"]
+            for row in store.lookup(passenger_name=name, max_reservations=200)
+        }
+
+
+def test_lookup_misses(store):
+    rsv_no = store._reservation(0)[0].decode("ascii")
+    assert store.lookup(reservation_no="ZZZZZ9") == []
+    assert store.lookup(reservation_no=rsv_no, passenger_name="없는이름") == []
+    assert store.lookup(passenger_name="없는이름") == []
+    assert store.lookup() == []
+
+
+def test_sample_store_without_configured_file():
+    store = load_reservation_store(None)
+    assert isinstance(store, InMemoryReservationStore)
+    row = SAMPLE_RESERVATION_ROWS[0]
+    rows = store.lookup(reservation_no=row["RSV_NO"])
+    assert rows and all(r["RSV_NO"] == row["RSV_NO"] for r in rows)
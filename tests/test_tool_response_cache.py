@@ -0,0 +1,107 @@
+import os
+import pytest
+from app.services import tool_response_cache
+from app.services.tool_response_cache import (
+    ToolCachePolicy,
+    ToolResponseCache,
+    load_tool_cache_policies,
+)
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(tool_response_cache.time, "monotonic", lambda: now[0])
+    return now
+
+
+def _cache(max_entries: int = 100) -> ToolResponseCache:
+    policies = {
+        "monitor_ev_system": ToolCachePolicy(
+            "monitor_ev_system", 15, ["charger_id"], []
+        ),
+        "control_ev_system": ToolCachePolicy(
+            "control_ev_system", None, None, ["monitor_ev_system"]
+        ),
+        "validate_pnr_format": ToolCachePolicy("validate_pnr_format", 60, None, []),
+    }
+    return ToolResponseCache(policies, max_entries)
+
+
+def _fill(cache, tool_name, payload, response):
+    key, cached = cache.lookup(tool_name, payload)
+    assert cached is None
+    cache.store(tool_name, payload, key, response)
+
+
+def test_repo_schemas_declare_invalidation():
+    policies = load_tool_cache_policies(REPO_ROOT)
+    assert policies["monitor_ev_system"].cacheable
+    assert not policies["control_ev_system"].cacheable
+    assert policies["control_ev_system"].invalidates == ["monitor_ev_system"]
+
+
+def test_hit_uses_key_fields_and_ignores_whitespace(clock):
+    cache = _cache()
+    _fill(cache, "monitor_ev_system", {"charger_id": "SEL-1"}, {"status": "ok"})
+
+    key, cached = cache.lookup(
+        "monitor_ev_system", {"charger_id": " SEL-1 ", "tool_call_id": "x"}
+    )
+    assert cached == {"status": "ok"}
+    assert cache.lookup("monitor_ev_system", {"charger_id": "SEL-2"})[1] is None
+    assert cache.hits["monitor_ev_system"] == 1
+
+
+def test_entries_expire_after_ttl(clock):
+    cache = _cache()
+    _fill(cache, "monitor_ev_system", {"charger_id": "SEL-1"}, {"status": "ok"})
+    clock[0] += 15
+    assert cache.lookup("monitor_ev_system", {"charger_id": "SEL-1"})[1] is None
+
+
+def test_state_changing_tool_invalidates_same_key(clock):
+    cache = _cache()
+    _fill(cache, "monitor_ev_system", {"charger_id": "SEL-1"}, {"status": "ok"})
+    _fill(cache, "monitor_ev_system", {"charger_id": "SEL-2"}, {"status": "ok"})
+
+    key, _ = cache.lookup("control_ev_system", {"charger_id": "SEL-1"})
+    assert key is None
+    cache.store("control_ev_system", {"charger_id": "SEL-1", "action": "stop"}, key, {})
+
+    assert cache.lookup("monitor_ev_system", {"charger_id": "SEL-1"})[1] is None
+    assert cache.lookup("monitor_ev_system", {"charger_id": "SEL-2"})[1] is not None
+    assert cache.invalidations == 1
+
+
+def test_invalidation_without_key_fields_clears_whole_tool(clock):
+    cache = _cache()
+    _fill(cache, "monitor_ev_system", {"charger_id": "SEL-1"}, {"status": "ok"})
+    _fill(cache, "monitor_ev_system", {"charger_id": "SEL-2"}, {"status": "ok"})
+    _fill(cache, "validate_pnr_format", {"pnr": "ABC123"}, {"valid": True})
+
+    assert cache.invalidate("monitor_ev_system", {"action": "reset_all"}) == 2
+    assert cache.lookup("monitor_ev_system", {"charger_id": "SEL-2"})[1] is None
+    assert cache.lookup("validate_pnr_format", {"pnr": "ABC123"})[1] is not None
+
+
+def test_error_responses_are_not_cached(clock):
+    cache = _cache()
+    _fill(cache, "validate_pnr_format", {"pnr": "bad"}, {"status": "error"})
+    _fill(cache, "validate_pnr_format", {"pnr": "worse"}, {"error": "x"})
+    assert cache.lookup("validate_pnr_format", {"pnr": "bad"})[1] is None
+    assert cache.lookup("validate_pnr_format", {"pnr": "worse"})[1] is None
+
+
+def test_least_recently_used_entry_is_evicted(clock):
+    cache = _cache(max_entries=2)
+    for pnr in ("AAA111", "BBB222"):
+        _fill(cache, "validate_pnr_format", {"pnr": pnr}, {"valid": True})
+    cache.lookup("validate_pnr_format", {"pnr": "AAA111"})
+    _fill(cache, "validate_pnr_format", {"pnr": "CCC333"}, {"valid": True})
+
+    assert cache.evictions == 1
+    assert cache.lookup("validate_pnr_format", {"pnr": "AAA111"})[1] is not None
+    assert cache.lookup("validate_pnr_format", {"pnr": "BBB222"})[1] is None